@@ -5,6 +5,7 @@ results, and doing data cleaning
 from statsmodels.compat.python import reduce, iteritems, lmap, zip, range
 from statsmodels.compat.numpy import np_matrix_rank
 import numpy as np
+from scipy import sparse
 from pandas import DataFrame, Series, isnull
 from statsmodels.tools.decorators import (resettable_cache, cache_readonly,
                                           cache_writable)
@@ -567,6 +568,54 @@ class PandasData(ModelData):
         else:
             return DataFrame(result, columns=self.ynames)
 
+
+class SparseData(ModelData):
+    """
+    Data handling class for a scipy sparse exog
+
+    exog is converted to a CSR matrix of floats and is never converted to a
+    dense array. Names are only taken from a pandas endog.
+    """
+
+    @classmethod
+    def handle_missing(cls, endog, exog, missing, **kwargs):
+        raise ValueError("missing='%s' is not available with a sparse exog"
+                         % missing)
+
+    def _get_xarr(self, exog):
+        return sparse.csr_matrix(exog, dtype=np.float64)
+
+    def _check_integrity(self):
+        if self.exog is not None:
+            if self.exog.shape[0] != len(self.endog):
+                raise ValueError("endog and exog matrices are different sizes")
+
+    def _handle_constant(self, hasconst):
+        if hasconst is not None or self.exog is None:
+            return super(SparseData, self)._handle_constant(hasconst)
+
+        exog = self.exog
+        max_ = exog.max(0).toarray().ravel()
+        min_ = exog.min(0).toarray().ravel()
+        const_idx = np.nonzero((max_ == min_) & (max_ != 0))[0]
+        if len(const_idx) > 0:
+            # prefer a column of ones
+            ones_idx = const_idx[max_[const_idx] == 1]
+            self.const_idx = ones_idx[0] if len(ones_idx) else const_idx[0]
+            self.k_constant = 1
+        else:
+            # look for implicit constant, e.g. a full set of dummies
+            from scipy.sparse.linalg import lsqr
+            nobs = exog.shape[0]
+            resid_norm = lsqr(exog, np.ones(nobs), atol=1e-12,
+                              btol=1e-12)[3]
+            self.k_constant = int(resid_norm < 1e-8 * np.sqrt(nobs))
+            self.const_idx = None
+
+    def _get_row_labels(self, arr):
+        return getattr(self.orig_endog, 'index', None)
+
+
 def _make_endog_names(endog):
     if endog.ndim == 1 or endog.shape[1] == 1:
         ynames = ['y']
@@ -577,7 +626,11 @@ def _make_endog_names(endog):
 
 
 def _make_exog_names(exog):
-    exog_var = exog.var(0)
+    if sparse.issparse(exog):
+        # the range is zero for the same columns as the variance
+        exog_var = (exog.max(0) - exog.min(0)).toarray().ravel()
+    else:
+        exog_var = exog.var(0)
     if (exog_var == 0).any():
         # assumes one constant in first or last position
         # avoid exception if more than one constant
@@ -603,7 +656,9 @@ def handle_data_class_factory(endog, exog):
     """
     Given inputs
     """
-    if data_util._is_using_ndarray_type(endog, exog):
+    if sparse.issparse(exog):
+        klass = SparseData
+    elif data_util._is_using_ndarray_type(endog, exog):
         klass = ModelData
     elif data_util._is_using_pandas(endog, exog):
         klass = PandasData
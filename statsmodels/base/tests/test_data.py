@@ -886,6 +886,37 @@ def test_formula_missing_extra_arrays():
     assert_raises(ValueError, sm_data.handle_data, endog, exog, **kwargs)
 
 
+def test_sparse_exog():
+    from scipy import sparse
+    np.random.seed(12345)
+    nobs = 20
+    x = np.random.randn(nobs, 2)
+    endog = np.random.randn(nobs)
+
+    exog = sparse.csr_matrix(np.column_stack((x, np.ones(nobs))))
+    data = sm_data.handle_data(endog, exog)
+    assert_(isinstance(data, sm_data.SparseData))
+    assert_(sparse.issparse(data.exog))
+    assert_equal(data.k_constant, 1)
+    assert_equal(data.const_idx, 2)
+    assert_equal(data.xnames, ['x1', 'x2', 'const'])
+
+    # implicit constant from a full set of dummies
+    dummies = (np.arange(nobs)[:, None] % 2 == np.arange(2)) * 1.
+    exog = sparse.csr_matrix(np.column_stack((dummies, x)))
+    data = sm_data.handle_data(endog, exog)
+    assert_equal(data.k_constant, 1)
+    assert_equal(data.const_idx, None)
+
+    data = sm_data.handle_data(endog, sparse.csr_matrix(x))
+    assert_equal(data.k_constant, 0)
+
+    assert_raises(ValueError, sm_data.handle_data, endog[:-1],
+                  sparse.csr_matrix(x))
+    assert_raises(ValueError, sm_data.handle_data, endog,
+                  sparse.csr_matrix(x), missing='drop')
+
+
 if __name__ == "__main__":
     import nose
     #nose.runmodule(argv=[__file__, '-vvs', '-x', '--pdb', '--pdb-failure'],
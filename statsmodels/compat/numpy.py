@@ -452,6 +452,186 @@ else:
         return ret
 
 
+if NumpyVersion(np.__version__) >= '1.10.0':
+    np_stack = np.stack
+else:
+    def np_stack(arrays, axis=0):
+        """
+        Join a sequence of arrays of the same shape along a new axis.
+
+        Parameters
+        ----------
+        arrays : sequence of array_like
+            Each array must have the same shape.
+        axis : int, optional
+            The axis in the result array along which the input arrays are
+            stacked.
+
+        Returns
+        -------
+        stacked : ndarray
+            The stacked array has one more dimension than the input arrays.
+
+        Notes
+        -----
+        Work around for np.stack which was introduced in 1.10.
+        """
+        arrays = [np.asanyarray(arr) for arr in arrays]
+        if not arrays:
+            raise ValueError('need at least one array to stack')
+        shapes = set(arr.shape for arr in arrays)
+        if len(shapes) != 1:
+            raise ValueError('all input arrays must have the same shape')
+        result_ndim = arrays[0].ndim + 1
+        if not -result_ndim <= axis < result_ndim:
+            raise IndexError('axis {0} out of bounds [-{1}, {1})'.format(
+                axis, result_ndim))
+        if axis < 0:
+            axis += result_ndim
+        index = (slice(None),) * axis + (None,)
+        return np.concatenate([arr[index] for arr in arrays], axis=axis)
+
+
+if NumpyVersion(np.__version__) >= '1.10.0':
+    np_broadcast_to = np.broadcast_to
+else:
+    def np_broadcast_to(array, shape):
+        """
+        Broadcast an array to a new shape.
+
+        Parameters
+        ----------
+        array : array_like
+            The array to broadcast.
+        shape : tuple
+            The shape of the desired array.
+
+        Returns
+        -------
+        broadcast : ndarray
+            A readonly view on the original array with the given shape.
+
+        Notes
+        -----
+        Work around for np.broadcast_to which was introduced in 1.10.
+        """
+        array = np.asarray(array)
+        shape = tuple(shape) if np.iterable(shape) else (shape,)
+        n_new = len(shape) - array.ndim
+        if n_new < 0:
+            raise ValueError('input operand has more dimensions than allowed '
+                             'by the axis remapping')
+        strides = [0] * n_new
+        for size, new_size, stride in zip(array.shape, shape[n_new:],
+                                          array.strides):
+            if size == new_size:
+                strides.append(stride)
+            elif size == 1:
+                strides.append(0)
+            else:
+                raise ValueError('operands could not be broadcast together '
+                                 'with remapped shapes {0} and requested '
+                                 'shape {1}'.format(array.shape, shape))
+        result = np.lib.stride_tricks.as_strided(array, shape=shape,
+                                                 strides=strides)
+        result.flags.writeable = False
+        return result
+
+
+if NumpyVersion(np.__version__) >= '1.10.0':
+    np_matmul = np.matmul
+else:
+    def np_matmul(a, b):
+        """
+        Matrix product of two arrays, broadcast as a stack of matrices.
+
+        Parameters
+        ----------
+        a, b : array_like
+            Input arrays, scalars not allowed.  Arrays with more than two
+            dimensions are treated as stacks of matrices in the last two
+            dimensions.
+
+        Returns
+        -------
+        output : ndarray
+            The matrix product of the inputs.
+
+        Notes
+        -----
+        Work around for np.matmul which was introduced in 1.10.
+        """
+        a, b = np.asarray(a), np.asarray(b)
+        if a.ndim == 0 or b.ndim == 0:
+            raise ValueError("Scalar operands are not allowed, use '*' "
+                             "instead")
+        if a.ndim == 1 and b.ndim == 1:
+            return np.dot(a, b)
+        if a.ndim == 1:
+            return np_matmul(a[None, :], b)[..., 0, :]
+        if b.ndim == 1:
+            return np_matmul(a, b[:, None])[..., 0]
+        if a.ndim == 2 and b.ndim == 2:
+            return np.dot(a, b)
+        lead = np.broadcast(a[..., 0, 0], b[..., 0, 0]).shape
+        a = np_broadcast_to(a, lead + a.shape[-2:])
+        b = np_broadcast_to(b, lead + b.shape[-2:])
+        return np.einsum('...ij,...jk->...ik', a, b)
+
+
+if NumpyVersion(np.__version__) >= '1.11.0':
+    np_moveaxis = np.moveaxis
+else:
+    def np_moveaxis(a, source, destination):
+        """
+        Move axes of an array to new positions.
+
+        Other axes remain in their original order.
+
+        Parameters
+        ----------
+        a : ndarray
+            The array whose axes should be reordered.
+        source : int or sequence of int
+            Original positions of the axes to move. These must be unique.
+        destination : int or sequence of int
+            Destination positions for each of the original axes. These must
+            also be unique.
+
+        Returns
+        -------
+        result : ndarray
+            Array with moved axes. This array is a view of the input array.
+
+        Notes
+        -----
+        Work around for np.moveaxis which was introduced in 1.11.
+        """
+        a = np.asanyarray(a)
+        ndim = a.ndim
+
+        def normalize(axes):
+            axes = [int(ax) for ax in np.atleast_1d(axes)]
+            for ax in axes:
+                if not -ndim <= ax < ndim:
+                    raise ValueError('axis {0} is out of bounds for array of '
+                                     'dimension {1}'.format(ax, ndim))
+            axes = [ax % ndim for ax in axes]
+            if len(set(axes)) != len(axes):
+                raise ValueError('repeated axis')
+            return axes
+
+        source = normalize(source)
+        destination = normalize(destination)
+        if len(source) != len(destination):
+            raise ValueError('`source` and `destination` arguments must have '
+                             'the same number of elements')
+        order = [n for n in range(ndim) if n not in source]
+        for dest, src in sorted(zip(destination, source)):
+            order.insert(dest, src)
+        return a.transpose(order)
+
+
 def recarray_select(recarray, fields):
     """"
     Work-around for changes in NumPy 1.13 that return views for recarray
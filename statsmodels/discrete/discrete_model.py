@@ -22,6 +22,7 @@ __all__ = ["Poisson", "Logit", "Probit", "MNLogit", "NegativeBinomial"]
 from statsmodels.compat.python import lmap, lzip, range
 import numpy as np
 from scipy.special import gammaln
+from scipy import sparse
 from scipy import stats, special, optimize  # opt just for nbin
 import statsmodels.tools.tools as tools
 from statsmodels.tools import data as data_tools
@@ -162,9 +163,9 @@ class DiscreteModel(base.LikelihoodModel):
         and should contain any preprocessing that needs to be done for a model.
         """
         # assumes constant
-        self.df_model = float(np_matrix_rank(self.exog) - 1)
-        self.df_resid = (float(self.exog.shape[0] -
-                         np_matrix_rank(self.exog)))
+        rank = lm._exog_rank(self.exog)
+        self.df_model = float(rank - 1)
+        self.df_resid = float(self.exog.shape[0] - rank)
 
     def cdf(self, X):
         """
@@ -180,7 +181,7 @@ class DiscreteModel(base.LikelihoodModel):
 
     def _check_perfect_pred(self, params, *args):
         endog = self.endog
-        fittedvalues = self.cdf(np.dot(self.exog, params[:self.exog.shape[1]]))
+        fittedvalues = self.cdf(self.exog.dot(params[:self.exog.shape[1]]))
         if (self.raise_on_perfect_prediction and
                 np.allclose(fittedvalues - endog, 0)):
             msg = "Perfect separation detected, results not available"
@@ -427,10 +428,14 @@ class BinaryModel(DiscreteModel):
         """
         if exog is None:
             exog = self.exog
+        if sparse.issparse(exog):
+            linpred = exog.dot(params)
+        else:
+            linpred = np.dot(exog, params)
         if not linear:
-            return self.cdf(np.dot(exog, params))
+            return self.cdf(linpred)
         else:
-            return np.dot(exog, params)
+            return linpred
 
     def fit_regularized(self, start_params=None, method='l1',
             maxiter='defined_by_method', full_output=1, disp=1, callback=None,
@@ -1259,7 +1264,7 @@ class Logit(BinaryModel):
         """
         q = 2*self.endog - 1
         X = self.exog
-        return np.sum(np.log(self.cdf(q*np.dot(X,params))))
+        return np.sum(np.log(self.cdf(q*X.dot(params))))
 
     def loglikeobs(self, params):
         """
@@ -1287,7 +1292,7 @@ class Logit(BinaryModel):
         """
         q = 2*self.endog - 1
         X = self.exog
-        return np.log(self.cdf(q*np.dot(X,params)))
+        return np.log(self.cdf(q*X.dot(params)))
 
     def score(self, params):
         """
@@ -1311,7 +1316,9 @@ class Logit(BinaryModel):
 
         y = self.endog
         X = self.exog
-        L = self.cdf(np.dot(X,params))
+        L = self.cdf(X.dot(params))
+        if sparse.issparse(X):
+            return X.T.dot(y - L)
         return np.dot(y - L,X)
 
     def score_obs(self, params):
@@ -1339,7 +1346,9 @@ class Logit(BinaryModel):
 
         y = self.endog
         X = self.exog
-        L = self.cdf(np.dot(X, params))
+        L = self.cdf(X.dot(params))
+        if sparse.issparse(X):
+            return sparse.diags(y - L).dot(X).tocsr()
         return (y - L)[:,None] * X
 
     def hessian(self, params):
@@ -1362,7 +1371,9 @@ class Logit(BinaryModel):
         .. math:: \\frac{\\partial^{2}\\ln L}{\\partial\\beta\\partial\\beta^{\\prime}}=-\\sum_{i}\\Lambda_{i}\\left(1-\\Lambda_{i}\\right)x_{i}x_{i}^{\\prime}
         """
         X = self.exog
-        L = self.cdf(np.dot(X,params))
+        L = self.cdf(X.dot(params))
+        if sparse.issparse(X):
+            return -X.T.dot(sparse.diags(L*(1-L)).dot(X)).toarray()
         return -np.dot(L*(1-L)*X.T,X)
 
     def fit(self, start_params=None, method='newton', maxiter=35,
@@ -2406,7 +2417,7 @@ class DiscreteResults(base.LikelihoodModelResults):
 
     @cache_readonly
     def fittedvalues(self):
-        return np.dot(self.model.exog, self.params[:self.model.exog.shape[1]])
+        return self.model.exog.dot(self.params[:self.model.exog.shape[1]])
 
     @cache_readonly
     def aic(self):
@@ -1510,6 +1510,38 @@ def test_binary_pred_table_zeros():
     assert_equal(res.pred_table(), expected)
 
 
+def test_logit_sparse_exog():
+    from scipy import sparse
+    from statsmodels.tools.grouputils import dummy_sparse
+    np.random.seed(987125)
+    nobs = 400
+    groups = np.random.randint(0, 10, size=nobs)
+    exog = sparse.hstack([dummy_sparse(groups),
+                          sparse.csr_matrix(np.random.randn(nobs, 2))])
+    exog = exog.tocsr()
+    exog_dense = exog.toarray()
+    linpred = exog_dense.dot(np.arange(12) / 20. - 0.3)
+    endog = (np.random.rand(nobs) < 1 / (1 + np.exp(-linpred))) * 1.
+
+    res1 = Logit(endog, exog).fit(disp=0)
+    res2 = Logit(endog, exog_dense).fit(disp=0)
+    assert_equal(res1.df_model, res2.df_model)
+    assert_allclose(res1.params, res2.params, rtol=1e-10)
+    assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+    assert_allclose(res1.llf, res2.llf, rtol=1e-10)
+    assert_allclose(res1.prsquared, res2.prsquared, rtol=1e-10)
+    assert_allclose(res1.predict(exog[:5]), res2.predict(exog_dense[:5]),
+                    rtol=1e-10)
+    assert_allclose(res1.resid_pearson, res2.resid_pearson, rtol=1e-10)
+    params = res2.params
+    assert_allclose(res1.model.score_obs(params).toarray(),
+                    res2.model.score_obs(params), rtol=1e-10)
+
+    # design without full rank
+    exog2 = sparse.hstack([exog, exog[:, :1]]).tocsr()
+    assert_raises(ValueError, Logit, endog, exog2)
+
+
 if __name__ == "__main__":
     import nose
     nose.runmodule(argv=[__file__, '-vvs', '-x', '--pdb'],
@@ -1,4 +1,5 @@
 from statsmodels.compat.python import iterkeys, itervalues, zip, range
+from statsmodels.compat.numpy import np_moveaxis
 from statsmodels.stats.correlation_tools import cov_nearest
 import numpy as np
 import pandas as pd
@@ -172,6 +173,48 @@ class CovStruct(object):
         soln = [spl.cho_solve(vco, x) for x in rhs]
         return soln
 
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+        """
+        Solves the matrix equations of several groups of the same size.
+
+        Parameters
+        ----------
+        expval : ndarray
+            The expected value of endog, with shape (n_groups, size).
+        index : ndarray
+            The group indices, with shape (n_groups,).
+        stdev : ndarray
+            The standard deviation of endog, with shape (n_groups, size).
+        rhs : list/tuple of ndarray
+            A set of right-hand sides, each with shape (n_groups, size)
+            or (n_groups, size, k).
+
+        Returns
+        -------
+        soln : list/tuple of ndarray
+            The solutions to the matrix equations, with the same shapes as
+            the right-hand sides.
+
+        Notes
+        -----
+        Returns None if the solver fails for any of the groups.
+
+        This is a default implementation that solves the equations of
+        each group with `covariance_matrix_solve`.  Subclasses can
+        reimplement it to solve the equations of all groups with
+        vectorized linear algebra.
+        """
+
+        soln = [np.empty(x.shape, dtype=np.float64) for x in rhs]
+        for j, i in enumerate(index):
+            rslt = self.covariance_matrix_solve(expval[j], i, stdev[j],
+                                                [x[j] for x in rhs])
+            if rslt is None:
+                return None
+            for y, r in zip(soln, rslt):
+                y[j] = r
+        return soln
+
     def summary(self):
         """
         Returns a text summary of the current estimate of the
@@ -180,6 +223,13 @@ class CovStruct(object):
         raise NotImplementedError
 
 
+def _expand_stdev(stdev, x):
+    """add a trailing axis to stdev if the right-hand side is 2-d per group"""
+    if x.ndim > stdev.ndim:
+        return stdev[..., None]
+    return stdev
+
+
 class Independence(CovStruct):
     """
     An independence working dependence structure.
@@ -203,9 +253,15 @@ class Independence(CovStruct):
                 rslt.append(x / v[:, None])
         return rslt
 
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+        v = stdev ** 2
+        return [x / _expand_stdev(v, x) for x in rhs]
+
     update.__doc__ = CovStruct.update.__doc__
     covariance_matrix.__doc__ = CovStruct.covariance_matrix.__doc__
     covariance_matrix_solve.__doc__ = CovStruct.covariance_matrix_solve.__doc__
+    covariance_matrix_solve_batch.__doc__ = (
+        CovStruct.covariance_matrix_solve_batch.__doc__)
 
     def summary(self):
         return ("Observations within a cluster are modeled "
@@ -289,9 +345,28 @@ class Exchangeable(CovStruct):
 
         return rslt
 
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+
+        k = expval.shape[1]
+        c = self.dep_params / (1. - self.dep_params)
+        c /= 1. + self.dep_params * (k - 1)
+
+        rslt = []
+        for x in rhs:
+            sd = _expand_stdev(stdev, x)
+            x1 = x / sd
+            y = x1 / (1. - self.dep_params)
+            y -= c * x1.sum(1)[:, None]
+            y /= sd
+            rslt.append(y)
+
+        return rslt
+
     update.__doc__ = CovStruct.update.__doc__
     covariance_matrix.__doc__ = CovStruct.covariance_matrix.__doc__
     covariance_matrix_solve.__doc__ = CovStruct.covariance_matrix_solve.__doc__
+    covariance_matrix_solve_batch.__doc__ = (
+        CovStruct.covariance_matrix_solve_batch.__doc__)
 
     def summary(self):
         return ("The correlation between two observations in the " +
@@ -617,11 +692,63 @@ class Stationary(CovStruct):
         from statsmodels.tools.linalg import stationary_solve
         r = np.zeros(len(expval))
         r[0:self.max_lag] = self.dep_params
-        return [stationary_solve(r, x) for x in rhs]
+        rslt = []
+        for x in rhs:
+            sd = _expand_stdev(stdev, x)
+            rslt.append(stationary_solve(r, x / sd) / sd)
+        return rslt
+
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+
+        n_groups, k = expval.shape
+        if self.grid:
+            # all groups of the same size share the correlation matrix
+            from scipy.linalg import toeplitz
+            r = np.zeros(k)
+            lag = min(k - 1, self.max_lag)
+            r[0] = 1
+            r[1:lag + 1] = self.dep_params[:lag]
+            try:
+                cfac = spl.cho_factor(toeplitz(r))
+            except np.linalg.LinAlgError:
+                return super(Stationary, self).covariance_matrix_solve_batch(
+                    expval, index, stdev, rhs)
+            rslt = []
+            for x in rhs:
+                sd = _expand_stdev(stdev, x)
+                x1 = np_moveaxis(x / sd, 1, 0)
+                y = spl.cho_solve(cfac, x1.reshape(k, -1))
+                rslt.append(np_moveaxis(y.reshape(x1.shape), 0, 1) / sd)
+            return rslt
+
+        time = np.array([self.time[i] for i in index])
+        dx = np.abs(time[:, :, None] - time[:, None, :])
+        dep_params = np.r_[0., self.dep_params]
+        cmat = np.where(dx <= self.max_lag,
+                        dep_params[np.minimum(dx, self.max_lag)], 0.)
+        cmat += np.eye(k)
+        vmat = cmat * stdev[:, :, None] * stdev[:, None, :]
+        try:
+            np.linalg.cholesky(vmat)
+        except np.linalg.LinAlgError:
+            # the default method projects the matrices to SPD matrices
+            return super(Stationary, self).covariance_matrix_solve_batch(
+                expval, index, stdev, rhs)
+        self.cov_adjust.extend([0] * n_groups)
+
+        rslt = []
+        for x in rhs:
+            if x.ndim == 2:
+                rslt.append(np.linalg.solve(vmat, x[:, :, None])[:, :, 0])
+            else:
+                rslt.append(np.linalg.solve(vmat, x))
+        return rslt
 
     update.__doc__ = CovStruct.update.__doc__
     covariance_matrix.__doc__ = CovStruct.covariance_matrix.__doc__
     covariance_matrix_solve.__doc__ = CovStruct.covariance_matrix_solve.__doc__
+    covariance_matrix_solve_batch.__doc__ = (
+        CovStruct.covariance_matrix_solve_batch.__doc__)
 
     def summary(self):
 
@@ -813,13 +940,13 @@ class Autoregressive(CovStruct):
                 flatten = True
             x1 = x / stdev[:, None]
 
-            z0 = np.zeros((1, x.shape[1]))
-            rhs1 = np.concatenate((x[1:, :], z0), axis=0)
-            rhs2 = np.concatenate((z0, x[0:-1, :]), axis=0)
+            z0 = np.zeros((1, x1.shape[1]))
+            rhs1 = np.concatenate((x1[1:, :], z0), axis=0)
+            rhs2 = np.concatenate((z0, x1[0:-1, :]), axis=0)
 
-            y = c0 * x + c2 * rhs1 + c2 * rhs2
-            y[0, :] = c1 * x[0, :] + c2 * x[1, :]
-            y[-1, :] = c1 * x[-1, :] + c2 * x[-2, :]
+            y = c0 * x1 + c2 * rhs1 + c2 * rhs2
+            y[0, :] = c1 * x1[0, :] + c2 * x1[1, :]
+            y[-1, :] = c1 * x1[-1, :] + c2 * x1[-2, :]
 
             y /= stdev[:, None]
 
@@ -830,9 +957,43 @@ class Autoregressive(CovStruct):
 
         return soln
 
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+        # Same as covariance_matrix_solve, with the groups in the first
+        # axis.
+        k = expval.shape[1]
+        a = self.dep_params
+        soln = []
+        for x in rhs:
+            sd = _expand_stdev(stdev, x)
+            if k == 1:
+                soln.append(x / sd ** 2)
+                continue
+
+            x1 = x / sd
+            if k == 2:
+                y = np.empty_like(x1)
+                y[:, 0] = x1[:, 0] - a * x1[:, 1]
+                y[:, 1] = x1[:, 1] - a * x1[:, 0]
+                y /= (1. - a ** 2)
+            else:
+                c0 = (1. + a ** 2) / (1. - a ** 2)
+                c1 = 1. / (1. - a ** 2)
+                c2 = -a / (1. - a ** 2)
+                y = c0 * x1
+                y[:, :-1] += c2 * x1[:, 1:]
+                y[:, 1:] += c2 * x1[:, :-1]
+                y[:, 0] = c1 * x1[:, 0] + c2 * x1[:, 1]
+                y[:, -1] = c1 * x1[:, -1] + c2 * x1[:, -2]
+            y /= sd
+            soln.append(y)
+
+        return soln
+
     update.__doc__ = CovStruct.update.__doc__
     covariance_matrix.__doc__ = CovStruct.covariance_matrix.__doc__
     covariance_matrix_solve.__doc__ = CovStruct.covariance_matrix_solve.__doc__
+    covariance_matrix_solve_batch.__doc__ = (
+        CovStruct.covariance_matrix_solve_batch.__doc__)
 
     def summary(self):
 
@@ -24,6 +24,7 @@ improved small-sample properties.  Biometrics. 2001 Mar;57(1):126-34.
 """
 from __future__ import division
 from statsmodels.compat.python import range, lzip, zip
+from statsmodels.compat.numpy import np_matmul
 
 import numpy as np
 from scipy import stats
@@ -457,6 +458,10 @@ class GEE(base.Model):
 
     cached_means = None
 
+    # groups split by size and the stacked data, see _cluster_batches
+    _batches = None
+    _batch_cache = None
+
     def __init__(self, endog, exog, groups, time=None, family=None,
                  cov_struct=None, missing='none', offset=None,
                  exposure=None, dep_data=None, constraint=None,
@@ -709,27 +714,27 @@ class GEE(base.Model):
                                     _Multinomial)):
             return 1.
 
-        endog = self.endog_li
         cached_means = self.cached_means
         nobs = self.nobs
         varfunc = self.family.variance
 
         scale = 0.
         fsum = 0.
-        for i in range(self.num_group):
-
-            if len(endog[i]) == 0:
-                continue
+        for batch, gidx in enumerate(self._cluster_batches()):
 
-            expval, _ = cached_means[i]
+            endog, _ = self._batch_data(batch)
+            expval = np.array([cached_means[i][0] for i in gidx])
 
-            f = self.weights_li[i] if self.weights is not None else 1.
+            if self.weights is not None:
+                f = self.weights_li[gidx]
+            else:
+                f = np.ones(len(gidx))
 
-            sdev = np.sqrt(varfunc(expval))
-            resid = (endog[i] - expval) / sdev
+            sdev = np.sqrt(varfunc(expval.ravel())).reshape(expval.shape)
+            resid = (endog - expval) / sdev
 
-            scale += f * np.sum(resid ** 2)
-            fsum += f * len(endog[i])
+            scale += np.dot(f, np.sum(resid ** 2, 1))
+            fsum += f.sum() * endog.shape[1]
 
         scale /= (fsum * (nobs - self.ddof_scale) / float(nobs))
 
@@ -802,31 +807,17 @@ class GEE(base.Model):
             incorporate the scale.
         """
 
-        endog = self.endog_li
-        exog = self.exog_li
-
-        cached_means = self.cached_means
-
-        varfunc = self.family.variance
-
         bmat, score = 0, 0
-        for i in range(self.num_group):
+        for batch in range(len(self._cluster_batches())):
 
-            expval, lpr = cached_means[i]
-            resid = endog[i] - expval
-            dmat = self.mean_deriv(exog[i], lpr)
-            sdev = np.sqrt(varfunc(expval))
-
-            rslt = self.cov_struct.covariance_matrix_solve(expval, i,
-                                                           sdev, (dmat, resid))
+            rslt = self._solve_batch(batch, with_resid=True)
             if rslt is None:
                 return None, None
-            vinv_d, vinv_resid = tuple(rslt)
-
-            f = self.weights_li[i] if self.weights is not None else 1.
+            f, dmat, _, vinv_d, vinv_resid = rslt
 
-            bmat += f * np.dot(dmat.T, vinv_d)
-            score += f * np.dot(dmat.T, vinv_resid)
+            fdmat = f[:, None, None] * dmat
+            bmat += np.tensordot(fdmat, vinv_d, axes=([0, 1], [0, 1]))
+            score += np.tensordot(fdmat, vinv_resid, axes=([0, 1], [0, 1]))
 
         update = np.linalg.solve(bmat, score)
 
@@ -835,6 +826,86 @@ class GEE(base.Model):
 
         return update, score
 
+    def _cluster_batches(self):
+        """
+        Returns the indices of the groups, split by group size.
+
+        The data of all groups with the same size are stacked, so that
+        the estimating equations are solved for them at once with
+        vectorized linear algebra instead of a loop over the groups.
+        """
+        if self._batches is None:
+            sizes = np.array([len(y) for y in self.endog_li])
+            self._batches = [np.flatnonzero(sizes == size)
+                             for size in np.unique(sizes) if size > 0]
+        return self._batches
+
+    def _batch_data(self, batch):
+        """
+        Returns endog and exog of the groups in `batch`, with the groups
+        in the first axis.  The stacked arrays are cached as long as
+        `endog_li` and `exog_li` do not change.
+        """
+        if self._batch_cache is None:
+            self._batch_cache = {}
+        cached = self._batch_cache.get(batch)
+        if (cached is None or cached[0] is not self.endog_li or
+                cached[1] is not self.exog_li):
+            gidx = self._cluster_batches()[batch]
+            endog = np.array([self.endog_li[i] for i in gidx])
+            exog = np.array([self.exog_li[i] for i in gidx])
+            cached = (self.endog_li, self.exog_li, endog, exog)
+            self._batch_cache[batch] = cached
+        return cached[2], cached[3]
+
+    def _solve_batch(self, batch, with_resid=True):
+        """
+        Solves the working covariance equations for a batch of groups.
+
+        Returns
+        -------
+        f : ndarray
+            The group weights.
+        dmat : ndarray
+            The derivative of the mean, shape (n_groups, size, k_params).
+        resid : ndarray
+            The residuals, shape (n_groups, size).
+        vinv_d : ndarray
+            The inverse working covariance times dmat.
+        vinv_resid : ndarray
+            The inverse working covariance times resid, None if
+            `with_resid` is False.
+
+        Returns None if the solver fails.
+        """
+        gidx = self._cluster_batches()[batch]
+        endog, exog = self._batch_data(batch)
+        cached_means = self.cached_means
+        expval = np.array([cached_means[i][0] for i in gidx])
+        lpr = np.array([cached_means[i][1] for i in gidx])
+        n_groups, size = expval.shape
+
+        dmat = self.mean_deriv(exog.reshape(n_groups * size, -1),
+                               lpr.ravel())
+        dmat = dmat.reshape(n_groups, size, -1)
+        sdev = np.sqrt(self.family.variance(expval.ravel()))
+        sdev = sdev.reshape(n_groups, size)
+        resid = endog - expval
+
+        rhs = (dmat, resid) if with_resid else (dmat,)
+        rslt = self.cov_struct.covariance_matrix_solve_batch(
+            expval, gidx, sdev, rhs)
+        if rslt is None:
+            return None
+        vinv_resid = rslt[1] if with_resid else None
+
+        if self.weights is not None:
+            f = self.weights_li[gidx]
+        else:
+            f = np.ones(n_groups)
+
+        return f, dmat, resid, rslt[0], vinv_resid
+
     def update_cached_means(self, mean_params):
         """
         cached_means should always contain the most recent calculation
@@ -843,25 +914,24 @@ class GEE(base.Model):
         keep the cached means up to date.
         """
 
-        endog = self.endog_li
-        exog = self.exog_li
         offset = self.offset_li
 
         linkinv = self.family.link.inverse
 
-        self.cached_means = []
-
-        for i in range(self.num_group):
+        cached_means = [None] * self.num_group
 
-            if len(endog[i]) == 0:
-                continue
+        for batch, gidx in enumerate(self._cluster_batches()):
 
-            lpr = np.dot(exog[i], mean_params)
+            _, exog = self._batch_data(batch)
+            lpr = np.dot(exog, mean_params)
             if offset is not None:
-                lpr += offset[i]
-            expval = linkinv(lpr)
+                lpr += np.array([offset[i] for i in gidx])
+            expval = linkinv(lpr.ravel()).reshape(lpr.shape)
 
-            self.cached_means.append((expval, lpr))
+            for j, i in enumerate(gidx):
+                cached_means[i] = (expval[j], lpr[j])
+
+        self.cached_means = cached_means
 
     def _covmat(self):
         """
@@ -883,32 +953,22 @@ class GEE(base.Model):
            obtaining score test results.
         """
 
-        endog = self.endog_li
-        exog = self.exog_li
-        varfunc = self.family.variance
-        cached_means = self.cached_means
-
         # Calculate the naive (model-based) and robust (sandwich)
         # covariances.
         bmat, cmat = 0, 0
-        for i in range(self.num_group):
-
-            expval, lpr = cached_means[i]
-            resid = endog[i] - expval
-            dmat = self.mean_deriv(exog[i], lpr)
-            sdev = np.sqrt(varfunc(expval))
+        for batch in range(len(self._cluster_batches())):
 
-            rslt = self.cov_struct.covariance_matrix_solve(
-                expval, i, sdev, (dmat, resid))
+            rslt = self._solve_batch(batch, with_resid=True)
             if rslt is None:
                 return None, None, None, None
-            vinv_d, vinv_resid = tuple(rslt)
+            f, dmat, _, vinv_d, vinv_resid = rslt
 
-            f = self.weights_li[i] if self.weights is not None else 1.
-
-            bmat += f * np.dot(dmat.T, vinv_d)
-            dvinv_resid = f * np.dot(dmat.T, vinv_resid)
-            cmat += np.outer(dvinv_resid, dvinv_resid)
+            bmat += np.tensordot(f[:, None, None] * dmat, vinv_d,
+                                 axes=([0, 1], [0, 1]))
+            # the score contribution of each group
+            dvinv_resid = f[:, None] * np.einsum('gik,gi->gk', dmat,
+                                                 vinv_resid)
+            cmat += np.dot(dvinv_resid.T, dvinv_resid)
 
         scale = self.estimate_scale()
 
@@ -925,40 +985,35 @@ class GEE(base.Model):
     def _bc_covmat(self, cov_naive):
 
         cov_naive = cov_naive / self.scaling_factor
-        endog = self.endog_li
-        exog = self.exog_li
         varfunc = self.family.variance
         cached_means = self.cached_means
         scale = self.estimate_scale()
 
         bcm = 0
-        for i in range(self.num_group):
-
-            expval, lpr = cached_means[i]
-            resid = endog[i] - expval
-            dmat = self.mean_deriv(exog[i], lpr)
-            sdev = np.sqrt(varfunc(expval))
+        for batch, gidx in enumerate(self._cluster_batches()):
 
-            rslt = self.cov_struct.covariance_matrix_solve(
-                expval, i, sdev, (dmat,))
+            rslt = self._solve_batch(batch, with_resid=False)
             if rslt is None:
                 return None
-            vinv_d = rslt[0]
+            f, dmat, resid, vinv_d, _ = rslt
             vinv_d /= scale
 
-            hmat = np.dot(vinv_d, cov_naive)
-            hmat = np.dot(hmat, dmat.T).T
-
-            f = self.weights_li[i] if self.weights is not None else 1.
-
-            aresid = np.linalg.solve(np.eye(len(resid)) - hmat, resid)
-            rslt = self.cov_struct.covariance_matrix_solve(
-                expval, i, sdev, (aresid,))
+            hmat = np_matmul(np_matmul(vinv_d, cov_naive),
+                             np.swapaxes(dmat, 1, 2))
+            hmat = np.swapaxes(hmat, 1, 2)
+
+            size = resid.shape[1]
+            aresid = np.linalg.solve(np.eye(size) - hmat,
+                                     resid[:, :, None])[:, :, 0]
+            expval = np.array([cached_means[i][0] for i in gidx])
+            sdev = np.sqrt(varfunc(expval.ravel())).reshape(expval.shape)
+            rslt = self.cov_struct.covariance_matrix_solve_batch(
+                expval, gidx, sdev, (aresid,))
             if rslt is None:
                 return None
-            srt = rslt[0]
-            srt = f * np.dot(dmat.T, srt) / scale
-            bcm += np.outer(srt, srt)
+            srt = np.einsum('gik,gi->gk', dmat, rslt[0])
+            srt *= f[:, None] / scale
+            bcm += np.dot(srt.T, srt)
 
         cov_robust_bc = np.dot(cov_naive, np.dot(bcm, cov_naive))
         cov_robust_bc *= self.scaling_factor
@@ -20,6 +20,7 @@ McCullagh, P. and Nelder, J.A.  1989.  "Generalized Linear Models." 2nd ed.
 from statsmodels.compat.numpy import np_matrix_rank
 
 import numpy as np
+from scipy import sparse
 from . import families
 from statsmodels.tools.decorators import cache_readonly, resettable_cache
 
@@ -293,11 +294,17 @@ class GLM(base.LikelihoodModel):
                         'params' : [np.inf],
                         'deviance' : [np.inf]}
 
-        self.pinv_wexog = np.linalg.pinv(self.exog)
-        self.normalized_cov_params = np.dot(self.pinv_wexog,
-                                            np.transpose(self.pinv_wexog))
+        if sparse.issparse(self.exog):
+            # the pseudoinverse of a sparse exog is dense and not needed
+            self.pinv_wexog = None
+            self.normalized_cov_params = None
+            self.df_model = self.exog.shape[1] - 1
+        else:
+            self.pinv_wexog = np.linalg.pinv(self.exog)
+            self.normalized_cov_params = np.dot(self.pinv_wexog,
+                                                np.transpose(self.pinv_wexog))
 
-        self.df_model = np_matrix_rank(self.exog) - 1
+            self.df_model = np_matrix_rank(self.exog) - 1
 
 
         if (self.freq_weights is not None) and \
@@ -361,7 +368,7 @@ class GLM(base.LikelihoodModel):
         """
         Evaluate the log-likelihood for a generalized linear model.
         """
-        lin_pred = np.dot(self.exog, params) + self._offset_exposure
+        lin_pred = self.exog.dot(params) + self._offset_exposure
         expval = self.family.link.inverse(lin_pred)
         if scale is None:
             scale = self.estimate_scale(expval)
@@ -390,6 +397,8 @@ class GLM(base.LikelihoodModel):
         """
 
         score_factor = self.score_factor(params, scale=scale)
+        if sparse.issparse(self.exog):
+            return sparse.diags(score_factor).dot(self.exog).tocsr()
         return score_factor[:, None] * self.exog
 
 
@@ -412,6 +421,9 @@ class GLM(base.LikelihoodModel):
             the sum of `score_obs`
 
         """
+        if sparse.issparse(self.exog):
+            score_factor = self.score_factor(params, scale=scale)
+            return self.exog.T.dot(score_factor)
         return self.score_obs(params, scale=scale).sum(0)
 
 
@@ -531,6 +543,9 @@ class GLM(base.LikelihoodModel):
         """
 
         factor = self.hessian_factor(params, scale=scale, observed=observed)
+        if sparse.issparse(self.exog):
+            hess = self.exog.T.dot(sparse.diags(factor).dot(self.exog))
+            return -hess.toarray()
         hess = -np.dot(self.exog.T * factor, self.exog)
         return hess
 
@@ -774,7 +789,10 @@ class GLM(base.LikelihoodModel):
         if exog is None:
             exog = self.exog
 
-        linpred = np.dot(exog, params) + offset + exposure
+        if sparse.issparse(exog):
+            linpred = exog.dot(params) + offset + exposure
+        else:
+            linpred = np.dot(exog, params) + offset + exposure
         if linear:
             return linpred
         else:
@@ -897,6 +915,18 @@ class GLM(base.LikelihoodModel):
             :math:`rtol * prior + atol > abs(current - prior)`
         tol_criterion : str, optional
             Defaults to ``'deviance'``. Can optionally be ``'params'``.
+        wls_method : str, optional
+            Method used to solve the weighted least squares problem in
+            each iteration, see `regression._tools._MinimalWLS.fit`. The
+            default is ``'lstsq'``. If exog is a scipy sparse matrix, then
+            ``'lsqr'`` uses an iterative sparse solver and the other methods
+            solve the sparse normal equations.
+
+        Notes
+        -----
+        exog can be a scipy sparse matrix. In this case the design matrix is
+        not converted to a dense array in IRLS and in the gradient and
+        Hessian computations, and it is assumed to have full column rank.
         """
         self.scaletype = scale
 
@@ -971,6 +1001,7 @@ class GLM(base.LikelihoodModel):
         atol = kwargs.get('atol')
         rtol = kwargs.get('rtol', 0.)
         tol_criterion = kwargs.get('tol_criterion', 'deviance')
+        wls_method = kwargs.get('wls_method', 'lstsq')
         atol = tol if atol is None else atol
 
         endog = self.endog
@@ -980,7 +1011,7 @@ class GLM(base.LikelihoodModel):
             mu = self.family.starting_mu(self.endog)
             lin_pred = self.family.predict(mu)
         else:
-            lin_pred = np.dot(wlsexog, start_params) + self._offset_exposure
+            lin_pred = wlsexog.dot(start_params) + self._offset_exposure
             mu = self.family.fitted(lin_pred)
         dev = self.family.deviance(self.endog, mu, self.freq_weights)
         if np.isnan(dev):
@@ -1005,8 +1036,8 @@ class GLM(base.LikelihoodModel):
                             self.family.weights(mu))
             wlsendog = (lin_pred + self.family.link.deriv(mu) * (self.endog-mu)
                         - self._offset_exposure)
-            wls_results = reg_tools._MinimalWLS(wlsendog, wlsexog, self.weights).fit(method='lstsq')
-            lin_pred = np.dot(self.exog, wls_results.params) + self._offset_exposure
+            wls_results = reg_tools._MinimalWLS(wlsendog, wlsexog, self.weights).fit(method=wls_method)
+            lin_pred = self.exog.dot(wls_results.params) + self._offset_exposure
             mu = self.family.fitted(lin_pred)
             history = self._update_history(wls_results, mu, history)
             self.scale = self.estimate_scale(mu)
@@ -1424,6 +1455,29 @@ class GLMResults(base.LikelihoodModelResults):
 
     get_prediction.__doc__ = pred.get_prediction_glm.__doc__
 
+    def get_influence(self, chunksize=None):
+        """
+        get an instance of GLMInfluence with influence and outlier measures
+
+        Parameters
+        ----------
+        chunksize : int or None
+            If not None, then the observation specific measures are
+            computed in blocks of `chunksize` rows.
+
+        Returns
+        -------
+        infl : GLMInfluence instance
+            the instance has methods to calculate the main influence and
+            outlier measures for the GLM
+
+        See also
+        --------
+        statsmodels.stats.outliers_influence.GLMInfluence
+        """
+        from statsmodels.stats.outliers_influence import GLMInfluence
+        return GLMInfluence(self, chunksize=chunksize)
+
 
     def remove_data(self):
         #GLM has alias/reference in result instance
@@ -1659,6 +1659,52 @@ def test_missing():
     assert_almost_equal(res.params.values, res2.params.values)
 
 
+def test_batched_solve():
+    # The estimating equations solved for groups of equal size at once
+    # agree with the per-group solves.
+    np.random.seed(342)
+    ngroup = 200
+    sizes = np.random.randint(3, 7, ngroup)
+    groups = np.repeat(np.arange(ngroup), sizes)
+    n = len(groups)
+    exog = np.column_stack((np.ones(n), np.random.normal(size=(n, 2))))
+    endog = np.random.poisson(np.exp(np.dot(exog, [0.2, 0.3, -0.2])))
+    time = np.concatenate([np.sort(np.random.choice(8, m, replace=False))
+                           for m in sizes])
+
+    for cs in [Independence(), Exchangeable(), Autoregressive(),
+               Stationary(max_lag=2, grid=True), Stationary(max_lag=2)]:
+        kwds = {}
+        if isinstance(cs, Stationary) and not cs.grid:
+            kwds["time"] = time
+        model = GEE(endog, exog, groups, family=Poisson(), cov_struct=cs,
+                    **kwds)
+        result = model.fit()
+
+        bmat, score, cmat = 0, 0, 0
+        for i in range(model.num_group):
+            expval, lpr = model.cached_means[i]
+            resid = model.endog_li[i] - expval
+            dmat = model.mean_deriv(model.exog_li[i], lpr)
+            sdev = np.sqrt(model.family.variance(expval))
+            vinv_d, vinv_resid = cs.covariance_matrix_solve(
+                expval, i, sdev, (dmat, resid))
+            bmat += np.dot(dmat.T, vinv_d)
+            s = np.dot(dmat.T, vinv_resid)
+            score += s
+            cmat += np.outer(s, s)
+
+        model._fit_history = {"cov_adjust": []}
+        update, score2 = model._update_mean_params()
+        assert_allclose(score2, score, rtol=1e-8, atol=1e-12)
+        assert_allclose(update, np.linalg.solve(bmat, score), rtol=1e-8,
+                        atol=1e-12)
+
+        bmati = np.linalg.inv(bmat)
+        cov_robust = np.dot(bmati, np.dot(cmat, bmati))
+        assert_allclose(result.cov_robust, cov_robust, rtol=1e-6)
+
+
 if __name__ == "__main__":
 
     import nose
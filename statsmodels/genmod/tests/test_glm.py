@@ -1871,6 +1871,34 @@ def test_non_invertible_hessian_fails_summary():
     res.summary()
 
 
+def test_glm_sparse_exog():
+    from scipy import sparse
+    from statsmodels.tools.grouputils import dummy_sparse
+    np.random.seed(987125)
+    nobs = 300
+    groups = np.random.randint(0, 10, size=nobs)
+    exog = sparse.hstack([dummy_sparse(groups),
+                          sparse.csr_matrix(np.random.randn(nobs, 2))])
+    exog = exog.tocsr()
+    exog_dense = exog.toarray()
+    endog = np.random.poisson(np.exp(exog_dense.dot(np.arange(12) / 20.)))
+
+    res2 = GLM(endog, exog_dense, family=sm.families.Poisson()).fit()
+    mod1 = GLM(endog, exog, family=sm.families.Poisson())
+    for fit_kwds in [{}, {'wls_method': 'lsqr'}, {'method': 'newton'}]:
+        res1 = mod1.fit(**fit_kwds)
+        assert_allclose(res1.params, res2.params, rtol=1e-8)
+        assert_allclose(res1.bse, res2.bse, rtol=1e-7)
+        assert_allclose(res1.llf, res2.llf, rtol=1e-10)
+        assert_allclose(res1.deviance, res2.deviance, rtol=1e-8)
+    assert_allclose(res1.predict(exog[:5]), res2.predict(exog_dense[:5]),
+                    rtol=1e-8)
+    assert_allclose(mod1.score(res2.params), res2.model.score(res2.params),
+                    atol=1e-8)
+    assert_allclose(mod1.hessian(res2.params),
+                    res2.model.hessian(res2.params), rtol=1e-10)
+
+
 if __name__ == "__main__":
     # run_module_suite()
     # taken from Fernando Perez:
@@ -3,9 +3,13 @@ Module containing the base object for multivariate kernel density and
 regression, plus some utilities.
 """
 from statsmodels.compat.python import range, string_types
+import collections
 import copy
+import functools
+import hashlib
 
 import numpy as np
+import scipy
 from scipy import optimize
 from scipy.stats.mstats import mquantiles
 
@@ -15,6 +19,9 @@ try:
 except ImportError:
     has_joblib = False
 
+from statsmodels.compat.numpy import np_matmul
+from statsmodels.compat.scipy import NumpyVersion
+from statsmodels.tools.parallel import parallel_func
 from . import kernels
 
 
@@ -32,6 +39,26 @@ kernel_func = dict(wangryzin=kernels.wang_ryzin,
                    d_gaussian=kernels.d_gaussian)
 
 
+# Maximum number of kernel values held in memory at once by `gpke_blocks`
+_GPKE_BLOCK_SIZE = 2**20
+
+# Largest number of points in the leaves of the k-d trees of
+# `_gpke_tree_sum`
+_TREE_LEAF_SIZE = 32
+
+# Relative size of the initial Nelder-Mead simplex of a warm started
+# bandwidth search, the default of `optimize.fmin` is 0.05
+_WARM_START_STEP = 0.01
+
+# `optimize.fmin` accepts an initial simplex since scipy 0.18
+_FMIN_HAS_SIMPLEX = NumpyVersion(scipy.__version__) >= '0.18.0'
+
+# Kernels supported by the approximate, tree based kernel sums
+_TREE_KERNELS = dict(c=('gaussian', 'd_gaussian'),
+                     o=('wangryzin', 'wangryzin_reg'),
+                     u=('aitchisonaitken', 'aitchison_aitken_reg'))
+
+
 def _compute_min_std_IQR(data):
     """Compute minimum of std and IQR for each variable."""
     s1 = np.std(data, axis=0)
@@ -43,7 +70,8 @@ def _compute_min_std_IQR(data):
 
 
 def _compute_subset(class_type, data, bw, co, do, n_cvars, ix_ord,
-                    ix_unord, n_sub, class_vars, randomize, bound):
+                    ix_unord, n_sub, class_vars, randomize, bound,
+                    bw_cache=None):
     """"Compute bw on subset of data.
 
     Called from ``GenericKDE._compute_efficient_*``.
@@ -53,6 +81,7 @@ def _compute_subset(class_type, data, bw, co, do, n_cvars, ix_ord,
     Needs to be outside the class in order for joblib to be able to pickle it.
 
     """
+    settings = EstimatorSettings(efficient=False, bw_cache=bw_cache)
     if randomize:
         np.random.shuffle(data)
         sub_data = data[:n_sub, :]
@@ -63,22 +92,21 @@ def _compute_subset(class_type, data, bw, co, do, n_cvars, ix_ord,
         from .kernel_density import KDEMultivariate
         var_type = class_vars[0]
         sub_model = KDEMultivariate(sub_data, var_type, bw=bw,
-                        defaults=EstimatorSettings(efficient=False))
+                                    defaults=settings)
     elif class_type == 'KDEMultivariateConditional':
         from .kernel_density import KDEMultivariateConditional
         k_dep, dep_type, indep_type = class_vars
         endog = sub_data[:, :k_dep]
         exog = sub_data[:, k_dep:]
         sub_model = KDEMultivariateConditional(endog, exog, dep_type,
-            indep_type, bw=bw, defaults=EstimatorSettings(efficient=False))
+            indep_type, bw=bw, defaults=settings)
     elif class_type == 'KernelReg':
         from .kernel_regression import KernelReg
         var_type, k_vars, reg_type = class_vars
         endog = _adjust_shape(sub_data[:, 0], 1)
         exog = _adjust_shape(sub_data[:, 1:], k_vars)
         sub_model = KernelReg(endog=endog, exog=exog, reg_type=reg_type,
-                              var_type=var_type, bw=bw,
-                              defaults=EstimatorSettings(efficient=False))
+                              var_type=var_type, bw=bw, defaults=settings)
     else:
         raise ValueError("class_type not recognized, should be one of " \
                  "{KDEMultivariate, KDEMultivariateConditional, KernelReg}")
@@ -133,10 +161,94 @@ class GenericKDE (object):
             # The user specified a bandwidth selection method
             self._bw_method = bw
             bwfunc = self.bw_func[bw]
-            res = bwfunc()
+            res = self._cached_bw(bw, bwfunc)
 
         return res
 
+    def _bw_cache_key(self, method):
+        """
+        Key of the bandwidth of this model in `bw_cache`.
+
+        The key is a tuple of the model key, made of the class, the variable
+        types and the bandwidth selection method, and of the data key, made
+        of a fingerprint of the data and of the settings of the efficient
+        estimation.  Warm starts are shared between models with the same
+        model key.
+        """
+        _, class_vars = self._get_class_vars_type()
+        model_key = (type(self).__name__, class_vars, method,
+                     getattr(self, 'censor_val', None), self.approx_atol,
+                     self.approx_rtol)
+        data = np.ascontiguousarray(self.data, dtype=float)
+        fingerprint = hashlib.sha1(data.view(np.uint8)).hexdigest()
+        if self.efficient:
+            settings = (self.randomize, self.n_res, self.n_sub,
+                        self.return_median, self.return_only_bw)
+        else:
+            settings = None
+        return model_key, (data.shape, fingerprint, settings)
+
+    def _cached_bw(self, method, bwfunc):
+        """
+        Returns the bandwidth selected by `bwfunc`, using `bw_cache`.
+
+        If the bandwidth of the same model and data is in the cache, it is
+        returned without running `bwfunc`.  Otherwise the search in `bwfunc`
+        is warm started from the cache, see `_bw_start`, and the result is
+        stored in the cache.
+        """
+        self._bw_scale = None
+        self._bw_h0 = None
+        self._bw_warm = False
+        cache = self.bw_cache
+        if cache is None or method == 'normal_reference':
+            return bwfunc()
+
+        key = self._bw_cache_key(method)
+        bw = cache.get(key)
+        if bw is not None:
+            return bw
+
+        self._bw_scale = cache.get_scale(key[0])
+        bw = bwfunc()
+        scale = None
+        if self._bw_h0 is not None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scale = bw / self._bw_h0
+        cache.store(key, bw, scale)
+        return bw
+
+    def _bw_start(self, h0):
+        """
+        Returns the starting value of the bandwidth search.
+
+        `h0` is the normal reference bandwidth.  If a warm start is available
+        from `bw_cache`, `h0` is multiplied by the ratio of the last selected
+        bandwidth of the same model to its normal reference bandwidth.
+        """
+        self._bw_h0 = h0
+        self._bw_warm = False
+        scale = getattr(self, '_bw_scale', None)
+        if scale is None or np.shape(scale) != np.shape(h0):
+            return h0
+        self._bw_warm = True
+        return h0 * scale
+
+    def _bw_fmin_kwds(self, x0):
+        """
+        Returns extra keywords of the Nelder-Mead bandwidth search.
+
+        This is empty, i.e. the defaults of `optimize.fmin`, unless the search
+        is warm started by `_bw_start`.  The start is then expected to be
+        close to the optimum, and a smaller initial simplex needs fewer
+        evaluations.  The simplex is not used with scipy < 0.18.
+        """
+        if not (getattr(self, '_bw_warm', False) and _FMIN_HAS_SIMPLEX):
+            return {}
+        x0 = np.asarray(x0, dtype=float)
+        step = np.where(x0 != 0, _WARM_START_STEP * x0, 0.00025)
+        return {'initial_simplex': np.vstack((x0, x0 + np.diag(step)))}
+
     def _compute_dispersion(self, data):
         """
         Computes the measure of dispersion.
@@ -182,6 +294,10 @@ class GenericKDE (object):
             self._bw_method = "user-specified"
             return bw
 
+        return self._cached_bw(bw, functools.partial(self._efficient_bw, bw))
+
+    def _efficient_bw(self, bw):
+        """Bandwidth from the scaling factors of the subsets."""
         nobs = self.nobs
         n_sub = self.n_sub
         data = copy.deepcopy(self.data)
@@ -204,20 +320,20 @@ class GenericKDE (object):
         only_bw = np.empty((n_blocks, self.k_vars))
 
         class_type, class_vars = self._get_class_vars_type()
-        if has_joblib:
-            # `res` is a list of tuples (sample_scale_sub, bw_sub)
-            res = joblib.Parallel(n_jobs=self.n_jobs) \
-                (joblib.delayed(_compute_subset) \
-                (class_type, data, bw, co, do, n_cvars, ix_ord, ix_unord, \
-                n_sub, class_vars, self.randomize, bounds[i]) \
-                for i in range(n_blocks))
+        # the subsets only use the warm starts of the cache
+        sub_cache = None
+        if self.bw_cache is not None:
+            sub_cache = self.bw_cache.warm_start_cache()
+        if has_joblib and self.n_jobs != 1:
+            parallel, p_func, _ = parallel_func(_compute_subset,
+                                                self.n_jobs, verbose=0)
         else:
-            res = []
-            for i in range(n_blocks):
-                res.append(_compute_subset(class_type, data, bw, co, do,
-                                           n_cvars, ix_ord, ix_unord, n_sub,
-                                           class_vars, self.randomize,
-                                           bounds[i]))
+            parallel, p_func = list, _compute_subset
+        # `res` is a list of tuples (sample_scale_sub, bw_sub)
+        res = parallel(p_func(class_type, data, bw, co, do, n_cvars, ix_ord,
+                              ix_unord, n_sub, class_vars, self.randomize,
+                              bounds[i], sub_cache)
+                       for i in range(n_blocks))
 
         for i in range(n_blocks):
             sample_scale[i, :] = res[i][0]
@@ -245,6 +361,9 @@ class GenericKDE (object):
         self.efficient = defaults.efficient
         self.return_only_bw = defaults.return_only_bw
         self.n_jobs = defaults.n_jobs
+        self.approx_atol = defaults.approx_atol
+        self.approx_rtol = defaults.approx_rtol
+        self.bw_cache = defaults.bw_cache
 
     def _normal_reference(self):
         """
@@ -300,9 +419,10 @@ class GenericKDE (object):
                         {q}h_{s}^{-1}k\left(\frac{X_{is}-X_{js}}{h_{s}}\right)
         """
         # the initial value for the optimization is the normal_reference
-        h0 = self._normal_reference()
+        h0 = self._bw_start(self._normal_reference())
         bw = optimize.fmin(self.loo_likelihood, x0=h0, args=(np.log, ),
-                           maxiter=1e3, maxfun=1e3, disp=0, xtol=1e-3)
+                           maxiter=1e3, maxfun=1e3, disp=0, xtol=1e-3,
+                           **self._bw_fmin_kwds(h0))
         bw = self._set_bw_bounds(bw)  # bound bw if necessary
         return bw
 
@@ -324,9 +444,9 @@ class GenericKDE (object):
         conditional (``KDEMultivariateConditional``) and unconditional
         (``KDEMultivariate``) kernel density estimation.
         """
-        h0 = self._normal_reference()
+        h0 = self._bw_start(self._normal_reference())
         bw = optimize.fmin(self.imse, x0=h0, maxiter=1e3, maxfun=1e3, disp=0,
-                           xtol=1e-3)
+                           xtol=1e-3, **self._bw_fmin_kwds(h0))
         bw = self._set_bw_bounds(bw)  # bound bw if necessary
         return bw
 
@@ -370,11 +490,30 @@ class EstimatorSettings(object):
         scaling factor.  This is *not* theoretically justified.
         Should be used only for experimenting.
     n_jobs : int, optional
-        The number of jobs to use for parallel estimation with
-        ``joblib.Parallel``.  Default is -1, meaning ``n_cores - 1``, with
-        ``n_cores`` the number of available CPU cores.
-        See the `joblib documentation
-        <https://pythonhosted.org/joblib/parallel.html>`_ for more details.
+        The number of jobs to use for the parallel estimation of the
+        sub-samples with ``joblib.Parallel``, see
+        `statsmodels.tools.parallel.parallel_func`.  Default is -1, meaning
+        all available CPU cores.  If 1, or if joblib is not installed, the
+        sub-samples are estimated sequentially.
+    approx_atol : float, optional
+        Absolute error tolerance for the approximate evaluation of the kernel
+        sums, on the scale of the density.  Default is 0.
+    approx_rtol : float, optional
+        Relative error tolerance for the approximate evaluation of the kernel
+        sums.  Default is 0.  If either tolerance is positive, the kernel sums
+        of `KDEMultivariate.pdf`, `KernelReg.fit` and of the leave-one-out
+        likelihoods used by ``bw='cv_ml'`` are computed by descending k-d
+        trees of the training and of the evaluation points, and the error
+        of the density at each point is at most ``approx_atol + approx_rtol *
+        pdf``.  This is much faster for large samples if the bandwidths are
+        small relative to the spread of the data.  Only the Gaussian kernel
+        for continuous variables is supported, and the bounds assume that
+        the bandwidths of discrete variables are at most one.
+    bw_cache : BandwidthCache instance, optional
+        If given, the bandwidths selected by ``bw='cv_ml'``, ``bw='cv_ls'``
+        or ``bw='aic'`` are stored in and looked up from `bw_cache`, and
+        the bandwidth search of new data is warm started from the
+        bandwidths selected for the same kind of model.  Default is None.
 
     Examples
     --------
@@ -383,7 +522,8 @@ class EstimatorSettings(object):
 
     """
     def __init__(self, efficient=False, randomize=False, n_res=25, n_sub=50,
-                 return_median=True, return_only_bw=False, n_jobs=-1):
+                 return_median=True, return_only_bw=False, n_jobs=-1,
+                 approx_atol=0., approx_rtol=0., bw_cache=None):
         self.efficient = efficient
         self.randomize = randomize
         self.n_res = n_res
@@ -391,6 +531,96 @@ class EstimatorSettings(object):
         self.return_median = return_median
         self.return_only_bw = return_only_bw  # TODO: remove this?
         self.n_jobs = n_jobs
+        self.approx_atol = approx_atol
+        self.approx_rtol = approx_rtol
+        self.bw_cache = bw_cache
+
+
+class BandwidthCache(object):
+    """
+    Cache of the bandwidths selected for nonparametric estimators.
+
+    Bandwidths are stored by the class of the model, the variable types,
+    the bandwidth selection method and a fingerprint of the data, so that
+    a model refit on the same data reuses the bandwidth instead of
+    repeating the cross-validation.  For new data, the bandwidth search
+    starts from the bandwidth last selected for the same kind of model,
+    rescaled by the normal reference rule, which usually needs far fewer
+    evaluations of the cross-validation criterion if the data change
+    slowly.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        The maximum number of bandwidths stored.  The least recently used
+        bandwidths are dropped first.  Default is 128.
+    warm_start : bool, optional
+        If True (default), the bandwidth search of data that is not in the
+        cache is started from the last selected bandwidth of the same kind
+        of model.  If False, it starts from the normal reference rule.
+
+    Examples
+    --------
+    >>> cache = BandwidthCache()
+    >>> settings = EstimatorSettings(bw_cache=cache)
+    >>> dens = KDEMultivariate(data, 'cc', bw='cv_ml', defaults=settings)
+    >>> dens2 = KDEMultivariate(new_data, 'cc', bw='cv_ml',
+    ...                         defaults=settings)
+    """
+    def __init__(self, maxsize=128, warm_start=True):
+        self.maxsize = maxsize
+        self.warm_start = warm_start
+        self._bws = collections.OrderedDict()
+        self._scales = {}
+
+    def __len__(self):
+        return len(self._bws)
+
+    def get(self, key):
+        """Returns a copy of the bandwidth stored for `key`, or None."""
+        bw = self._bws.pop(key, None)
+        if bw is None:
+            return None
+        self._bws[key] = bw
+        return bw.copy()
+
+    def get_scale(self, model_key):
+        """
+        Returns the warm start for `model_key`, the ratio of the last
+        selected bandwidth to the normal reference bandwidth, or None.
+        """
+        if not self.warm_start:
+            return None
+        return self._scales.get(model_key)
+
+    def store(self, key, bw, scale=None):
+        """
+        Stores the bandwidth `bw` for `key` and, if `scale` is finite, the
+        warm start of the model key ``key[0]``.
+        """
+        bw = np.array(bw, dtype=float)
+        if self.maxsize > 0:
+            self._bws.pop(key, None)
+            self._bws[key] = bw
+            while len(self._bws) > self.maxsize:
+                self._bws.popitem(last=False)
+        if scale is not None and np.all(np.isfinite(scale)):
+            self._scales[key[0]] = np.array(scale, dtype=float)
+
+    def warm_start_cache(self):
+        """
+        Returns a cache that shares the warm starts, but no bandwidths.
+
+        Used for the sub-samples of the efficient bandwidth estimation.
+        """
+        cache = BandwidthCache(maxsize=0, warm_start=self.warm_start)
+        cache._scales = self._scales
+        return cache
+
+    def clear(self):
+        """Removes all bandwidths and warm starts."""
+        self._bws.clear()
+        self._scales.clear()
 
 
 class LeaveOneOut(object):
@@ -516,3 +746,517 @@ def gpke(bw, data, data_predict, var_type, ckertype='gaussian',
         return dens.sum(axis=0)
     else:
         return dens
+
+
+def gpke_blocks(bw, data, data_predict, var_type, ckertype='gaussian',
+                okertype='wangryzin', ukertype='aitchisonaitken', loo=False):
+    r"""
+    Generalized Product Kernel between all evaluation and training points
+
+    Evaluates the same kernel as `gpke`, but for all points of
+    `data_predict` at once.  The (n_predict, nobs) kernel matrix is
+    returned in blocks of rows, so that only a bounded number of kernel
+    values is held in memory.
+
+    Parameters
+    ----------
+    bw: 1-D ndarray
+        The user-specified bandwidth parameters.
+    data: 2-D ndarray
+        The training data, shape (nobs, k_vars).
+    data_predict: 2-D ndarray
+        The evaluation points, shape (n_predict, k_vars).
+    var_type: str
+        The variable type (continuous, ordered, unordered).
+    ckertype: str, optional
+        The kernel used for the continuous variables.
+    okertype: str, optional
+        The kernel used for the ordered discrete variables.
+    ukertype: str, optional
+        The kernel used for the unordered discrete variables.
+    loo : bool, optional
+        If True, `data_predict` is the training data itself and the kernel
+        of each point with itself is set to zero, which gives the
+        leave-one-out estimators.  Default is False.
+
+    Yields
+    ------
+    rows : slice
+        The rows of `data_predict` in the block.
+    dens : ndarray
+        The kernel values of the block, shape (n_rows, nobs).
+    """
+    kertypes = dict(c=ckertype, o=okertype, u=ukertype)
+    bw = np.asarray(bw)
+    iscontinuous = np.array([c == 'c' for c in var_type])
+    bw_cont_prod = np.prod(bw[iscontinuous])
+    # the product of Gaussian kernels needs a single exponential
+    joint_gaussian = ckertype == 'gaussian' and iscontinuous.any()
+    if joint_gaussian:
+        bw_cont_prod *= np.sqrt(2 * np.pi) ** iscontinuous.sum()
+        data_cont = data[:, iscontinuous] / bw[iscontinuous]
+        predict_cont = data_predict[:, iscontinuous] / bw[iscontinuous]
+    funcs = [(ii, kernel_func[kertypes[vtype]])
+             for ii, vtype in enumerate(var_type)
+             if not (joint_gaussian and vtype == 'c')]
+
+    nobs = data.shape[0]
+    n_predict = data_predict.shape[0]
+    step = max(_GPKE_BLOCK_SIZE // max(nobs, 1), 1)
+    for start in range(0, n_predict, step):
+        rows = slice(start, min(start + step, n_predict))
+        x = data_predict[rows]
+        dens = 1.
+        if joint_gaussian:
+            z2 = np.zeros((len(x), nobs))
+            for ii in range(data_cont.shape[1]):
+                z = data_cont[:, ii] - predict_cont[rows, ii:ii + 1]
+                z2 += z * z
+            z2 *= -0.5
+            dens = np.exp(z2, out=z2)
+        for ii, func in funcs:
+            dens = dens * func(bw[ii], data[:, ii], x[:, ii:ii + 1])
+
+        dens = dens / bw_cont_prod
+        if loo:
+            ix = np.arange(rows.start, rows.stop)
+            dens[ix - rows.start, ix] = 0
+        yield rows, dens
+
+
+def gpke_sum(bw, data, data_predict, var_type, ckertype='gaussian',
+             okertype='wangryzin', ukertype='aitchisonaitken', loo=False,
+             weights=None, atol=0., rtol=0.):
+    """
+    Sum of the Generalized Product Kernel over the training points
+
+    Returns the result of ``gpke(bw, data, data_predict[i], ...)`` for all
+    evaluation points, shape (n_predict,).  See `gpke_blocks` for the other
+    parameters.
+
+    Parameters
+    ----------
+    weights : ndarray, optional
+        Weights of the training points, shape (nobs,) or (nobs, k).  If
+        given, the weighted sums of the kernel are returned, with shape
+        (n_predict,) or (n_predict, k).
+    atol, rtol : float, optional
+        Absolute and relative error tolerance.  If either is positive, the
+        sums are approximated with two k-d trees, see `_gpke_tree_sum`.  Both
+        refer to the kernel sums divided by the number of training points.
+        Default is 0, the exact sums.
+    """
+    kertypes = dict(c=ckertype, o=okertype, u=ukertype)
+    if ((atol > 0 or rtol > 0) and 'c' in var_type and
+            all(kertypes[vtype] in _TREE_KERNELS[vtype]
+                for vtype in var_type)):
+        return _gpke_tree_sum(bw, data, data_predict, var_type,
+                              ckertype=ckertype, okertype=okertype,
+                              ukertype=ukertype, loo=loo, weights=weights,
+                              atol=atol, rtol=rtol)
+
+    shape = data_predict.shape[:1]
+    if weights is not None:
+        shape += np.shape(weights)[1:]
+    dens = np.empty(shape)
+    for rows, block in gpke_blocks(bw, data, data_predict, var_type,
+                                   ckertype=ckertype, okertype=okertype,
+                                   ukertype=ukertype, loo=loo):
+        if weights is None:
+            dens[rows] = block.sum(axis=1)
+        else:
+            dens[rows] = block.dot(weights)
+    return dens
+
+
+def _kd_tree(x, split_first, leaf_size):
+    """
+    Balanced k-d tree of the rows of `x`
+
+    Each node is split at the median of its widest coordinate until the
+    nodes have at most `leaf_size` points.  The coordinates marked in
+    `split_first` are split before the others as long as they are not
+    constant within the node.  The children of node ``i`` of a level are
+    the nodes ``2 * i`` and ``2 * i + 1`` of the next level.
+
+    Returns
+    -------
+    order : ndarray
+        The rows of `x` in the order of the tree, the points of each node
+        are contiguous.
+    starts : list of ndarray
+        For each level, the first point of each node followed by the number
+        of points.
+    boxes : list of tuple
+        For each level, the smallest and the largest coordinates of the
+        points of each node.
+    """
+    nobs = len(x)
+    depth = 0
+    while -(-nobs // 2**depth) > leaf_size:
+        depth += 1
+    order = np.arange(nobs)
+    start = np.array([0, nobs])
+    # coordinate by which the points of each node are sorted
+    sorted_dim = np.array([-1])
+    starts, boxes = [], []
+    xs = x.copy()
+    for level in range(depth + 1):
+        lower = np.minimum.reduceat(xs, start[:-1], axis=0)
+        upper = np.maximum.reduceat(xs, start[:-1], axis=0)
+        starts.append(start)
+        boxes.append((lower, upper))
+        if level == depth:
+            break
+        width = upper - lower
+        width[:, split_first] = np.where(width[:, split_first] > 0, np.inf, 0)
+        nodes = np.arange(len(width))
+        dim = width.argmax(axis=1)
+        span = upper[nodes, dim] - lower[nodes, dim]
+        size = np.diff(start)
+        # sort the points of the nodes by the split coordinate, unless they
+        # are already sorted by it
+        unsorted = np.flatnonzero(np.repeat(dim != sorted_dim, size))
+        if len(unsorted):
+            node = np.repeat(nodes, size)[unsorted]
+            pos = ((xs[unsorted, dim[node]] - lower[node, dim[node]]) /
+                   np.where(span > 0, span, 1)[node])
+            perm = unsorted[np.argsort(node + 0.5 * pos)]
+            order[unsorted] = order[perm]
+            xs[unsorted] = xs[perm]
+        sorted_dim = np.repeat(dim, 2)
+        start = np.append(np.column_stack((start[:-1],
+                                           start[:-1] + size // 2)), nobs)
+    return order, starts, boxes
+
+
+def _gpke_tree_sum(bw, data, data_predict, var_type, ckertype='gaussian',
+                   okertype='wangryzin', ukertype='aitchisonaitken',
+                   loo=False, weights=None, atol=0., rtol=0.):
+    """
+    Approximate sums of the Generalized Product Kernel with two k-d trees
+
+    The training points and the evaluation points are each put in a k-d
+    tree, with the continuous variables scaled by their bandwidths, and the
+    sums are computed by descending both trees at once.  For each pair of
+    nodes, the product kernel is bounded by the bounds of its factors over
+    the boxes of the two nodes.  The kernel of all pairs of points of the
+    two nodes is replaced by the midpoint of the bounds or, for the
+    Gaussian kernel and nodes with constant discrete variables, by a first
+    order expansion around the centers of the boxes, if its error bound is
+    small enough.  Otherwise both nodes are split.  Pairs of leaves are
+    summed exactly.
+
+    The error of ``gpke_sum(...) / nobs`` is at most ``atol + rtol * s /
+    nobs`` at every evaluation point, with ``s`` the sum of the absolute
+    kernel values: each pair of nodes gets the share of its training points
+    of the tolerance left by the pairs already resolved for its evaluation
+    node.  The lower bounds of ``s`` are taken from the
+    pairs of nodes visited so far and, if `atol` is zero, from a first
+    cheap pass that only splits the nodes until the bounds of the kernel
+    are within a factor of two, or to the leaves, whose bounds are used
+    instead of their exact sums.  The weighted sums use the same bounds, so
+    that their error is at most the tolerance times the largest absolute
+    weight.
+
+    See `gpke_sum` for the parameters.
+    """
+    bw = np.asarray(bw, dtype=float)
+    nobs = data.shape[0]
+    kertypes = dict(o=okertype, u=ukertype)
+    iscontinuous = np.array([c == 'c' for c in var_type])
+    k_cont = iscontinuous.sum()
+    bw_cont = bw[iscontinuous]
+    funcs = []
+    for ii, vtype in enumerate(var_type):
+        if vtype == 'c':
+            continue
+        func = kernel_func[kertypes[vtype]]
+        if kertypes[vtype] == 'aitchisonaitken':
+            # the number of levels is taken from all training points
+            func = functools.partial(func,
+                                     num_levels=np.unique(data[:, ii]).size)
+        # smallest nonzero difference of two levels
+        levels = np.unique(np.concatenate((data[:, ii], data_predict[:, ii])))
+        gap = np.diff(levels).min() if len(levels) > 1 else 1.
+        funcs.append((bw[ii], func, gap))
+
+    deriv = ckertype == 'd_gaussian'
+    norm = np.sqrt(2 * np.pi) ** k_cont * np.prod(bw_cont)
+
+    def leaf_kernel(x_r, x_q, center):
+        # kernel of all pairs of the blocks of points `x_r` and `x_q`, the
+        # squared distances are computed around the centers of the blocks
+        cont_r = x_r[..., :k_cont] - center[:, None, :]
+        cont_q = x_q[..., :k_cont] - center[:, None, :]
+        dist = ((cont_q**2).sum(-1)[:, :, None] +
+                (cont_r**2).sum(-1)[:, None, :] -
+                2 * np_matmul(cont_q, cont_r.transpose(0, 2, 1)))
+        ker = np.exp(-0.5 * np.maximum(dist, 0))
+        if deriv:
+            for jj in range(k_cont):
+                ker *= (2 * (cont_r[:, None, :, jj] - cont_q[:, :, None, jj]) /
+                        bw_cont[jj])
+        for jj, (h, func, _) in enumerate(funcs):
+            ker *= func(h, x_r[:, None, :, k_cont + jj] -
+                        x_q[:, :, None, k_cont + jj], 0.)
+        return ker
+
+    def product(lower, upper, factor_lower, factor_upper):
+        # bounds of the product of two intervals
+        cands = [lower * factor_lower, lower * factor_upper,
+                 upper * factor_lower, upper * factor_upper]
+        return np.minimum.reduce(cands), np.maximum.reduce(cands)
+
+    def bounds(low, high):
+        # bounds of the kernel over the differences in [low, high], and of
+        # the factor of the discrete variables
+        low_c, high_c = low[:, :k_cont], high[:, :k_cont]
+        near = np.where((low_c <= 0) & (high_c >= 0), 0,
+                        np.minimum(abs(low_c), abs(high_c)))
+        far = np.maximum(abs(low_c), abs(high_c))
+        if deriv:
+            # t * exp(-t**2 / 2) is largest at t = 1 and smallest at t = -1
+            lower = upper = np.ones(len(low))
+            for jj in range(k_cont):
+                t = np.column_stack((low_c[:, jj], high_c[:, jj],
+                                     np.clip(1, low_c[:, jj], high_c[:, jj]),
+                                     np.clip(-1, low_c[:, jj], high_c[:, jj])))
+                t = 2 * t * np.exp(-0.5 * t**2) / bw_cont[jj]
+                lower, upper = product(lower, upper, t.min(1), t.max(1))
+        else:
+            lower = np.exp(-0.5 * (far**2).sum(1))
+            upper = np.exp(-0.5 * (near**2).sum(1))
+        disc_lower = disc_upper = np.ones(len(low))
+        for jj, (h, func, gap) in enumerate(funcs):
+            a, b = low[:, k_cont + jj], high[:, k_cont + jj]
+            d_near = np.where((a <= 0) & (b >= 0), 0,
+                              np.minimum(abs(a), abs(b)))
+            d_far = np.maximum(abs(a), abs(b))
+            # the kernels are monotone in the distance of distinct levels
+            vals = np.column_stack((
+                func(h, d_near, 0.), func(h, d_far, 0.),
+                func(h, np.where(d_near > 0, d_near, np.minimum(gap, d_far)),
+                     0.)))
+            disc_lower, disc_upper = product(disc_lower, disc_upper,
+                                             vals.min(1), vals.max(1))
+        lower, upper = product(lower, upper, disc_lower, disc_upper)
+        return lower, upper, near, far, disc_lower
+
+    def hessian_bound(near, far):
+        # largest spectral norm of the Hessian of exp(-|u|**2 / 2) for
+        # |u| in [near, far], max(1, |s**2 - 1|) * exp(-s**2 / 2) peaks at
+        # s = 0 and s = sqrt(3)
+        s = np.column_stack((near, far, np.clip(np.sqrt(3), near, far)))
+        return (np.maximum(1, abs(s**2 - 1)) * np.exp(-0.5 * s**2)).max(1)
+
+    # continuous variables scaled by their bandwidths, then discrete
+    x_train = np.column_stack((data[:, iscontinuous] / bw_cont,
+                               data[:, ~iscontinuous]))
+    x_eval = np.column_stack((data_predict[:, iscontinuous] / bw_cont,
+                              data_predict[:, ~iscontinuous]))
+    n_eval = len(x_eval)
+    discrete = np.arange(x_train.shape[1]) >= k_cont
+    train, train_starts, train_boxes = _kd_tree(x_train, discrete,
+                                                _TREE_LEAF_SIZE)
+    evals, eval_starts, eval_boxes = _kd_tree(x_eval, discrete,
+                                              _TREE_LEAF_SIZE)
+    x_train = x_train[train]
+    x_eval = x_eval[evals]
+    if weights is None:
+        w = np.ones((nobs, 1))
+    else:
+        w = np.reshape(weights, (nobs, -1))
+    w_tree = w[train]
+
+    # centers, radii and counts of the nodes
+    def centers(boxes):
+        return [(high[:, :k_cont] + low[:, :k_cont]) / 2
+                for low, high in boxes]
+
+    def radii(boxes):
+        return [np.sqrt((((high - low)[:, :k_cont] / 2)**2).sum(1))
+                for low, high in boxes]
+
+    def pure(boxes):
+        return [np.all(low[:, k_cont:] == high[:, k_cont:], axis=1)
+                for low, high in boxes]
+
+    train_center, eval_center = centers(train_boxes), centers(eval_boxes)
+    train_radius, eval_radius = radii(train_boxes), radii(eval_boxes)
+    train_pure, eval_pure = pure(train_boxes), pure(eval_boxes)
+    train_count = [np.diff(start) for start in train_starts]
+    depth_train, depth_eval = len(train_starts) - 1, len(eval_starts) - 1
+    expand = not deriv and k_cont > 0
+
+    # kernel of a point with itself
+    self_ker = leaf_kernel(np.zeros((1, 1, x_train.shape[1])),
+                           np.zeros((1, 1, x_train.shape[1])),
+                           np.zeros((1, k_cont)))[0, 0, 0]
+    self_abs = abs(self_ker) if loo else 0.
+    tol = atol * nobs * norm
+
+    def descend(w_tree, prior=None, first=False):
+        # sums of the kernel times the columns of `w_tree` and lower bounds
+        # of the sums of the absolute kernel, in the order of the tree
+        n_cols = w_tree.shape[1]
+        node_weight = [np.add.reduceat(w_tree, start[:-1], axis=0)
+                       for start in train_starts]
+        if expand:
+            # first moments around the centers of the nodes
+            node_moment = [
+                np.add.reduceat(w_tree[:, :, None] *
+                                x_train[:, None, :k_cont], start[:-1],
+                                axis=0) -
+                weight[:, :, None] * center[:, None, :]
+                for start, weight, center in zip(train_starts, node_weight,
+                                                 train_center)]
+        node_sums = [np.zeros((len(start) - 1, n_cols))
+                     for start in eval_starts]
+        node_grad = [np.zeros((len(start) - 1, n_cols, k_cont))
+                     for start in eval_starts]
+        node_abs = [np.zeros(len(start) - 1) for start in eval_starts]
+
+        def add(ix, values, out):
+            for jj in range(values.shape[1]):
+                out[:, jj] += np.bincount(ix, weights=values[:, jj],
+                                          minlength=len(out))
+
+        q = r = np.zeros(1, dtype=np.intp)
+        lq = lr = 0
+        # lower bound of the absolute sums, error bound and number of the
+        # training points of the pairs resolved so far, per evaluation node
+        resolved = np.zeros(1)
+        used = np.zeros(1)
+        count = np.zeros(1)
+        while len(q):
+            low = train_boxes[lr][0][r] - eval_boxes[lq][1][q]
+            high = train_boxes[lr][1][r] - eval_boxes[lq][0][q]
+            lower, upper, near, far, disc = bounds(low, high)
+            abs_lower = np.where(lower > 0, lower,
+                                 np.where(upper < 0, -upper, 0))
+            abs_lower = abs_lower * train_count[lr][r]
+            n_q = len(node_abs[lq])
+            bound = resolved + np.bincount(q, weights=abs_lower, minlength=n_q)
+            if prior is not None:
+                bound = np.maximum(bound, prior[lq])
+            # the tolerance left is shared by the training points left
+            tau = ((tol + rtol * np.maximum(bound - self_abs, 0) - used) /
+                   np.maximum(nobs - count, 1))
+            tau = tau[q]
+            if first:
+                # only the lower bounds are needed: the bounds of the kernel
+                # are within a factor two, the kernel is negligible or the
+                # nodes are leaves
+                top = np.maximum(abs(lower), abs(upper))
+                top_q = np.zeros(n_q)
+                np.maximum.at(top_q, q, top)
+                mid = ((upper - lower <= 2 * tau) |
+                       (abs_lower >= 0.5 * top * train_count[lr][r]) |
+                       (top <= rtol * top_q[q]) |
+                       (lq == depth_eval and lr == depth_train))
+            else:
+                mid = upper - lower <= 2 * tau
+            value = (lower + upper) / 2
+            add(q[mid], node_weight[lr][r[mid]] * value[mid, None],
+                node_sums[lq])
+            done = mid
+            error = np.where(mid, (upper - lower) / 2, 0)
+            if expand and not first:
+                # first order expansion around the centers of the two nodes
+                cand = np.flatnonzero(~mid & eval_pure[lq][q] &
+                                      train_pure[lr][r])
+                tq, tr = q[cand], r[cand]
+                err = (disc[cand] *
+                       hessian_bound(np.sqrt((near[cand]**2).sum(1)),
+                                     np.sqrt((far[cand]**2).sum(1))) *
+                       (eval_radius[lq][tq] + train_radius[lr][tr])**2 / 2)
+                ok = err <= tau[cand]
+                cand, tq, tr = cand[ok], tq[ok], tr[ok]
+                error[cand] = err[ok]
+                u0 = train_center[lr][tr] - eval_center[lq][tq]
+                f0 = disc[cand] * np.exp(-0.5 * (u0**2).sum(1))
+                grad = -u0 * f0[:, None]
+                weight = node_weight[lr][tr]
+                add(tq, weight * f0[:, None] +
+                    np.einsum('ik,ijk->ij', grad, node_moment[lr][tr]),
+                    node_sums[lq])
+                add(tq, -(weight[:, :, None] *
+                              grad[:, None, :]).reshape(len(tq),
+                                                        n_cols * k_cont),
+                    node_grad[lq].reshape(n_q, n_cols * k_cont))
+                done = done.copy()
+                done[cand] = True
+            new = np.bincount(q[done], weights=abs_lower[done], minlength=n_q)
+            node_abs[lq] += new
+            resolved = resolved + new
+            n_train = train_count[lr][r]
+            used = used + np.bincount(q, weights=error * n_train,
+                                      minlength=n_q)
+            count = count + np.bincount(q[done], weights=n_train[done],
+                                        minlength=n_q)
+            q, r = q[~done], r[~done]
+            if lq == depth_eval and lr == depth_train:
+                break
+            if lq < depth_eval and lr < depth_train:
+                q = (2 * q[:, None] + [0, 0, 1, 1]).ravel()
+                r = (2 * r[:, None] + [0, 1, 0, 1]).ravel()
+            elif lq < depth_eval:
+                q = (2 * q[:, None] + [0, 1]).ravel()
+                r = np.repeat(r, 2)
+            else:
+                q = np.repeat(q, 2)
+                r = (2 * r[:, None] + [0, 1]).ravel()
+            if lq < depth_eval:
+                resolved = np.repeat(resolved, 2)
+                used = np.repeat(used, 2)
+                count = np.repeat(count, 2)
+                lq += 1
+            lr = min(lr + 1, depth_train)
+
+        sums = np.zeros((n_eval, n_cols))
+        abs_sums = np.zeros(n_eval)
+        if len(q):
+            # pairs of leaves
+            q_start = eval_starts[-1][q]
+            q_size = eval_starts[-1][q + 1] - q_start
+            r_start = train_starts[-1][r]
+            r_size = train_starts[-1][r + 1] - r_start
+            max_q, max_r = q_size.max(), r_size.max()
+            step = max(_GPKE_BLOCK_SIZE // (max_q * max_r * x_train.shape[1]),
+                       1)
+            for start in range(0, len(q), step):
+                block = slice(start, start + step)
+                mask_q = np.arange(max_q) < q_size[block, None]
+                mask_r = np.arange(max_r) < r_size[block, None]
+                iq = q_start[block, None] + np.arange(max_q) * mask_q
+                ir = r_start[block, None] + np.arange(max_r) * mask_r
+                ker = leaf_kernel(x_train[ir], x_eval[iq],
+                                  eval_center[-1][q[block]])
+                ker *= mask_q[:, :, None] & mask_r[:, None, :]
+                add(iq[mask_q], np_matmul(ker, w_tree[ir])[mask_q], sums)
+
+        # add the sums of the nodes to their points
+        for start, node, grad, node_a, center in zip(
+                eval_starts, node_sums, node_grad, node_abs, eval_center):
+            size = np.diff(start)
+            sums += np.repeat(node, size, axis=0)
+            abs_sums += np.repeat(node_a, size)
+            if expand and not first:
+                offset = x_eval[:, :k_cont] - np.repeat(center, size, axis=0)
+                sums += np.einsum('ijk,ik->ij', np.repeat(grad, size, axis=0),
+                                  offset)
+        return sums, abs_sums
+
+    prior = None
+    if rtol > 0 and atol == 0:
+        abs_sums = descend(np.empty((nobs, 0)), first=True)[1]
+        prior = [np.minimum.reduceat(abs_sums, start[:-1])
+                 for start in eval_starts]
+    sums = np.empty((n_eval, w.shape[1]))
+    sums[evals] = descend(w_tree, prior)[0] / norm
+    if loo:
+        sums -= self_ker * w / norm
+    if weights is None:
+        return sums[:, 0]
+    return sums.reshape(sums.shape[:1] + np.shape(weights)[1:])
@@ -16,21 +16,23 @@ Scatterplots". Journal of the American Statistical Association 74 (368): 829-836
 
 cimport numpy as np
 import numpy as np
-from cpython cimport bool
 cimport cython
+from libc.math cimport fabs, NAN
+from libc.stdlib cimport malloc, free
+import threading
+import multiprocessing
 
 # there's no fmax in math.h with windows SDK apparently
-cdef inline double fmax(double x, double y): return x if x >= y else y
+cdef inline double fmax(double x, double y) nogil: return x if x >= y else y
 
 DTYPE = np.double
 ctypedef np.double_t DTYPE_t
 
-def lowess(np.ndarray[DTYPE_t, ndim = 1] endog,
-           np.ndarray[DTYPE_t, ndim = 1] exog,
-           double frac = 2.0 / 3.0,
-           Py_ssize_t it = 3,
-           double delta = 0.0):
-    '''lowess(endog, exog, frac=2.0/3.0, it=3, delta=0.0)
+
+def lowess(endog, exog, double frac=2.0 / 3.0, Py_ssize_t it=3,
+           double delta=0.0, xvals=None, n_jobs=1):
+    '''lowess(endog, exog, frac=2.0/3.0, it=3, delta=0.0, xvals=None,
+              n_jobs=1)
     LOWESS (Locally Weighted Scatterplot Smoothing)
 
     A lowess function that outs smoothed estimates of endog
@@ -38,8 +40,9 @@ def lowess(np.ndarray[DTYPE_t, ndim = 1] endog,
 
     Parameters
     ----------
-    endog: 1-D numpy array
-        The y-values of the observed points
+    endog: 1-D or 2-D numpy array
+        The y-values of the observed points. If 2-D, each column is
+        smoothed separately against the same exog.
     exog: 1-D numpy array
         The x-values of the observed points. exog has to be increasing.
     frac: float
@@ -51,93 +54,44 @@ def lowess(np.ndarray[DTYPE_t, ndim = 1] endog,
     delta: float
         Distance within which to use linear-interpolation
         instead of weighted regression.
+    xvals: 1-D numpy array, optional
+        The x-values at which the smoothed estimates are computed. If
+        None, exog is used. xvals does not need to be sorted.
+    n_jobs: int
+        The number of threads used for the local regressions. -1 uses
+        all processors.
 
     Returns
     -------
-    out: numpy array
-        A numpy array with two columns. The first column
-        is the sorted x values and the second column the
-        associated estimated y-values.
+    y_fit: numpy array
+        The smoothed values at exog, or at xvals if given. The array has
+        the same number of dimensions as endog.
 
     Notes
     -----
-    This lowess function implements the algorithm given in the
-    reference below using local linear estimates.
-
-    Suppose the input data has N points. The algorithm works by
-    estimating the `smooth` y_i by taking the frac*N closest points
-    to (x_i,y_i) based on their x values and estimating y_i
-    using a weighted linear regression. The weight for (x_j,y_j)
-    is tricube function applied to |x_i-x_j|.
-
-    If it > 1, then further weighted local linear regressions
-    are performed, where the weights are the same as above
-    times the _lowess_bisquare function of the residuals. Each iteration
-    takes approximately the same amount of time as the original fit,
-    so these iterations are expensive. They are most useful when
-    the noise has extremely heavy tails, such as Cauchy noise.
-    Noise with less heavy-tails, such as t-distributions with df>2,
-    are less problematic. The weights downgrade the influence of
-    points with large residuals. In the extreme case, points whose
-    residuals are larger than 6 times the median absolute residual
-    are given weight 0.
-
-    delta can be used to save computations. For each x_i, regressions
-    are skipped for points closer than delta. The next regression is
-    fit for the farthest point within delta of x_i and all points in
-    between are estimated by linearly interpolating between the two
-    regression fits.
-
-    Judicious choice of delta can cut computation time considerably
-    for large data (N > 5000). A good choice is delta = 0.01 *
-    range(exog).
-
-    Some experimentation is likely required to find a good
-    choice of frac and iter for a particular dataset.
+    See statsmodels.nonparametric.smoothers_lowess.lowess for the details
+    of the algorithm.
+
+    The neighborhood of each point is found by bisection, so that the
+    local regressions are independent of each other. They are run without
+    the GIL and are split between `n_jobs` threads. All columns of endog
+    share the neighborhoods and, in the first iteration, also the local
+    projection vectors.
 
     References
     ----------
     Cleveland, W.S. (1979) "Robust Locally Weighted Regression
     and Smoothing Scatterplots". Journal of the American Statistical
     Association 74 (368): 829-836.
-
-    Examples
-    --------
-    The below allows a comparison between how different the fits from
-    lowess for different values of frac can be.
-
-    >>> import numpy as np
-    >>> import statsmodels.api as sm
-    >>> lowess = sm.nonparametric.lowess
-    >>> x = np.random.uniform(low = -2*np.pi, high = 2*np.pi, size=500)
-    >>> y = np.sin(x) + np.random.normal(size=len(x))
-    >>> z = lowess(y, x)
-    >>> w = lowess(y, x, frac=1./3)
-
-    This gives a similar comparison for when it is 0 vs not.
-
-    >>> import numpy as np
-    >>> import scipy.stats as stats
-    >>> import statsmodels.api as sm
-    >>> lowess = sm.nonparametric.lowess
-    >>> x = np.random.uniform(low = -2*np.pi, high = 2*np.pi, size=500)
-    >>> y = np.sin(x) + stats.cauchy.rvs(size=len(x))
-    >>> z = lowess(y, x, frac= 1./3, it=0)
-    >>> w = lowess(y, x, frac=1./3)
-
     '''
     cdef:
-        Py_ssize_t n
-        int k
-        Py_ssize_t robiter, i, left_end, right_end
-        int last_fit_i,
-        np.ndarray[DTYPE_t, ndim = 1] x, y
-        np.ndarray[DTYPE_t, ndim = 1] y_fit
-        np.ndarray[DTYPE_t, ndim = 1] weights
-        np.ndarray[DTYPE_t, ndim = 1] resid_weights
-
-    y = endog   # now just alias
-    x = exog
+        Py_ssize_t n, k, robiter
+        np.ndarray[DTYPE_t, ndim = 1] x
+        np.ndarray[DTYPE_t, ndim = 2] y, y_fit
+        np.ndarray[DTYPE_t, ndim = 2] resid_weights = None
+
+    y = np.ascontiguousarray(endog, dtype=DTYPE).reshape(len(endog), -1)
+    x = np.ascontiguousarray(exog, dtype=DTYPE)
 
     n = x.shape[0]
 
@@ -152,395 +106,409 @@ def lowess(np.ndarray[DTYPE_t, ndim = 1] endog,
     if k > n:
         k = n
 
-    y_fit = np.zeros(n, dtype = DTYPE)
-    resid_weights = np.zeros(n, dtype = DTYPE)
-
-    it += 1 # Add one to it for initial run.
-    for robiter in xrange(it):
-        i = 0
-        last_fit_i = -1
-        left_end = 0
-        right_end = k
-        y_fit = np.zeros(n, dtype = DTYPE)
-
-        # 'do' Fit y[i]'s 'until' the end of the regression
-        while True:
-            # Re-initialize the weights for each point x[i].
-            weights = np.zeros(n, dtype = DTYPE)
-
-            # Describe the neighborhood around the current x[i].
-            left_end, right_end, radius = update_neighborhood(x, i, n,
-                                                              left_end,
-                                                              right_end)
-
-            # Calculate the weights for the regression in this neighborhood.
-            # Determine if at least some weights are positive, so a regression
-            # is ok.
-            reg_ok = calculate_weights(x, weights, resid_weights, i, left_end,
-                                       right_end, radius, robiter > 0)
-
-            # If ok, run the regression
-            calculate_y_fit(x, y, i, y_fit, weights, left_end, right_end,
-                            reg_ok)
-
-            # If we skipped some points (because of how delta was set), go back
-            # and fit them by linear interpolation.
-            if last_fit_i < (i - 1):
-                interpolate_skipped_fits(x, y_fit, i, last_fit_i)
-
-            # Update the last fit counter to indicate we've now fit this point.
-            # Find the next i for which we'll run a regression.
-            i, last_fit_i = update_indices(x, y_fit, delta, i, n, last_fit_i)
-
-            if last_fit_i >= n-1:
-                break
+    if n_jobs == -1:
+        n_jobs = multiprocessing.cpu_count()
 
-        # Calculate residual weights, but don't bother on the last iteration.
-        if robiter < it - 1:
-            resid_weights = calculate_residual_weights(y, y_fit)
+    # The robustifying iterations always fit at the observed points,
+    # only the final fit is evaluated at xvals.
+    for robiter in range(it):
+        y_fit = _fit_sorted(x, y, resid_weights, x, True, k, delta, n_jobs)
+        resid_weights = calculate_residual_weights(y, y_fit)
 
-    return np.array([x, y_fit]).T
+    if xvals is None:
+        y_fit = _fit_sorted(x, y, resid_weights, x, True, k, delta, n_jobs)
+    else:
+        xvals = np.asarray(xvals, dtype=DTYPE)
+        sort_index = np.argsort(xvals)
+        y_fit = np.empty((len(xvals), y.shape[1]), dtype=DTYPE)
+        y_fit[sort_index] = _fit_sorted(x, y, resid_weights,
+                                        xvals[sort_index], False, k, delta,
+                                        n_jobs)
 
+    if np.ndim(endog) == 1:
+        return y_fit[:, 0]
+    return y_fit
 
-def update_neighborhood(np.ndarray[DTYPE_t, ndim = 1] x,
-                        Py_ssize_t i,
-                        Py_ssize_t n,
-                        Py_ssize_t left_end,
-                        Py_ssize_t right_end):
-    '''
-    Find the indices bounding the k-nearest-neighbors of the current point.
 
-    Parameters
-    ----------
-    x: 1-D numpy array
-        The input x-values
-    i: indexing integer
-        The index of the point currently being fit.
-    n: indexing integer
-        The length of the input vectors, x and y.
-    left_end: indexing integer
-        The index of the left-most point in the neighborhood
-        of x[i-1] (the previously-fit point).
-    right_end: indexing integer
-        The index of the right-most point in the neighborhood
-        of x[i-1]. Non-inclusive, s.t. the neighborhood is
-        x[left_end] <= x < x[right_end].
-    radius: float
-        The radius of the current neighborhood. The larger of
-        distances between x[i] and its left-most or right-most
-        neighbor.
+def _fit_sorted(double[::1] x, double[:, ::1] y, resid_weights,
+                double[::1] xvals, bint observed, Py_ssize_t k, double delta,
+                Py_ssize_t n_jobs):
+    '''
+    Fit the local regressions at the sorted points xvals.
 
-    Returns
-    -------
-    left_end: indexing integer
-        The index of the left-most point in the neighborhood
-              of x[i] (the current point).
-    right_end: indexing integer
-        The index of the right-most point in the neighborhood
-               of x[i]. Non-inclusive, s.t. the neighborhood is
-               x[left_end] <= x < x[right_end].
-    radius: float
-        The radius of the current neighborhood. The larger of
-        distances between x[i] and its left-most or right-most
-        neighbor.
+    If `delta` is positive, the regressions are run only at a subset of
+    xvals and the values in between are interpolated, see
+    `delta_anchors`. If `observed` is True, xvals are the observed points
+    x, and a point for which the regression cannot be run keeps its
+    observed y-value.
     '''
+    cdef:
+        Py_ssize_t m = xvals.shape[0]
+        np.ndarray[DTYPE_t, ndim = 2] y_fit
+        Py_ssize_t[::1] anchors
 
-    cdef double radius
-    # A subtle loop. Start from the current neighborhood range:
-    # [left_end, right_end). Shift both ends rightwards by one
-    # (so that the neighborhood still contains k points), until
-    # the current point is in the center (or just to the left of
-    # the center) of the neighborhood. This neighborhood will
-    # contain the k-nearest neighbors of x[i].
-    #
-    # Once the right end hits the end of the data, hold the
-    # neighborhood the same for the remaining x[i]s.
-    while True:
-        if right_end < n:
+    y_fit = np.zeros((m, y.shape[1]), dtype=DTYPE)
+    if m == 0:
+        return y_fit
 
-            if (x[i] > (x[left_end] + x[right_end]) / 2.0):
-                left_end += 1
-                right_end += 1
-            else:
-                break
-        else:
-            break
+    anchors = np.empty(m, dtype=np.intp)
+    m = _walk(&xvals[0], xvals.shape[0], delta, &anchors[0], NULL, 0)
+    anchors = anchors[:m]
 
-    radius = fmax(x[i] - x[left_end], x[right_end-1] - x[i])
+    y_fit[anchors] = _fit_points(x, y, resid_weights,
+                                 np.asarray(xvals)[anchors],
+                                 anchors if observed else None, k, n_jobs)
+    if m < xvals.shape[0]:
+        _walk(&xvals[0], xvals.shape[0], delta, NULL, &y_fit[0, 0],
+              y.shape[1])
+    return y_fit
 
-    return left_end, right_end, radius
 
-cdef bool calculate_weights(np.ndarray[DTYPE_t, ndim = 1] x,
-                            np.ndarray[DTYPE_t, ndim = 1] weights,
-                            np.ndarray[DTYPE_t, ndim = 1] resid_weights,
-                            Py_ssize_t i,
-                            Py_ssize_t left_end,
-                            Py_ssize_t right_end,
-                            double radius,
-                            bool use_resid_weights):
+def delta_anchors(double[::1] x, double delta):
     '''
+    Find the points at which the local regressions are run.
 
     Parameters
     ----------
-    x: 1-D vector
-        The input x-values.
-    weights: 1-D numpy array
-        The vector of regression weights.
-    resid_weights: 1-D numpy array
-        The vector of residual weights from the last iteration.
-    i: indexing integer
-        The index of the point currently being fit.
-    left_end: indexing integer
-        The index of the left-most point in the neighborhood of
-        x[i].
-    right_end: indexing integer
-        The index of the right-most point in the neighborhood
-        of x[i]. Non-inclusive, s.t. the neighborhood is
-        x[left_end] <= x < x[right_end].
-    radius: float
-        The radius of the current neighborhood. The larger of
-        distances between x[i] and its left-most or right-most
-        neighbor.
-    use_resid_weights: boolean
-        If True, multiply the x-distance weights by the residual
-        weights from the last iteration of regressions. Set to
-        False on the first iteration (since there are no residuals
-        yet) and True on the subsequent ``robustifying`` iterations.
-
+    x: 1-D numpy array
+        The sorted points at which the smoothed values are computed.
+    delta: float
+        Indicates the range of x values within which linear
+        interpolation should be used to estimate y_fit instead
+        of weighted regression.
 
     Returns
     -------
-    reg_ok: boolean
-        If True, at least some points have positive weight, and the
-        regression will be run. If False, the regression is skipped
-        and y_fit[i] is set to equal y[i].
-    Also, changes elements of weights in-place.
+    anchors: 1-D numpy array
+        The indices of the points at which the regressions are run.
+        Points tied with an anchor copy its fitted value, the others are
+        interpolated between the two neighboring anchors.
     '''
-
     cdef:
-        np.ndarray[DTYPE_t, ndim = 1] x_j = x[left_end:right_end]
-        np.ndarray[DTYPE_t, ndim = 1] dist_i_j = np.abs(x_j - x[i]) / radius
-        bool reg_ok = True
-        double sum_weights
-
-    # Assign the distance measure to the weights, then apply the tricube
-    # function to change in-place.
-    # use_resid_weights will be False on the first iteration, then True
-    # on the subsequent ones, after some residuals have been calculated.
-    weights[left_end:right_end] = dist_i_j
-    if use_resid_weights == False:
-        tricube(weights[left_end:right_end])
-    if use_resid_weights == True:
-        tricube(weights[left_end:right_end])
-        weights[left_end:right_end] = (weights[left_end:right_end] *
-                                          resid_weights[left_end:right_end])
-
-    sum_weights = np.sum(weights[left_end:right_end])
-
-    if sum_weights <= 0.0 or (np.sum(weights[left_end:right_end] != 0) == 1):
-        # 2nd condition checks if only 1 local weight is non-zero, which
-        # will give a divisor of zero in calculate_y_fit
-        # see 1960
-        reg_ok = False
-    else:
-        weights[left_end:right_end] = weights[left_end:right_end] / sum_weights
+        Py_ssize_t m
+        Py_ssize_t[::1] anchors = np.empty(x.shape[0], dtype=np.intp)
 
-    return reg_ok
+    if x.shape[0] == 0:
+        return np.asarray(anchors)
+    m = _walk(&x[0], x.shape[0], delta, &anchors[0], NULL, 0)
+    return np.asarray(anchors[:m])
 
 
-cdef void calculate_y_fit(np.ndarray[DTYPE_t, ndim = 1] x,
-                          np.ndarray[DTYPE_t, ndim = 1] y,
-                          Py_ssize_t i,
-                          np.ndarray[DTYPE_t, ndim = 1] y_fit,
-                          np.ndarray[DTYPE_t, ndim = 1] weights,
-                          Py_ssize_t left_end,
-                          Py_ssize_t right_end,
-                          bool reg_ok):
+cdef Py_ssize_t _walk(double *x, Py_ssize_t n, double delta,
+                      Py_ssize_t *anchors, double *y_fit, Py_ssize_t p) nogil:
     '''
-    Calculate smoothed/fitted y-value by weighted regression.
+    Walk through the sorted points x, skipping points within delta.
 
-    Parameters
-    ----------
-    x: 1-D numpy array
-        The vector of input x-values.
-    y: 1-D numpy array
-        The vector of input y-values.
-    i: indexing integer
-        The index of the point currently being fit.
-    y_fit: 1-D numpy array
-        The vector of fitted y-values.
-    weights: 1-D numpy array
-        The vector of regression weights.
-    left_end: indexing integer
-        The index of the left-most point in the neighborhood of
-        x[i].
-    right_end: indexing integers
-        The index of the right-most point in the neighborhood
-        of x[i]. Non-inclusive, s.t. the neighborhood is
-        x[left_end] <= x < x[right_end].
-    reg_ok: boolean
-        If True, at least some points have positive weight, and the
-        regression will be run. If False, the regression is skipped
-        and y_fit[i] is set to equal y[i].
+    If `anchors` is not NULL, the indices of the points at which the
+    regressions are run are stored in it. If `y_fit` is not NULL, the
+    fitted values at the anchors are already computed and the skipped
+    points are filled in by linear interpolation or, for tied x-values,
+    by copying the fitted value.
 
-    Returns
-    -------
-    Nothing. Changes y_fit[i] in-place.
-
-    Notes
-    -----
-    No regression function (e.g. lstsq) is called. Instead "projection
-    vector" p_i_j is calculated, and y_fit[i] = sum(p_i_j * y[j]) = y_fit[i]
-    for j s.t. x[j] is in the neighborhood of x[i]. p_i_j is a function of
-    the weights, x[i], and its neighbors.
+    Returns the number of anchors.
     '''
+    cdef:
+        Py_ssize_t i = 0, last_fit_i = -1, k, j, c, nanchors = 0
+        double cutpoint, a
 
+    while True:
+        if anchors != NULL:
+            anchors[nanchors] = i
+        nanchors += 1
+
+        # If we skipped some points (because of how delta was set), go back
+        # and fit them by linear interpolation.
+        if y_fit != NULL and last_fit_i < (i - 1):
+            for j in range(last_fit_i + 1, i):
+                a = (x[j] - x[last_fit_i]) / (x[i] - x[last_fit_i])
+                for c in range(p):
+                    y_fit[j * p + c] = (a * y_fit[i * p + c] + (1.0 - a) *
+                                        y_fit[last_fit_i * p + c])
+
+        # For most points within delta of the current point, we skip the
+        # weighted linear regression (which save much computation of
+        # weights and fitted points). Instead, we'll jump to the last
+        # point within delta, fit the weighted regression at that point,
+        # and linearly interpolate in between.
+        last_fit_i = i
+        k = last_fit_i
+        cutpoint = x[last_fit_i] + delta
+        for j in range(last_fit_i + 1, n):
+            k = j
+            if x[k] > cutpoint:
+                break
+            if x[k] == x[last_fit_i]:
+                # if tied with previous x-value, just use the already
+                # fitted y, and update the last-fit counter.
+                if y_fit != NULL:
+                    for c in range(p):
+                        y_fit[k * p + c] = y_fit[last_fit_i * p + c]
+                last_fit_i = k
+
+        # i, which indicates the next point to fit the regression at, is
+        # either one prior to k (since k should be the first point outside
+        # of delta) or is just incremented + 1 if k = i+1. This insures we
+        # always step forward.
+        i = k - 1 if k - 1 > last_fit_i + 1 else last_fit_i + 1
+
+        if last_fit_i >= n - 1:
+            break
+
+    return nanchors
+
+
+def _fit_points(double[::1] x, double[:, ::1] y, resid_weights,
+                double[::1] xvals, observed, Py_ssize_t k,
+                Py_ssize_t n_jobs):
+    '''
+    Fit the local regressions at the points xvals, in n_jobs threads.
+    '''
     cdef:
-       double sum_weighted_x = 0, weighted_sqdev_x = 0, p_i_j
+        Py_ssize_t m = xvals.shape[0], p = y.shape[1]
+        Py_ssize_t[::1] fallback
+        double[:, ::1] rw, y_fit
+
+    y_fit = np.zeros((m, p), dtype=DTYPE)
+    if observed is None:
+        fallback = np.full(m, -1, dtype=np.intp)
+    else:
+        fallback = np.ascontiguousarray(observed, dtype=np.intp)
+    if resid_weights is None:
+        rw = np.ones((1, p), dtype=DTYPE)
+    else:
+        rw = resid_weights
 
-    if reg_ok == False:
-        y_fit[i] = y[i]
+    n_jobs = max(min(n_jobs, m // 64), 1)
+    if n_jobs == 1:
+        _fit_chunk(x, y, rw, resid_weights is not None, xvals, fallback, k,
+                   y_fit, 0, m)
     else:
-        for j in xrange(left_end, right_end):
-            sum_weighted_x += weights[j] * x[j]
-        for j in xrange(left_end, right_end):
-            weighted_sqdev_x += weights[j] * (x[j] - sum_weighted_x) ** 2
-        for j in xrange(left_end, right_end):
-            p_i_j = weights[j] * (1.0 + (x[i] - sum_weighted_x) *
-                             (x[j] - sum_weighted_x) / weighted_sqdev_x)
-            y_fit[i] += p_i_j * y[j]
-
-cdef void interpolate_skipped_fits(np.ndarray[DTYPE_t, ndim = 1] x,
-                                   np.ndarray[DTYPE_t, ndim = 1] y_fit,
-                                   Py_ssize_t i,
-                                   Py_ssize_t last_fit_i):
+        bounds = np.linspace(0, m, n_jobs + 1).astype(np.intp)
+        errors = []
+        threads = [threading.Thread(target=_run_chunk,
+                                    args=(errors, x, y, rw,
+                                          resid_weights is not None,
+                                          xvals, fallback, k, y_fit,
+                                          bounds[i], bounds[i + 1]))
+                   for i in range(n_jobs)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # exceptions in the threads are not propagated by threading
+        if errors:
+            raise errors[0]
+    return np.asarray(y_fit)
+
+
+def _run_chunk(errors, *args):
     '''
-    Calculate smoothed/fitted y by linear interpolation between the current
-    and previous y fitted by weighted regression.
-    Called only if delta > 0.
+    Run `_fit_chunk` in a thread, appending any exception to `errors`.
+    '''
+    try:
+        _fit_chunk(*args)
+    except BaseException as e:
+        errors.append(e)
 
-    Parameters
-    ----------
-    x: 1-D numpy array
-        The vector of input x-values.
-    y_fit: 1-D numpy array
-        The vector of fitted y-values
-    i: indexing integer
-        The index of the point currently being fit by weighted
-        regression.
-    last_fit_i: indexing integer
-        The index of the last point fit by weighted regression.
 
-    Returns
-    -------
-    Nothing: changes elements of y_fit in-place.
+def _fit_chunk(double[::1] x, double[:, ::1] y, double[:, ::1] rw,
+               bint use_resid_weights, double[::1] xvals,
+               Py_ssize_t[::1] fallback, Py_ssize_t k, double[:, ::1] y_fit,
+               Py_ssize_t start, Py_ssize_t stop):
+    '''
+    Fit the local regressions at xvals[start:stop] without the GIL.
+    '''
+    cdef:
+        Py_ssize_t n = x.shape[0], p = y.shape[1], i
+        double *weights
+        double *proj
+
+    if stop <= start:
+        return
+    weights = <double *> malloc(2 * k * sizeof(double))
+    if weights == NULL:
+        raise MemoryError()
+    proj = weights + k
+    with nogil:
+        for i in range(start, stop):
+            fit_point(&x[0], &y[0, 0], &rw[0, 0], use_resid_weights, n, p,
+                      k, xvals[i], fallback[i], weights, proj, &y_fit[i, 0])
+    free(weights)
+
+
+cdef Py_ssize_t update_neighborhood(double *x, double xi, Py_ssize_t n,
+                                    Py_ssize_t k) nogil:
     '''
+    Find the index of the left-most of the k-nearest-neighbors of xi.
 
-    cdef np.ndarray[DTYPE_t, ndim = 1] a
+    The neighborhood [left_end, left_end + k) is shifted to the right as
+    long as xi is to the right of its center, so that it contains the
+    k-nearest neighbors of xi. Once the right end hits the end of the
+    data, the neighborhood stays the same. As the centers are increasing
+    in left_end, the left end is found by bisection.
+    '''
+    cdef Py_ssize_t lo = 0, hi = n - k, mid
 
-    a = x[(last_fit_i + 1): i] - x[last_fit_i]
-    a =  a / (x[i] - x[last_fit_i])
-    y_fit[(last_fit_i + 1): i] = a * y_fit[i] + (1.0 - a) * y_fit[last_fit_i]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if xi > (x[mid] + x[mid + k]) / 2.0:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
 
 
-def update_indices(np.ndarray[DTYPE_t, ndim = 1] x,
-                   np.ndarray[DTYPE_t, ndim = 1] y_fit,
-                   double delta,
-                   Py_ssize_t i,
-                   Py_ssize_t n,
-                   Py_ssize_t last_fit_i):
+cdef void fit_point(double *x, double *y, double *rw, bint use_resid_weights,
+                    Py_ssize_t n, Py_ssize_t p, Py_ssize_t k, double xi,
+                    Py_ssize_t fallback, double *weights, double *proj,
+                    double *y_fit) nogil:
     '''
-    Update the counters of the local regression.
+    Calculate the smoothed values of all p columns of y at xi.
 
     Parameters
     ----------
-    x: 1-D numpy array
-        The vector of input x-values.
-    y_fit: 1-D numpy array
-        The vector of fitted y-values
-    delta: float
-        Indicates the range of x values within which linear
-        interpolation should be used to estimate y_fit instead
-        of weighted regression.
-    i: indexing integer
-        The index of the current point being fit.
-    n: indexing integer
-        The length of the input vectors, x and y.
-    last_fit_i: indexing integer
-        The last point at which y_fit was calculated.
+    x: pointer to n doubles
+        The sorted input x-values.
+    y: pointer to n * p doubles
+        The input y-values, C-contiguous.
+    rw: pointer to n * p doubles
+        The residual weights from the last iteration, C-contiguous. Not
+        used if use_resid_weights is False.
+    use_resid_weights: boolean
+        If True, multiply the x-distance weights by the residual
+        weights from the last iteration of regressions.
+    xi: float
+        The point at which the local regression is run.
+    fallback: indexing integer
+        The index of the observation at xi, or -1 if xi is not an
+        observed point. If the regression cannot be run, y_fit is set to
+        y[fallback], or to the value of the only point with positive
+        weight if xi is not observed.
+    weights, proj: pointers to k doubles
+        Work space.
+    y_fit: pointer to p doubles
+        The smoothed values, changed in-place.
+    '''
+    cdef:
+        Py_ssize_t left_end, j, c
+        double radius, dist
+        double *x_j
+        double *y_j
+        double *rw_j
+
+    left_end = update_neighborhood(x, xi, n, k)
+    radius = fmax(xi - x[left_end], x[left_end + k - 1] - xi)
+    x_j = x + left_end
+    y_j = y + left_end * p
+    rw_j = rw + left_end * p
+
+    # The tri-cubic function (1 - dist**3)**3 of the distances in units
+    # of the neighborhood radius.
+    for j in range(k):
+        dist = fabs(x_j[j] - xi) / radius
+        dist = 1 - dist * dist * dist
+        weights[j] = dist * dist * dist
+
+    if not use_resid_weights:
+        # The projection vector is the same for all columns.
+        if calculate_projection(x_j, xi, weights, weights, k):
+            for c in range(p):
+                y_fit[c] = 0
+                for j in range(k):
+                    y_fit[c] += weights[j] * y_j[j * p + c]
+        else:
+            for c in range(p):
+                y_fit[c] = skipped_fit(y, p, c, fallback, weights, y_j, k)
+    else:
+        for c in range(p):
+            for j in range(k):
+                proj[j] = weights[j] * rw_j[j * p + c]
+            if calculate_projection(x_j, xi, proj, proj, k):
+                y_fit[c] = 0
+                for j in range(k):
+                    y_fit[c] += proj[j] * y_j[j * p + c]
+            else:
+                y_fit[c] = skipped_fit(y, p, c, fallback, proj, y_j, k)
 
-    Returns
-    -------
-    i: indexing integer
-        The next point at which to run a weighted regression.
-    last_fit_i: indexing integer
-        The updated last point at which y_fit was calculated
 
-    Notes
-    -----
-    The relationship between the outputs is s.t. x[i+1] >
-    x[last_fit_i] + delta.
+cdef bint calculate_projection(double *x_j, double xi, double *weights,
+                               double *proj, Py_ssize_t k) nogil:
+    '''
+    Calculate the projection vector of the weighted linear regression.
+
+    No regression function (e.g. lstsq) is called. Instead "projection
+    vector" p_i_j is calculated, and y_fit[i] = sum(p_i_j * y[j]) for j
+    s.t. x[j] is in the neighborhood of x[i]. p_i_j is a function of the
+    weights, x[i], and its neighbors.
 
+    Returns False if less than two points have positive weight, in which
+    case the regression is skipped and proj is not changed.
     '''
     cdef:
-        Py_ssize_t k
-        double cutpoint
-
-    last_fit_i = i
-    k = last_fit_i
-    # For most points within delta of the current point, we skip the
-    # weighted linear regression (which save much computation of
-    # weights and fitted points). Instead, we'll jump to the last
-    # point within delta, fit the weighted regression at that point,
-    # and linearly interpolate in between.
-
-    # This loop increments until we fall just outside of delta distance,
-    # copying the results for any repeated x's along the way.
-    cutpoint = x[last_fit_i] + delta
-    for k in range(last_fit_i + 1, n):
-        if x[k] > cutpoint:
-            break
-        if x[k] == x[last_fit_i]:
-            # if tied with previous x-value, just use the already
-            # fitted y, and update the last-fit counter.
-            y_fit[k] = y_fit[last_fit_i]
-            last_fit_i = k
+        Py_ssize_t j, nonzero = 0
+        double sum_weights = 0, sum_weighted_x = 0, weighted_sqdev_x = 0
 
-    # i, which indicates the next point to fit the regression at, is
-    # either one prior to k (since k should be the first point outside
-    # of delta) or is just incremented + 1 if k = i+1. This insures we
-    # always step forward.
-    i = max(k-1, last_fit_i + 1)
+    for j in range(k):
+        sum_weights += weights[j]
+        if weights[j] != 0:
+            nonzero += 1
 
-    return i, last_fit_i
+    if sum_weights <= 0.0 or nonzero == 1:
+        # 2nd condition checks if only 1 local weight is non-zero, which
+        # will give a divisor of zero in weighted_sqdev_x
+        # see 1960
+        return False
+
+    for j in range(k):
+        proj[j] = weights[j] / sum_weights
+    for j in range(k):
+        sum_weighted_x += proj[j] * x_j[j]
+    for j in range(k):
+        weighted_sqdev_x += proj[j] * (x_j[j] - sum_weighted_x) ** 2
+    for j in range(k):
+        proj[j] = proj[j] * (1.0 + (xi - sum_weighted_x) *
+                             (x_j[j] - sum_weighted_x) / weighted_sqdev_x)
+    return True
+
+
+cdef double skipped_fit(double *y, Py_ssize_t p, Py_ssize_t c,
+                        Py_ssize_t fallback, double *weights, double *y_j,
+                        Py_ssize_t k) nogil:
+    '''
+    The smoothed value of column c if the regression cannot be run.
+    '''
+    cdef Py_ssize_t j
+
+    if fallback >= 0:
+        return y[fallback * p + c]
+    for j in range(k):
+        if weights[j] > 0:
+            return y_j[j * p + c]
+    return NAN
 
 
-def calculate_residual_weights(np.ndarray[DTYPE_t, ndim = 1] y,
-                              np.ndarray[DTYPE_t, ndim = 1] y_fit):
+def calculate_residual_weights(y, y_fit):
     '''
     Calculate residual weights for the next `robustifying` iteration.
 
     Parameters
     ----------
-    y: 1-D numpy array
-        The vector of actual input y-values.
-    y_fit: 1-D numpy array
-        The vector of fitted y-values from the current
-        iteration.
+    y: 2-D numpy array
+        The actual input y-values, one column per series.
+    y_fit: 2-D numpy array
+        The fitted y-values from the current iteration.
 
     Returns
     -------
-    resid_weights: 1-D numpy array
-        The vector of residual weights, to be used in the
-        next iteration of regressions.
+    resid_weights: 2-D numpy array
+        The residual weights, to be used in the next iteration of
+        regressions.
     '''
 
     std_resid = np.abs(y - y_fit)
-    median = np.median(std_resid)
-    if median == 0:
-        std_resid[std_resid > 0] = 1
-    else:
-        std_resid /= 6.0 * median
+    median = np.median(std_resid, axis=0)
+    scale = np.where(median == 0, 1., 6.0 * median)
+    std_resid = np.where(median == 0, std_resid > 0, std_resid / scale)
 
     # Some trimming of outlier residuals.
     std_resid[std_resid >= 1.0] = 1.0
@@ -549,52 +517,10 @@ def calculate_residual_weights(np.ndarray[DTYPE_t, ndim = 1] y,
 
     resid_weights = bisquare(std_resid)
 
-    return resid_weights
-
-
-cdef void tricube(np.ndarray[DTYPE_t, ndim = 1] x):
-    '''
-    The tri-cubic function (1 - x**3)**3. Used to weight neighboring
-    points along the x-axis based on their distance to the current point.
-
-    Parameters
-    ----------
-    x: 1-D numpy array
-        A vector of neighbors` distances from the current point,
-        in units of the neighborhood radius.
-
-    Returns
-    -------
-    Nothing. Changes array elements in-place
-    '''
-
-    # fast_array_cube is an elementwise, in-place cubed-power
-    # operator.
-    fast_array_cube(x)
-    x[:] = np.negative(x)
-    x += 1
-    fast_array_cube(x)
-
-
-cdef void fast_array_cube(np.ndarray[DTYPE_t, ndim = 1] x):
-    '''
-    A fast, elementwise, in-place cube operator. Called by the
-    tricube function.
-
-    Parameters
-    ----------
-    x: 1-D numpy array
-
-    Returns
-    -------
-    Nothing. Changes array elements in-place.
-    '''
-
-    x2 = x*x
-    x *= x2
+    return np.ascontiguousarray(resid_weights)
 
 
-def bisquare(np.ndarray[DTYPE_t, ndim = 1] x):
+def bisquare(x):
     '''
     The bi-square function (1 - x**2)**2.
 
@@ -603,13 +529,13 @@ def bisquare(np.ndarray[DTYPE_t, ndim = 1] x):
 
     Parameters
     ----------
-    x: 1-D numpy array
-        A vector of absolute regression residuals, in units of
+    x: numpy array
+        The absolute regression residuals, in units of
         6 times the median absolute residual.
 
     Returns
     -------
-    A 1-D numpy array of residual weights.
+    A numpy array of residual weights.
     '''
 
     return (1.0 - x**2)**2
@@ -3,6 +3,7 @@ from .smoothers_lowess import lowess
 from . import bandwidths
 
 from .kernel_density import \
-    KDEMultivariate, KDEMultivariateConditional, EstimatorSettings
+    KDEMultivariate, KDEMultivariateConditional, EstimatorSettings, \
+    BandwidthCache
 from .kernel_regression import KernelReg, KernelCensoredReg
 
@@ -17,7 +17,7 @@ from statsmodels.compat.python import range
 import warnings
 
 import numpy as np
-from scipy import integrate, stats
+from scipy import integrate, signal, stats
 from statsmodels.sandbox.nonparametric import kernels
 from statsmodels.tools.decorators import (cache_readonly,
                                                     resettable_cache)
@@ -115,9 +115,12 @@ class KDEUnivariate(object):
 
         fft : bool
             Whether or not to use FFT. FFT implementation is more
-            computationally efficient. However, only the Gaussian kernel
-            is implemented. If FFT is False, then a 'nobs' x 'gridsize'
-            intermediate array is created.
+            computationally efficient.  The data, and weights if given, are
+            linearly binned on the grid first.  If FFT is False, then a
+            'nobs' x 'gridsize' intermediate array is created.
+        weights : array or None
+            Optional weights of the observations, of the same length as
+            `endog`.
         gridsize : int
             If gridsize is None, max(len(X), 50) is used.
         cut : float
@@ -135,12 +138,6 @@ class KDEUnivariate(object):
         endog = self.endog
 
         if fft:
-            if kernel != "gau":
-                msg = "Only gaussian kernel is available for fft"
-                raise NotImplementedError(msg)
-            if weights is not None:
-                msg = "Weights are not implemented for fft"
-                raise NotImplementedError(msg)
             density, grid, bw = kdensityfft(endog, kernel=kernel, bw=bw,
                     adjust=adjust, weights=weights, gridsize=gridsize,
                     clip=clip, cut=cut)
@@ -156,7 +153,7 @@ class KDEUnivariate(object):
         # put here to ensure empty cache after re-fit with new options
         self.kernel.weights = weights
         if weights is not None:
-            self.kernel.weights /= weights.sum()
+            self.kernel.weights = weights / weights.sum()
         self._cache = resettable_cache()
 
     @cache_readonly
@@ -389,21 +386,20 @@ def kdensityfft(X, kernel="gau", bw="normal_reference", weights=None, gridsize=N
     X : array-like
         The variable for which the density estimate is desired.
     kernel : str
-        ONLY GAUSSIAN IS CURRENTLY IMPLEMENTED.
-        "bi" for biweight
-        "cos" for cosine
-        "epa" for Epanechnikov, default
-        "epa2" for alternative Epanechnikov
-        "gau" for Gaussian.
-        "par" for Parzen
-        "rect" for rectangular
-        "tri" for triangular
+        The Kernel to be used. Choices are
+        - "biw" for biweight
+        - "cos" for cosine
+        - "cos2" for the cosine kernel of Stata
+        - "epa" for Epanechnikov
+        - "gau" for Gaussian.
+        - "tri" for triangular
+        - "triw" for triweight
+        - "uni" for uniform
     bw : str, float
         "scott" - 1.059 * A * nobs ** (-1/5.), where A is min(std(X),IQR/1.34)
         "silverman" - .9 * A * nobs ** (-1/5.), where A is min(std(X),IQR/1.34)
         If a float is given, it is the bandwidth.
     weights : array or None
-        WEIGHTS ARE NOT CURRENTLY IMPLEMENTED.
         Optional  weights. If the X value is clipped, then this weight is
         also dropped.
     gridsize : int
@@ -430,12 +426,14 @@ def kdensityfft(X, kernel="gau", bw="normal_reference", weights=None, gridsize=N
 
     Notes
     -----
-    Only the default kernel is implemented. Weights aren't implemented yet.
     This follows Silverman (1982) with changes suggested by Jones and Lotwick
     (1984). However, the discretization step is replaced by linear binning
-    of Fan and Marron (1994). This should be extended to accept the parts
-    that are dependent only on the data to speed things up for
-    cross-validation.
+    of Fan and Marron (1994), which also bins the weights. For the Gaussian
+    kernel the binned data are multiplied with the closed form FFT of the
+    kernel, the other kernels are convolved with the kernel evaluated at the
+    grid points within its domain, also with the FFT. This should be
+    extended to accept the parts that are dependent only on the data to
+    speed things up for cross-validation.
 
     References
     ---------- ::
@@ -451,8 +449,8 @@ def kdensityfft(X, kernel="gau", bw="normal_reference", weights=None, gridsize=N
         Series C. 31.2, 93-9.
     """
     X = np.asarray(X)
-    X = X[np.logical_and(X>clip[0], X<clip[1])] # won't work for two columns.
-                                                # will affect underlying data?
+    clip_x = np.logical_and(X>clip[0], X<clip[1]) # won't work for two columns.
+    X = X[clip_x]                                 # will affect underlying data?
 
     # Get kernel object corresponding to selection
     kern = kernel_switch[kernel]()
@@ -465,6 +463,17 @@ def kdensityfft(X, kernel="gau", bw="normal_reference", weights=None, gridsize=N
 
     nobs = len(X) # after trim
 
+    # handle weights
+    if weights is None:
+        q = nobs
+    else:
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(weights) != len(clip_x):
+            msg = "The length of the weights must be the same as the given X."
+            raise ValueError(msg)
+        weights = weights[clip_x]
+        q = weights.sum()
+
     # 1 Make grid and discretize the data
     if gridsize == None:
         gridsize = np.max((nobs,512.))
@@ -491,7 +500,23 @@ def kdensityfft(X, kernel="gau", bw="normal_reference", weights=None, gridsize=N
 #    binned /= (nobs)*delta**2 # normalize binned to sum to 1/delta
 
 #NOTE: THE ABOVE IS WRONG, JUST TRY WITH LINEAR BINNING
-    binned = fast_linbin(X,a,b,gridsize)/(delta*nobs)
+    binned = fast_linbin(X,a,b,gridsize,weights=weights)/(delta*q)
+
+    if kernel != "gau":
+        # discrete convolution with the kernel at the grid points within its
+        # domain, f(grid[i]) = sum_j binned[j] k[i - j].  The discretized
+        # kernel is normalized to sum to one, so that the density integrates
+        # to one also if bw is not large relative to the grid step.
+        z_max = np.max(np.abs(kern.domain))
+        L = int(min(np.floor(z_max * bw / delta), gridsize - 1))
+        k = kern(np.arange(-L, L + 1) * delta / bw)
+        k[k < 0] = 0
+        k /= k.sum()
+        f = signal.fftconvolve(binned, k, mode='same')
+        if retgrid:
+            return f, grid, bw
+        else:
+            return f, bw
 
     # step 2 compute FFT of the weights, using Munro (1976) FFT convention
     y = forrt(binned)
@@ -500,7 +525,7 @@ def kdensityfft(X, kernel="gau", bw="normal_reference", weights=None, gridsize=N
     # don't have to redo the above if just changing bw, ie., for cross val
 
 #NOTE: silverman_transform is the closed form solution of the FFT of the
-#gaussian kernel. Not yet sure how to generalize it.
+#gaussian kernel.
     zstar = silverman_transform(bw, gridsize, RANGE)*y # 3.49 in Silverman
                                                    # 3.50 w Gaussian kernel
     f = revrt(zstar)
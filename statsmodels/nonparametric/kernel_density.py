@@ -33,12 +33,12 @@ from __future__ import division
 from statsmodels.compat.python import range, next
 import numpy as np
 
-from . import kernels
-from ._kernel_base import GenericKDE, EstimatorSettings, gpke, \
-    LeaveOneOut, _adjust_shape
+from ._kernel_base import GenericKDE, EstimatorSettings, BandwidthCache, \
+    gpke, gpke_blocks, gpke_sum, LeaveOneOut, _adjust_shape
 
 
-__all__ = ['KDEMultivariate', 'KDEMultivariateConditional', 'EstimatorSettings']
+__all__ = ['KDEMultivariate', 'KDEMultivariateConditional', 'EstimatorSettings',
+           'BandwidthCache']
 
 
 class KDEMultivariate(GenericKDE):
@@ -153,12 +153,12 @@ class KDEMultivariate(GenericKDE):
         .. math:: K_{h}(X_{i},X_{j}) =
             \prod_{s=1}^{q}h_{s}^{-1}k\left(\frac{X_{is}-X_{js}}{h_{s}}\right)
         """
-        LOO = LeaveOneOut(self.data)
-        L = 0
-        for i, X_not_i in enumerate(LOO):
-            f_i = gpke(bw, data=-X_not_i, data_predict=-self.data[i, :],
-                       var_type=self.var_type)
-            L += func(f_i)
+        # all leave-one-out estimates at once, the kernel of each
+        # observation with itself is left out of the sums
+        f = gpke_sum(bw, data=self.data, data_predict=self.data,
+                     var_type=self.var_type, loo=True,
+                     atol=self.approx_atol, rtol=self.approx_rtol)
+        L = np.sum(func(f))
 
         return -L
 
@@ -189,11 +189,9 @@ class KDEMultivariate(GenericKDE):
         else:
             data_predict = _adjust_shape(data_predict, self.k_vars)
 
-        pdf_est = []
-        for i in range(np.shape(data_predict)[0]):
-            pdf_est.append(gpke(self.bw, data=self.data,
-                                data_predict=data_predict[i, :],
-                                var_type=self.var_type) / self.nobs)
+        pdf_est = gpke_sum(self.bw, data=self.data, data_predict=data_predict,
+                           var_type=self.var_type, atol=self.approx_atol,
+                           rtol=self.approx_rtol) / self.nobs
 
         pdf_est = np.squeeze(pdf_est)
         return pdf_est
@@ -234,14 +232,11 @@ class KDEMultivariate(GenericKDE):
         else:
             data_predict = _adjust_shape(data_predict, self.k_vars)
 
-        cdf_est = []
-        for i in range(np.shape(data_predict)[0]):
-            cdf_est.append(gpke(self.bw, data=self.data,
-                                data_predict=data_predict[i, :],
-                                var_type=self.var_type,
-                                ckertype="gaussian_cdf",
-                                ukertype="aitchisonaitken_cdf",
-                                okertype='wangryzin_cdf') / self.nobs)
+        cdf_est = gpke_sum(self.bw, data=self.data, data_predict=data_predict,
+                           var_type=self.var_type,
+                           ckertype="gaussian_cdf",
+                           ukertype="aitchisonaitken_cdf",
+                           okertype='wangryzin_cdf') / self.nobs
 
         cdf_est = np.squeeze(cdf_est)
         return cdf_est
@@ -281,55 +276,15 @@ class KDEMultivariate(GenericKDE):
         .. [2] Racine, J., Li, Q. "Nonparametric Estimation of Distributions
                 with Categorical and Continuous Data." Working Paper. (2000)
         """
-        #F = 0
-        #for i in range(self.nobs):
-        #    k_bar_sum = gpke(bw, data=-self.data,
-        #                     data_predict=-self.data[i, :],
-        #                     var_type=self.var_type,
-        #                     ckertype='gauss_convolution',
-        #                     okertype='wangryzin_convolution',
-        #                     ukertype='aitchisonaitken_convolution')
-        #    F += k_bar_sum
-        ## there is a + because loo_likelihood returns the negative
-        #return (F / self.nobs**2 + self.loo_likelihood(bw) * \
-        #        2 / ((self.nobs) * (self.nobs - 1)))
-
-        # The code below is equivalent to the commented-out code above.  It's
-        # about 20% faster due to some code being moved outside the for-loops
-        # and shared by gpke() and loo_likelihood().
-        F = 0
-        kertypes = dict(c=kernels.gaussian_convolution,
-                        o=kernels.wang_ryzin_convolution,
-                        u=kernels.aitchison_aitken_convolution)
         nobs = self.nobs
-        data = -self.data
-        var_type = self.var_type
-        ix_cont = np.array([c == 'c' for c in var_type])
-        _bw_cont_product = bw[ix_cont].prod()
-        Kval = np.empty(data.shape)
-        for i in range(nobs):
-            for ii, vtype in enumerate(var_type):
-                Kval[:, ii] = kertypes[vtype](bw[ii],
-                                              data[:, ii],
-                                              data[i, ii])
-
-            dens = Kval.prod(axis=1) / _bw_cont_product
-            k_bar_sum = dens.sum(axis=0)
-            F += k_bar_sum  # sum of prod kernel over nobs
-
-        kertypes = dict(c=kernels.gaussian,
-                        o=kernels.wang_ryzin,
-                        u=kernels.aitchison_aitken)
-        LOO = LeaveOneOut(self.data)
-        L = 0   # leave-one-out likelihood
-        Kval = np.empty((data.shape[0]-1, data.shape[1]))
-        for i, X_not_i in enumerate(LOO):
-            for ii, vtype in enumerate(var_type):
-                Kval[:, ii] = kertypes[vtype](bw[ii],
-                                              -X_not_i[:, ii],
-                                              data[i, ii])
-            dens = Kval.prod(axis=1) / _bw_cont_product
-            L += dens.sum(axis=0)
+        F = gpke_sum(bw, data=self.data, data_predict=self.data,
+                     var_type=self.var_type,
+                     ckertype='gauss_convolution',
+                     okertype='wangryzin_convolution',
+                     ukertype='aitchisonaitken_convolution').sum()
+        # leave-one-out sum of the product kernels
+        L = gpke_sum(bw, data=self.data, data_predict=self.data,
+                     var_type=self.var_type, loo=True).sum()
 
         # CV objective function, eq. (2.4) of Ref. [3]
         return (F / nobs**2 - 2 * L / (nobs * (nobs - 1)))
@@ -463,18 +418,13 @@ class KDEMultivariateConditional(GenericKDE):
         Similar to ``KDE.loo_likelihood`, but substitute ``f(y|x)=f(x,y)/f(x)``
         for ``f(x)``.
         """
-        yLOO = LeaveOneOut(self.data)
-        xLOO = LeaveOneOut(self.exog).__iter__()
-        L = 0
-        for i, Y_j in enumerate(yLOO):
-            X_not_i = next(xLOO)
-            f_yx = gpke(bw, data=-Y_j, data_predict=-self.data[i, :],
-                        var_type=(self.dep_type + self.indep_type))
-            f_x = gpke(bw[self.k_dep:], data=-X_not_i,
-                       data_predict=-self.exog[i, :],
-                       var_type=self.indep_type)
-            f_i = f_yx / f_x
-            L += func(f_i)
+        f_yx = gpke_sum(bw, data=self.data, data_predict=self.data,
+                        var_type=(self.dep_type + self.indep_type), loo=True,
+                        atol=self.approx_atol, rtol=self.approx_rtol)
+        f_x = gpke_sum(bw[self.k_dep:], data=self.exog,
+                       data_predict=self.exog, var_type=self.indep_type,
+                       loo=True, atol=self.approx_atol, rtol=self.approx_rtol)
+        L = np.sum(func(f_yx / f_x))
 
         return -L
 
@@ -517,16 +467,12 @@ class KDEMultivariateConditional(GenericKDE):
         else:
             exog_predict = _adjust_shape(exog_predict, self.k_indep)
 
-        pdf_est = []
         data_predict = np.column_stack((endog_predict, exog_predict))
-        for i in range(np.shape(data_predict)[0]):
-            f_yx = gpke(self.bw, data=self.data,
-                        data_predict=data_predict[i, :],
+        f_yx = gpke_sum(self.bw, data=self.data, data_predict=data_predict,
                         var_type=(self.dep_type + self.indep_type))
-            f_x = gpke(self.bw[self.k_dep:], data=self.exog,
-                       data_predict=exog_predict[i, :],
-                       var_type=self.indep_type)
-            pdf_est.append(f_yx / f_x)
+        f_x = gpke_sum(self.bw[self.k_dep:], data=self.exog,
+                       data_predict=exog_predict, var_type=self.indep_type)
+        pdf_est = f_yx / f_x
 
         return np.squeeze(pdf_est)
 
@@ -582,23 +528,20 @@ class KDEMultivariateConditional(GenericKDE):
 
         N_data_predict = np.shape(exog_predict)[0]
         cdf_est = np.empty(N_data_predict)
-        for i in range(N_data_predict):
-            mu_x = gpke(self.bw[self.k_dep:], data=self.exog,
-                        data_predict=exog_predict[i, :],
-                        var_type=self.indep_type) / self.nobs
-            mu_x = np.squeeze(mu_x)
-            cdf_endog = gpke(self.bw[0:self.k_dep], data=self.endog,
-                             data_predict=endog_predict[i, :],
-                             var_type=self.dep_type,
-                             ckertype="gaussian_cdf",
-                             ukertype="aitchisonaitken_cdf",
-                             okertype='wangryzin_cdf', tosum=False)
-
-            cdf_exog = gpke(self.bw[self.k_dep:], data=self.exog,
-                            data_predict=exog_predict[i, :],
-                            var_type=self.indep_type, tosum=False)
-            S = (cdf_endog * cdf_exog).sum(axis=0)
-            cdf_est[i] = S / (self.nobs * mu_x)
+        cdf_endog = gpke_blocks(self.bw[0:self.k_dep], data=self.endog,
+                                data_predict=endog_predict,
+                                var_type=self.dep_type,
+                                ckertype="gaussian_cdf",
+                                ukertype="aitchisonaitken_cdf",
+                                okertype='wangryzin_cdf')
+        cdf_exog = gpke_blocks(self.bw[self.k_dep:], data=self.exog,
+                               data_predict=exog_predict,
+                               var_type=self.indep_type)
+        # both kernels are split into the same blocks of rows
+        for (rows, K_endog), (_, K_exog) in zip(cdf_endog, cdf_exog):
+            mu_x = K_exog.sum(axis=1) / self.nobs
+            S = (K_endog * K_exog).sum(axis=1)
+            cdf_est[rows] = S / (self.nobs * mu_x)
 
         return cdf_est
 
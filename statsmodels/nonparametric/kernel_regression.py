@@ -39,7 +39,7 @@ from scipy import optimize
 from scipy.stats.mstats import mquantiles
 
 from ._kernel_base import GenericKDE, EstimatorSettings, gpke, \
-    LeaveOneOut, _get_type_pos, _adjust_shape, _compute_min_std_IQR
+    gpke_blocks, gpke_sum, _get_type_pos, _adjust_shape, _compute_min_std_IQR
 
 
 
@@ -103,6 +103,8 @@ class KernelReg(GenericKDE):
         self.nobs = np.shape(self.exog)[0]
         self.bw_func = dict(cv_ls=self.cv_loo, aic=self.aic_hurvich)
         self.est = dict(lc=self._est_loc_constant, ll=self._est_loc_linear)
+        self._est_all = dict(lc=self._est_loc_constant_all,
+                             ll=self._est_loc_linear_all)
         self._set_defaults(defaults)
         if not self.efficient:
             self.bw = self._compute_reg_bw(bw)
@@ -116,15 +118,21 @@ class KernelReg(GenericKDE):
         else:
             # The user specified a bandwidth selection method e.g. 'cv_ls'
             self._bw_method = bw
-            res = self.bw_func[bw]
-            X = np.std(self.exog, axis=0)
-            h0 = 1.06 * X * \
-                 self.nobs ** (- 1. / (4 + np.size(self.exog, axis=1)))
+            return self._cached_bw(bw, self._optimize_reg_bw)
 
-            func = self.est[self.reg_type]
-            bw_estimated = optimize.fmin(res, x0=h0, args=(func, ),
-                                         maxiter=1e3, maxfun=1e3, disp=0)
-            return bw_estimated
+    def _optimize_reg_bw(self):
+        """Minimizes the bandwidth selection criterion `self._bw_method`."""
+        res = self.bw_func[self._bw_method]
+        X = np.std(self.exog, axis=0)
+        h0 = 1.06 * X * \
+             self.nobs ** (- 1. / (4 + np.size(self.exog, axis=1)))
+        h0 = self._bw_start(h0)
+
+        func = self.est[self.reg_type]
+        bw_estimated = optimize.fmin(res, x0=h0, args=(func, ),
+                                     maxiter=1e3, maxfun=1e3, disp=0,
+                                     **self._bw_fmin_kwds(h0))
+        return bw_estimated
 
     def _est_loc_linear(self, bw, endog, exog, data_predict):
         """
@@ -235,6 +243,117 @@ class KernelReg(GenericKDE):
         #B_x = (f_x * d_mx - m_x * d_fx) / (f_x ** 2)
         return G, B_x
 
+    def _est_loc_linear_all(self, bw, endog, exog, data_predict, W=None,
+                            loo=False, okertype='wangryzin',
+                            ukertype='aitchisonaitken', atol=0., rtol=0.):
+        """
+        Local linear estimator of g(x) at all points of `data_predict`.
+
+        Vectorized version of `_est_loc_linear`, the kernel sums are computed
+        for all evaluation points with `gpke_sum`.
+
+        Parameters
+        ----------
+        bw : array_like
+            Vector of bandwidth value(s).
+        endog : 2D array_like, shape (nobs, 1)
+            The dependent variable.
+        exog : 2D array_like
+            The independent variable(s).
+        data_predict : 2D array_like
+            The points at which the conditional mean is estimated.
+        W : 2D array_like, shape (nobs, 1), optional
+            Weights of the observations, used by `KernelCensoredReg`.
+        loo : bool, optional
+            If True, `data_predict` is `exog` and each observation is left
+            out of its own estimate.
+        atol, rtol : float, optional
+            Error tolerances of the approximate kernel sums, see `gpke_sum`.
+            Default is 0, the exact sums.
+
+        Returns
+        -------
+        mean : ndarray, shape (n_predict,)
+            The conditional mean at `data_predict`.
+        mfx : ndarray, shape (n_predict, k_vars)
+            The marginal effects.
+        """
+        nobs, k_vars = exog.shape
+        endog = np.reshape(endog, nobs)
+        # the moments only depend on exog - data_predict, centering keeps
+        # them accurate when the data are far from zero
+        center = exog.mean(axis=0)
+        exog_c = exog - center
+        predict_c = data_predict - center
+        exog_outer = (exog_c[:, :, None] * exog_c[:, None, :]).reshape(nobs, -1)
+        moments = np.column_stack((np.ones(nobs), exog_c, exog_outer, endog,
+                                   exog_c * endog[:, None]))
+        if W is not None:
+            moments = moments * W
+        moments = gpke_sum(bw, data=exog, data_predict=data_predict,
+                           var_type=self.var_type, okertype=okertype,
+                           ukertype=ukertype, loo=loo, weights=moments,
+                           atol=atol, rtol=rtol) / float(nobs - loo)
+        S0, S1, S2, V0, V1 = np.split(moments, np.cumsum(
+            [1, k_vars, k_vars**2, 1]), axis=1)
+        S0 = S0[:, 0]
+        V0 = V0[:, 0]
+
+        x = predict_c
+        # the matrix on p.492 in [7] for each evaluation point
+        M12 = S1 - S0[:, None] * x
+        M22 = (S2.reshape(-1, k_vars, k_vars) -
+               x[:, :, None] * S1[:, None, :] -
+               S1[:, :, None] * x[:, None, :] +
+               S0[:, None, None] * x[:, :, None] * x[:, None, :])
+        M = np.empty((len(x), k_vars + 1, k_vars + 1))
+        M[:, 0, 0] = S0
+        M[:, 0, 1:] = M12
+        M[:, 1:, 0] = M12
+        M[:, 1:, 1:] = M22
+
+        V = np.column_stack((V0, V1 - x * V0[:, None]))
+        # pinv(M) V from the SVD of the stack, np.linalg.pinv of stacked
+        # matrices needs numpy >= 1.14
+        u, s, vt = np.linalg.svd(M)
+        nonzero = s > 1e-15 * s.max(axis=1)[:, None]
+        s_inv = np.zeros_like(s)
+        s_inv[nonzero] = 1. / s[nonzero]
+        mean_mfx = np.einsum('ikj,ik->ij', vt,
+                             s_inv * np.einsum('ikj,ik->ij', u, V))
+
+        return mean_mfx[:, 0], mean_mfx[:, 1:]
+
+    def _est_loc_constant_all(self, bw, endog, exog, data_predict, loo=False,
+                              atol=0., rtol=0.):
+        """
+        Local constant estimator of g(x) at all points of `data_predict`.
+
+        Vectorized version of `_est_loc_constant`, see
+        `_est_loc_linear_all` for the parameters.
+
+        Returns
+        -------
+        G : ndarray, shape (n_predict,)
+            The value of the conditional mean at `data_predict`.
+        B_x : ndarray, shape (n_predict, k_vars)
+            The marginal effects.
+        """
+        nobs, k_vars = exog.shape
+        moments = np.column_stack((np.ones(nobs), endog))
+        G_denom, G_numer = gpke_sum(bw, data=exog, data_predict=data_predict,
+                                    var_type=self.var_type, loo=loo,
+                                    weights=moments, atol=atol, rtol=rtol).T
+        d_fx, d_mx = -gpke_sum(bw, data=exog, data_predict=data_predict,
+                               var_type=self.var_type, ckertype='d_gaussian',
+                               loo=loo, weights=moments, atol=atol,
+                               rtol=rtol).T / float(nobs - loo)
+        G = G_numer / G_denom
+        B_x = (G_numer * d_fx - G_denom * d_mx) / (G_denom**2)
+
+        # as in `_est_loc_constant`, one marginal effect for all variables
+        return G, np.repeat(B_x[:, None], k_vars, axis=1)
+
     def aic_hurvich(self, bw, func=None):
         """
         Computes the AIC Hurvich criteria for the estimation of the bandwidth.
@@ -257,9 +376,10 @@ class KernelReg(GenericKDE):
 
         """
         H = np.empty((self.nobs, self.nobs))
-        for j in range(self.nobs):
-            H[:, j] = gpke(bw, data=self.exog, data_predict=self.exog[j,:],
-                           var_type=self.var_type, tosum=False)
+        for cols, ker in gpke_blocks(bw, data=self.exog,
+                                     data_predict=self.exog,
+                                     var_type=self.var_type):
+            H[:, cols] = ker.T
 
         denom = H.sum(axis=1)
         H = H / denom
@@ -307,16 +427,14 @@ class KernelReg(GenericKDE):
         and :math:`h` is the vector of bandwidths
 
         """
-        LOO_X = LeaveOneOut(self.exog)
-        LOO_Y = LeaveOneOut(self.endog).__iter__()
-        L = 0
-        for ii, X_not_i in enumerate(LOO_X):
-            Y = next(LOO_Y)
-            G = func(bw, endog=Y, exog=-X_not_i,
-                     data_predict=-self.exog[ii, :])[0]
-            L += (self.endog[ii] - G) ** 2
+        # all leave-one-out estimates at once with the vectorized version of
+        # the estimator
+        est_all = {self._est_loc_constant: self._est_loc_constant_all,
+                   self._est_loc_linear: self._est_loc_linear_all}[func]
+        G = est_all(bw, endog=self.endog, exog=self.exog,
+                    data_predict=self.exog, loo=True)[0]
+        L = ((self.endog[:, 0] - G) ** 2).sum()
 
-        # Note: There might be a way to vectorize this. See p.72 in [1]
         return L / self.nobs
 
     def r_squared(self):
@@ -362,21 +480,15 @@ class KernelReg(GenericKDE):
             The marginal effects, i.e. the partial derivatives of the mean.
 
         """
-        func = self.est[self.reg_type]
+        func = self._est_all[self.reg_type]
         if data_predict is None:
             data_predict = self.exog
         else:
             data_predict = _adjust_shape(data_predict, self.k_vars)
 
-        N_data_predict = np.shape(data_predict)[0]
-        mean = np.empty((N_data_predict,))
-        mfx = np.empty((N_data_predict, self.k_vars))
-        for i in range(N_data_predict):
-            mean_mfx = func(self.bw, self.endog, self.exog,
-                            data_predict=data_predict[i, :])
-            mean[i] = mean_mfx[0]
-            mfx_c = np.squeeze(mean_mfx[1])
-            mfx[i, :] = mfx_c
+        mean, mfx = func(self.bw, self.endog, self.exog,
+                         data_predict=data_predict, atol=self.approx_atol,
+                         rtol=self.approx_rtol)
 
         return mean, mfx
 
@@ -502,6 +614,8 @@ class KernelCensoredReg(KernelReg):
         self.nobs = np.shape(self.exog)[0]
         self.bw_func = dict(cv_ls=self.cv_loo, aic=self.aic_hurvich)
         self.est = dict(lc=self._est_loc_constant, ll=self._est_loc_linear)
+        self._est_all = dict(lc=self._est_loc_constant_all,
+                             ll=self._est_loc_linear_all)
         self._set_defaults(defaults)
         self.censor_val = censor_val
         if self.censor_val is not None:
@@ -599,6 +713,19 @@ class KernelCensoredReg(KernelReg):
         mfx = mean_mfx[1:, :]
         return mean, mfx
 
+    def _est_loc_linear_all(self, bw, endog, exog, data_predict, W=None,
+                            loo=False, atol=0., rtol=0.):
+        """
+        Local linear estimator of g(x) at all points of `data_predict`.
+
+        Vectorized version of `_est_loc_linear`, with the kernels of
+        `_est_loc_linear`.  See `KernelReg._est_loc_linear_all`.
+        """
+        return KernelReg._est_loc_linear_all(self, bw, endog, exog,
+                                             data_predict, W=W, loo=loo,
+                                             okertype='wangryzin_reg',
+                                             ukertype='aitchison_aitken_reg',
+                                             atol=atol, rtol=rtol)
 
     def cv_loo(self, bw, func):
         r"""
@@ -633,40 +760,29 @@ class KernelCensoredReg(KernelReg):
         and :math:`h` is the vector of bandwidths
 
         """
-        LOO_X = LeaveOneOut(self.exog)
-        LOO_Y = LeaveOneOut(self.endog).__iter__()
-        LOO_W = LeaveOneOut(self.W_in).__iter__()
-        L = 0
-        for ii, X_not_i in enumerate(LOO_X):
-            Y = next(LOO_Y)
-            w = next(LOO_W)
-            G = func(bw, endog=Y, exog=-X_not_i,
-                     data_predict=-self.exog[ii, :], W=w)[0]
-            L += (self.endog[ii] - G) ** 2
+        # all leave-one-out estimates at once with the vectorized version of
+        # the estimator
+        est_all = {self._est_loc_constant: self._est_loc_constant_all,
+                   self._est_loc_linear: self._est_loc_linear_all}[func]
+        G = est_all(bw, endog=self.endog, exog=self.exog,
+                    data_predict=self.exog, W=self.W_in, loo=True)[0]
+        L = ((self.endog[:, 0] - G) ** 2).sum()
 
-        # Note: There might be a way to vectorize this. See p.72 in [1]
         return L / self.nobs
 
     def fit(self, data_predict=None):
         """
         Returns the marginal effects at the data_predict points.
         """
-        func = self.est[self.reg_type]
+        func = self._est_all[self.reg_type]
         if data_predict is None:
             data_predict = self.exog
         else:
             data_predict = _adjust_shape(data_predict, self.k_vars)
 
-        N_data_predict = np.shape(data_predict)[0]
-        mean = np.empty((N_data_predict,))
-        mfx = np.empty((N_data_predict, self.k_vars))
-        for i in range(N_data_predict):
-            mean_mfx = func(self.bw, self.endog, self.exog,
-                            data_predict=data_predict[i, :],
-                            W=self.W_in)
-            mean[i] = mean_mfx[0]
-            mfx_c = np.squeeze(mean_mfx[1])
-            mfx[i, :] = mfx_c
+        mean, mfx = func(self.bw, self.endog, self.exog,
+                         data_predict=data_predict, W=self.W_in,
+                         atol=self.approx_atol, rtol=self.approx_rtol)
 
         return mean, mfx
 
@@ -8,6 +8,10 @@ statsmodels.nonparametric.kernels where each kernel is a class object.
 Having kernel functions rather than classes makes extension to a multivariate
 kernel density estimation much easier.
 
+The kernels broadcast `Xi` against `x`, so that for example ``Xi`` of shape
+(nobs,) and ``x`` of shape (n_predict, 1) give the kernel values of all
+evaluation points at all training points, shape (n_predict, nobs).
+
 NOTE: As it is, this module does not interact with the existing API
 """
 
@@ -57,13 +61,11 @@ def aitchison_aitken(h, Xi, x, num_levels=None):
     .. [2] Racine, Jeff. "Nonparametric Econometrics: A Primer," Foundation
            and Trends in Econometrics: Vol 3: No 1, pp1-88., 2008.
     """
-    Xi = Xi.reshape(Xi.size)  # seems needed in case Xi is scalar
+    Xi = np.atleast_1d(Xi)  # seems needed in case Xi is scalar
     if num_levels is None:
         num_levels = np.asarray(np.unique(Xi).size)
 
-    kernel_value = np.ones(Xi.size) * h / (num_levels - 1)
-    idx = Xi == x
-    kernel_value[idx] = (idx * (1 - h))[idx]
+    kernel_value = np.where(Xi == x, 1 - h, h / (num_levels - 1))
     return kernel_value
 
 
@@ -100,10 +102,8 @@ def wang_ryzin(h, Xi, x):
     .. [2] M.-C. Wang and J. van Ryzin, "A class of smooth estimators for
            discrete distributions", Biometrika, vol. 68, pp. 301-309, 1981.
     """
-    Xi = Xi.reshape(Xi.size)  # seems needed in case Xi is scalar
-    kernel_value = 0.5 * (1 - h) * (h ** abs(Xi - x))
-    idx = Xi == x
-    kernel_value[idx] = (idx * (1 - h))[idx]
+    Xi = np.atleast_1d(Xi)  # seems needed in case Xi is scalar
+    kernel_value = np.where(Xi == x, 1 - h, 0.5 * (1 - h) * (h ** abs(Xi - x)))
     return kernel_value
 
 
@@ -137,7 +137,7 @@ def wang_ryzin_convolution(h, Xi, Xj):
     # This is the equivalent of the convolution case with the Gaussian Kernel
     # However it is not exactly convolution. Think of a better name
     # References
-    ordered = np.zeros(Xi.size)
+    ordered = np.zeros(np.broadcast(Xi, Xj).shape)
     for x in np.unique(Xi):
         ordered += wang_ryzin(h, Xi, x) * wang_ryzin(h, Xj, x)
 
@@ -146,7 +146,7 @@ def wang_ryzin_convolution(h, Xi, Xj):
 
 def aitchison_aitken_convolution(h, Xi, Xj):
     Xi_vals = np.unique(Xi)
-    ordered = np.zeros(Xi.size)
+    ordered = np.zeros(np.broadcast(Xi, Xj).shape)
     num_levels = Xi_vals.size
     for x in Xi_vals:
         ordered += aitchison_aitken(h, Xi, x, num_levels=num_levels) * \
@@ -160,22 +160,22 @@ def gaussian_cdf(h, Xi, x):
 
 
 def aitchison_aitken_cdf(h, Xi, x_u):
-    x_u = int(x_u)
+    x_u = np.asarray(x_u).astype(int)
     Xi_vals = np.unique(Xi)
-    ordered = np.zeros(Xi.size)
+    ordered = np.zeros(np.broadcast(Xi, x_u).shape)
     num_levels = Xi_vals.size
     for x in Xi_vals:
-        if x <= x_u:  #FIXME: why a comparison for unordered variables?
-            ordered += aitchison_aitken(h, Xi, x, num_levels=num_levels)
+        #FIXME: why a comparison for unordered variables?
+        ordered += (x <= x_u) * aitchison_aitken(h, Xi, x,
+                                                 num_levels=num_levels)
 
     return ordered
 
 
 def wang_ryzin_cdf(h, Xi, x_u):
-    ordered = np.zeros(Xi.size)
+    ordered = np.zeros(np.broadcast(Xi, x_u).shape)
     for x in np.unique(Xi):
-        if x <= x_u:
-            ordered += wang_ryzin(h, Xi, x)
+        ordered += (x <= x_u) * wang_ryzin(h, Xi, x)
 
     return ordered
 
@@ -191,10 +191,7 @@ def aitchison_aitken_reg(h, Xi, x):
 
     Suggested by Li and Racine.
     """
-    kernel_value = np.ones(Xi.size)
-    ix = Xi != x
-    inDom = ix * h
-    kernel_value[ix] = inDom[ix]
+    kernel_value = np.where(Xi != x, h, 1.)
     return kernel_value
 
 
@@ -14,25 +14,38 @@ ctypedef np.int_t INT
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.cdivision(True)
-def fast_linbin(np.ndarray[DOUBLE] X, double a, double b, int M, int trunc=1):
+def fast_linbin(np.ndarray[DOUBLE] X, double a, double b, int M, int trunc=1,
+                np.ndarray[DOUBLE] weights=None):
     """
     Linear Binning as described in Fan and Marron (1994)
+
+    Each observation is split between its two neighboring grid points, in
+    proportion to its distance to the other one.  If `weights` is given,
+    the observations are split with their weights instead of one.  If
+    `trunc` is 1, observations outside of [a, b] are dropped, otherwise
+    they are assigned to the end points of the grid.
     """
     cdef:
         Py_ssize_t i, li_i
         int nobs = X.shape[0]
+        int weighted = weights is not None
         double delta = (b - a)/(M - 1)
+        double lxi, rem, w_i = 1
         np.ndarray[DOUBLE] gcnts = np.zeros(M, np.float)
-        np.ndarray[DOUBLE] lxi = (X - a)/delta
-        np.ndarray[INT] li = lxi.astype(int)
-        np.ndarray[DOUBLE] rem = lxi - li
-
 
     for i in range(nobs):
-        li_i = li[i]
-        if li_i > 1 and li_i < M:
-            gcnts[li_i] = gcnts[li_i] + 1 - rem[i]
-            gcnts[li_i+1] = gcnts[li_i+1] + rem[i]
-        if li_i > M and trunc == 0:
-            gcnts[M] = gcnts[M] + 1
+        lxi = (X[i] - a)/delta
+        if weighted:
+            w_i = weights[i]
+        if lxi >= 0 and lxi <= M - 1:
+            # the last grid point belongs to the last interval
+            li_i = min(<Py_ssize_t>lxi, M - 2)
+            rem = lxi - li_i
+            gcnts[li_i] = gcnts[li_i] + (1 - rem) * w_i
+            gcnts[li_i+1] = gcnts[li_i+1] + rem * w_i
+        elif trunc == 0:
+            if lxi < 0:
+                gcnts[0] = gcnts[0] + w_i
+            else:
+                gcnts[M-1] = gcnts[M-1] + w_i
     return gcnts
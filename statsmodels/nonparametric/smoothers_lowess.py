@@ -11,7 +11,7 @@ import numpy as np
 from ._smoothers_lowess import lowess as _lowess
 
 def lowess(endog, exog, frac=2.0/3.0, it=3, delta=0.0, is_sorted=False,
-           missing='drop', return_sorted=True):
+           missing='drop', return_sorted=True, xvals=None, n_jobs=1):
     '''LOWESS (Locally Weighted Scatterplot Smoothing)
 
     A lowess function that outs smoothed estimates of endog
@@ -19,8 +19,9 @@ def lowess(endog, exog, frac=2.0/3.0, it=3, delta=0.0, is_sorted=False,
 
     Parameters
     ----------
-    endog: 1-D numpy array
-        The y-values of the observed points
+    endog: 1-D or 2-D numpy array
+        The y-values of the observed points. If 2-D, each column is
+        smoothed separately against the same exog.
     exog: 1-D numpy array
         The x-values of the observed points
     frac: float
@@ -45,6 +46,13 @@ def lowess(endog, exog, frac=2.0/3.0, it=3, delta=0.0, is_sorted=False,
         missing (nan or infinite) observations removed.
         If False, then the returned array is in the same length and the same
         sequence of observations as the input array.
+        Ignored if xvals is given.
+    xvals: 1-D numpy array, optional
+        The x-values at which the smoothed estimates are computed. If
+        None (default), the estimates are computed at exog.
+    n_jobs : int
+        The number of threads used for the local regressions. -1 uses all
+        processors. Default is 1.
 
     Returns
     -------
@@ -56,6 +64,10 @@ def lowess(endog, exog, frac=2.0/3.0, it=3, delta=0.0, is_sorted=False,
         the associated estimated y (endog) values.
         If return_sorted is False, then only the fitted values are returned,
         and the observations will be in the same order as the input arrays.
+        If xvals is given, then only the fitted values at xvals are
+        returned.
+        If endog is 2-D, then there is one column of fitted values for each
+        column of endog.
 
     Notes
     -----
@@ -89,6 +101,22 @@ def lowess(endog, exog, frac=2.0/3.0, it=3, delta=0.0, is_sorted=False,
     Judicious choice of delta can cut computation time considerably
     for large data (N > 5000). A good choice is ``delta = 0.01 * range(exog)``.
 
+    With `xvals`, the robustifying iterations are run at the observed
+    points, and the final local regressions are evaluated at `xvals`,
+    using the same neighborhoods of `frac*N` observed points. `delta` then
+    applies to the sorted `xvals`, so that a dense grid of evaluation
+    points is mostly interpolated. This can also be used for
+    out-of-sample prediction.
+
+    If endog has several columns, the neighborhoods are found only once
+    and, when `it` is 0, also the local regression weights are shared
+    between the columns, which is much faster than smoothing the columns
+    one by one. A row with a missing value in any column is dropped for
+    all columns.
+
+    The local regressions are run without the GIL and can be split
+    between several threads with `n_jobs`.
+
     Some experimentation is likely required to find a good
     choice of `frac` and `iter` for a particular dataset.
 
@@ -122,23 +150,39 @@ def lowess(endog, exog, frac=2.0/3.0, it=3, delta=0.0, is_sorted=False,
     >>> z = lowess(y, x, frac= 1./3, it=0)
     >>> w = lowess(y, x, frac=1./3)
 
+    Smoothed values on a grid, and for several series at once.
+
+    >>> grid = np.linspace(-2*np.pi, 2*np.pi, 100)
+    >>> z = lowess(y, x, xvals=grid)
+    >>> z2 = lowess(np.column_stack((y, 2 * y)), x, xvals=grid)
+
     '''
 
     endog = np.asarray(endog, float)
     exog = np.asarray(exog, float)
 
     # Inputs should be vectors (1-D arrays) of the
-    # same length.
+    # same length, endog can also have several columns.
     if exog.ndim != 1:
         raise ValueError('exog must be a vector')
-    if endog.ndim != 1:
-        raise ValueError('endog must be a vector')
+    if endog.ndim not in [1, 2]:
+        raise ValueError('endog must be a vector or a 2-D array')
     if endog.shape[0] != exog.shape[0] :
         raise ValueError('exog and endog must have same length')
+    if xvals is not None:
+        xvals = np.asarray(xvals, float)
+        if xvals.ndim != 1:
+            raise ValueError('xvals must be a vector')
+        if not np.all(np.isfinite(xvals)):
+            raise ValueError('xvals must be finite')
 
     if missing in ['drop', 'raise']:
         # Cut out missing values
-        mask_valid = (np.isfinite(exog) & np.isfinite(endog))
+        mask_valid = np.isfinite(exog)
+        if endog.ndim == 1:
+            mask_valid &= np.isfinite(endog)
+        else:
+            mask_valid &= np.isfinite(endog).all(1)
         all_valid = np.all(mask_valid)
         if all_valid:
             y = endog
@@ -162,11 +206,13 @@ def lowess(endog, exog, frac=2.0/3.0, it=3, delta=0.0, is_sorted=False,
         x = np.array(x[sort_index])
         y = np.array(y[sort_index])
 
-    res = _lowess(y, x, frac=frac, it=it, delta=delta)
-    _, yfitted = res.T
+    yfitted = _lowess(y, x, frac=frac, it=it, delta=delta, xvals=xvals,
+                      n_jobs=n_jobs)
 
-    if return_sorted:
-        return res
+    if xvals is not None:
+        return yfitted
+    elif return_sorted:
+        return np.column_stack((x, yfitted))
     else:
         # rebuild yfitted with original indices
         # a bit messy: y might have been selected twice
@@ -43,20 +43,15 @@ class TestKDEExceptions(object):
     def test_check_is_fit_exception(self):
         self.kde.evaluate(0)
 
-    @raises(NotImplementedError)
-    def test_non_weighted_fft_exception(self):
-        self.kde.fit(kernel="gau", gridsize=50, weights=self.weights_200, fft=True,
-                    bw="silverman")
-
     @raises(ValueError)
     def test_wrong_weight_length_exception(self):
         self.kde.fit(kernel="gau", gridsize=50, weights=self.weights_100, fft=False,
                     bw="silverman")
 
-    @raises(NotImplementedError)
-    def test_non_gaussian_fft_exception(self):
-        self.kde.fit(kernel="epa", gridsize=50, fft=True,
-                    bw="silverman")
+    @raises(ValueError)
+    def test_wrong_weight_length_fft_exception(self):
+        self.kde.fit(kernel="gau", gridsize=50, weights=self.weights_100,
+                     fft=True, bw="silverman")
 
 class CheckKDE(object):
 
@@ -189,6 +184,45 @@ class TestKDEGaussFFT(CheckKDE):
         rfname2 = os.path.join(curdir,'results','results_kde_fft.csv')
         cls.res_density = np.genfromtxt(open(rfname2, 'rb'))
 
+class TestKDEFFTWeights(object):
+    # the FFT estimates agree with the direct ones up to the binning error
+
+    def test_kernels(self):
+        weights = np.linspace(1, 100, 200)
+        for kernel in ['gau', 'epa', 'uni', 'tri', 'biw', 'triw', 'cos',
+                       'cos2']:
+            for w in [None, weights]:
+                res_fft = KDE(Xi)
+                res_fft.fit(kernel=kernel, weights=w, fft=True, bw=0.3,
+                            gridsize=2**12)
+                res = KDE(Xi)
+                res.fit(kernel=kernel, weights=w, fft=False, bw=0.3,
+                        gridsize=2**12)
+                npt.assert_allclose(res_fft.support, res.support)
+                # binning smears the jumps of the uniform kernel
+                atol = 2e-2 if kernel == 'uni' else 1e-3
+                npt.assert_allclose(res_fft.density, res.density, atol=atol)
+
+    def test_integrate(self):
+        # the density integrates to one also for small bandwidths
+        for kernel in ['gau', 'epa', 'uni', 'tri', 'biw', 'triw', 'cos',
+                       'cos2']:
+            for bw in [0.001, 0.05, 0.3]:
+                res = KDE(Xi)
+                res.fit(kernel=kernel, fft=True, bw=bw, gridsize=100)
+                delta = res.support[1] - res.support[0]
+                npt.assert_allclose(res.density.sum() * delta, 1, rtol=1e-6)
+
+    def test_weights(self):
+        # integer weights are the same as repeated observations
+        weights = np.arange(200) % 3 + 1
+        res = KDE(Xi)
+        res.fit(kernel='epa', weights=weights, bw=0.3, cut=0, gridsize=512)
+        res_repeat = KDE(np.repeat(Xi, weights))
+        res_repeat.fit(kernel='epa', bw=0.3, cut=0, gridsize=512)
+        npt.assert_allclose(res.density, res_repeat.density, atol=1e-12)
+
+
 class CheckKDEWeights(object):
 
     @classmethod
@@ -263,6 +263,214 @@ class TestKDEMultivariate(KDETestBase):
         npt.assert_equal(dens.bw, bw_user)
 
 
+    def test_gpke_blocks(self):
+        # the vectorized kernel sums agree with gpke at each point, also
+        # when the evaluation points are split into several blocks
+        from statsmodels.nonparametric import _kernel_base
+        data = np.column_stack([self.c1, self.c2, self.o, self.o2])
+        var_type = 'ccou'
+        bw = np.array([0.5, 0.8, 0.3, 0.4])
+        kwds = [{}, dict(ckertype='gaussian_cdf', okertype='wangryzin_cdf',
+                         ukertype='aitchisonaitken_cdf'),
+                dict(ckertype='gauss_convolution',
+                     okertype='wangryzin_convolution',
+                     ukertype='aitchisonaitken_convolution')]
+        block_size = _kernel_base._GPKE_BLOCK_SIZE
+        try:
+            _kernel_base._GPKE_BLOCK_SIZE = 7 * data.shape[0]
+            for kwd in kwds:
+                desired = [_kernel_base.gpke(bw, data, data[i], var_type,
+                                             **kwd)
+                           for i in range(data.shape[0])]
+                actual = _kernel_base.gpke_sum(bw, data, data, var_type,
+                                               **kwd)
+                npt.assert_allclose(actual, desired)
+
+            # leave-one-out sums
+            loo = _kernel_base.LeaveOneOut(data)
+            desired = [_kernel_base.gpke(bw, -X_not_i, -data[i], var_type)
+                       for i, X_not_i in enumerate(loo)]
+            actual = _kernel_base.gpke_sum(bw, data, data, var_type, loo=True)
+            npt.assert_allclose(actual, desired)
+        finally:
+            _kernel_base._GPKE_BLOCK_SIZE = block_size
+
+    def test_gpke_tree_sum(self):
+        # the approximate kernel sums are within the error tolerance
+        from statsmodels.nonparametric import _kernel_base
+        data = np.column_stack([self.c1, self.c2, self.o, self.o2])
+        data_predict = data + [0.1, -0.1, 0, 0]
+        var_type = 'ccou'
+        bw = np.array([0.2, 0.3, 0.3, 0.4])
+        weights = np.column_stack([self.c1, self.y])
+        leaf_size = _kernel_base._TREE_LEAF_SIZE
+        try:
+            # use small leaves, so that the nodes are approximated
+            _kernel_base._TREE_LEAF_SIZE = 4
+            for ckertype in ['gaussian', 'd_gaussian']:
+                for loo in [False, True]:
+                    x = data if loo else data_predict
+                    kwds = dict(ckertype=ckertype, loo=loo)
+                    desired = _kernel_base.gpke_sum(bw, data, x, var_type,
+                                                    **kwds)
+                    # rtol is relative to the sums of absolute values
+                    abs_sums = np.empty(len(x))
+                    for rows, block in _kernel_base.gpke_blocks(
+                            bw, data, x, var_type, **kwds):
+                        abs_sums[rows] = np.abs(block).sum(1)
+                    for atol, rtol in [(1e-3, 0), (0, 1e-2), (1e-4, 1e-3)]:
+                        actual = _kernel_base._gpke_tree_sum(
+                            bw, data, x, var_type, atol=atol, rtol=rtol,
+                            **kwds)
+                        tol = atol * 60 + rtol * abs_sums
+                        assert np.all(np.abs(actual - desired) <= tol)
+
+                    # weighted sums
+                    desired = _kernel_base.gpke_sum(bw, data, x, var_type,
+                                                    weights=weights, **kwds)
+                    actual = _kernel_base._gpke_tree_sum(
+                        bw, data, x, var_type, weights=weights, atol=1e-4,
+                        **kwds)
+                    tol = 1e-4 * 60 * np.abs(weights).max(0)
+                    assert np.all(np.abs(actual - desired) <= tol)
+        finally:
+            _kernel_base._TREE_LEAF_SIZE = leaf_size
+
+    def test_approx_tolerance(self):
+        # the kernel sums with a k-d tree are within the error tolerance
+        np.random.seed(12345)
+        nobs = 20000
+        data = np.column_stack([np.random.normal(size=nobs),
+                                np.random.binomial(3, 0.5, size=nobs)])
+        data_predict = data[:1000] + [0.01, 0]
+        for var_type, bw in [('c', [0.05]), ('cu', [0.05, 0.3])]:
+            exact = nparam.KDEMultivariate(data[:, :len(var_type)],
+                                           var_type=var_type, bw=bw)
+            pdf = exact.pdf(data_predict[:, :len(var_type)])
+            # with atol > 0 the points are merged into grid cells
+            for atol, rtol in [(1e-2, 0), (0, 1e-3), (1e-3, 1e-2)]:
+                settings = nparam.EstimatorSettings(approx_atol=atol,
+                                                    approx_rtol=rtol)
+                dens = nparam.KDEMultivariate(data[:, :len(var_type)],
+                                              var_type=var_type, bw=bw,
+                                              defaults=settings)
+                approx = dens.pdf(data_predict[:, :len(var_type)])
+                assert np.all(np.abs(approx - pdf) <= atol + rtol * pdf)
+
+    def test_approx_cv_ml(self):
+        data = np.column_stack([self.c1, self.c2, self.o])
+        settings = nparam.EstimatorSettings(approx_rtol=1e-6)
+        dens = nparam.KDEMultivariate(data, var_type='cco', bw='cv_ml',
+                                      defaults=settings)
+        exact = nparam.KDEMultivariate(data, var_type='cco', bw='cv_ml')
+        npt.assert_allclose(dens.bw, exact.bw, rtol=1e-3)
+
+    def test_bw_cache(self):
+        data = np.column_stack([self.c1, self.c2])
+        cache = nparam.BandwidthCache()
+        settings = nparam.EstimatorSettings(bw_cache=cache)
+        exact = nparam.KDEMultivariate(data, var_type='cc', bw='cv_ml')
+        dens = nparam.KDEMultivariate(data, var_type='cc', bw='cv_ml',
+                                      defaults=settings)
+        npt.assert_allclose(dens.bw, exact.bw)
+        npt.assert_equal(len(cache), 1)
+
+        # the same data and method are looked up in the cache
+        cache.store(dens._bw_cache_key('cv_ml'), [0.5, 0.6])
+        dens = nparam.KDEMultivariate(data, var_type='cc', bw='cv_ml',
+                                      defaults=settings)
+        npt.assert_equal(dens.bw, [0.5, 0.6])
+        dens.bw[0] = 1
+        npt.assert_equal(cache.get(dens._bw_cache_key('cv_ml')), [0.5, 0.6])
+        nparam.KDEMultivariate(data, var_type='cc', bw='cv_ls',
+                               defaults=settings)
+        nparam.KDEMultivariate(data, var_type='co', bw='cv_ml',
+                               defaults=settings)
+        npt.assert_equal(len(cache), 3)
+
+        # new data is warm started from the last selected bandwidth
+        data[:5] = np.random.normal(size=(5, 2)) + [0, 10]
+        exact = nparam.KDEMultivariate(data, var_type='cc', bw='cv_ml')
+        dens = nparam.KDEMultivariate(data, var_type='cc', bw='cv_ml',
+                                      defaults=settings)
+        assert dens._bw_warm
+        npt.assert_allclose(dens.bw, exact.bw, rtol=1e-2)
+        npt.assert_equal(len(cache), 4)
+
+        cache = nparam.BandwidthCache(maxsize=2, warm_start=False)
+        settings = nparam.EstimatorSettings(bw_cache=cache)
+        for var_type in ['cc', 'co', 'oc']:
+            dens = nparam.KDEMultivariate(data, var_type=var_type,
+                                          bw='normal_reference',
+                                          defaults=settings)
+            dens = nparam.KDEMultivariate(data, var_type=var_type,
+                                          bw='cv_ml', defaults=settings)
+            assert not dens._bw_warm
+        npt.assert_equal(len(cache), 2)
+        assert cache.get(dens._bw_cache_key('cv_ml')) is not None
+        cache.clear()
+        npt.assert_equal(len(cache), 0)
+
+    def test_bw_fmin_old_scipy(self):
+        # scipy < 0.18 has no initial_simplex keyword in fmin
+        from scipy import optimize
+        from statsmodels.nonparametric import _kernel_base
+        fmin = optimize.fmin
+
+        def fmin_old(func, x0, args=(), xtol=1e-4, ftol=1e-4, maxiter=None,
+                     maxfun=None, full_output=0, disp=1, retall=0,
+                     callback=None):
+            return fmin(func, x0, args=args, xtol=xtol, ftol=ftol,
+                        maxiter=maxiter, maxfun=maxfun, disp=disp)
+
+        data = np.column_stack([self.c1, self.c2])
+        exact = [nparam.KDEMultivariate(data, var_type='cc', bw=bw).bw
+                 for bw in ['cv_ml', 'cv_ls']]
+        has_simplex = _kernel_base._FMIN_HAS_SIMPLEX
+        optimize.fmin = fmin_old
+        _kernel_base._FMIN_HAS_SIMPLEX = False
+        try:
+            settings = nparam.EstimatorSettings(
+                bw_cache=nparam.BandwidthCache())
+            for bw, bw_exact in zip(['cv_ml', 'cv_ls'], exact):
+                dens = nparam.KDEMultivariate(data, var_type='cc', bw=bw)
+                npt.assert_allclose(dens.bw, bw_exact)
+                # warm started without the simplex
+                nparam.KDEMultivariate(data[1:], var_type='cc', bw=bw,
+                                       defaults=settings)
+                dens = nparam.KDEMultivariate(data[2:], var_type='cc', bw=bw,
+                                              defaults=settings)
+                assert dens._bw_warm
+                assert dens._bw_fmin_kwds(dens.bw) == {}
+        finally:
+            optimize.fmin = fmin
+            _kernel_base._FMIN_HAS_SIMPLEX = has_simplex
+
+    def test_bw_cache_efficient(self):
+        nobs = 200
+        np.random.seed(12345)
+        data = np.random.normal(size=(nobs, 2))
+        settings = nparam.EstimatorSettings(efficient=True, n_sub=50,
+                                            n_jobs=1)
+        exact = nparam.KDEMultivariate(data, var_type='cc', bw='cv_ml',
+                                       defaults=settings)
+        settings.bw_cache = nparam.BandwidthCache()
+        dens = nparam.KDEMultivariate(data, var_type='cc', bw='cv_ml',
+                                      defaults=settings)
+        npt.assert_allclose(dens.bw, exact.bw, rtol=1e-2)
+        npt.assert_equal(len(settings.bw_cache), 1)
+        dens2 = nparam.KDEMultivariate(data, var_type='cc', bw='cv_ml',
+                                       defaults=settings)
+        npt.assert_equal(dens2.bw, dens.bw)
+
+        # the full sample and the subsets are separate entries
+        settings.efficient = False
+        dens = nparam.KDEMultivariate(data, var_type='cc', bw='cv_ml',
+                                      defaults=settings)
+        assert dens._bw_warm
+        npt.assert_equal(len(settings.bw_cache), 2)
+
+
 class TestKDEMultivariateConditional(KDETestBase):
     @dec.slow
     def test_mixeddata_CV_LS(self):
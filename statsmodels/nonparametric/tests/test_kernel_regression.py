@@ -155,6 +155,110 @@ class TestKernelReg(KernelRegressionTestBase):
         sm_mean = sm_mean[0:5]
         npt.assert_allclose(sm_mfx[0,:], [b1,b2,b3], rtol=2e-1)
 
+    def test_fit_vectorized(self):
+        # the vectorized estimators agree with the estimators at each point
+        exog = np.column_stack([self.c1, self.c2, self.o])
+        for reg_type in ['lc', 'll']:
+            model = nparam.KernelReg(endog=[self.y], exog=exog,
+                                     reg_type=reg_type, var_type='cco',
+                                     bw=[0.5, 0.8, 0.3])
+            mean, mfx = model.fit()
+            est = model.est[reg_type]
+            for i in range(5):
+                desired = est(model.bw, model.endog, model.exog,
+                              data_predict=model.exog[i])
+                npt.assert_allclose(mean[i], desired[0])
+                npt.assert_allclose(mfx[i], np.squeeze(desired[1]) *
+                                    np.ones(3), rtol=1e-6)
+
+            # leave-one-out cross-validation
+            cv = 0
+            for i in range(model.nobs):
+                index = np.arange(model.nobs) != i
+                G = est(model.bw, model.endog[index], -model.exog[index],
+                        data_predict=-model.exog[i])[0]
+                cv += (model.endog[i] - G)**2
+            npt.assert_allclose(model.cv_loo(model.bw, est),
+                                cv / model.nobs)
+
+    def test_fit_approx(self):
+        exog = np.column_stack([self.c1, self.c2, self.o])
+        settings = nparam.EstimatorSettings(approx_atol=1e-8)
+        for reg_type in ['lc', 'll']:
+            model = nparam.KernelReg(endog=[self.y], exog=exog,
+                                     reg_type=reg_type, var_type='cco',
+                                     bw=[0.5, 0.8, 0.3])
+            approx = nparam.KernelReg(endog=[self.y], exog=exog,
+                                      reg_type=reg_type, var_type='cco',
+                                      bw=[0.5, 0.8, 0.3], defaults=settings)
+            mean, mfx = model.fit()
+            mean_approx, mfx_approx = approx.fit()
+            npt.assert_allclose(mean_approx, mean, rtol=1e-5)
+            npt.assert_allclose(mfx_approx, mfx, rtol=1e-3, atol=1e-3)
+
+    def test_bw_cache(self):
+        exog = np.column_stack([self.c1, self.c2])
+        cache = nparam.BandwidthCache()
+        settings = nparam.EstimatorSettings(bw_cache=cache)
+        exact = nparam.KernelReg(endog=[self.y], exog=exog, reg_type='lc',
+                                 var_type='cc', bw='cv_ls')
+        model = nparam.KernelReg(endog=[self.y], exog=exog, reg_type='lc',
+                                 var_type='cc', bw='cv_ls', defaults=settings)
+        npt.assert_allclose(model.bw, exact.bw)
+        model2 = nparam.KernelReg(endog=[self.y], exog=exog, reg_type='lc',
+                                  var_type='cc', bw='cv_ls',
+                                  defaults=settings)
+        npt.assert_equal(model2.bw, model.bw)
+        npt.assert_equal(len(cache), 1)
+
+        # censored regression, local linear and aic are separate entries
+        key = model._bw_cache_key('cv_ls')
+        cache.store(key, [1., 2.])
+        for reg_type, bw in [('ll', 'cv_ls'), ('lc', 'aic')]:
+            model = nparam.KernelReg(endog=[self.y], exog=exog,
+                                     reg_type=reg_type, var_type='cc', bw=bw,
+                                     defaults=settings)
+        model = nparam.KernelCensoredReg(endog=[self.y], exog=exog,
+                                         reg_type='ll', var_type='cc',
+                                         bw='cv_ls', censor_val=0,
+                                         defaults=settings)
+        assert model._bw_cache_key('cv_ls') != key
+        npt.assert_equal(len(cache), 4)
+
+        # new data is warm started
+        y = self.y.copy()
+        y[:3] += 0.5
+        exact = nparam.KernelReg(endog=[y], exog=exog, reg_type='ll',
+                                 var_type='cc', bw='cv_ls')
+        model = nparam.KernelReg(endog=[y], exog=exog, reg_type='ll',
+                                 var_type='cc', bw='cv_ls', defaults=settings)
+        assert model._bw_warm
+        npt.assert_allclose(model.bw, exact.bw, rtol=1e-2)
+
+    def test_bw_fmin_old_scipy(self):
+        # scipy < 0.18 has no initial_simplex keyword in fmin
+        from scipy import optimize
+        fmin = optimize.fmin
+
+        def fmin_old(func, x0, args=(), xtol=1e-4, ftol=1e-4, maxiter=None,
+                     maxfun=None, full_output=0, disp=1, retall=0,
+                     callback=None):
+            return fmin(func, x0, args=args, xtol=xtol, ftol=ftol,
+                        maxiter=maxiter, maxfun=maxfun, disp=disp)
+
+        exog = np.column_stack([self.c1, self.c2])
+        exact = [nparam.KernelReg(endog=[self.y], exog=exog, reg_type='lc',
+                                  var_type='cc', bw=bw).bw
+                 for bw in ['cv_ls', 'aic']]
+        optimize.fmin = fmin_old
+        try:
+            for bw, bw_exact in zip(['cv_ls', 'aic'], exact):
+                model = nparam.KernelReg(endog=[self.y], exog=exog,
+                                         reg_type='lc', var_type='cc', bw=bw)
+                npt.assert_allclose(model.bw, bw_exact)
+        finally:
+            optimize.fmin = fmin
+
     def test_mixed_mfx_ll_cvls(self, file_name='RegData.csv'):
         nobs = 200
         np.random.seed(1234)
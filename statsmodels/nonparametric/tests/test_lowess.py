@@ -145,6 +145,105 @@ def test_returns_inputs():
     result = lowess(y, x, frac=.4)
     assert_almost_equal(result, np.column_stack((x, y)))
 
+def test_xvals():
+    rfile = os.path.join(rpath, 'test_lowess_delta.csv')
+    test_data = np.genfromtxt(rfile, delimiter=',', names=True)
+    y, x = test_data['y'], test_data['x']
+
+    # evaluating at exog, in any order, gives the fitted values
+    res = lowess(y, x, frac=0.1)
+    perm_idx = np.random.RandomState(0).permutation(len(x))
+    yhat = lowess(y, x, frac=0.1, xvals=x[perm_idx])
+    assert_almost_equal(yhat, res[perm_idx, 1], decimal=13)
+    yhat = lowess(y, x, frac=0.1, it=0, xvals=x)
+    assert_almost_equal(yhat, lowess(y, x, frac=0.1, it=0)[:, 1],
+                        decimal=13)
+
+    # delta applies to the evaluation points
+    delta = 0.01 * x.ptp()
+    yhat = lowess(y, x, frac=0.1, delta=delta, xvals=x)
+    assert_almost_equal(yhat, test_data['out_Rdef'], decimal=7)
+
+    # a grid, including points outside of the data range
+    grid = np.linspace(x.min() - 1, x.max() + 1, 200)
+    yhat = lowess(y, x, frac=0.1, xvals=grid)
+    yhat_delta = lowess(y, x, frac=0.1, xvals=grid, delta=delta)
+    assert_(np.isfinite(yhat).all())
+    assert_almost_equal(yhat_delta, yhat, decimal=0)
+
+    # linear data is reproduced out of sample
+    yhat = lowess(2 * x + 1, x, xvals=[-10, 0.5, 100])
+    assert_almost_equal(yhat, [-19, 2, 201], decimal=10)
+
+    assert_raises(ValueError, lowess, y, x, xvals=[[1, 2]])
+    assert_raises(ValueError, lowess, y, x, xvals=[1, np.nan])
+
+    # the positional arguments before xvals are unchanged
+    idx = np.argsort(x)
+    res = lowess(y[idx], x[idx], 0.1, 3, 0.0, True, 'drop', False)
+    assert_equal(res, lowess(y[idx], x[idx], frac=0.1, is_sorted=True,
+                             return_sorted=False))
+
+
+def test_batched():
+    rfile = os.path.join(rpath, 'test_lowess_iter.csv')
+    test_data = np.genfromtxt(rfile, delimiter=',', names=True)
+    y, x = test_data['y'], test_data['x']
+    endog = np.column_stack((y, y ** 2, -y))
+    grid = np.linspace(x.min(), x.max(), 50)
+    for it in [0, 3]:
+        res = lowess(endog, x, it=it)
+        assert_equal(res.shape, (len(x), 4))
+        yhat = lowess(endog, x, it=it, xvals=grid)
+        assert_equal(yhat.shape, (50, 3))
+        for i in range(3):
+            res1 = lowess(endog[:, i], x, it=it)
+            assert_almost_equal(res[:, [0, i + 1]], res1, decimal=13)
+            assert_almost_equal(yhat[:, i],
+                                lowess(endog[:, i], x, it=it, xvals=grid),
+                                decimal=13)
+    assert_almost_equal(res[:, 1:], lowess(endog, x, n_jobs=2)[:, 1:],
+                        decimal=13)
+
+    # rows with a missing value in any column are dropped
+    endog[3, 1] = np.nan
+    fitted = lowess(endog, x, return_sorted=False)
+    assert_equal(np.isnan(fitted).any(1), np.arange(len(x)) == 3)
+    mask = np.arange(len(x)) != 3
+    assert_almost_equal(fitted[mask, 0],
+                        lowess(y[mask], x[mask], return_sorted=False),
+                        decimal=13)
+    assert_raises(ValueError, lowess, endog[:, :, None], x)
+
+
+def test_threads():
+    np.random.seed(12345)
+    x = np.random.uniform(0, 10, size=1000)
+    y = np.sin(x) + np.random.standard_t(3, size=1000)
+    res = lowess(y, x, frac=0.2, delta=0.05)
+    assert_almost_equal(lowess(y, x, frac=0.2, delta=0.05, n_jobs=3), res,
+                        decimal=13)
+    assert_almost_equal(lowess(y, x, frac=0.2, delta=0.05, n_jobs=-1), res,
+                        decimal=13)
+
+
+def test_threads_exception():
+    # errors in the worker threads are raised by lowess
+    from statsmodels.nonparametric import _smoothers_lowess
+
+    def fit_chunk(*args):
+        raise MemoryError()
+
+    np.random.seed(12345)
+    x = np.random.uniform(0, 10, size=1000)
+    y = np.sin(x) + np.random.standard_t(3, size=1000)
+    _fit_chunk = _smoothers_lowess._fit_chunk
+    _smoothers_lowess._fit_chunk = fit_chunk
+    try:
+        assert_raises(MemoryError, lowess, y, x, n_jobs=3)
+    finally:
+        _smoothers_lowess._fit_chunk = _fit_chunk
+
 if __name__ == '__main__':
     import nose
     nose.runmodule()
@@ -1,5 +1,6 @@
 from collections import namedtuple
 import numpy as np
+from scipy import sparse
 from statsmodels.tools.tools import Bunch
 
 _MinimalWLSModel = namedtuple('_MinimalWLSModel', ['weights'])
@@ -43,7 +44,10 @@ class _MinimalWLS(object):
         w_half = np.sqrt(weights)
 
         self.wendog = w_half * endog
-        if np.isscalar(weights):
+        if sparse.issparse(exog):
+            w_half = w_half * np.ones(exog.shape[0])
+            self.wexog = sparse.diags(w_half).dot(exog).tocsr()
+        elif np.isscalar(weights):
             self.wexog = w_half * exog
         else:
             self.wexog = w_half[:, None] * exog
@@ -62,6 +66,10 @@ class _MinimalWLS(object):
               * "qr" uses the QR factorization.
               * "lstsq" uses the least squares implementation in numpy.linalg
 
+            If exog is a scipy sparse matrix, then "lsqr" uses the iterative
+            solver scipy.sparse.linalg.lsqr and all other methods solve the
+            normal equations with a sparse LU factorization.
+
         Returns
         -------
         results : namedtuple
@@ -82,7 +90,9 @@ class _MinimalWLS(object):
         --------
         statsmodels.regression.linear_model.WLS
         """
-        if method == 'pinv':
+        if sparse.issparse(self.wexog):
+            params = self._fit_sparse(method)
+        elif method == 'pinv':
             pinv_wexog = np.linalg.pinv(self.wexog)
             params = pinv_wexog.dot(self.wendog)
         elif method == 'qr':
@@ -99,3 +109,11 @@ class _MinimalWLS(object):
 
         return Bunch(params=params, fittedvalues=fitted_values, resid=resid,
                      model=self, scale=scale)
+
+    def _fit_sparse(self, method):
+        from scipy.sparse.linalg import lsqr, spsolve
+        wexog = self.wexog
+        if method == 'lsqr':
+            return lsqr(wexog, self.wendog, atol=1e-14, btol=1e-14)[0]
+        xtx = wexog.T.dot(wexog).tocsc()
+        return spsolve(xtx, wexog.T.dot(self.wendog))
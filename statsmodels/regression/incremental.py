@@ -0,0 +1,1022 @@
+"""
+Least squares estimation for data that does not fit into memory
+
+The models in this module never hold the full design matrix. The data is
+passed in as a sequence of row blocks ("chunks") and reduced to the
+triangular factor `R` of a QR decomposition of the augmented, whitened
+design matrix ``[wexog, wendog]``. `R` is of shape ``(k_vars + 1, k_vars + 1)``
+independently of the number of observations, so memory is O(k_vars**2).
+
+Heteroscedasticity and cluster robust covariance matrices need the residuals
+at the final parameter estimate and are computed in a second pass over the
+data. This requires that the chunks can be iterated over more than once.
+
+`UpdatableOLS` keeps its data and updates the triangular factor when
+observations are added or removed, using Givens rotations for additions and
+the LINPACK ``dchdd`` algorithm for removals, at O(k_vars**2) per row.
+
+References
+----------
+Dongarra, J. J., Bunch, J. R., Moler, C. B. and Stewart, G. W. (1979).
+    LINPACK Users' Guide. SIAM. Chapter 10.
+Golub, G. H. and Van Loan, C. F. (2013). Matrix Computations, 4th ed.
+    Johns Hopkins University Press. Sections 5.6 and 6.5.
+"""
+from statsmodels.compat.python import range
+
+import numpy as np
+from scipy import linalg
+
+from statsmodels.compat.numpy import np_matrix_rank
+from statsmodels.tools.tools import pinv_extended, Bunch
+from statsmodels.tools.decorators import cache_readonly, cache_writable
+from statsmodels.base.data import handle_data
+import statsmodels.stats.sandwich_covariance as sw
+from statsmodels.regression.linear_model import (
+    RegressionResults, RegressionResultsWrapper)
+
+__all__ = ['IncrementalOLS', 'IncrementalWLS', 'UpdatableOLS',
+           'chunk_arrays']
+
+
+class _ArrayChunks(object):
+    """
+    Re-iterable sequence of row blocks of arrays
+
+    Slicing is delayed until iteration so that memory mapped arrays are only
+    read one block at a time.
+    """
+    def __init__(self, arrays, chunksize):
+        self.arrays = arrays
+        self.chunksize = int(chunksize)
+        self.nobs = len(arrays[0])
+
+    def __iter__(self):
+        for start in range(0, self.nobs, self.chunksize):
+            stop = start + self.chunksize
+            yield tuple(None if arr is None else arr[start:stop]
+                        for arr in self.arrays)
+
+    def __len__(self):
+        return -(-self.nobs // self.chunksize)
+
+
+def chunk_arrays(endog, exog, weights=None, groups=None, chunksize=100000):
+    """
+    Split arrays into row blocks that can be used by the incremental models
+
+    Parameters
+    ----------
+    endog : array-like
+        1-d endogenous response variable, can be a memory mapped array.
+    exog : array-like
+        nobs x k_vars design matrix, can be a memory mapped array.
+    weights : array-like, optional
+        1-d array of weights for `IncrementalWLS`.
+    groups : array-like, optional
+        1-d array of cluster labels, required for cluster robust standard
+        errors.
+    chunksize : int
+        The number of rows in each block.
+
+    Returns
+    -------
+    chunks : iterable
+        Iterable of tuples ``(endog, exog, weights, groups)`` that can be
+        iterated over repeatedly. Slicing is delayed, so that memory mapped
+        arrays are not read into memory at once.
+    """
+    nobs = len(endog)
+    for arr in (exog, weights, groups):
+        if arr is not None and len(arr) != nobs:
+            raise ValueError('all arrays need to have the same number of rows')
+    return _ArrayChunks((endog, exog, weights, groups), chunksize)
+
+
+def _ssr_from_R(R, params):
+    # R is the triangular factor of [wexog, wendog]
+    k_vars = R.shape[1] - 1
+    diff = np.dot(R[:k_vars, :k_vars], params) - R[:k_vars, k_vars]
+    return np.dot(diff, diff) + R[k_vars, k_vars]**2
+
+
+def _givens_update(R, rows):
+    """
+    Update upper triangular R in place so that R'R becomes R'R + rows'rows
+    """
+    p = R.shape[0]
+    for x in rows:
+        x = np.array(x, dtype=np.float64)
+        for i in range(p):
+            if x[i] == 0:
+                continue
+            r = np.hypot(R[i, i], x[i])
+            c, s = R[i, i] / r, x[i] / r
+            Ri = R[i, i:].copy()
+            R[i, i:] = c * Ri + s * x[i:]
+            x[i:] = c * x[i:] - s * Ri
+    return R
+
+
+def _givens_downdate(R, rows, tol=1e-8):
+    """
+    Update upper triangular R in place so that R'R becomes R'R - rows'rows
+
+    This is the algorithm of LINPACK dchdd. Returns False, with R partially
+    updated, if the downdated matrix is not numerically positive definite.
+    """
+    p = R.shape[0]
+    c = np.empty(p)
+    s = np.empty(p)
+    for x in rows:
+        try:
+            a = linalg.solve_triangular(R, x, trans='T', check_finite=False)
+        except linalg.LinAlgError:
+            return False
+        norm2 = np.dot(a, a)
+        if not norm2 < 1 - tol:
+            return False
+        alpha = np.sqrt(1 - norm2)
+        for i in range(p - 1, -1, -1):
+            scale = alpha + np.abs(a[i])
+            a_i, b_i = a[i] / scale, alpha / scale
+            norm = np.hypot(a_i, b_i)
+            c[i], s[i] = b_i / norm, a_i / norm
+            alpha = scale * norm
+        xx = np.zeros(p)
+        for i in range(p - 1, -1, -1):
+            t = c[i] * xx + s[i] * R[i]
+            R[i] = c[i] * R[i] - s[i] * xx
+            xx = t
+    return True
+
+
+class _OneShotChunks(object):
+    """
+    Wraps an iterator that can only be consumed once
+    """
+    def __init__(self, iterator):
+        self.iterator = iterator
+        self.consumed = False
+
+    def __call__(self):
+        if self.consumed:
+            raise ValueError('the chunks are an iterator that has already '
+                             'been consumed. Provide a sequence or a '
+                             'callable returning a new iterator to allow '
+                             'more than one pass over the data.')
+        self.consumed = True
+        return self.iterator
+
+
+class IncrementalWLS(object):
+    """
+    Weighted least squares estimated from chunks of data
+
+    Parameters
+    ----------
+    chunks : iterable or callable
+        The data as row blocks. Each block is a tuple ``(endog, exog)``,
+        ``(endog, exog, weights)`` or ``(endog, exog, weights, groups)``,
+        see Notes. `chunks` can be a sequence, for example the return of
+        `chunk_arrays`, a callable without arguments that returns a new
+        iterator over the blocks, or an iterator. An iterator can only be
+        consumed once and does not allow for robust covariance matrices.
+    hasconst : None or bool
+        Indicates whether the design includes a user-supplied constant. If
+        None, then a column that is constant and nonzero over all chunks is
+        treated as the constant. An implicit constant, e.g. a full set of
+        dummy variables, is only used if `hasconst` is True.
+
+    Attributes
+    ----------
+    nobs : float
+        The number of observations over all chunks.
+    exog_R : ndarray
+        Upper triangular factor of the QR decomposition of the whitened
+        design matrix.
+    effects : ndarray
+        The first `k_vars` elements of Q'wendog, see OLS.fit(method='qr').
+    rank : int
+        The rank of the design matrix, available after `fit`.
+
+    Notes
+    -----
+    Weights are the inverse of the variance of the observations as in
+    `WLS`. `weights` and `groups` in a block can be None. `groups` contains
+    the cluster labels that are required for ``cov_type='cluster'``.
+
+    The data is read once when the model is created and reduced to an
+    upper triangular matrix of size ``(k_vars + 1, k_vars + 1)`` by
+    updating the QR decomposition of ``[wexog, wendog]`` for each block.
+    The memory requirement does not depend on the number of observations,
+    except for cluster robust standard errors which store a score sum for
+    each cluster.
+
+    Heteroscedasticity and cluster robust covariance matrices require the
+    residuals and are computed in a second pass over the data. Residuals,
+    fitted values and the statistics based on them like the residual
+    diagnostics in the summary are not available.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from statsmodels.regression.incremental import (IncrementalOLS,
+    ...                                                 chunk_arrays)
+    >>> exog = np.load('exog.npy', mmap_mode='r')
+    >>> endog = np.load('endog.npy', mmap_mode='r')
+    >>> mod = IncrementalOLS(chunk_arrays(endog, exog, chunksize=50000))
+    >>> res = mod.fit(cov_type='HC1')
+    """
+    _weighted = True
+
+    def __init__(self, chunks, hasconst=None):
+        if callable(chunks):
+            self._get_chunks = chunks
+        elif iter(chunks) is chunks:
+            self._get_chunks = _OneShotChunks(chunks)
+        else:
+            self._get_chunks = lambda: iter(chunks)
+
+        self._hasconst = hasconst
+        self._data_attr = []
+        self._accumulate()
+
+    def _split_chunk(self, chunk):
+        chunk = tuple(chunk) + (None,) * (4 - len(chunk))
+        endog, exog, weights, groups = chunk
+        if weights is not None and not self._weighted:
+            raise ValueError('%s does not use weights' %
+                             self.__class__.__name__)
+        return endog, exog, weights, groups
+
+    def _whiten(self, endog, exog, weights):
+        endog = np.asarray(endog, dtype=np.float64).squeeze()
+        endog = np.atleast_1d(endog)
+        exog = np.asarray(exog, dtype=np.float64)
+        if exog.ndim == 1:
+            exog = exog[:, None]
+        if exog.shape[0] != endog.shape[0]:
+            raise ValueError('endog and exog of a chunk need to have the '
+                             'same number of rows')
+        if weights is None:
+            return endog, exog, None
+        weights = np.asarray(weights, dtype=np.float64)
+        w_half = np.sqrt(weights)
+        return w_half * endog, w_half[:, None] * exog, weights
+
+    def _update_moments(self, endog, weights, sign=1):
+        # weighted mean and centered sum of squares of endog, merged over
+        # chunks (Chan, Golub and LeVeque update), sign=-1 removes the rows
+        y = endog
+        if weights is None:
+            w_chunk = float(y.shape[0])
+            mean_chunk = y.mean()
+            m2_chunk = np.sum((y - mean_chunk)**2)
+        else:
+            w_chunk = weights.sum()
+            mean_chunk = np.dot(weights, y) / w_chunk
+            m2_chunk = np.dot(weights, (y - mean_chunk)**2)
+            self._sum_logw += sign * np.sum(np.log(weights))
+        self._nobs += sign * y.shape[0]
+
+        if sign > 0:
+            sum_w = self._sum_w + w_chunk
+            delta = mean_chunk - self._mean_y
+            self._mean_y += delta * w_chunk / sum_w
+            self._m2_y += m2_chunk + delta**2 * self._sum_w * w_chunk / sum_w
+        else:
+            sum_w = self._sum_w - w_chunk
+            if sum_w <= 0:
+                self._mean_y = self._m2_y = 0.
+            else:
+                self._mean_y = ((self._sum_w * self._mean_y -
+                                 w_chunk * mean_chunk) / sum_w)
+                delta = mean_chunk - self._mean_y
+                self._m2_y -= (m2_chunk +
+                               delta**2 * sum_w * w_chunk / self._sum_w)
+        self._sum_w = sum_w
+
+    def _accumulate(self):
+        R = None
+        first = None
+        self._nobs = 0
+        self._sum_logw = 0.
+        self._sum_w = 0.
+        self._mean_y = 0.
+        self._m2_y = 0.
+        col_min = col_max = None
+
+        for chunk in self._get_chunks():
+            endog, exog, weights, _ = self._split_chunk(chunk)
+            if first is None:
+                first = (endog[:1], exog[:1])
+            wendog, wexog, weights = self._whiten(endog, exog, weights)
+            exog_ = np.asarray(exog, dtype=np.float64)
+            if exog_.ndim == 1:
+                exog_ = exog_[:, None]
+            y = np.asarray(endog, dtype=np.float64).reshape(wendog.shape)
+
+            if R is None:
+                col_min = exog_.min(0)
+                col_max = exog_.max(0)
+            else:
+                col_min = np.minimum(col_min, exog_.min(0))
+                col_max = np.maximum(col_max, exog_.max(0))
+
+            block = np.column_stack((wexog, wendog))
+            if R is not None:
+                block = np.vstack((R, block))
+            R = np.linalg.qr(block, mode='r')
+            self._update_moments(y, weights)
+
+        if R is None:
+            raise ValueError('chunks did not contain any data')
+
+        k_vars = R.shape[1] - 1
+        if R.shape[0] < k_vars + 1:
+            # fewer observations than columns
+            R = np.vstack((R, np.zeros((k_vars + 1 - R.shape[0], k_vars + 1))))
+        self._R = R
+        self.k_vars = k_vars
+
+        const_idx = np.nonzero((col_min == col_max) & (col_max != 0))[0]
+        if self._hasconst is not None:
+            k_constant = int(bool(self._hasconst))
+        else:
+            k_constant = int(const_idx.size > 0)
+        self.data = handle_data(first[0], first[1], hasconst=bool(k_constant))
+        if k_constant and const_idx.size > 0:
+            self.data.const_idx = const_idx[0]
+        self.k_constant = k_constant
+
+        self.rank = None
+        self._df_model = None
+        self._df_resid = None
+
+    @property
+    def nobs(self):
+        return float(self._nobs)
+
+    @property
+    def exog_R(self):
+        return self._R[:self.k_vars, :self.k_vars]
+
+    @property
+    def effects(self):
+        return self._R[:self.k_vars, self.k_vars]
+
+    @property
+    def _resid_R(self):
+        return self._R[self.k_vars, self.k_vars]
+
+    @property
+    def _centered_tss(self):
+        return self._m2_y
+
+    @property
+    def _uncentered_tss(self):
+        return np.dot(self._R[:, self.k_vars], self._R[:, self.k_vars])
+
+    @property
+    def endog_names(self):
+        return self.data.ynames
+
+    @property
+    def exog_names(self):
+        return self.data.xnames
+
+    @property
+    def df_model(self):
+        """
+        The model degree of freedom, defined as the rank of the regressor
+        matrix minus 1 if a constant is included.
+        """
+        if self._df_model is None:
+            if self.rank is None:
+                self.rank = np_matrix_rank(self.exog_R)
+            self._df_model = float(self.rank - self.k_constant)
+        return self._df_model
+
+    @df_model.setter
+    def df_model(self, value):
+        self._df_model = value
+
+    @property
+    def df_resid(self):
+        """
+        The residual degree of freedom, defined as the number of observations
+        minus the rank of the regressor matrix.
+        """
+        if self._df_resid is None:
+            if self.rank is None:
+                self.rank = np_matrix_rank(self.exog_R)
+            self._df_resid = self.nobs - self.rank
+        return self._df_resid
+
+    @df_resid.setter
+    def df_resid(self, value):
+        self._df_resid = value
+
+    def fit(self, cov_type='nonrobust', cov_kwds=None, use_t=None):
+        """
+        Fit the model from the accumulated QR decomposition
+
+        Parameters
+        ----------
+        cov_type : str, optional
+            'nonrobust', 'fixed scale', 'HC0', 'HC1', 'HC2', 'HC3' or
+            'cluster'. All options except 'nonrobust' and 'fixed scale'
+            require a second pass over the data.
+        cov_kwds : dict or None, optional
+            Options for the covariance estimator. For 'cluster' these are
+            `use_correction` and `df_correction`, see
+            `RegressionResults.get_robustcov_results`. The cluster labels
+            are taken from the chunks.
+        use_t : bool, optional
+            Flag indicating to use the Student's t distribution when
+            computing p-values.
+
+        Returns
+        -------
+        results : IncrementalRegressionResults instance
+        """
+        pinv_R, singular_values = pinv_extended(self.exog_R)
+        self.normalized_cov_params = np.dot(pinv_R, pinv_R.T)
+        self.wexog_singular_values = singular_values
+        self.rank = np_matrix_rank(np.diag(singular_values))
+        params = np.dot(pinv_R, self.effects)
+
+        if self._df_model is None:
+            self._df_model = float(self.rank - self.k_constant)
+        if self._df_resid is None:
+            self._df_resid = self.nobs - self.rank
+
+        res = IncrementalRegressionResults(
+            self, params, normalized_cov_params=self.normalized_cov_params,
+            cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t)
+        return RegressionResultsWrapper(res)
+
+    def predict(self, params, exog=None):
+        """
+        Return linear predicted values from a design matrix.
+
+        Parameters
+        ----------
+        params : array-like
+            Parameters of a linear model
+        exog : array-like
+            Design / exogenous data. This is required because the model
+            does not keep the data.
+
+        Returns
+        -------
+        An array of fitted values
+        """
+        if exog is None:
+            raise ValueError('exog is required, %s does not keep the data' %
+                             self.__class__.__name__)
+        return np.dot(exog, params)
+
+    def ssr(self, params):
+        """
+        Sum of squared whitened residuals at `params` using the R factor
+        """
+        return _ssr_from_R(self._R, params)
+
+    def _snapshot(self):
+        # copy of the accumulated statistics for the results instance
+        return Bunch(R=self._R.copy(), nobs=self.nobs,
+                     centered_tss=self._centered_tss,
+                     uncentered_tss=self._uncentered_tss,
+                     sum_logw=self._sum_logw,
+                     data_version=getattr(self, '_data_version', 0))
+
+    def loglike(self, params):
+        """
+        The profile (concentrated) Gaussian log-likelihood at `params`
+        """
+        nobs2 = self.nobs / 2.0
+        ssr = self.ssr(params)
+        llf = -nobs2 * np.log(2 * np.pi) - nobs2 * np.log(ssr / self.nobs)
+        llf -= nobs2
+        llf += 0.5 * self._sum_logw
+        return llf
+
+    def score_outer_product(self, params, cov_type='HC0',
+                            normalized_cov_params=None):
+        """
+        Outer product of the scores in a second pass over the data
+
+        Parameters
+        ----------
+        params : ndarray
+            The parameters at which the whitened residuals are evaluated.
+        cov_type : str
+            'HC0', 'HC2', 'HC3' or 'cluster'. 'HC2' and 'HC3' rescale the
+            residuals by the leverage, 'cluster' sums the scores within
+            cluster before taking the outer product.
+        normalized_cov_params : ndarray, optional
+            The inverse of wexog'wexog, required for 'HC2' and 'HC3'.
+
+        Returns
+        -------
+        meat : ndarray
+            The k_vars x k_vars middle part of the sandwich.
+        n_groups : int
+            The number of clusters, None if cov_type is not 'cluster'.
+        """
+        cov_type = cov_type.upper()
+        meat = np.zeros((self.k_vars, self.k_vars))
+        group_sums = {}
+        for chunk in self._get_chunks():
+            endog, exog, weights, groups = self._split_chunk(chunk)
+            wendog, wexog, _ = self._whiten(endog, exog, weights)
+            u = wendog - np.dot(wexog, params)
+            if cov_type in ('HC2', 'HC3'):
+                h = (np.dot(wexog, normalized_cov_params) * wexog).sum(1)
+                if cov_type == 'HC2':
+                    u = u / np.sqrt(1 - h)
+                else:
+                    u = u / (1 - h)
+            xu = wexog * u[:, None]
+
+            if cov_type == 'CLUSTER':
+                if groups is None:
+                    raise ValueError('cluster robust standard errors require '
+                                     'groups in each chunk')
+                labels, group_idx = np.unique(np.asarray(groups),
+                                              return_inverse=True)
+                sums = np.zeros((len(labels), self.k_vars))
+                np.add.at(sums, group_idx, xu)
+                for label, s in zip(labels.tolist(), sums):
+                    if label in group_sums:
+                        group_sums[label] += s
+                    else:
+                        group_sums[label] = s
+            else:
+                meat += np.dot(xu.T, xu)
+
+        if cov_type == 'CLUSTER':
+            for s in group_sums.values():
+                meat += np.outer(s, s)
+            return meat, len(group_sums)
+        return meat, None
+
+
+class IncrementalOLS(IncrementalWLS):
+    __doc__ = IncrementalWLS.__doc__.replace(
+        'Weighted least squares', 'Ordinary least squares')
+    _weighted = False
+
+
+class UpdatableOLS(IncrementalOLS):
+    """
+    Ordinary least squares that can be updated with new or removed rows
+
+    Parameters
+    ----------
+    endog : array-like
+        1-d endogenous response variable.
+    exog : array-like
+        nobs x k_vars design matrix.
+    hasconst : None or bool
+        Indicates whether the design includes a user-supplied constant. If
+        None, then it is detected from the initial data.
+
+    Notes
+    -----
+    The model holds the triangular factor `R` of the QR decomposition of
+    ``[exog, endog]``. `append` adds rows with Givens rotations and `drop`
+    removes rows with the LINPACK downdating algorithm, both at
+    O(k_vars**2) operations per row instead of O(nobs * k_vars**2) for a
+    new fit. If a downdate is numerically unstable, then the factor is
+    recomputed from the data.
+
+    Rows are identified by their position in the order in which they were
+    added, starting with 0 for the first row of the initial data. The
+    identifiers do not change when other rows are dropped. The rows are
+    kept for robust covariance matrices and for recomputing the
+    factorization.
+
+    Results instances keep a copy of the factorization. Statistics that
+    need a pass over the data, like heteroscedasticity robust covariances,
+    have to be computed before the model is updated.
+
+    Examples
+    --------
+    Rolling regression with a window of 50 observations
+
+    >>> mod = UpdatableOLS(endog[:50], exog[:50])
+    >>> res = mod.fit()
+    >>> for t in range(50, len(endog)):
+    ...     res = mod.append(endog[t], exog[t])
+    ...     res = mod.drop(t - 50)
+    """
+
+    def __init__(self, endog, exog, hasconst=None):
+        endog_ = np.asarray(endog, dtype=np.float64).reshape(-1)
+        exog_ = np.asarray(exog, dtype=np.float64)
+        exog_ = exog_.reshape(endog_.shape[0], -1)
+        nobs = endog_.shape[0]
+        self._endog = endog_.copy()
+        self._exog = exog_.copy()
+        self._ids = np.arange(nobs)
+        self._active = np.ones(nobs, dtype=bool)
+        self._n_buffer = nobs
+        self._next_id = nobs
+        self._data_version = 0
+        self._fit_kwds = {}
+        super(UpdatableOLS, self).__init__([(endog, exog)], hasconst=hasconst)
+        self._get_chunks = self._active_chunks
+
+    def _active_chunks(self):
+        return iter([(self.endog, self.exog)])
+
+    @property
+    def endog(self):
+        """The endog of the current observations"""
+        return self._endog[:self._n_buffer][self._active[:self._n_buffer]]
+
+    @property
+    def exog(self):
+        """The exog of the current observations"""
+        return self._exog[:self._n_buffer][self._active[:self._n_buffer]]
+
+    @property
+    def row_ids(self):
+        """Identifiers of the current observations used by `drop`"""
+        return self._ids[:self._n_buffer][self._active[:self._n_buffer]]
+
+    def _updated(self):
+        self._data_version += 1
+        self.rank = None
+        self._df_model = None
+        self._df_resid = None
+
+    def _refactorize(self):
+        block = np.column_stack((self.exog, self.endog))
+        R = np.linalg.qr(block, mode='r')
+        k = self.k_vars + 1
+        if R.shape[0] < k:
+            R = np.vstack((R, np.zeros((k - R.shape[0], k))))
+        self._R = R
+
+    def fit(self, cov_type='nonrobust', cov_kwds=None, use_t=None):
+        self._fit_kwds = dict(cov_type=cov_type, cov_kwds=cov_kwds,
+                              use_t=use_t)
+        return super(UpdatableOLS, self).fit(cov_type=cov_type,
+                                             cov_kwds=cov_kwds, use_t=use_t)
+
+    fit.__doc__ = IncrementalWLS.fit.__doc__
+
+    def append(self, endog, exog):
+        """
+        Add observations and refit the model
+
+        Parameters
+        ----------
+        endog : array-like
+            The new values of endog, scalar or 1-d.
+        exog : array-like
+            The new rows of exog, 1-d for a single observation.
+
+        Returns
+        -------
+        results : IncrementalRegressionResults instance
+            The results of the updated model using the options of the
+            last call to `fit`.
+        """
+        endog = np.atleast_1d(np.asarray(endog, dtype=np.float64))
+        endog = endog.reshape(-1)
+        n_new = endog.shape[0]
+        exog = np.asarray(exog, dtype=np.float64).reshape(n_new, self.k_vars)
+
+        n_buffer = self._n_buffer
+        if n_buffer + n_new > self._endog.shape[0]:
+            capacity = max(2 * self._endog.shape[0], n_buffer + n_new)
+            for name, fill in [('_endog', 0.), ('_exog', 0.), ('_ids', 0),
+                               ('_active', False)]:
+                old = getattr(self, name)
+                new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+                new[:n_buffer] = old[:n_buffer]
+                new[n_buffer:] = fill
+                setattr(self, name, new)
+        sl = slice(n_buffer, n_buffer + n_new)
+        self._endog[sl] = endog
+        self._exog[sl] = exog
+        self._ids[sl] = np.arange(self._next_id, self._next_id + n_new)
+        self._active[sl] = True
+        self._n_buffer += n_new
+        self._next_id += n_new
+
+        rows = np.column_stack((exog, endog))
+        if n_new > self.k_vars:
+            R = np.linalg.qr(np.vstack((self._R, rows)), mode='r')
+            k = self.k_vars + 1
+            if R.shape[0] < k:
+                R = np.vstack((R, np.zeros((k - R.shape[0], k))))
+            self._R = R
+        else:
+            _givens_update(self._R, rows)
+        self._update_moments(endog, None)
+        self._updated()
+        return self.fit(**self._fit_kwds)
+
+    def drop(self, rows):
+        """
+        Remove observations and refit the model
+
+        Parameters
+        ----------
+        rows : int or array-like of int
+            The identifiers of the observations to remove, i.e. the position
+            in the order in which they were added, see `row_ids`.
+
+        Returns
+        -------
+        results : IncrementalRegressionResults instance
+            The results of the updated model using the options of the
+            last call to `fit`.
+        """
+        rows = np.unique(np.atleast_1d(np.asarray(rows, dtype=np.int64)))
+        n_buffer = self._n_buffer
+        ids = self._ids[:n_buffer]
+        pos = np.searchsorted(ids, rows)
+        valid = pos < n_buffer
+        valid[valid] = ids[pos[valid]] == rows[valid]
+        if not valid.all() or not self._active[pos].all():
+            raise ValueError('rows are not observations of the model')
+        if len(rows) >= self._nobs:
+            raise ValueError('cannot drop all observations')
+
+        endog = self._endog[pos]
+        exog = self._exog[pos]
+        self._active[pos] = False
+
+        R = self._R.copy()
+        if _givens_downdate(R, np.column_stack((exog, endog))):
+            self._R = R
+        else:
+            self._refactorize()
+        self._update_moments(endog, None, sign=-1)
+
+        n_active = int(self._nobs)
+        if n_buffer - n_active > n_active:
+            # compact the storage, ids are kept
+            active = self._active[:n_buffer]
+            for name in ['_endog', '_exog', '_ids']:
+                setattr(self, name, getattr(self, name)[:n_buffer][active])
+            self._active = np.ones(n_active, dtype=bool)
+            self._n_buffer = n_active
+
+        self._updated()
+        return self.fit(**self._fit_kwds)
+
+
+def _not_kept_message(name, model):
+    return ('%s is not available for %s, per-observation quantities are not '
+            'kept when fitting from chunks of data' %
+            (name, model.__class__.__name__))
+
+
+def _not_kept(name):
+    # property for a per-observation result of RegressionResults
+    def fget(self):
+        raise AttributeError(_not_kept_message(name, self.model))
+    return property(fget)
+
+
+class IncrementalRegressionResults(RegressionResults):
+    """
+    Results for least squares models estimated from chunks of data
+
+    The statistics are computed from the accumulated QR decomposition of the
+    whitened data. Residuals and fitted values are not available, robust
+    covariance matrices are computed with a second pass over the data.
+
+    See Also
+    --------
+    RegressionResults
+    """
+
+    def __init__(self, model, params, normalized_cov_params=None, scale=1.,
+                 cov_type='nonrobust', cov_kwds=None, use_t=None, **kwargs):
+        self._state = model._snapshot()
+        super(IncrementalRegressionResults, self).__init__(
+            model, params, normalized_cov_params=normalized_cov_params,
+            scale=scale, cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t,
+            **kwargs)
+
+    def _score_outer_product(self, cov_type):
+        if (self._state.data_version !=
+                getattr(self.model, '_data_version', 0)):
+            raise ValueError('the data of the model has changed since the '
+                             'results were created')
+        return self.model.score_outer_product(
+            self.params, cov_type=cov_type,
+            normalized_cov_params=self.normalized_cov_params)
+
+    @cache_readonly
+    def nobs(self):
+        return self._state.nobs
+
+    @cache_readonly
+    def llf(self):
+        nobs2 = self.nobs / 2.0
+        llf = -nobs2 * np.log(2 * np.pi) - nobs2 * np.log(self.ssr / self.nobs)
+        llf -= nobs2
+        llf += 0.5 * self._state.sum_logw
+        return llf
+
+    wresid = _not_kept('wresid')
+    resid = _not_kept('resid')
+    fittedvalues = _not_kept('fittedvalues')
+    resid_pearson = _not_kept('resid_pearson')
+
+    def get_influence(self):
+        """
+        Not available, the observations are not kept
+        """
+        raise ValueError(_not_kept_message('get_influence', self.model))
+
+    def outlier_test(self, method='bonf', alpha=.05):
+        """
+        Not available, the observations are not kept
+        """
+        raise ValueError(_not_kept_message('outlier_test', self.model))
+
+    @cache_writable()
+    def scale(self):
+        return self.ssr / self.df_resid
+
+    @cache_readonly
+    def ssr(self):
+        return _ssr_from_R(self._state.R, self.params)
+
+    @cache_readonly
+    def centered_tss(self):
+        return self._state.centered_tss
+
+    @cache_readonly
+    def uncentered_tss(self):
+        return self._state.uncentered_tss
+
+    def _cov_sandwich(self, cov_type):
+        meat, _ = self._score_outer_product(cov_type)
+        return sw._HCCM2(self.normalized_cov_params, meat)
+
+    @cache_readonly
+    def cov_HC0(self):
+        """
+        See statsmodels.RegressionResults
+        """
+        return self._cov_sandwich('HC0')
+
+    @cache_readonly
+    def cov_HC1(self):
+        """
+        See statsmodels.RegressionResults
+        """
+        return self.nobs / self.df_resid * self.cov_HC0
+
+    @cache_readonly
+    def cov_HC2(self):
+        """
+        See statsmodels.RegressionResults
+        """
+        return self._cov_sandwich('HC2')
+
+    @cache_readonly
+    def cov_HC3(self):
+        """
+        See statsmodels.RegressionResults
+        """
+        return self._cov_sandwich('HC3')
+
+    def get_robustcov_results(self, cov_type='HC1', use_t=None, **kwds):
+        """create new results instance with robust covariance as default
+
+        Parameters
+        ----------
+        cov_type : string
+            'fixed scale', 'HC0', 'HC1', 'HC2', 'HC3' or 'cluster'. The
+            cluster labels are taken from the chunks of the model.
+        use_t : bool
+            If true, then the t distribution is used for inference.
+        kwds : depends on cov_type
+            `scale` for 'fixed scale', `use_correction` and `df_correction`
+            for 'cluster', see `RegressionResults.get_robustcov_results`.
+
+        Returns
+        -------
+        results : results instance
+            This method creates a new results instance with the
+            requested robust covariance as the default covariance of
+            the parameters.
+        """
+        if cov_type.lower() != 'cluster':
+            if cov_type.upper() not in ('HC0', 'HC1', 'HC2', 'HC3',
+                                        'FIXED SCALE', 'FIXED_SCALE'):
+                raise ValueError('cov_type %s is not available for %s' %
+                                 (cov_type, self.model.__class__.__name__))
+            res = super(IncrementalRegressionResults,
+                        self).get_robustcov_results(cov_type=cov_type,
+                                                    use_t=use_t, **kwds)
+            res._state = self._state
+            return res
+
+        use_self = kwds.pop('use_self', False)
+        if use_self:
+            res = self
+        else:
+            res = self.__class__(
+                self.model, self.params,
+                normalized_cov_params=self.normalized_cov_params,
+                scale=self.scale)
+            res._state = self._state
+
+        res.cov_type = cov_type
+        if use_t is None:
+            use_t = self.use_t
+        res.cov_kwds = {'use_t': use_t}
+        res.use_t = use_t
+
+        adjust_df = kwds.get('df_correction', None) is not False
+        res.cov_kwds['adjust_df'] = adjust_df
+        use_correction = kwds.get('use_correction', True)
+        res.cov_kwds['use_correction'] = use_correction
+
+        meat, n_groups = self._score_outer_product('cluster')
+        cov_c = sw._HCCM2(self.normalized_cov_params, meat)
+        if use_correction:
+            nobs, k_params = self.nobs, self.model.k_vars
+            cov_c *= (n_groups / (n_groups - 1.) *
+                      ((nobs - 1.) / float(nobs - k_params)))
+        res.cov_params_default = cov_c
+        self.n_groups = res.n_groups = n_groups
+        res.cov_kwds['description'] = (
+            'Standard Errors are robust to' +
+            'cluster correlation ' + '(' + cov_type + ')')
+
+        if adjust_df:
+            res.df_resid_inference = n_groups - 1
+
+        return res
+
+    def summary(self, yname=None, xname=None, title=None, alpha=.05):
+        """Summarize the Regression Results
+
+        Residual diagnostics are not included since the residuals are not
+        available.
+
+        Parameters
+        -----------
+        yname : string, optional
+            Default is `y`
+        xname : list of strings, optional
+            Default is `var_##` for ## in p the number of regressors
+        title : string, optional
+            Title for the top table. If not None, then this replaces the
+            default title
+        alpha : float
+            significance level for the confidence intervals
+
+        Returns
+        -------
+        smry : Summary instance
+            this holds the summary tables and text, which can be printed or
+            converted to various output formats.
+        """
+        top_left = [('Dep. Variable:', None),
+                    ('Model:', None),
+                    ('Method:', ['Least Squares']),
+                    ('Date:', None),
+                    ('Time:', None),
+                    ('No. Observations:', None),
+                    ('Df Residuals:', None),
+                    ('Df Model:', None),
+                    ('Covariance Type:', [self.cov_type])
+                    ]
+
+        top_right = [('R-squared:', ["%#8.3f" % self.rsquared]),
+                     ('Adj. R-squared:', ["%#8.3f" % self.rsquared_adj]),
+                     ('F-statistic:', ["%#8.4g" % self.fvalue]),
+                     ('Prob (F-statistic):', ["%#6.3g" % self.f_pvalue]),
+                     ('Log-Likelihood:', None),
+                     ('AIC:', ["%#8.4g" % self.aic]),
+                     ('BIC:', ["%#8.4g" % self.bic]),
+                     ('Cond. No.', ["%#8.3g" % self.condition_number])
+                     ]
+
+        if title is None:
+            title = self.model.__class__.__name__ + ' ' + "Regression Results"
+
+        from statsmodels.iolib.summary import Summary
+        smry = Summary()
+        smry.add_table_2cols(self, gleft=top_left, gright=top_right,
+                             yname=yname, xname=xname, title=title)
+        smry.add_table_params(self, yname=yname, xname=xname, alpha=alpha,
+                              use_t=self.use_t)
+        smry.add_extra_txt(["[1] " + self.cov_kwds['description']])
+        return smry
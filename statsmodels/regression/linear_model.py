@@ -33,14 +33,16 @@ W. Green.  "Econometric Analysis," 5th ed., Pearson, 2003.
 
 from __future__ import print_function
 
-from statsmodels.compat.python import lrange, lzip, range
+from statsmodels.compat.python import lrange, lzip, range, string_types
 
 import numpy as np
 from scipy.linalg import toeplitz
+from scipy import sparse
 from scipy import stats
 from scipy import optimize
 
-from statsmodels.compat.numpy import np_matrix_rank
+from statsmodels.compat.numpy import (np_matrix_rank, np_matmul,
+                                      np_broadcast_to)
 from statsmodels.tools.tools import add_constant, chain_dot, pinv_extended
 from statsmodels.tools.decorators import (resettable_cache,
                                           cache_readonly,
@@ -169,6 +171,206 @@ def _get_sigma(sigma, nobs):
     return sigma, cholsigmainv
 
 
+# Minimum pivot of the LU factorization of the normal equations with unit
+# diagonal for a sparse design matrix to have full column rank
+_SPARSE_PIVOT_TOL = 1e-12
+
+# Pivots of the LU factorization of the cross product of the scaled dummy
+# variables below this are counted as redundant absorbed effects. Redundant
+# pivots are at the level of rounding errors, the others are of order one.
+_ABSORB_PIVOT_TOL = 1e-8
+
+
+def _exog_rank(exog):
+    """
+    rank of exog, a sparse exog needs to have full column rank, which is
+    checked with `_sparse_normal_lu`
+    """
+    if sparse.issparse(exog):
+        _sparse_normal_lu(exog)
+        return exog.shape[1]
+    return np_matrix_rank(exog)
+
+
+def _sparse_normal_lu(exog):
+    """
+    Sparse LU factorization of the scaled normal equations of exog
+
+    Parameters
+    ----------
+    exog : scipy sparse matrix
+        The design matrix.
+
+    Returns
+    -------
+    lu : scipy.sparse.linalg.SuperLU
+        The factorization of D exog' exog D, with D the diagonal matrix of
+        the inverse column norms of exog.
+    col_scale : ndarray
+        The diagonal of D.
+
+    Notes
+    -----
+    The scaled normal equations have a unit diagonal and exog is taken to
+    be rank deficient if a pivot of the factorization is smaller than
+    `_SPARSE_PIVOT_TOL` in absolute value, in which case a ValueError is
+    raised.
+    """
+    from scipy.sparse.linalg import splu
+    msg = 'the sparse design matrix does not have full column rank'
+    xtx = exog.T.dot(exog)
+    norms = np.sqrt(xtx.diagonal())
+    if (norms == 0).any():
+        raise ValueError(msg)
+    col_scale = 1. / norms
+    d = sparse.diags(col_scale)
+    try:
+        lu = splu(d.dot(xtx).dot(d).tocsc())
+    except RuntimeError:
+        # exactly singular
+        raise ValueError(msg)
+    if np.abs(lu.U.diagonal()).min() < _SPARSE_PIVOT_TOL:
+        raise ValueError(msg)
+    return lu, col_scale
+
+
+def _absorb_demean(x, groups, weights=None, tol=1e-10, maxiter=1000):
+    """
+    Remove categorical effects from the columns of x by alternating projections
+
+    Parameters
+    ----------
+    x : ndarray
+        1-d or 2-d array with observations in rows
+    groups : list of Group instances
+        The factors that are absorbed.
+    weights : None or ndarray
+        Observation weights, the projections are orthogonal in the weighted
+        inner product.
+    tol : float
+        Convergence tolerance for the maximum absolute change relative to
+        the scale of the columns of x.
+    maxiter : int
+        Maximum number of sweeps over all factors.
+
+    Returns
+    -------
+    x_demeaned : ndarray
+        Residuals of the weighted least squares projection of x on the
+        dummy variables of all factors.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    x, _ = groups[0].group_demean(x, weights=weights)
+    if len(groups) == 1:
+        # a single projection is exact
+        return x
+
+    scale = np.maximum(np.abs(x).max(0), 1e-300)
+    for _ in range(maxiter):
+        x_old = x
+        for group in groups:
+            x, _ = group.group_demean(x, weights=weights)
+        if np.max(np.abs(x - x_old) / scale) <= tol:
+            break
+    else:
+        from statsmodels.tools.sm_exceptions import ConvergenceWarning
+        warnings.warn("Alternating projections for absorbed effects did not "
+                      "converge in %d iterations" % maxiter,
+                      ConvergenceWarning)
+    return x
+
+
+def _absorb_dof(groups):
+    """
+    Number of parameters of the absorbed effects
+
+    This is the rank of the stacked dummy variables of all factors. For two
+    factors the number of redundant parameters is the number of connected
+    components of their bipartite graph, which also covers nested factors.
+    For more than two factors the factor with the most levels, whose block of
+    the cross product of the dummy variables is diagonal, is eliminated
+    exactly and the rank of the sparse Schur complement of the remaining
+    levels is the number of pivots of its LU factorization that are not
+    below `_ABSORB_PIVOT_TOL`. No dense array is created.
+    """
+    if len(groups) == 1:
+        return groups[0].n_groups
+    if len(groups) == 2:
+        from scipy.sparse.csgraph import connected_components
+        g1, g2 = groups[0], groups[1]
+        n1, n2 = g1.n_groups, g2.n_groups
+        edges = sparse.coo_matrix((np.ones(len(g1.group_int)),
+                                   (g1.group_int, g2.group_int + n1)),
+                                  shape=(n1 + n2, n1 + n2))
+        n_comp = connected_components(edges, directed=False)[0]
+        return n1 + n2 - n_comp
+    from scipy.sparse.linalg import splu
+    nobs = len(groups[0].group_int)
+    groups = sorted(groups, key=lambda group: -group.n_groups)
+    # dummy variables scaled to unit length, so that the cross product has
+    # a unit diagonal
+    dummies = []
+    for group in groups:
+        counts = np.bincount(group.group_int, minlength=group.n_groups)
+        dummies.append(sparse.csc_matrix(
+            (1. / np.sqrt(counts[group.group_int]),
+             (np.arange(nobs), group.group_int)),
+            shape=(nobs, group.n_groups)))
+    rest = sparse.hstack(dummies[1:]).tocsc()
+    cross = dummies[0].T.dot(rest)
+    schur = rest.T.dot(rest) - cross.T.dot(cross)
+    # a tiny ridge keeps the factorization from breaking down on exactly
+    # zero pivots
+    schur = schur + 1e-14 * sparse.identity(schur.shape[0])
+    lu = splu(schur.tocsc(), permc_spec='COLAMD', diag_pivot_thresh=0.,
+              options=dict(SymmetricMode=True))
+    n_redundant = (np.abs(lu.U.diagonal()) < _ABSORB_PIVOT_TOL).sum()
+    return groups[0].n_groups + schur.shape[0] - n_redundant
+
+
+def _absorb_check(absorb):
+    """
+    convert absorb to a 2-d array with one column per factor
+
+    Returns the array and the index of absorb if it is a pandas object,
+    which is used to align the rows with the data.
+    """
+    if absorb is None:
+        return None, None
+    import pandas as pd
+    index = getattr(absorb, 'index', None)
+    absorb = np.asarray(absorb)
+    if absorb.ndim == 1:
+        absorb = absorb[:, None]
+    if absorb.ndim != 2:
+        raise ValueError("absorb must be 1-d or 2-d")
+    if pd.isnull(absorb).any():
+        raise ValueError("absorb cannot contain missing values")
+    return absorb, index
+
+
+_absorb_doc = """absorb : array-like, optional
+        One or more categorical variables, with observations in rows and one
+        factor per column, whose fixed effects are removed from endog and exog
+        by the within transformation. Using the formula interface, this can
+        also be a column name or a list of column names in data. See Notes."""
+
+_absorb_notes = """
+    If `absorb` is given, then the model is estimated on endog and exog
+    demeaned by all factors, computed by alternating projections without
+    creating the dummy variables. The parameters and their covariance are
+    the same as in the regression including the full set of dummy variables.
+    exog cannot include a constant, since it is absorbed by the fixed
+    effects, and the formula interface drops the intercept. `rsquared` and
+    `fvalue` refer to the within transformed model, and `df_resid` is
+    reduced by the number of absorbed effects `k_absorb`, the rank of the
+    dummy variables of all factors. `predict` is based on the demeaned exog
+    and does not include the fixed effects. If absorb and the data are
+    pandas objects, then the rows of absorb are aligned by the row labels,
+    otherwise by position after removing the rows with missing values.
+"""
+
+
 class RegressionModel(base.LikelihoodModel):
     """
     Base class for linear regression models. Should not be directly called.
@@ -179,7 +381,12 @@ class RegressionModel(base.LikelihoodModel):
         super(RegressionModel, self).__init__(endog, exog, **kwargs)
         self._data_attr.extend(['pinv_wexog', 'wendog', 'wexog', 'weights'])
 
+    # number of absorbed fixed effects parameters
+    k_absorb = 0
+
     def initialize(self):
+        if getattr(self, 'absorb', None) is not None:
+            self._absorb_effects()
         self.wexog = self.whiten(self.exog)
         self.wendog = self.whiten(self.endog)
         # overwrite nobs from class Model:
@@ -196,8 +403,7 @@ class RegressionModel(base.LikelihoodModel):
         matrix minus 1 if a constant is included.
         """
         if self._df_model is None:
-            if self.rank is None:
-                self.rank = np_matrix_rank(self.exog)
+            self._get_rank()
             self._df_model = float(self.rank - self.k_constant)
         return self._df_model
 
@@ -213,18 +419,202 @@ class RegressionModel(base.LikelihoodModel):
         """
 
         if self._df_resid is None:
-            if self.rank is None:
-                self.rank = np_matrix_rank(self.exog)
-            self._df_resid = self.nobs - self.rank
+            self._get_rank()
+            self._df_resid = self.nobs - self.rank - self.k_absorb
         return self._df_resid
 
     @df_resid.setter
     def df_resid(self, value):
         self._df_resid = value
 
+    def _get_rank(self):
+        """
+        rank of the design matrix, a sparse design is checked for full column
+        rank by the factorization that is also used for the parameters
+        """
+        if self.rank is None:
+            if sparse.issparse(self.wexog):
+                self._sparse_factorize()
+            else:
+                self.rank = _exog_rank(self.exog)
+        return self.rank
+
     def whiten(self, X):
         raise NotImplementedError("Subclasses should implement.")
 
+    def _absorb_effects(self):
+        """
+        Replace endog and exog by their within transformation
+
+        The rows of `absorb` are aligned with the data after missing value
+        handling and the number of absorbed parameters is attached as
+        `k_absorb`. If both absorb and the data are pandas objects, then
+        the rows are aligned by the row labels, otherwise by position.
+        """
+        from statsmodels.tools.grouputils import Group
+        nobs = self.exog.shape[0]
+        absorb = self.absorb
+        row_labels = getattr(self.data, 'row_labels', None)
+        if self._absorb_index is not None and row_labels is not None:
+            loc = self._absorb_index.get_indexer(row_labels)
+            if not self._absorb_index.is_unique or (loc < 0).any():
+                raise ValueError("the index of absorb needs to be unique "
+                                 "and to include the row labels of the data")
+            absorb = absorb[loc]
+            self.absorb = absorb
+        elif absorb.shape[0] != nobs:
+            # indices of the rows dropped because of missing values
+            row_idx = getattr(self.data, 'missing_row_idx', None)
+            if row_idx is None or absorb.shape[0] - len(row_idx) != nobs:
+                raise ValueError("absorb must have the same number of rows "
+                                 "as endog")
+            absorb = np.delete(absorb, row_idx, axis=0)
+            self.absorb = absorb
+        if sparse.issparse(self.exog):
+            raise ValueError("absorb is not available with a sparse exog")
+        if self.data.const_idx is not None:
+            raise ValueError("exog cannot include a constant if fixed "
+                             "effects are absorbed")
+
+        groups = [Group(absorb[:, i]) for i in range(absorb.shape[1])]
+        weights = getattr(self, 'weights', None)
+        if weights is not None and np.ndim(weights) == 0:
+            weights = None
+        endog = np.asarray(self.endog)
+        k_endog = 1 if endog.ndim == 1 else endog.shape[1]
+        x = _absorb_demean(np.column_stack((endog, self.exog)), groups,
+                           weights=weights)
+        self.endog = x[:, 0] if endog.ndim == 1 else x[:, :k_endog]
+        self.exog = x[:, k_endog:]
+        self.k_absorb = _absorb_dof(groups)
+        # the constant is part of the absorbed effects
+        self.k_constant = 0
+
+    @classmethod
+    def from_formula(cls, formula, data, subset=None, drop_cols=None,
+                     *args, **kwargs):
+        absorb = kwargs.get('absorb', None)
+        if absorb is not None:
+            if subset is not None:
+                data = data.loc[subset]
+                subset = None
+            if isinstance(absorb, string_types):
+                absorb = [absorb]
+            if (isinstance(absorb, (list, tuple)) and
+                    all(isinstance(name, string_types) for name in absorb)):
+                absorb = data[list(absorb)]
+            kwargs['absorb'] = absorb
+            drop_cols = ['Intercept'] + list(drop_cols or [])
+        return super(RegressionModel, cls).from_formula(
+            formula, data, subset=subset, drop_cols=drop_cols, *args,
+            **kwargs)
+
+    def _fit_params(self, method="pinv"):
+        """
+        Least squares parameters, caching the decomposition of wexog
+
+        The pseudoinverse or the QR decomposition of the whitened design
+        matrix is attached to the model and reused in later calls. wendog
+        can be 2-d, in which case the columns are fit separately.
+
+        If wexog is sparse, then the normal equations are solved with a
+        sparse LU factorization and `method` is ignored.
+        """
+        if sparse.issparse(self.wexog):
+            beta = self._fit_params_sparse()
+        elif method == "pinv":
+            if not (hasattr(self, 'pinv_wexog') and
+                    hasattr(self, 'normalized_cov_params') and
+                    hasattr(self, 'rank')):
+
+                self.pinv_wexog, singular_values = pinv_extended(self.wexog)
+                self.normalized_cov_params = np.dot(
+                    self.pinv_wexog, np.transpose(self.pinv_wexog))
+
+                # Cache these singular values for use later.
+                self.wexog_singular_values = singular_values
+                self.rank = np_matrix_rank(np.diag(singular_values))
+
+            beta = np.dot(self.pinv_wexog, self.wendog)
+
+        elif method == "qr":
+            if not (hasattr(self, 'exog_Q') and
+                    hasattr(self, 'exog_R') and
+                    hasattr(self, 'normalized_cov_params') and
+                    hasattr(self, 'rank')):
+                Q, R = np.linalg.qr(self.wexog)
+                self.exog_Q, self.exog_R = Q, R
+                self.normalized_cov_params = np.linalg.inv(np.dot(R.T, R))
+
+                # Cache singular values from R.
+                self.wexog_singular_values = np.linalg.svd(R, 0, 0)
+                self.rank = np_matrix_rank(R)
+            else:
+                Q, R = self.exog_Q, self.exog_R
+
+            # used in ANOVA
+            self.effects = effects = np.dot(Q.T, self.wendog)
+            beta = np.linalg.solve(R, effects)
+
+        if self._df_model is None:
+            self._df_model = float(self.rank - self.k_constant)
+        if self._df_resid is None:
+            self.df_resid = self.nobs - self.rank - self.k_absorb
+
+        return beta
+
+    def _fit_params_sparse(self):
+        """
+        Least squares parameters for a sparse wexog from the normal equations
+
+        The sparse LU factorization of the scaled wexog' wexog is cached.
+        The design matrix needs to have full column rank. The dense
+        normalized_cov_params is not computed, the results compute it or
+        only the required columns of it when requested.
+        """
+        self._sparse_factorize()
+        return self._sparse_solve(np.asarray(self.wexog.T.dot(self.wendog)))
+
+    def _sparse_factorize(self):
+        """
+        Cache the sparse LU factorization of the scaled wexog' wexog
+
+        Raises a ValueError if wexog does not have full column rank, see
+        `_sparse_normal_lu`.
+        """
+        if not hasattr(self, '_wexog_lu'):
+            self._wexog_lu, self._wexog_col_scale = _sparse_normal_lu(
+                self.wexog)
+            self.rank = self.wexog.shape[1]
+
+    def _sparse_solve(self, b):
+        """solve wexog' wexog x = b with the cached sparse factorization"""
+        d = self._wexog_col_scale
+        if b.ndim == 2:
+            d = d[:, None]
+        return d * self._wexog_lu.solve(d * b)
+
+    def _sparse_cov_columns(self, columns):
+        """columns of the inverse of wexog' wexog for a sparse wexog"""
+        columns = np.asarray(columns)
+        rhs = np.zeros((len(self._wexog_col_scale), len(columns)))
+        rhs[columns, np.arange(len(columns))] = 1
+        return self._sparse_solve(rhs)
+
+    def _sparse_cov_diag(self, block=256):
+        """
+        diagonal of the inverse of wexog' wexog for a sparse wexog
+
+        The columns of the inverse are computed in blocks of `block` columns.
+        """
+        k_vars = len(self._wexog_col_scale)
+        diag = np.empty(k_vars)
+        for start in range(0, k_vars, block):
+            cols = np.arange(start, min(start + block, k_vars))
+            cov = self._sparse_cov_columns(cols)
+            diag[cols] = cov[cols, np.arange(len(cols))]
+        return diag
+
     def fit(self, method="pinv", cov_type='nonrobust', cov_kwds=None,
             use_t=None, **kwargs):
         """
@@ -264,59 +654,70 @@ class RegressionModel(base.LikelihoodModel):
         -----
         The fit method uses the pseudoinverse of the design/exogenous variables
         to solve the least squares minimization.
-        """
-        if method == "pinv":
-            if not (hasattr(self, 'pinv_wexog') and
-                    hasattr(self, 'normalized_cov_params') and
-                    hasattr(self, 'rank')):
-
-                self.pinv_wexog, singular_values = pinv_extended(self.wexog)
-                self.normalized_cov_params = np.dot(
-                    self.pinv_wexog, np.transpose(self.pinv_wexog))
-
-                # Cache these singular values for use later.
-                self.wexog_singular_values = singular_values
-                self.rank = np_matrix_rank(np.diag(singular_values))
-
-            beta = np.dot(self.pinv_wexog, self.wendog)
-
-        elif method == "qr":
-            if not (hasattr(self, 'exog_Q') and
-                    hasattr(self, 'exog_R') and
-                    hasattr(self, 'normalized_cov_params') and
-                    hasattr(self, 'rank')):
-                Q, R = np.linalg.qr(self.wexog)
-                self.exog_Q, self.exog_R = Q, R
-                self.normalized_cov_params = np.linalg.inv(np.dot(R.T, R))
-
-                # Cache singular values from R.
-                self.wexog_singular_values = np.linalg.svd(R, 0, 0)
-                self.rank = np_matrix_rank(R)
-            else:
-                Q, R = self.exog_Q, self.exog_R
 
-            # used in ANOVA
-            self.effects = effects = np.dot(Q.T, self.wendog)
-            beta = np.linalg.solve(R, effects)
-
-        if self._df_model is None:
-            self._df_model = float(self.rank - self.k_constant)
-        if self._df_resid is None:
-            self.df_resid = self.nobs - self.rank
+        If exog is a scipy sparse matrix, then the normal equations are
+        solved with a sparse LU factorization, `method` is ignored and the
+        design matrix needs to have full column rank, otherwise a ValueError
+        is raised. Only the nonrobust, fixed scale and HC0 to HC3 covariances
+        are available in this case. For the nonrobust covariance the dense
+        `normalized_cov_params` is only computed when it is accessed, `bse`
+        and `cov_params(column=...)` solve only for the required columns.
+        """
+        beta = self._fit_params(method)
 
         if isinstance(self, OLS):
             lfit = OLSResults(
                 self, beta,
-                normalized_cov_params=self.normalized_cov_params,
+                normalized_cov_params=getattr(self, 'normalized_cov_params',
+                                              None),
                 cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t)
         else:
             lfit = RegressionResults(
                 self, beta,
-                normalized_cov_params=self.normalized_cov_params,
+                normalized_cov_params=getattr(self, 'normalized_cov_params',
+                                              None),
                 cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t,
                 **kwargs)
         return RegressionResultsWrapper(lfit)
 
+    def fit_batched(self, method="pinv", cov_type='nonrobust', cov_kwds=None,
+                    use_t=None):
+        """
+        Fit a separate regression for each column of a 2-d endog.
+
+        The whitened design matrix is decomposed only once and the
+        statistics of all regressions are computed with array operations.
+
+        Parameters
+        ----------
+        method : str, optional
+            Can be "pinv", "qr", see `fit`.
+        cov_type : str, optional
+            'nonrobust', 'HC0', 'HC1', 'HC2', 'HC3' or 'cluster'.
+        cov_kwds : dict or None, optional
+            For 'cluster' the required `groups` and the optional
+            `use_correction` and `df_correction`, see
+            `RegressionResults.get_robustcov_results`.
+        use_t : bool, optional
+            Flag indicating to use the Student's t distribution when computing
+            p-values. The default is True for cov_type nonrobust and False
+            otherwise.
+
+        Returns
+        -------
+        A BatchedRegressionResults class instance.
+
+        See Also
+        --------
+        regression.linear_model.BatchedRegressionResults
+        """
+        if self.wendog.ndim != 2:
+            raise ValueError('fit_batched requires a 2-d endog')
+        beta = self._fit_params(method)
+        res = BatchedRegressionResults(self, beta, cov_type=cov_type,
+                                       cov_kwds=cov_kwds, use_t=use_t)
+        return BatchedRegressionResultsWrapper(res)
+
     def predict(self, params, exog=None):
         """
         Return linear predicted values from a design matrix.
@@ -342,6 +743,8 @@ class RegressionModel(base.LikelihoodModel):
         if exog is None:
             exog = self.exog
 
+        if sparse.issparse(exog):
+            return exog.dot(params)
         return np.dot(exog, params)
 
     def get_distribution(self, params, scale, exog=None, dist_class=None):
@@ -487,6 +890,14 @@ class GLS(RegressionModel):
         --------
         regression.GLS
         """
+        if sparse.issparse(X):
+            if self.sigma is None or self.sigma.shape == ():
+                return X
+            elif self.sigma.ndim == 1:
+                return sparse.diags(self.cholsigmainv).dot(X).tocsr()
+            else:
+                # the whitened design is dense for a full sigma
+                return X.T.dot(self.cholsigmainv.T).T
         X = np.asarray(X)
         if self.sigma is None or self.sigma.shape == ():
             return X
@@ -527,7 +938,7 @@ class GLS(RegressionModel):
         """
         # TODO: combine this with OLS/WLS loglike and add _det_sigma argument
         nobs2 = self.nobs / 2.0
-        SSR = np.sum((self.wendog - np.dot(self.wexog, params))**2, axis=0)
+        SSR = np.sum((self.wendog - self.wexog.dot(params))**2, axis=0)
         llf = -np.log(SSR) * nobs2      # concentrated likelihood
         llf -= (1+np.log(np.pi/nobs2))*nobs2  # with likelihood constant
         if np.any(self.sigma):
@@ -607,12 +1018,15 @@ class WLS(RegressionModel):
         1d array of weights.  If you supply 1/W then the variables are
         pre- multiplied by 1/sqrt(W).  If no weights are supplied the
         default value is 1 and WLS results are the same as OLS.
+    %(absorb)s
     %(extra_params)s
 
     Attributes
     ----------
     weights : array
         The stored weights supplied as an argument.
+    k_absorb : int
+        The number of absorbed fixed effects parameters.
 
     See regression.GLS
 
@@ -639,11 +1053,16 @@ class WLS(RegressionModel):
     If the weights are a function of the data, then the post estimation
     statistics such as fvalue and mse_model might not be correct, as the
     package does not yet support no-constant regression.
-    """ % {'params': base._model_params_doc,
-           'extra_params': base._missing_param_doc + base._extra_param_doc}
+    %(absorb_notes)s""" % {'params': base._model_params_doc,
+                           'absorb': _absorb_doc,
+                           'absorb_notes': _absorb_notes,
+                           'extra_params': (base._missing_param_doc +
+                                            base._extra_param_doc)}
 
     def __init__(self, endog, exog, weights=1., missing='none', hasconst=None,
-                 **kwargs):
+                 absorb=None, **kwargs):
+        # attached before initialize is called by the super class
+        self.absorb, self._absorb_index = _absorb_check(absorb)
         weights = np.array(weights)
         if weights.shape == ():
             if (missing == 'drop' and 'missing_idx' in kwargs and
@@ -659,6 +1078,8 @@ class WLS(RegressionModel):
             weights = weights.squeeze()
         super(WLS, self).__init__(endog, exog, missing=missing,
                                   weights=weights, hasconst=hasconst, **kwargs)
+        if self.absorb is not None:
+            self._init_keys.append('absorb')
         nobs = self.exog.shape[0]
         weights = self.weights
         # Experimental normalization of weights
@@ -680,6 +1101,8 @@ class WLS(RegressionModel):
         sqrt(weights)*X
         """
 
+        if sparse.issparse(X):
+            return sparse.diags(np.sqrt(self.weights)).dot(X).tocsr()
         X = np.asarray(X)
         if X.ndim == 1:
             return X * np.sqrt(self.weights)
@@ -710,7 +1133,7 @@ class WLS(RegressionModel):
         where :math:`W` is a diagonal matrix
         """
         nobs2 = self.nobs / 2.0
-        SSR = np.sum((self.wendog - np.dot(self.wexog, params))**2, axis=0)
+        SSR = np.sum((self.wendog - self.wexog.dot(params))**2, axis=0)
         llf = -np.log(SSR) * nobs2      # concentrated likelihood
         llf -= (1+np.log(np.pi/nobs2))*nobs2  # with constant
         llf += 0.5 * np.sum(np.log(self.weights))
@@ -769,12 +1192,15 @@ class OLS(WLS):
     A simple ordinary least squares model.
 
     %(params)s
+    %(absorb)s
     %(extra_params)s
 
     Attributes
     ----------
     weights : scalar
         Has an attribute weights = array(1.0) due to inheritance from WLS.
+    k_absorb : int
+        The number of absorbed fixed effects parameters.
 
     See Also
     --------
@@ -804,14 +1230,17 @@ class OLS(WLS):
     Notes
     -----
     No constant is added by the model unless you are using formulas.
-    """ % {'params': base._model_params_doc,
-           'extra_params': base._missing_param_doc + base._extra_param_doc}
+    %(absorb_notes)s""" % {'params': base._model_params_doc,
+                           'absorb': _absorb_doc,
+                           'absorb_notes': _absorb_notes,
+                           'extra_params': (base._missing_param_doc +
+                                            base._extra_param_doc)}
 
     # TODO: change example to use datasets.  This was the point of datasets!
     def __init__(self, endog, exog=None, missing='none', hasconst=None,
-                 **kwargs):
+                 absorb=None, **kwargs):
         super(OLS, self).__init__(endog, exog, missing=missing,
-                                  hasconst=hasconst, **kwargs)
+                                  hasconst=hasconst, absorb=absorb, **kwargs)
         if "weights" in self._init_keys:
             self._init_keys.remove("weights")
 
@@ -834,7 +1263,7 @@ class OLS(WLS):
         """
         nobs2 = self.nobs / 2.0
         nobs = float(self.nobs)
-        resid = self.endog - np.dot(self.exog, params)
+        resid = self.endog - self.exog.dot(params)
         if hasattr(self, 'offset'):
             resid -= self.offset
         ssr = np.sum(resid**2)
@@ -1592,8 +2021,53 @@ class RegressionResults(base.LikelihoodModelResults):
     def f_pvalue(self):
         return stats.f.sf(self.fvalue, self.df_model, self.df_resid)
 
+    @property
+    def normalized_cov_params(self):
+        """
+        The inverse of wexog' wexog, computed when first accessed for a
+        sparse wexog.
+        """
+        cov = getattr(self, '_normalized_cov_params', None)
+        if cov is None and hasattr(self.model, '_wexog_lu'):
+            cov = self.model._sparse_cov_columns(np.arange(len(self.params)))
+            cov = self._normalized_cov_params = (cov + cov.T) / 2.
+        return cov
+
+    @normalized_cov_params.setter
+    def normalized_cov_params(self, value):
+        self._normalized_cov_params = value
+
+    def _sparse_cov_pending(self):
+        """True if the covariance of a sparse wexog has not been computed"""
+        return (getattr(self, '_normalized_cov_params', None) is None and
+                not hasattr(self, 'cov_params_default') and
+                hasattr(self.model, '_wexog_lu'))
+
+    def cov_params(self, r_matrix=None, column=None, scale=None, cov_p=None,
+                   other=None):
+        """
+        Returns the variance/covariance matrix.
+
+        See `LikelihoodModelResults.cov_params`. For a sparse wexog only the
+        requested columns of the normalized covariance are computed if
+        `column` is given.
+        """
+        if (column is not None and r_matrix is None and cov_p is None and
+                other is None and self._sparse_cov_pending()):
+            if scale is None:
+                scale = self.scale
+            column = np.asarray(column)
+            cols = np.atleast_1d(column)
+            cov = scale * self.model._sparse_cov_columns(cols)[cols]
+            return cov[0, 0] if column.shape == () else cov
+        return super(RegressionResults, self).cov_params(
+            r_matrix=r_matrix, column=column, scale=scale, cov_p=cov_p,
+            other=other)
+
     @cache_readonly
     def bse(self):
+        if self._sparse_cov_pending():
+            return np.sqrt(self.scale * self.model._sparse_cov_diag())
         return np.sqrt(np.diag(self.cov_params()))
 
     @cache_readonly
@@ -1612,6 +2086,9 @@ class RegressionResults(base.LikelihoodModelResults):
         """
         if self._wexog_singular_values is not None:
             eigvals = self._wexog_singular_values ** 2
+        elif sparse.issparse(self.model.wexog):
+            wexog = self.model.wexog
+            eigvals = np.linalg.linalg.eigvalsh(wexog.T.dot(wexog).toarray())
         else:
             eigvals = np.linalg.linalg.eigvalsh(np.dot(self.model.wexog.T,
                                                        self.model.wexog))
@@ -1629,10 +2106,23 @@ class RegressionResults(base.LikelihoodModelResults):
 
     # TODO: make these properties reset bse
     def _HCCM(self, scale):
+        if sparse.issparse(self.model.wexog):
+            wexog = self.model.wexog
+            meat = wexog.T.dot(sparse.diags(scale).dot(wexog)).toarray()
+            return chain_dot(self.normalized_cov_params, meat,
+                             self.normalized_cov_params)
         H = np.dot(self.model.pinv_wexog,
                    scale[:, None] * self.model.pinv_wexog.T)
         return H
 
+    def _wexog_leverage(self):
+        """diagonal of the hat matrix of wexog"""
+        wexog = self.model.wexog
+        if sparse.issparse(wexog):
+            xg = wexog.dot(self.normalized_cov_params)
+            return np.asarray(wexog.multiply(xg).sum(1)).ravel()
+        return (np.dot(wexog, self.normalized_cov_params) * wexog).sum(1)
+
     @cache_readonly
     def cov_HC0(self):
         """
@@ -1659,10 +2149,7 @@ class RegressionResults(base.LikelihoodModelResults):
         See statsmodels.RegressionResults
         """
 
-        # probably could be optimized
-        h = np.diag(chain_dot(self.model.wexog,
-                              self.normalized_cov_params,
-                              self.model.wexog.T))
+        h = self._wexog_leverage()
         self.het_scale = self.wresid**2/(1-h)
         cov_HC2 = self._HCCM(self.het_scale)
         return cov_HC2
@@ -1672,8 +2159,7 @@ class RegressionResults(base.LikelihoodModelResults):
         """
         See statsmodels.RegressionResults
         """
-        h = np.diag(chain_dot(
-            self.model.wexog, self.normalized_cov_params, self.model.wexog.T))
+        h = self._wexog_leverage()
         self.het_scale = (self.wresid / (1 - h))**2
         cov_HC3 = self._HCCM(self.het_scale)
         return cov_HC3
@@ -2122,6 +2608,12 @@ class RegressionResults(base.LikelihoodModelResults):
         if 'kernel' in kwds:
             kwds['weights_func'] = kwds.pop('kernel')
 
+        sparse_exog = sparse.issparse(getattr(self.model, 'wexog', None))
+        if sparse_exog and cov_type.upper() not in [
+                'FIXED SCALE', 'FIXED_SCALE', 'HC0', 'HC1', 'HC2', 'HC3']:
+            raise ValueError('cov_type %s is not available for a sparse '
+                             'exog' % cov_type)
+
         # TODO: make separate function that returns a robust cov plus info
         use_self = kwds.pop('use_self', False)
         if use_self:
@@ -2222,6 +2714,13 @@ class RegressionResults(base.LikelihoodModelResults):
                     self, groups, use_correction=use_correction)[0]
             else:
                 raise ValueError('only two groups are supported')
+            k_absorb = getattr(self.model, 'k_absorb', 0)
+            if use_correction and k_absorb:
+                # include absorbed effects in the small sample correction
+                # as in the regression with dummy variables
+                k_params = len(self.params)
+                res.cov_params_default *= ((self.nobs - k_params) /
+                                           (self.nobs - k_params - k_absorb))
             res.cov_kwds['description'] = (
                 'Standard Errors are robust to' +
                 'cluster correlation ' + '(' + cov_type + ')')
@@ -2532,10 +3031,16 @@ class OLSResults(RegressionResults):
 
     """
 
-    def get_influence(self):
+    def get_influence(self, chunksize=None):
         """
         get an instance of Influence with influence and outlier measures
 
+        Parameters
+        ----------
+        chunksize : int or None
+            If not None, then the observation specific measures are
+            computed in blocks of `chunksize` rows.
+
         Returns
         -------
         infl : Influence instance
@@ -2547,7 +3052,7 @@ class OLSResults(RegressionResults):
         statsmodels.stats.outliers_influence.OLSInfluence
         """
         from statsmodels.stats.outliers_influence import OLSInfluence
-        return OLSInfluence(self)
+        return OLSInfluence(self, chunksize=chunksize)
 
     def outlier_test(self, method='bonf', alpha=.05):
         """
@@ -2794,6 +3299,399 @@ wrap.populate_wrapper(RegressionResultsWrapper,
                       RegressionResults)
 
 
+class BatchedRegressionResults(object):
+    """
+    Results for regressions of several endog columns on the same design.
+
+    The attributes are stacked over the columns of endog. Parameter related
+    attributes like `params` and `bse` have shape (k_vars, k_endog),
+    statistics like `ssr` and `rsquared` have shape (k_endog,) and the
+    covariance matrices returned by `cov_params` have shape
+    (k_endog, k_vars, k_vars).
+
+    Parameters
+    ----------
+    model : RegressionModel instance
+        Model with a 2-d endog that has been fit by `fit_batched`.
+    params : ndarray
+        The (k_vars, k_endog) array of parameter estimates.
+    cov_type : str
+        'nonrobust', 'HC0', 'HC1', 'HC2', 'HC3' or 'cluster'
+    cov_kwds : dict or None
+        Options for the covariance, `groups` is required for 'cluster'.
+    use_t : bool or None
+        Flag indicating to use the Student's t distribution for inference.
+
+    Notes
+    -----
+    A full `RegressionResults` instance for a single column is returned by
+    `column_results`. It is created when requested and shares the
+    decomposition of the design matrix with the model.
+    """
+
+    def __init__(self, model, params, cov_type='nonrobust', cov_kwds=None,
+                 use_t=None):
+        self.model = model
+        self.params = params
+        self.normalized_cov_params = model.normalized_cov_params
+        self.k_constant = model.k_constant
+        self.df_model = model.df_model
+        self.df_resid = model.df_resid
+        self.k_endog = params.shape[1]
+        self._cache = resettable_cache()
+        self._column_results = {}
+
+        if use_t is None:
+            use_t = (cov_type == 'nonrobust')
+        self.use_t = use_t
+        self.cov_type = cov_type
+        self.cov_kwds = cov_kwds = {} if cov_kwds is None else dict(cov_kwds)
+        cov_type_ = cov_type.upper()
+        if cov_type_ == 'NONROBUST':
+            self.cov_kwds['description'] = (
+                'Standard Errors assume that the covariance matrix of the '
+                'errors is correctly specified.')
+        elif cov_type_ in ('HC0', 'HC1', 'HC2', 'HC3'):
+            if cov_kwds:
+                raise ValueError('heteroscedasticity robust covarians ' +
+                                 'does not use keywords')
+            self.cov_kwds['description'] = (
+                'Standard Errors are heteroscedasticity ' +
+                'robust ' + '(' + cov_type + ')')
+        elif cov_type_ == 'CLUSTER':
+            if 'groups' not in cov_kwds:
+                raise ValueError('cov_type cluster requires groups')
+            self.cov_kwds['description'] = (
+                'Standard Errors are robust to' +
+                'cluster correlation ' + '(' + cov_type + ')')
+        else:
+            raise ValueError('cov_type %s is not available for batched '
+                             'regressions' % cov_type)
+
+    @cache_readonly
+    def nobs(self):
+        return float(self.model.wexog.shape[0])
+
+    @cache_readonly
+    def fittedvalues(self):
+        return self.model.predict(self.params, self.model.exog)
+
+    @cache_readonly
+    def wresid(self):
+        return self.model.wendog - np.dot(self.model.wexog, self.params)
+
+    @cache_readonly
+    def resid(self):
+        return self.model.endog - self.fittedvalues
+
+    @cache_readonly
+    def ssr(self):
+        wresid = self.wresid
+        return (wresid**2).sum(0)
+
+    @cache_readonly
+    def scale(self):
+        return self.ssr / self.df_resid
+
+    @cache_readonly
+    def centered_tss(self):
+        model = self.model
+        weights = getattr(model, 'weights', None)
+        if weights is not None:
+            weights = np_broadcast_to(weights, (model.endog.shape[0],))
+            mean = np.dot(weights, model.endog) / weights.sum()
+            return np.dot(weights, (model.endog - mean)**2)
+        else:
+            centered_endog = model.wendog - model.wendog.mean(0)
+            return (centered_endog**2).sum(0)
+
+    @cache_readonly
+    def uncentered_tss(self):
+        return (self.model.wendog**2).sum(0)
+
+    @cache_readonly
+    def ess(self):
+        if self.k_constant:
+            return self.centered_tss - self.ssr
+        else:
+            return self.uncentered_tss - self.ssr
+
+    @cache_readonly
+    def rsquared(self):
+        if self.k_constant:
+            return 1 - self.ssr / self.centered_tss
+        else:
+            return 1 - self.ssr / self.uncentered_tss
+
+    @cache_readonly
+    def rsquared_adj(self):
+        return 1 - (np.divide(self.nobs - self.k_constant, self.df_resid)
+                    * (1 - self.rsquared))
+
+    @cache_readonly
+    def mse_model(self):
+        return self.ess / self.df_model
+
+    @cache_readonly
+    def mse_resid(self):
+        return self.ssr / self.df_resid
+
+    @cache_readonly
+    def llf(self):
+        nobs2 = self.nobs / 2.0
+        llf = -nobs2 * np.log(2 * np.pi) - nobs2 * np.log(self.ssr / self.nobs)
+        llf -= nobs2
+        weights = getattr(self.model, 'weights', None)
+        if weights is not None:
+            weights = np_broadcast_to(weights, (self.model.endog.shape[0],))
+            llf += 0.5 * np.sum(np.log(weights))
+        return llf
+
+    @cache_readonly
+    def aic(self):
+        return -2 * self.llf + 2 * (self.df_model + self.k_constant)
+
+    @cache_readonly
+    def bic(self):
+        return (-2 * self.llf + np.log(self.nobs) * (self.df_model +
+                                                     self.k_constant))
+
+    @cache_readonly
+    def df_resid_inference(self):
+        if (self.cov_type.upper() == 'CLUSTER' and
+                self.cov_kwds.get('df_correction', True) is not False):
+            return self.n_groups - 1
+        return self.df_resid
+
+    def _sandwich(self, meat):
+        # bread * meat * bread for a stack of (k_vars, k_vars) meats
+        bread = self.normalized_cov_params
+        return np_matmul(np_matmul(bread, meat), bread)
+
+    def _het_meat(self, het_scale):
+        # sum_i het_scale[i, j] x_i x_i' for all columns j, in row blocks
+        # of the unique elements of the outer products
+        wexog = self.model.wexog
+        nobs, k_vars = wexog.shape
+        ii, jj = np.triu_indices(k_vars)
+        meat_triu = np.zeros((het_scale.shape[1], len(ii)))
+        blocksize = max(1, 2**20 // len(ii))
+        for start in range(0, nobs, blocksize):
+            x = wexog[start:start + blocksize]
+            meat_triu += np.dot(het_scale[start:start + blocksize].T,
+                                x[:, ii] * x[:, jj])
+        meat = np.zeros((het_scale.shape[1], k_vars, k_vars))
+        meat[:, ii, jj] = meat_triu
+        meat[:, jj, ii] = meat_triu
+        return meat
+
+    def _cluster_meat(self, groups):
+        wexog = self.model.wexog
+        wresid = self.wresid
+        nobs, k_vars = wexog.shape
+        groups = np.asarray(groups)
+        if groups.ndim > 1:
+            groups = groups.squeeze()
+        sort_idx = np.argsort(groups, kind='mergesort')
+        groups_sorted = groups[sort_idx]
+        starts = np.concatenate(([0], np.nonzero(groups_sorted[1:] !=
+                                                 groups_sorted[:-1])[0] + 1))
+        self.n_groups = len(starts)
+        wexog = wexog[sort_idx]
+        wresid = wresid[sort_idx]
+
+        meat = np.zeros((self.k_endog, k_vars, k_vars))
+        blocksize = max(1, 2**22 // (nobs * k_vars))
+        for start in range(0, self.k_endog, blocksize):
+            cols = slice(start, start + blocksize)
+            xu = wexog[:, :, None] * wresid[:, None, cols]
+            score_sums = np.add.reduceat(xu, starts, axis=0)
+            meat[cols] = np.einsum('gkm,glm->mkl', score_sums, score_sums)
+        return meat
+
+    @cache_readonly
+    def cov_HC0(self):
+        """
+        Stacked HC0 covariance matrices, see RegressionResults
+        """
+        return self._sandwich(self._het_meat(self.wresid**2))
+
+    @cache_readonly
+    def cov_HC1(self):
+        """
+        Stacked HC1 covariance matrices, see RegressionResults
+        """
+        return self.nobs / self.df_resid * self.cov_HC0
+
+    @cache_readonly
+    def _leverage(self):
+        wexog = self.model.wexog
+        return (np.dot(wexog, self.normalized_cov_params) * wexog).sum(1)
+
+    @cache_readonly
+    def cov_HC2(self):
+        """
+        Stacked HC2 covariance matrices, see RegressionResults
+        """
+        het_scale = self.wresid**2 / (1 - self._leverage)[:, None]
+        return self._sandwich(self._het_meat(het_scale))
+
+    @cache_readonly
+    def cov_HC3(self):
+        """
+        Stacked HC3 covariance matrices, see RegressionResults
+        """
+        het_scale = (self.wresid / (1 - self._leverage)[:, None])**2
+        return self._sandwich(self._het_meat(het_scale))
+
+    @cache_readonly
+    def cov_params_default(self):
+        cov_type = self.cov_type.upper()
+        if cov_type == 'NONROBUST':
+            return (self.scale[:, None, None] *
+                    self.normalized_cov_params[None, :, :])
+        elif cov_type == 'CLUSTER':
+            cov_c = self._sandwich(self._cluster_meat(self.cov_kwds['groups']))
+            if self.cov_kwds.get('use_correction', True):
+                n_groups = self.n_groups
+                nobs, k_params = self.nobs, self.model.wexog.shape[1]
+                cov_c *= (n_groups / (n_groups - 1.) *
+                          ((nobs - 1.) / float(nobs - k_params)))
+            return cov_c
+        else:
+            return getattr(self, 'cov_' + cov_type)
+
+    def cov_params(self):
+        """
+        Stacked covariance matrices of the parameter estimates.
+
+        Returns
+        -------
+        cov : ndarray
+            (k_endog, k_vars, k_vars) array, the covariance of the parameters
+            of the regression for endog column `j` is ``cov[j]``.
+        """
+        return self.cov_params_default
+
+    @cache_readonly
+    def bse(self):
+        cov = self.cov_params_default
+        return np.sqrt(np.diagonal(cov, axis1=1, axis2=2)).T
+
+    @cache_readonly
+    def tvalues(self):
+        return self.params / self.bse
+
+    @cache_readonly
+    def pvalues(self):
+        if self.use_t:
+            df_resid = self.df_resid_inference
+            return stats.t.sf(np.abs(self.tvalues), df_resid) * 2
+        else:
+            return stats.norm.sf(np.abs(self.tvalues)) * 2
+
+    @cache_readonly
+    def fvalue(self):
+        if self.cov_type.upper() == 'NONROBUST':
+            return self.mse_model / self.mse_resid
+        # Wald test that all slope coefficients are zero
+        k_params = self.params.shape[0]
+        idx = lrange(k_params)
+        if self.k_constant:
+            const_idx = self.model.data.const_idx
+            if const_idx is None:
+                return np.nan * np.ones(self.k_endog)
+            idx.pop(const_idx)
+        params = self.params[idx].T[:, :, None]
+        cov = self.cov_params_default[:, idx][:, :, idx]
+        wald = np_matmul(np.swapaxes(params, 1, 2),
+                         np.linalg.solve(cov, params)).squeeze((1, 2))
+        return wald / len(idx)
+
+    @cache_readonly
+    def f_pvalue(self):
+        if self.cov_type.upper() == 'NONROBUST':
+            return stats.f.sf(self.fvalue, self.df_model, self.df_resid)
+        k_test = self.params.shape[0] - int(bool(self.k_constant))
+        return stats.f.sf(self.fvalue, k_test, self.df_resid_inference)
+
+    def column_results(self, idx):
+        """
+        Results instance of the regression for a single column of endog.
+
+        Parameters
+        ----------
+        idx : int
+            Column index of endog.
+
+        Returns
+        -------
+        results : RegressionResults instance
+            The results use the covariance type of the batched results.
+            They are created on the first request and cached.
+        """
+        if idx in self._column_results:
+            return self._column_results[idx]
+
+        import copy
+        model = copy.copy(self.model)
+        model.endog = self.model.endog[:, idx]
+        model.wendog = self.model.wendog[:, idx]
+        data = copy.copy(self.model.data)
+        data._cache = resettable_cache()
+        data.endog = model.endog
+        ynames = self.model.data.ynames
+        data.ynames = ynames[idx] if isinstance(ynames, list) else ynames
+        model.data = data
+
+        klass = OLSResults if isinstance(model, OLS) else RegressionResults
+        res = klass(model, self.params[:, idx],
+                    normalized_cov_params=self.normalized_cov_params)
+        if self.cov_type != 'nonrobust':
+            res.cov_type = self.cov_type
+            res.cov_kwds = dict(self.cov_kwds, use_t=self.use_t)
+            res.use_t = self.use_t
+            res.cov_params_default = self.cov_params_default[idx]
+            if self.cov_type.upper() == 'CLUSTER':
+                res.n_groups = self.n_groups
+                if self.cov_kwds.get('df_correction', True) is not False:
+                    res.df_resid_inference = self.df_resid_inference
+        res = RegressionResultsWrapper(res)
+        self._column_results[idx] = res
+        return res
+
+
+class BatchedRegressionResultsWrapper(wrap.ResultsWrapper):
+
+    _wrap_attrs = {
+        'params': 'columns_eq',
+        'bse': 'columns_eq',
+        'tvalues': 'columns_eq',
+        'pvalues': 'columns_eq',
+        'ssr': ('generic_columns', 'ynames'),
+        'scale': ('generic_columns', 'ynames'),
+        'centered_tss': ('generic_columns', 'ynames'),
+        'uncentered_tss': ('generic_columns', 'ynames'),
+        'ess': ('generic_columns', 'ynames'),
+        'rsquared': ('generic_columns', 'ynames'),
+        'rsquared_adj': ('generic_columns', 'ynames'),
+        'mse_model': ('generic_columns', 'ynames'),
+        'mse_resid': ('generic_columns', 'ynames'),
+        'llf': ('generic_columns', 'ynames'),
+        'aic': ('generic_columns', 'ynames'),
+        'bic': ('generic_columns', 'ynames'),
+        'fvalue': ('generic_columns', 'ynames'),
+        'f_pvalue': ('generic_columns', 'ynames'),
+        'fittedvalues': 'rows',
+        'resid': 'rows',
+        'wresid': 'rows',
+    }
+
+    _wrap_methods = {}
+
+wrap.populate_wrapper(BatchedRegressionResultsWrapper,
+                      BatchedRegressionResults)
+
 if __name__ == "__main__":
     import statsmodels.api as sm
     data = sm.datasets.longley.load()
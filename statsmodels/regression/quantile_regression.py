@@ -3,8 +3,9 @@
 '''
 Quantile regression model
 
-Model parameters are estimated using iterated reweighted least squares. The
-asymptotic covariance matrix estimated using kernel density estimation.
+Model parameters are estimated using iterated reweighted least squares or
+the Frisch-Newton interior point method. The asymptotic covariance matrix
+estimated using kernel density estimation.
 
 Author: Vincent Arel-Bundock
 License: BSD-3
@@ -19,13 +20,16 @@ Prinoth (christian at prinoth dot name).
 
 from statsmodels.compat.python import range
 import numpy as np
+import pandas as pd
 import warnings
 import scipy.stats as stats
+from scipy import linalg
 from scipy.linalg import pinv
 from scipy.stats import norm
 from statsmodels.tools.tools import chain_dot
 from statsmodels.compat.numpy import np_matrix_rank
 from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools.data import _is_using_pandas
 from statsmodels.regression.linear_model import (RegressionModel,
                                                  RegressionResults,
                                                  RegressionResultsWrapper)
@@ -36,7 +40,7 @@ class QuantReg(RegressionModel):
     '''Quantile Regression
 
     Estimate a quantile regression model using iterative reweighted least
-    squares.
+    squares or an interior point method.
 
     Parameters
     ----------
@@ -62,6 +66,7 @@ class QuantReg(RegressionModel):
     * Green,W. H. (2008). Econometric Analysis. Sixth Edition. International Student Edition.
     * Koenker, R. (2005). Quantile Regression. New York: Cambridge University Press.
     * LeSage, J. P.(1999). Applied Econometrics Using MATLAB,
+    * Portnoy, S. and R. Koenker (1997). The Gaussian Hare and the Laplacian Tortoise: Computability of Squared-Error versus Absolute-Error Estimators. Statistical Science 12: 279-300.
 
     Kernels (used by the fit method):
 
@@ -87,8 +92,9 @@ class QuantReg(RegressionModel):
         return data
 
     def fit(self, q=.5, vcov='robust', kernel='epa', bandwidth='hsheather',
-            max_iter=1000, p_tol=1e-6, **kwargs):
-        '''Solve by Iterative Weighted Least Squares
+            max_iter=1000, p_tol=1e-6, method='irls', start_params=None,
+            **kwargs):
+        '''Solve by Iterative Weighted Least Squares or an interior point method
 
         Parameters
         ----------
@@ -116,48 +122,119 @@ class QuantReg(RegressionModel):
             - hsheather: Hall-Sheather (1988)
             - bofinger: Bofinger (1975)
             - chamberlain: Chamberlain (1994)
+
+        max_iter : int
+            Maximum number of iterations
+        p_tol : float
+            Convergence tolerance for the maximum absolute change in the
+            parameters, only used by ``irls``. The interior point method
+            stops when the duality gap is zero up to rounding error.
+        method : string
+            Method used to solve the linear program:
+
+            - irls : iteratively reweighted least squares
+            - interior-point : Frisch-Newton primal-dual interior point
+              method (Portnoy and Koenker 1997), which needs far fewer
+              iterations for large samples
+
+        start_params : None or array_like
+            Starting values for the parameters. The default is ordinary least
+            squares.
         '''
 
         if q < 0 or q > 1:
             raise Exception('p must be between 0 and 1')
 
-        kern_names = ['biw', 'cos', 'epa', 'gau', 'par']
-        if kernel not in kern_names:
-            raise Exception("kernel must be one of " + ', '.join(kern_names))
-        else:
-            kernel = kernels[kernel]
-
-        if bandwidth == 'hsheather':
-            bandwidth = hall_sheather
-        elif bandwidth == 'bofinger':
-            bandwidth = bofinger
-        elif bandwidth == 'chamberlain':
-            bandwidth = chamberlain
+        kernel, bandwidth = _get_kernel_bandwidth(kernel, bandwidth)
+        self._set_dof()
+        beta, n_iter, history = self._solve(q, method, max_iter, p_tol,
+                                            start_params)
+        lfit = self._make_results(beta, q, vcov, kernel, bandwidth)
+        lfit.iterations = n_iter
+        lfit.history = history
+
+        return RegressionResultsWrapper(lfit)
+
+    def fit_quantiles(self, qs, vcov='robust', kernel='epa',
+                      bandwidth='hsheather', max_iter=1000, p_tol=1e-6,
+                      method='interior-point', warm_start=True):
+        '''Fit the model for a sequence of quantiles
+
+        Parameters
+        ----------
+        qs : array_like
+            Quantiles, each strictly between 0 and 1. Neighboring quantiles
+            are used as warm starts, so `qs` should be sorted.
+        vcov, kernel, bandwidth, max_iter, p_tol, method
+            See `fit`. The default method is ``interior-point``.
+        warm_start : bool
+            If True, then the parameters of the previous quantile are used as
+            starting values.
+
+        Returns
+        -------
+        results : QuantRegProcessResults
+            Stacked results with one row per quantile.
+
+        Notes
+        -----
+        The inverse of exog' exog is computed once and shared by the
+        covariance estimates of all quantiles.
+        '''
+        qs = np.atleast_1d(np.asarray(qs, dtype=np.float64))
+        if np.any(qs <= 0) or np.any(qs >= 1):
+            raise ValueError('quantiles must be strictly between 0 and 1')
+
+        kernel, bandwidth = _get_kernel_bandwidth(kernel, bandwidth)
+        self._set_dof()
+        xtxi = pinv(np.dot(self.exog.T, self.exog))
+        results = []
+        beta = None
+        for q in qs:
+            start_params = beta if warm_start else None
+            beta, n_iter, history = self._solve(q, method, max_iter, p_tol,
+                                                start_params)
+            lfit = self._make_results(beta, q, vcov, kernel, bandwidth,
+                                      xtxi=xtxi)
+            lfit.iterations = n_iter
+            lfit.history = history
+            results.append(RegressionResultsWrapper(lfit))
+
+        return QuantRegProcessResults(self, qs, results)
+
+    def _set_dof(self):
+        self.rank = np_matrix_rank(self.exog)
+        self.df_model = float(self.rank - self.k_constant)
+        self.df_resid = self.nobs - self.rank
+
+    def _solve(self, q, method, max_iter, p_tol, start_params):
+        if method == 'irls':
+            return self._fit_irls(q, max_iter, p_tol, start_params)
+        elif method == 'interior-point':
+            if q <= 0 or q >= 1:
+                raise ValueError('the interior point method requires q '
+                                 'strictly between 0 and 1')
+            return _fit_interior_point(self.endog, self.exog, q,
+                                       start_params=start_params,
+                                       max_iter=max_iter)
         else:
-            raise Exception("bandwidth must be in 'hsheather', 'bofinger', 'chamberlain'")
+            raise ValueError("method must be 'irls' or 'interior-point'")
 
+    def _fit_irls(self, q, max_iter, p_tol, start_params=None):
         endog = self.endog
         exog = self.exog
-        nobs = self.nobs
-        exog_rank = np_matrix_rank(self.exog)
-        self.rank = exog_rank
-        self.df_model = float(self.rank - self.k_constant)
-        self.df_resid = self.nobs - self.rank
         n_iter = 0
         xstar = exog
 
-        beta = np.ones(exog_rank)
+        beta = np.ones(self.rank)
         # TODO: better start, initial beta is used only for convergence check
-
-        # Note the following doesn't work yet,
-        # the iteration loop always starts with OLS as initial beta
-#        if start_params is not None:
-#            if len(start_params) != rank:
-#                raise ValueError('start_params has wrong length')
-#            beta = start_params
-#        else:
-#            # start with OLS
-#            beta = np.dot(np.linalg.pinv(exog), endog)
+        if start_params is not None:
+            beta = np.asarray(start_params, dtype=np.float64)
+            if len(beta) != exog.shape[1]:
+                raise ValueError('start_params has wrong length')
+            # reweight with the residuals at the starting values
+            resid = _irls_weights(endog - np.dot(exog, beta), q)
+            xstar = exog / resid[:, np.newaxis]
 
         diff = 10
         cycle = False
@@ -169,12 +246,7 @@ class QuantReg(RegressionModel):
             xtx = np.dot(xstar.T, exog)
             xty = np.dot(xstar.T, endog)
             beta = np.dot(pinv(xtx), xty)
-            resid = endog - np.dot(exog, beta)
-
-            mask = np.abs(resid) < .000001
-            resid[mask] = ((resid[mask] >= 0) * 2 - 1) * .000001
-            resid = np.where(resid < 0, q * resid, (1-q) * resid)
-            resid = np.abs(resid)
+            resid = _irls_weights(endog - np.dot(exog, beta), q)
             xstar = exog / resid[:, np.newaxis]
             diff = np.max(np.abs(beta - beta0))
             history['params'].append(beta)
@@ -189,9 +261,16 @@ class QuantReg(RegressionModel):
                         break
 
         if n_iter == max_iter:
-            warnings.warn("Maximum number of iterations (" + str(max_iter) + 
+            warnings.warn("Maximum number of iterations (" + str(max_iter) +
                           ") reached.", IterationLimitWarning)
 
+        return beta, n_iter, history
+
+    def _make_results(self, beta, q, vcov, kernel, bandwidth, xtxi=None):
+        endog = self.endog
+        exog = self.exog
+        nobs = self.nobs
+
         e = endog - np.dot(exog, beta)
         # Greene (2008, p.407) writes that Stata 6 uses this bandwidth:
         # h = 0.9 * np.std(e) / (nobs**0.2)
@@ -203,25 +282,163 @@ class QuantReg(RegressionModel):
 
         fhat0 = 1. / (nobs * h) * np.sum(kernel(e / h))
 
+        if xtxi is None:
+            xtxi = pinv(np.dot(exog.T, exog))
         if vcov == 'robust':
             d = np.where(e > 0, (q/fhat0)**2, ((1-q)/fhat0)**2)
-            xtxi = pinv(np.dot(exog.T, exog))
             xtdx = np.dot(exog.T * d[np.newaxis, :], exog)
             vcov = chain_dot(xtxi, xtdx, xtxi)
         elif vcov == 'iid':
-            vcov = (1. / fhat0)**2 * q * (1 - q) * pinv(np.dot(exog.T, exog))
+            vcov = (1. / fhat0)**2 * q * (1 - q) * xtxi
         else:
             raise Exception("vcov must be 'robust' or 'iid'")
 
         lfit = QuantRegResults(self, beta, normalized_cov_params=vcov)
 
         lfit.q = q
-        lfit.iterations = n_iter
         lfit.sparsity = 1. / fhat0
         lfit.bandwidth = h
-        lfit.history = history
-
-        return RegressionResultsWrapper(lfit)
+        return lfit
+
+
+def _get_kernel_bandwidth(kernel, bandwidth):
+    kern_names = ['biw', 'cos', 'epa', 'gau', 'par']
+    if kernel not in kern_names:
+        raise Exception("kernel must be one of " + ', '.join(kern_names))
+    else:
+        kernel = kernels[kernel]
+
+    if bandwidth == 'hsheather':
+        bandwidth = hall_sheather
+    elif bandwidth == 'bofinger':
+        bandwidth = bofinger
+    elif bandwidth == 'chamberlain':
+        bandwidth = chamberlain
+    else:
+        raise Exception("bandwidth must be in 'hsheather', 'bofinger', 'chamberlain'")
+    return kernel, bandwidth
+
+
+def _irls_weights(resid, q):
+    mask = np.abs(resid) < .000001
+    resid[mask] = ((resid[mask] >= 0) * 2 - 1) * .000001
+    resid = np.where(resid < 0, q * resid, (1-q) * resid)
+    return np.abs(resid)
+
+
+def _step_length(x, dx):
+    """largest step in direction dx that keeps x nonnegative"""
+    # the step is limited by the largest relative decrease, fmax ignores
+    # the nans of components that are zero and do not change
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = np.fmax.reduce(-dx / x)
+    if rate <= 0:
+        return 1e20
+    return 1. / rate
+
+
+def _fit_interior_point(endog, exog, q, start_params=None, max_iter=1000,
+                        gap_tol=1e-10, beta=0.99995):
+    """
+    Quantile regression by the Frisch-Newton interior point method
+
+    The dual linear program, max y'a subject to X'a = (1 - q) X'1 and
+    0 <= a <= 1, is solved with Mehrotra's predictor-corrector steps as
+    in Portnoy and Koenker (1997) and `rq.fit.fnb` of the R package
+    quantreg. Each step solves the normal equations with a Cholesky
+    factorization of X' diag(d) X that is shared by the predictor and
+    corrector step.
+
+    The iterations stop if the duality gap relative to the initial objective
+    function is smaller than `gap_tol`.
+
+    Returns
+    -------
+    params : ndarray
+    n_iter : int
+    history : dict
+        Duality gap in each iteration.
+    """
+    nobs = exog.shape[0]
+    c = -endog
+    u = np.ones(nobs)
+    x = (1 - q) * u
+    b = np.dot(exog.T, x)
+    s = u - x
+
+    def factorize(weights):
+        xtdx = np.dot(exog.T * weights, exog)
+        try:
+            factor = linalg.cho_factor(xtdx)
+            return lambda rhs: linalg.cho_solve(factor, rhs)
+        except linalg.LinAlgError:
+            xtdx_inv = pinv(xtdx)
+            return lambda rhs: np.dot(xtdx_inv, rhs)
+
+    if start_params is None:
+        y = np.linalg.lstsq(exog, c, rcond=-1)[0]
+    else:
+        y = -np.asarray(start_params, dtype=np.float64)
+        if len(y) != exog.shape[1]:
+            raise ValueError('start_params has wrong length')
+    r = c - np.dot(exog, y)
+    # z - w = r with z, w > 0, the shift keeps the slacks of observations
+    # with zero residuals, e.g. at warm starts, away from the boundary
+    shift = 1e-3 * max(np.mean(np.abs(r)), 1e-10)
+    z = np.where(r > 0, r, 0) + shift
+    w = z - r
+    gap = np.dot(c, x) - np.dot(y, b) + np.dot(w, u)
+
+    history = dict(gap=[gap])
+    n_iter = 0
+    gap_tol = gap_tol * max(1, np.abs(np.dot(c, x)))
+    while gap > gap_tol and n_iter < max_iter:
+        n_iter += 1
+        # affine scaling (predictor) step
+        d = 1. / (z / x + w / s)
+        r = z - w
+        solve = factorize(d)
+        dy = solve(np.dot(exog.T, d * r))
+        dx = d * (np.dot(exog, dy) - r)
+        ds = -dx
+        dz = -z * (dx / x + 1)
+        dw = -w * (ds / s + 1)
+        fp = min(beta * min(_step_length(x, dx), _step_length(s, ds)), 1)
+        fd = min(beta * min(_step_length(w, dw), _step_length(z, dz)), 1)
+
+        if min(fp, fd) < 1:
+            # centering (corrector) step
+            mu = np.dot(z, x) + np.dot(w, s)
+            g = (np.dot(z + fd * dz, x + fp * dx) +
+                 np.dot(w + fd * dw, s + fp * ds))
+            mu = mu * (g / mu)**3 / (2 * nobs)
+            dxdz = dx * dz
+            dsdw = ds * dw
+            xinv = 1. / x
+            sinv = 1. / s
+            xi = mu * (xinv - sinv)
+            rhs = d * r + d * (dxdz - dsdw - xi)
+            dy = solve(np.dot(exog.T, rhs))
+            dx = d * (np.dot(exog, dy) + xi - r - dxdz + dsdw)
+            ds = -dx
+            dz = mu * xinv - z - xinv * z * dx - dxdz
+            dw = mu * sinv - w - sinv * w * ds - dsdw
+            fp = min(beta * min(_step_length(x, dx), _step_length(s, ds)), 1)
+            fd = min(beta * min(_step_length(w, dw), _step_length(z, dz)), 1)
+
+        x = x + fp * dx
+        s = s + fp * ds
+        y = y + fd * dy
+        w = w + fd * dw
+        z = z + fd * dz
+        gap = np.dot(c, x) - np.dot(y, b) + np.dot(w, u)
+        history['gap'].append(gap)
+
+    if n_iter == max_iter:
+        warnings.warn("Maximum number of iterations (" + str(max_iter) +
+                      ") reached.", IterationLimitWarning)
+
+    return -y, n_iter, history
 
 
 def _parzen(u):
@@ -443,3 +660,110 @@ class QuantRegResults(RegressionResults):
             smry.add_extra_txt(etext)
 
         return smry
+
+
+class QuantRegProcessResults(object):
+    """
+    Results of quantile regressions for a sequence of quantiles
+
+    Parameter related attributes have shape (n_quantiles, k_vars) and
+    statistics have shape (n_quantiles,). If the data of the model are
+    pandas objects, then the attributes are returned as DataFrames or
+    Series indexed by the quantiles.
+
+    Attributes
+    ----------
+    q : ndarray
+        The quantiles.
+    results : list
+        The `QuantRegResults` instance of each quantile.
+    """
+
+    def __init__(self, model, q, results):
+        self.model = model
+        self.q = q
+        self.results = results
+
+    def __len__(self):
+        return len(self.results)
+
+    def __getitem__(self, idx):
+        return self.results[idx]
+
+    def _stack(self, name):
+        return np.array([getattr(res._results, name) for res in self.results])
+
+    def _wrap(self, value, columns=None):
+        if not _is_using_pandas(self.model.data.orig_endog, None):
+            return value
+        index = pd.Index(self.q, name='q')
+        if value.ndim == 1:
+            return pd.Series(value, index=index)
+        return pd.DataFrame(value, index=index, columns=columns)
+
+    @property
+    def params(self):
+        """Estimated parameters of each quantile"""
+        return self._wrap(self._stack('params'), self.model.data.param_names)
+
+    @property
+    def bse(self):
+        """Standard errors of the parameter estimates"""
+        return self._wrap(self._stack('bse'), self.model.data.param_names)
+
+    @property
+    def tvalues(self):
+        """t-statistics of the parameter estimates"""
+        return self._wrap(self._stack('tvalues'), self.model.data.param_names)
+
+    @property
+    def pvalues(self):
+        """Two-sided p-values of the t-statistics"""
+        return self._wrap(self._stack('pvalues'), self.model.data.param_names)
+
+    @property
+    def prsquared(self):
+        """Pseudo R-squared of each quantile"""
+        return self._wrap(self._stack('prsquared'))
+
+    @property
+    def sparsity(self):
+        """Estimated sparsity of each quantile"""
+        return self._wrap(self._stack('sparsity'))
+
+    @property
+    def iterations(self):
+        """Number of iterations of each quantile"""
+        return self._wrap(self._stack('iterations'))
+
+    def cov_params(self):
+        """
+        Covariance of the parameter estimates
+
+        Returns
+        -------
+        cov : ndarray
+            Array of shape (n_quantiles, k_vars, k_vars).
+        """
+        return np.array([res._results.cov_params() for res in self.results])
+
+    def conf_int(self, alpha=.05):
+        """
+        Confidence intervals of the parameters
+
+        Parameters
+        ----------
+        alpha : float
+            The confidence intervals have coverage 1 - alpha.
+
+        Returns
+        -------
+        lower, upper : ndarray or DataFrame
+            Lower and upper confidence limits with shape
+            (n_quantiles, k_vars).
+        """
+        ci = np.array([res._results.conf_int(alpha)
+                       for res in self.results])
+        names = self.model.data.param_names
+        return (self._wrap(ci[:, :, 0], names),
+                self._wrap(ci[:, :, 1], names))
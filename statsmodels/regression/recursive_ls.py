@@ -231,6 +231,12 @@ class RecursiveLSResults(MLEResults):
         self.specification = Bunch(**{
             'k_exog': self.model.k_exog})
 
+    def _filter_fixed(self, mod, **kwargs):
+        # the coefficients are the states, so the recursions continue with
+        # the measurement variance of these results
+        mod['obs_cov', 0, 0] = self.filter_results.obs_cov[0, 0]
+        return mod.filter(**kwargs)
+
     @property
     def recursive_coefficients(self):
         """
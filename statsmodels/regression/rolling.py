@@ -0,0 +1,631 @@
+"""
+Rolling and expanding window least squares
+
+The cross products of all windows are computed at once from window sums of
+the row outer products. Window sums are formed from prefix and suffix sums
+within blocks of length `window`, which avoids the loss of precision of
+differencing long cumulative sums. The cross products with endog are taken
+of the residuals of the full sample regression, so that the sums of
+squared residuals of the windows do not cancel against y'y.
+
+References
+----------
+Gil, J. and Werman, M. (1993). Computing 2-D min, median, and max filters.
+    IEEE Transactions on Pattern Analysis and Machine Intelligence, 15(5),
+    504-507.
+"""
+from statsmodels.compat.python import lrange, range
+from statsmodels.compat.numpy import np_matmul
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from statsmodels.base.data import handle_data
+from statsmodels.tools.data import _is_using_pandas
+from statsmodels.tools.decorators import cache_readonly, resettable_cache
+
+__all__ = ['RollingOLS', 'RollingWLS']
+
+# Windows for which the sum of squared residuals is smaller than this
+# fraction of the sum of squares of the full sample residuals are
+# recomputed from the residuals of the window
+_SSR_CANCEL_TOL = 1e-6
+
+
+def _window_sums(x, window):
+    """
+    Sums of `x` over the rows ``max(0, t - window + 1), ..., t``
+
+    Parameters
+    ----------
+    x : ndarray
+        Array with observations in the first axis.
+    window : int or None
+        Length of the window. If None, then the sums are cumulative sums.
+
+    Returns
+    -------
+    sums : ndarray
+        Array with the same shape as `x`.
+    """
+    nobs = x.shape[0]
+    if window is None or window >= nobs:
+        return np.cumsum(x, axis=0)
+
+    n_blocks = -(-nobs // window)
+    pad = n_blocks * window - nobs
+    xp = np.concatenate((x, np.zeros((pad,) + x.shape[1:])), axis=0)
+    xb = xp.reshape((n_blocks, window) + x.shape[1:])
+    prefix = np.cumsum(xb, axis=1).reshape(xp.shape)[:nobs]
+    suffix = np.cumsum(xb[:, ::-1], axis=1)[:, ::-1].reshape(xp.shape)[:nobs]
+
+    # windows that are not aligned with a block combine the suffix of the
+    # previous block with the prefix of the current block
+    sums = prefix
+    t = np.arange(window, nobs)
+    t = t[t % window != window - 1]
+    sums[t] += suffix[t - window + 1]
+    return sums
+
+
+def _stacked_cholesky(a):
+    """
+    Cholesky factors of a stack of matrices
+
+    Returns the lower triangular factors and a boolean array that is False
+    for the matrices that are not numerically positive definite, whose
+    factors are nan.
+    """
+    try:
+        return np.linalg.cholesky(a), np.ones(len(a), dtype=bool)
+    except np.linalg.LinAlgError:
+        chol = np.empty_like(a)
+        chol.fill(np.nan)
+        chol_ok = np.zeros(len(a), dtype=bool)
+        for i in range(len(a)):
+            try:
+                chol[i] = np.linalg.cholesky(a[i])
+                chol_ok[i] = True
+            except np.linalg.LinAlgError:
+                pass
+        return chol, chol_ok
+
+
+def _stacked_solve(a, b):
+    """
+    Solutions of a stack of linear systems
+
+    Returns the solutions of ``a[i] x = b[i]``, which are nan for the
+    singular matrices instead of raising for the whole stack.
+    """
+    try:
+        return np.linalg.solve(a, b)
+    except np.linalg.LinAlgError:
+        x = np.empty(np.broadcast(a[..., :1], b).shape)
+        x.fill(np.nan)
+        for i in range(len(a)):
+            try:
+                x[i] = np.linalg.solve(a[i], b[i])
+            except np.linalg.LinAlgError:
+                pass
+        return x
+
+
+class RollingWLS(object):
+    """
+    Rolling weighted least squares
+
+    Parameters
+    ----------
+    endog : array-like
+        1-d endogenous response variable.
+    exog : array-like
+        nobs x k_vars design matrix. An intercept is not included by
+        default and should be added by the user.
+    window : int or None
+        Length of the rolling window. If None, then the windows expand from
+        the first observation to the end of the sample.
+    weights : array-like, optional
+        1d array of weights, see `WLS`. Default is 1, i.e. OLS.
+    min_nobs : int, optional
+        Minimum number of valid observations in a window required for an
+        estimate. Default is k_vars + 1.
+    expanding : bool
+        If True, then the windows at the beginning of the sample, before
+        `window` observations are available, are filled with expanding
+        windows that have at least `min_nobs` valid observations. If False,
+        these windows are nan.
+    missing : str
+        'drop' excludes observations with nan from the windows that
+        contain them, 'raise' raises an error if there are nans.
+    hasconst : None or bool
+        Indicates whether the design includes a user-supplied constant.
+
+    Notes
+    -----
+    The estimates for a window are stored at the position of the last
+    observation of the window. Estimates of windows with fewer than
+    `min_nobs` valid observations are nan.
+
+    The cross products X'X, X'e and e'e of all windows, with e the
+    residuals of the full sample regression, are computed as window sums,
+    so that the cost of the fit is O(nobs * k_vars**2) for the cross
+    products plus the Cholesky factorizations of the nobs (k_vars, k_vars)
+    systems, independently of the window length. The sum of squared
+    residuals of a window is e'e minus the explained part, and is
+    recomputed from the residuals of the window if the difference loses
+    too much precision. Rank deficient windows are estimated separately
+    with the pseudo-inverse of the window's exog, as in `OLS`.
+    Heteroscedasticity robust covariances require the residuals of each
+    window and are computed in blocks of windows with matrix products.
+
+    Examples
+    --------
+    >>> mod = RollingOLS(endog, exog, window=60)
+    >>> res = mod.fit(cov_type='HC0')
+    >>> res.params.tail()
+    """
+    def __init__(self, endog, exog, window=None, weights=None, min_nobs=None,
+                 expanding=False, missing='drop', hasconst=None):
+        if missing not in ('drop', 'raise'):
+            raise ValueError("missing must be 'drop' or 'raise'")
+        self.data = handle_data(endog, exog, hasconst=hasconst)
+        self.k_constant = self.data.k_constant
+        self.endog = np.asarray(self.data.endog, dtype=np.float64)
+        self.exog = np.asarray(self.data.exog, dtype=np.float64)
+        if self.endog.ndim != 1:
+            raise ValueError('endog must be 1-d')
+        nobs, k_vars = self.exog.shape
+        self.nobs = nobs
+        self.k_vars = k_vars
+
+        if weights is None:
+            weights = np.ones(nobs)
+        else:
+            weights = np.asarray(weights, dtype=np.float64)
+            if weights.shape == ():
+                weights = np.repeat(weights, nobs)
+            if weights.shape != (nobs,):
+                raise ValueError('weights must be scalar or have the same '
+                                 'length as endog')
+        self.weights = weights
+
+        if window is not None:
+            window = int(window)
+            if window < 1 or window > nobs:
+                raise ValueError('window must be between 1 and nobs')
+        self.window = window
+        self.min_nobs = k_vars + 1 if min_nobs is None else int(min_nobs)
+        if self.min_nobs < 1:
+            raise ValueError('min_nobs must be positive')
+        self.expanding = expanding or window is None
+        self.missing = missing
+
+        valid = ~(np.isnan(self.endog) | np.isnan(self.exog).any(1) |
+                  np.isnan(weights))
+        if missing == 'raise' and not valid.all():
+            raise ValueError('endog, exog or weights contain nan')
+        self._valid = valid
+
+    @property
+    def endog_names(self):
+        return self.data.ynames
+
+    @property
+    def exog_names(self):
+        return self.data.xnames
+
+    def _whitened(self):
+        valid = self._valid
+        w_half = np.where(valid, np.sqrt(np.where(valid, self.weights, 1.)),
+                          0.)
+        wendog = np.where(valid, self.endog, 0.) * w_half
+        wexog = np.where(valid[:, None], self.exog, 0.) * w_half[:, None]
+        return wendog, wexog
+
+    def _window_starts(self):
+        t = np.arange(self.nobs)
+        if self.window is None:
+            return np.zeros(self.nobs, dtype=int)
+        return np.maximum(t - self.window + 1, 0)
+
+    def fit(self, cov_type='nonrobust', use_t=None, params_only=False):
+        """
+        Estimate the regression for all windows
+
+        Parameters
+        ----------
+        cov_type : str, optional
+            'nonrobust', 'HC0', 'HC1', 'HC2' or 'HC3'. The
+            heteroscedasticity robust covariances are computed from the
+            residuals of each window.
+        use_t : bool, optional
+            Flag indicating to use the Student's t distribution when
+            computing p-values. The default is True for cov_type nonrobust
+            and False otherwise.
+        params_only : bool, optional
+            If True, then the covariances of the parameters are not
+            computed. The statistics that do not depend on them, e.g.
+            `nobs`, `ssr` and `rsquared`, are available, but `cov_params`,
+            `bse`, `tvalues`, `pvalues` and `fvalue` raise ValueError.
+
+        Returns
+        -------
+        results : RollingRegressionResults instance
+        """
+        cov_type_ = cov_type.upper()
+        if cov_type_ not in ('NONROBUST', 'HC0', 'HC1', 'HC2', 'HC3'):
+            raise ValueError('cov_type %s is not available for rolling '
+                             'regressions' % cov_type)
+        window = self.window
+        wendog, wexog = self._whitened()
+        nobs, k_vars = wexog.shape
+
+        # residuals of the full sample regression, the windows are fit to
+        # these residuals
+        params0 = np.linalg.lstsq(wexog, wendog, rcond=-1)[0]
+        resid0 = wendog - np.dot(wexog, params0)
+
+        xx = wexog[:, :, None] * wexog[:, None, :]
+        xtx = _window_sums(xx, window)
+        xte = _window_sums(wexog * resid0[:, None], window)
+        ee = _window_sums(resid0**2, window)
+        nobs_window = _window_sums(self._valid.astype(np.float64), window)
+
+        ok = nobs_window >= self.min_nobs
+        if not self.expanding:
+            ok[:window - 1] = False
+        idx = np.nonzero(ok)[0]
+
+        rank = np.zeros(nobs)
+        rank[idx] = np.linalg.matrix_rank(xtx[idx])
+        full = idx[rank[idx] == k_vars]
+        chol, chol_ok = _stacked_cholesky(xtx[full])
+        deficient = np.sort(np.r_[idx[rank[idx] < k_vars], full[~chol_ok]])
+        full = full[chol_ok]
+        chol = chol[chol_ok]
+
+        params = np.empty((nobs, k_vars))
+        params.fill(np.nan)
+        ssr = np.empty(nobs)
+        ssr.fill(np.nan)
+        xtx_inv = np.empty((nobs, k_vars, k_vars))
+        xtx_inv.fill(np.nan)
+
+        # X'X = L L', the window parameters are params0 + L'^-1 L^-1 X'e and
+        # the sum of squared residuals is e'e - |L^-1 X'e|**2
+        z = np.linalg.solve(chol, xte[full][:, :, None])
+        params[full] = params0 + np.linalg.solve(np.swapaxes(chol, 1, 2),
+                                                 z)[:, :, 0]
+        ssr[full] = ee[full] - (z[:, :, 0]**2).sum(1)
+        cancel = full[ssr[full] < _SSR_CANCEL_TOL * ee[full]]
+        ssr[cancel] = self._window_ssr(resid0, wexog, params - params0,
+                                       cancel)
+        if not params_only:
+            chol_inv = np.linalg.inv(chol)
+            xtx_inv[full] = np_matmul(np.swapaxes(chol_inv, 1, 2), chol_inv)
+
+        starts = self._window_starts()
+        for t in deficient:
+            x = wexog[starts[t]:t + 1]
+            y = wendog[starts[t]:t + 1]
+            pinv_x = np.linalg.pinv(x)
+            params[t] = np.dot(pinv_x, y)
+            resid = y - np.dot(x, params[t])
+            ssr[t] = np.dot(resid, resid)
+            xtx_inv[t] = np.dot(pinv_x, pinv_x.T)
+
+        res = RollingRegressionResults(self, params, cov_type=cov_type,
+                                       use_t=use_t)
+
+        valid = self._valid
+        w = np.where(valid, self.weights, 0.)
+        y = np.where(valid, self.endog, 0.)
+        sums = _window_sums(np.column_stack((wendog**2, w, w * y,
+                                             np.log(np.where(valid, w, 1.)))),
+                            window)
+        yy, sum_w, sum_wy, sum_logw = sums.T
+
+        nan = np.where(ok, 1., np.nan)
+        res.nobs = np.where(ok, nobs_window, np.nan)
+        res.df_model = (rank - self.k_constant) * nan
+        res.df_resid = (nobs_window - rank) * nan
+        res.ssr = ssr
+        res.uncentered_tss = yy * nan
+        with np.errstate(invalid='ignore', divide='ignore'):
+            res.centered_tss = (yy - sum_wy**2 / sum_w) * nan
+        res._sum_logw = sum_logw * nan
+        if params_only:
+            return res
+
+        res.normalized_cov_params = xtx_inv
+        if cov_type_ != 'NONROBUST':
+            cov = np.empty((nobs, k_vars, k_vars))
+            cov.fill(np.nan)
+            meat = self._hc_meat(wendog, wexog, params, xtx_inv[idx], idx,
+                                 cov_type_)
+            cov[idx] = np_matmul(np_matmul(xtx_inv[idx], meat), xtx_inv[idx])
+            if cov_type_ == 'HC1':
+                cov *= (res.nobs / res.df_resid)[:, None, None]
+            res.cov_params_default = cov
+        return res
+
+    def _window_blocks(self, ends):
+        """
+        Iterate over blocks of the windows ending at `ends`
+
+        Yields the slice of `ends` in the block, the first and last row + 1
+        of the rows in the windows of the block and the mask of the rows
+        that are in each window, (rows x windows).
+        """
+        starts = self._window_starts()
+        length = self.nobs if self.window is None else self.window
+        block = max(1, min(length, 2**22 // (2 * length)))
+        for b0 in range(0, len(ends), block):
+            sl = slice(b0, b0 + block)
+            e = ends[sl]
+            r0 = starts[e].min()
+            r1 = e.max() + 1
+            rows = np.arange(r0, r1)
+            mask = ((rows[:, None] >= starts[e][None, :]) &
+                    (rows[:, None] <= e[None, :]))
+            yield sl, r0, r1, mask
+
+    def _window_ssr(self, resid0, wexog, delta, ends):
+        """
+        Sum of squared residuals of the windows ending at `ends`
+
+        The residuals of each window are resid0 - wexog * delta, with
+        delta the difference of the window parameters to the full sample
+        parameters.
+        """
+        ssr = np.empty(len(ends))
+        for sl, r0, r1, mask in self._window_blocks(ends):
+            resid = resid0[r0:r1, None] - np.dot(wexog[r0:r1],
+                                                 delta[ends[sl]].T)
+            ssr[sl] = np.where(mask, resid**2, 0.).sum(0)
+        return ssr
+
+    def _hc_meat(self, wendog, wexog, params, xtx_inv, idx, cov_type):
+        """
+        Middle part of the HC sandwich for the windows in `idx`
+
+        The windows are processed in blocks. For a block the residuals of
+        all rows in the windows of the block are computed with the
+        parameters of each window and the meats are obtained with one
+        matrix product with the row outer products.
+        """
+        nobs, k_vars = wexog.shape
+        xx = (wexog[:, :, None] * wexog[:, None, :]).reshape(nobs, -1)
+        meat = np.empty((len(idx), k_vars * k_vars))
+        for sl, r0, r1, mask in self._window_blocks(idx):
+            ends = idx[sl]
+            resid = (wendog[r0:r1, None] -
+                     np.dot(wexog[r0:r1], params[ends].T))
+            if cov_type in ('HC2', 'HC3'):
+                inv = xtx_inv[sl].reshape(len(ends), -1)
+                h = np.dot(xx[r0:r1], inv.T)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    if cov_type == 'HC2':
+                        resid = resid / np.sqrt(1 - h)
+                    else:
+                        resid = resid / (1 - h)
+                # exclude rows with leverage one, e.g. invalid rows
+                resid[~mask] = 0
+            het_scale = np.where(mask, resid**2, 0.)
+            meat[sl] = np.dot(het_scale.T, xx[r0:r1])
+        return meat.reshape(len(idx), k_vars, k_vars)
+
+
+class RollingOLS(RollingWLS):
+    """
+    Rolling ordinary least squares
+
+    Parameters
+    ----------
+    endog : array-like
+        1-d endogenous response variable.
+    exog : array-like
+        nobs x k_vars design matrix. An intercept is not included by
+        default and should be added by the user.
+    window : int or None
+        Length of the rolling window. If None, then the windows expand from
+        the first observation to the end of the sample.
+    min_nobs : int, optional
+        Minimum number of valid observations in a window required for an
+        estimate. Default is k_vars + 1.
+    expanding : bool
+        If True, then the windows at the beginning of the sample, before
+        `window` observations are available, are filled with expanding
+        windows that have at least `min_nobs` valid observations. If False,
+        these windows are nan.
+    missing : str
+        'drop' excludes observations with nan from the windows that
+        contain them, 'raise' raises an error if there are nans.
+    hasconst : None or bool
+        Indicates whether the design includes a user-supplied constant.
+
+    See Also
+    --------
+    RollingWLS
+    """
+    def __init__(self, endog, exog, window=None, min_nobs=None,
+                 expanding=False, missing='drop', hasconst=None):
+        super(RollingOLS, self).__init__(
+            endog, exog, window=window, weights=None, min_nobs=min_nobs,
+            expanding=expanding, missing=missing, hasconst=hasconst)
+
+
+class RollingRegressionResults(object):
+    """
+    Results of rolling window regressions
+
+    The estimates of a window are stored at the position of the last
+    observation in the window. Parameter related attributes have shape
+    (nobs, k_vars), statistics have shape (nobs,) and `cov_params` returns
+    an array of shape (nobs, k_vars, k_vars). If the data of the model are
+    pandas objects, then the attributes are returned as DataFrames or
+    Series indexed by the index of the data.
+
+    Attributes are computed with the same definitions as in
+    `RegressionResults`.
+    """
+
+    def __init__(self, model, params, cov_type='nonrobust', use_t=None):
+        self.model = model
+        self._params = params
+        self.cov_type = cov_type
+        if use_t is None:
+            use_t = (cov_type == 'nonrobust')
+        self.use_t = use_t
+        self.k_constant = model.k_constant
+        self._cache = resettable_cache()
+
+    def _wrap(self, value, columns=None):
+        if not _is_using_pandas(self.model.data.orig_endog, None):
+            return value
+        index = self.model.data.row_labels
+        if value.ndim == 1:
+            return pd.Series(value, index=index)
+        return pd.DataFrame(value, index=index, columns=columns)
+
+    @property
+    def params(self):
+        """Estimated parameters of each window"""
+        return self._wrap(self._params, self.model.data.param_names)
+
+    def cov_params(self):
+        """
+        Covariance matrices of the parameters of each window
+
+        Returns
+        -------
+        cov : ndarray
+            (nobs, k_vars, k_vars) array
+        """
+        if hasattr(self, 'cov_params_default'):
+            return self.cov_params_default
+        if not hasattr(self, 'normalized_cov_params'):
+            raise ValueError('the covariances are not computed with '
+                             'params_only=True')
+        return self.scale_[:, None, None] * self.normalized_cov_params
+
+    @cache_readonly
+    def scale_(self):
+        return self.ssr / self.df_resid
+
+    @property
+    def scale(self):
+        return self._wrap(self.scale_)
+
+    @cache_readonly
+    def _bse(self):
+        return np.sqrt(np.diagonal(self.cov_params(), axis1=1, axis2=2))
+
+    @property
+    def bse(self):
+        return self._wrap(self._bse, self.model.data.param_names)
+
+    @property
+    def tvalues(self):
+        return self._wrap(self._params / self._bse,
+                          self.model.data.param_names)
+
+    @property
+    def pvalues(self):
+        tvalues = np.abs(self._params / self._bse)
+        if self.use_t:
+            pvalues = stats.t.sf(tvalues, self.df_resid[:, None]) * 2
+        else:
+            pvalues = stats.norm.sf(tvalues) * 2
+        return self._wrap(pvalues, self.model.data.param_names)
+
+    @cache_readonly
+    def _ess(self):
+        if self.k_constant:
+            return self.centered_tss - self.ssr
+        else:
+            return self.uncentered_tss - self.ssr
+
+    @property
+    def ess(self):
+        return self._wrap(self._ess)
+
+    @cache_readonly
+    def _rsquared(self):
+        if self.k_constant:
+            return 1 - self.ssr / self.centered_tss
+        else:
+            return 1 - self.ssr / self.uncentered_tss
+
+    @property
+    def rsquared(self):
+        return self._wrap(self._rsquared)
+
+    @property
+    def rsquared_adj(self):
+        return self._wrap(1 - (self.nobs - self.k_constant) / self.df_resid *
+                          (1 - self._rsquared))
+
+    @property
+    def mse_model(self):
+        return self._wrap(self._ess / self.df_model)
+
+    @property
+    def mse_resid(self):
+        return self._wrap(self.ssr / self.df_resid)
+
+    @cache_readonly
+    def _llf(self):
+        nobs2 = self.nobs / 2.0
+        llf = -nobs2 * np.log(2 * np.pi) - nobs2 * np.log(self.ssr / self.nobs)
+        return llf - nobs2 + 0.5 * self._sum_logw
+
+    @property
+    def llf(self):
+        return self._wrap(self._llf)
+
+    @property
+    def aic(self):
+        return self._wrap(-2 * self._llf + 2 * (self.df_model +
+                                                self.k_constant))
+
+    @property
+    def bic(self):
+        return self._wrap(-2 * self._llf + np.log(self.nobs) *
+                          (self.df_model + self.k_constant))
+
+    @cache_readonly
+    def _fvalue(self):
+        if self.cov_type == 'nonrobust':
+            return (self._ess / self.df_model) / (self.ssr / self.df_resid)
+        # Wald test that all slope coefficients are zero
+        k_params = self._params.shape[1]
+        idx = lrange(k_params)
+        if self.k_constant:
+            const_idx = self.model.data.const_idx
+            if const_idx is None:
+                return np.nan * np.ones(self._params.shape[0])
+            idx.pop(const_idx)
+        fvalue = np.empty(self._params.shape[0])
+        fvalue.fill(np.nan)
+        ok = ~np.isnan(self._params).any(1)
+        params = self._params[ok][:, idx, None]
+        cov = self.cov_params()[ok][:, idx][:, :, idx]
+        # the windows with a singular covariance get nan
+        wald = np_matmul(np.swapaxes(params, 1, 2), _stacked_solve(cov, params))
+        fvalue[ok] = wald[:, 0, 0] / len(idx)
+        return fvalue
+
+    @property
+    def fvalue(self):
+        return self._wrap(self._fvalue)
+
+    @property
+    def f_pvalue(self):
+        if self.cov_type == 'nonrobust':
+            df_num = self.df_model
+        else:
+            df_num = self._params.shape[1] - int(bool(self.k_constant))
+        return self._wrap(stats.f.sf(self._fvalue, df_num, self.df_resid))
@@ -0,0 +1,276 @@
+"""
+Tests for least squares estimated from chunks of data
+"""
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose, assert_equal, assert_raises
+
+from statsmodels.regression.linear_model import OLS, WLS
+from statsmodels.regression.incremental import (
+    IncrementalOLS, IncrementalWLS, UpdatableOLS, chunk_arrays,
+    _givens_update, _givens_downdate)
+
+
+class CheckIncremental(object):
+
+    def test_params(self):
+        assert_allclose(self.res1.params, self.res2.params, rtol=1e-10)
+        assert_allclose(self.res1.bse, self.res2.bse, rtol=1e-10)
+        assert_allclose(self.res1.tvalues, self.res2.tvalues, rtol=1e-10)
+
+    def test_statistics(self):
+        res1, res2 = self.res1, self.res2
+        assert_equal(res1.nobs, res2.nobs)
+        assert_equal(res1.df_model, res2.df_model)
+        assert_equal(res1.df_resid, res2.df_resid)
+        assert_equal(res1.k_constant, res2.k_constant)
+        assert_allclose(res1.ssr, res2.ssr, rtol=1e-10)
+        assert_allclose(res1.scale, res2.scale, rtol=1e-10)
+        assert_allclose(res1.centered_tss, res2.centered_tss, rtol=1e-10)
+        assert_allclose(res1.uncentered_tss, res2.uncentered_tss, rtol=1e-10)
+        assert_allclose(res1.rsquared, res2.rsquared, rtol=1e-10)
+        assert_allclose(res1.rsquared_adj, res2.rsquared_adj, rtol=1e-10)
+        assert_allclose(res1.fvalue, res2.fvalue, rtol=1e-10)
+        assert_allclose(res1.llf, res2.llf, rtol=1e-10)
+        assert_allclose(res1.aic, res2.aic, rtol=1e-10)
+        assert_allclose(res1.condition_number, res2.condition_number,
+                        rtol=1e-8)
+
+    def test_robust(self):
+        for cov_type in ['HC0', 'HC1', 'HC2', 'HC3']:
+            r1 = self.res1.get_robustcov_results(cov_type)
+            r2 = self.res2.get_robustcov_results(cov_type)
+            assert_allclose(r1.bse, r2.bse, rtol=1e-10)
+            assert_allclose(r1.fvalue, r2.fvalue, rtol=1e-10)
+            assert_equal(r1.cov_type, cov_type)
+
+    def test_cluster(self):
+        mod1 = self.res1.model
+        res1 = mod1.fit(cov_type='cluster')
+        res2 = self.res2.model.fit(cov_type='cluster',
+                                   cov_kwds={'groups': self.groups})
+        assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+        assert_allclose(res1.pvalues, res2.pvalues, rtol=1e-10)
+        assert_equal(res1.df_resid_inference, res2.df_resid_inference)
+
+        res1 = mod1.fit(cov_type='cluster',
+                        cov_kwds={'use_correction': False,
+                                  'df_correction': False})
+        res2 = self.res2.model.fit(cov_type='cluster',
+                                   cov_kwds={'groups': self.groups,
+                                             'use_correction': False,
+                                             'df_correction': False})
+        assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+        assert_allclose(res1.pvalues, res2.pvalues, rtol=1e-10)
+
+    def test_summary(self):
+        smry = self.res1.summary()
+        assert_equal('Incremental' in str(smry), True)
+
+    def test_predict(self):
+        exog = self.res2.model.exog[:5]
+        assert_allclose(self.res1.predict(exog), self.res2.predict(exog),
+                        rtol=1e-10)
+
+
+class TestIncrementalOLS(CheckIncremental):
+
+    @classmethod
+    def setup_class(cls):
+        np.random.seed(987125)
+        nobs, k_vars = 1003, 4
+        exog = np.column_stack((np.ones(nobs),
+                                np.random.randn(nobs, k_vars - 1)))
+        endog = (exog.sum(1) + np.random.randn(nobs) *
+                 (1 + np.abs(exog[:, 1])))
+        cls.groups = np.random.randint(0, 25, size=nobs)
+
+        chunks = chunk_arrays(endog, exog, groups=cls.groups, chunksize=97)
+        cls.res1 = IncrementalOLS(chunks).fit()
+        cls.res2 = OLS(endog, exog).fit()
+
+
+class TestIncrementalWLS(CheckIncremental):
+
+    @classmethod
+    def setup_class(cls):
+        np.random.seed(987125)
+        nobs, k_vars = 1003, 4
+        exog = np.column_stack((np.ones(nobs),
+                                np.random.randn(nobs, k_vars - 1)))
+        weights = 1. / (1 + np.abs(exog[:, 1]))
+        endog = exog.sum(1) + np.random.randn(nobs) / np.sqrt(weights)
+        cls.groups = np.random.randint(0, 25, size=nobs)
+
+        chunks = chunk_arrays(endog, exog, weights=weights,
+                              groups=cls.groups, chunksize=200)
+        cls.res1 = IncrementalWLS(chunks).fit()
+        cls.res2 = WLS(endog, exog, weights=weights).fit()
+
+
+def test_pandas_names():
+    np.random.seed(987125)
+    nobs = 100
+    exog = pd.DataFrame(np.random.randn(nobs, 2), columns=['a', 'b'])
+    exog['const'] = 1.
+    endog = pd.Series(exog.sum(1) + np.random.randn(nobs), name='y')
+    chunks = [(endog.iloc[i:i + 30], exog.iloc[i:i + 30])
+              for i in range(0, nobs, 30)]
+
+    res1 = IncrementalOLS(chunks).fit()
+    res2 = OLS(endog, exog).fit()
+    assert_equal(res1.model.exog_names, ['a', 'b', 'const'])
+    assert_equal(res1.model.endog_names, 'y')
+    assert_equal(res1.model.data.const_idx, 2)
+    assert_allclose(res1.params, res2.params, rtol=1e-10)
+    assert_equal(res1.params.index.tolist(), ['a', 'b', 'const'])
+
+
+def test_memmap():
+    np.random.seed(987125)
+    nobs = 500
+    exog = np.column_stack((np.ones(nobs), np.random.randn(nobs, 2)))
+    endog = exog.sum(1) + np.random.randn(nobs)
+    res2 = OLS(endog, exog).fit()
+
+    fname = tempfile.mktemp(suffix='.npy')
+    try:
+        np.save(fname, exog)
+        exog_mm = np.load(fname, mmap_mode='r')
+        mod = IncrementalOLS(chunk_arrays(endog, exog_mm, chunksize=64))
+        res1 = mod.fit(cov_type='HC1')
+        assert_allclose(res1.params, res2.params, rtol=1e-10)
+        assert_allclose(res1.bse, res2.HC1_se, rtol=1e-10)
+        del exog_mm, mod, res1
+    finally:
+        os.remove(fname)
+
+
+def test_iterator():
+    np.random.seed(987125)
+    nobs = 200
+    exog = np.column_stack((np.ones(nobs), np.random.randn(nobs, 2)))
+    endog = exog.sum(1) + np.random.randn(nobs)
+    res2 = OLS(endog, exog).fit()
+
+    chunks = ((endog[i:i + 50], exog[i:i + 50]) for i in range(0, nobs, 50))
+    res1 = IncrementalOLS(chunks).fit()
+    assert_allclose(res1.params, res2.params, rtol=1e-10)
+    assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+    # a second pass over the data is not possible
+    assert_raises(ValueError, res1.get_robustcov_results, 'HC0')
+
+    # callable returning a new iterator allows several passes
+    def chunks():
+        return ((endog[i:i + 50], exog[i:i + 50])
+                for i in range(0, nobs, 50))
+    res1 = IncrementalOLS(chunks).fit(cov_type='HC0')
+    assert_allclose(res1.bse, res2.HC0_se, rtol=1e-10)
+
+
+def test_errors():
+    np.random.seed(987125)
+    nobs = 100
+    exog = np.column_stack((np.ones(nobs), np.random.randn(nobs, 2)))
+    endog = exog.sum(1) + np.random.randn(nobs)
+    weights = np.ones(nobs)
+
+    assert_raises(ValueError, IncrementalOLS,
+                  chunk_arrays(endog, exog, weights=weights))
+    assert_raises(ValueError, chunk_arrays, endog, exog[:-1])
+
+    res = IncrementalOLS(chunk_arrays(endog, exog)).fit()
+    assert_raises(ValueError, res.get_robustcov_results, 'HAC', maxlags=2)
+    assert_raises(ValueError, res.get_robustcov_results, 'cluster')
+    for name in ['resid', 'wresid', 'fittedvalues', 'resid_pearson']:
+        assert_raises(AttributeError, getattr, res, name)
+    assert_raises(ValueError, res.get_influence)
+    assert_raises(ValueError, res.outlier_test)
+
+
+def test_givens():
+    np.random.seed(987125)
+    x = np.random.randn(20, 4)
+    R = np.linalg.qr(x[:15], mode='r')
+    _givens_update(R, x[15:])
+    assert_allclose(R.T.dot(R), x.T.dot(x), rtol=1e-10)
+    assert_equal(np.tril(R, -1), np.zeros((4, 4)))
+
+    assert_equal(_givens_downdate(R, x[:5]), True)
+    assert_allclose(R.T.dot(R), x[5:].T.dot(x[5:]), rtol=1e-10)
+    assert_equal(np.tril(R, -1), np.zeros((4, 4)))
+
+    # not positive definite after downdate
+    R = np.linalg.qr(x[:4], mode='r')
+    assert_equal(_givens_downdate(R, x[:1]), False)
+
+
+def test_updatable_rolling():
+    np.random.seed(987125)
+    nobs, window = 200, 30
+    exog = np.column_stack((np.ones(nobs), np.random.randn(nobs, 2)))
+    endog = exog.sum(1) + np.random.randn(nobs) * (1 + np.abs(exog[:, 1]))
+
+    mod = UpdatableOLS(endog[:window], exog[:window])
+    res = mod.fit(cov_type='HC0')
+    for t in range(window, nobs):
+        mod.append(endog[t], exog[t])
+        res = mod.drop(t - window)
+        res2 = OLS(endog[t - window + 1:t + 1],
+                   exog[t - window + 1:t + 1]).fit(cov_type='HC0')
+        assert_equal(res.nobs, window)
+        assert_allclose(res.params, res2.params, rtol=1e-8)
+        assert_allclose(res.bse, res2.bse, rtol=1e-8)
+        assert_allclose(res.rsquared, res2.rsquared, rtol=1e-8)
+        assert_allclose(res.llf, res2.llf, rtol=1e-8)
+    assert_equal(mod.row_ids, np.arange(nobs - window, nobs))
+    # storage is compacted
+    assert_equal(mod._endog.shape[0] < 2 * window + 2, True)
+
+
+def test_updatable_blocks():
+    np.random.seed(987125)
+    nobs = 100
+    exog = np.column_stack((np.ones(nobs), np.random.randn(nobs, 2)))
+    endog = exog.sum(1) + np.random.randn(nobs)
+
+    mod = UpdatableOLS(endog[:20], exog[:20])
+    res = mod.append(endog[20:], exog[20:])
+    res2 = OLS(endog, exog).fit()
+    assert_allclose(res.params, res2.params, rtol=1e-8)
+    assert_allclose(res.centered_tss, res2.centered_tss, rtol=1e-8)
+
+    # earlier results are not changed by updates
+    res = mod.drop([3, 50, 7])
+    keep = np.setdiff1d(np.arange(nobs), [3, 50, 7])
+    res3 = OLS(endog[keep], exog[keep]).fit()
+    assert_allclose(res.params, res3.params, rtol=1e-8)
+    assert_allclose(res.bse, res3.bse, rtol=1e-8)
+    assert_allclose(res.centered_tss, res3.centered_tss, rtol=1e-8)
+    assert_equal(mod.row_ids, keep)
+
+    # exact fit, the downdate is unstable and R is recomputed
+    res = mod.drop(keep[:-3])
+    res4 = OLS(endog[keep[-3:]], exog[keep[-3:]]).fit()
+    assert_allclose(res.params, res4.params, rtol=1e-8)
+
+    assert_raises(ValueError, mod.drop, 3)
+    assert_raises(ValueError, mod.drop, nobs + 1)
+    assert_raises(ValueError, mod.drop, keep[-3:])
+
+
+def test_updatable_stale_results():
+    np.random.seed(987125)
+    nobs = 50
+    exog = np.column_stack((np.ones(nobs), np.random.randn(nobs, 2)))
+    endog = exog.sum(1) + np.random.randn(nobs)
+
+    mod = UpdatableOLS(endog[:40], exog[:40])
+    res = mod.fit()
+    bse = res.bse
+    mod.append(endog[40:], exog[40:])
+    assert_allclose(res.bse, bse)
+    assert_raises(ValueError, getattr, res, 'HC0_se')
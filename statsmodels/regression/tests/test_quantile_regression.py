@@ -253,3 +253,51 @@ def test_zero_resid():
     assert_allclose(res.bse, np.array([0.04455029, 0.01155251]), rtol=1e-4, atol=1e-20)
     assert_allclose(res.resid, np.array([-9.99982796e-08, 3.22583598e-02,
                                          -3.22574234e-02, 9.46361860e-07]), rtol=1e-4, atol=1e-20)
+
+
+def test_interior_point():
+    data = sm.datasets.engel.load_pandas().data
+    y, X = dmatrices('foodexp ~ income', data, return_type='dataframe')
+    res = QuantReg(y, X).fit(q=.1, method='interior-point')
+    assert_almost_equal(np.array(res.fittedvalues), Rquantreg.fittedvalues, 5)
+    assert_almost_equal(np.array(res.resid), Rquantreg.residuals, 5)
+
+    for q in [.25, .5, .9]:
+        res1 = QuantReg(y, X).fit(q=q, vcov='iid', method='interior-point')
+        res2 = QuantReg(y, X).fit(q=q, vcov='iid', p_tol=1e-10,
+                                  max_iter=5000)
+        assert_allclose(res1.params, res2.params, rtol=1e-6)
+        assert_allclose(res1.bse, res2.bse, rtol=1e-5)
+        assert_allclose(res1.prsquared, res2.prsquared, rtol=1e-6)
+        assert_equal(res1.iterations < 30, True)
+
+
+def test_fit_quantiles():
+    data = sm.datasets.engel.load_pandas().data
+    y, X = dmatrices('foodexp ~ income', data, return_type='dataframe')
+    mod = QuantReg(y, X)
+    qs = [.1, .25, .5, .75, .9]
+    res = mod.fit_quantiles(qs, vcov='iid')
+    assert_equal(len(res), 5)
+    assert_equal(list(res.params.index), qs)
+    assert_equal(list(res.params.columns), ['Intercept', 'income'])
+    lower, upper = res.conf_int()
+    for i, q in enumerate(qs):
+        res_q = mod.fit(q=q, vcov='iid', method='interior-point')
+        assert_allclose(res.params.iloc[i], res_q.params, rtol=1e-8)
+        assert_allclose(res.bse.iloc[i], res_q.bse, rtol=1e-8)
+        assert_allclose(res.sparsity.iloc[i], res_q.sparsity, rtol=1e-8)
+        assert_allclose(lower.iloc[i], res_q.conf_int()[0], rtol=1e-8)
+        assert_allclose(upper.iloc[i], res_q.conf_int()[1], rtol=1e-8)
+        assert_allclose(res[i].params, res_q.params, rtol=1e-8)
+    assert_equal(res.cov_params().shape, (5, 2, 2))
+
+    # warm starts of irls
+    res_irls = mod.fit_quantiles(qs, method='irls', p_tol=1e-10,
+                                 max_iter=5000)
+    assert_allclose(res_irls.params, res.params, rtol=1e-6)
+
+    # plain arrays
+    res_arr = QuantReg(np.asarray(y), np.asarray(X)).fit_quantiles(qs)
+    assert_equal(res_arr.params.shape, (5, 2))
+    assert_allclose(res_arr.params, res.params, rtol=1e-8)
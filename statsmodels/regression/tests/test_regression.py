@@ -1217,6 +1217,308 @@ def test_regularized_options():
     assert_allclose(result1.params, result2.params)
 
 
+def test_fit_batched():
+    np.random.seed(3132)
+    nobs, k_vars, k_endog = 200, 3, 4
+    xmat = np.column_stack((np.ones(nobs),
+                            np.random.normal(size=(nobs, k_vars - 1))))
+    ymat = (xmat.dot(np.random.normal(size=(k_vars, k_endog))) +
+            np.random.normal(size=(nobs, k_endog)) *
+            (1 + np.abs(xmat[:, 1:2])))
+    wgt = np.random.uniform(1, 2, nobs)
+    groups = np.random.randint(0, 15, size=nobs)
+
+    cov_options = [('nonrobust', None), ('HC0', None), ('HC1', None),
+                   ('HC2', None), ('HC3', None),
+                   ('cluster', {'groups': groups})]
+    for klass, kwds in [(OLS, {}), (WLS, {'weights': wgt})]:
+        for method in ['pinv', 'qr']:
+            for cov_type, cov_kwds in cov_options:
+                if method == 'qr' and cov_type.startswith('HC'):
+                    # single column RegressionResults requires pinv_wexog
+                    continue
+                res = klass(ymat, xmat, **kwds).fit_batched(
+                    method=method, cov_type=cov_type, cov_kwds=cov_kwds)
+                assert_equal(res.params.shape, (k_vars, k_endog))
+                assert_equal(res.cov_params().shape,
+                             (k_endog, k_vars, k_vars))
+                for j in range(k_endog):
+                    res2 = klass(ymat[:, j], xmat, **kwds).fit(
+                        method=method, cov_type=cov_type, cov_kwds=cov_kwds)
+                    assert_allclose(res.params[:, j], res2.params,
+                                    rtol=1e-10)
+                    assert_allclose(res.bse[:, j], res2.bse, rtol=1e-10)
+                    assert_allclose(res.pvalues[:, j], res2.pvalues,
+                                    rtol=1e-10)
+                    assert_allclose(res.cov_params()[j], res2.cov_params(),
+                                    rtol=1e-10)
+                    for attr in ['ssr', 'scale', 'rsquared', 'rsquared_adj',
+                                 'fvalue', 'f_pvalue', 'llf', 'aic', 'bic']:
+                        assert_allclose(getattr(res, attr)[j],
+                                        getattr(res2, attr), rtol=1e-10)
+
+                    res3 = res.column_results(j)
+                    assert_allclose(res3.bse, res2.bse, rtol=1e-10)
+                    assert_allclose(res3.llf, res2.llf, rtol=1e-10)
+                    assert_allclose(res3.fvalue, res2.fvalue, rtol=1e-10)
+                    assert_equal(res3.cov_type, res2.cov_type)
+                    assert_(res.column_results(j) is res3)
+
+
+def test_fit_batched_pandas():
+    np.random.seed(3132)
+    nobs = 50
+    xmat = pandas.DataFrame(np.random.normal(size=(nobs, 2)),
+                            columns=['a', 'b'])
+    xmat = add_constant(xmat)
+    ymat = pandas.DataFrame(np.random.normal(size=(nobs, 3)),
+                            columns=['y1', 'y2', 'y3'])
+    res = OLS(ymat, xmat).fit_batched()
+    assert_equal(res.params.index.tolist(), ['const', 'a', 'b'])
+    assert_equal(res.params.columns.tolist(), ['y1', 'y2', 'y3'])
+    assert_equal(res.rsquared.index.tolist(), ['y1', 'y2', 'y3'])
+    res2 = OLS(ymat['y2'], xmat).fit()
+    assert_allclose(res.params['y2'], res2.params)
+    assert_equal(res.column_results(1).model.endog_names, 'y2')
+
+    assert_raises(ValueError, OLS(ymat['y2'], xmat).fit_batched)
+    assert_raises(ValueError, OLS(ymat, xmat).fit_batched, cov_type='HAC')
+
+
+def test_sparse_exog():
+    from scipy import sparse
+    from statsmodels.tools.grouputils import dummy_sparse
+    np.random.seed(3132)
+    nobs = 200
+    groups = np.random.randint(0, 10, size=nobs)
+    xmat = sparse.hstack([dummy_sparse(groups),
+                          sparse.csr_matrix(np.random.randn(nobs, 2))])
+    xmat = xmat.tocsr()
+    xdense = xmat.toarray()
+    y = xdense.dot(np.arange(12) / 10.) + np.random.randn(nobs)
+    weights = np.random.uniform(0.5, 2, size=nobs)
+
+    for mod1, mod2 in [(OLS(y, xmat), OLS(y, xdense)),
+                       (WLS(y, xmat, weights=weights),
+                        WLS(y, xdense, weights=weights))]:
+        assert_(sparse.issparse(mod1.wexog))
+        # full set of dummies is an implicit constant
+        assert_equal(mod1.k_constant, 1)
+        res1 = mod1.fit()
+        res2 = mod2.fit()
+        assert_allclose(res1.params, res2.params, rtol=1e-10)
+        assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+        assert_allclose(res1.rsquared, res2.rsquared, rtol=1e-10)
+        assert_allclose(res1.llf, res2.llf, rtol=1e-10)
+        assert_allclose(res1.condition_number, res2.condition_number,
+                        rtol=1e-8)
+        assert_equal(res1.df_resid, res2.df_resid)
+        assert_allclose(res1.predict(xmat[:5]), res2.predict(xdense[:5]),
+                        rtol=1e-10)
+        for cov_type in ['HC0', 'HC1', 'HC2', 'HC3']:
+            assert_allclose(mod1.fit(cov_type=cov_type).bse,
+                            mod2.fit(cov_type=cov_type).bse, rtol=1e-10)
+        res1.summary()
+
+    assert_raises(ValueError, OLS(y, xmat).fit, cov_type='HAC',
+                  cov_kwds={'maxlags': 2})
+    # design without full rank
+    xmat2 = sparse.hstack([xmat, xmat[:, :1]]).tocsr()
+    assert_raises(ValueError, OLS(y, xmat2).fit)
+    # numerically collinear columns with badly scaled regressors
+    xmat3 = sparse.hstack([xmat * 1e4, xmat[:, 10] * 3e-3 + xmat[:, 11]])
+    assert_raises(ValueError, OLS(y, xmat3.tocsr()).fit)
+
+
+def test_sparse_exog_lazy_cov():
+    from scipy import sparse
+    from statsmodels.tools.grouputils import dummy_sparse
+    np.random.seed(3132)
+    nobs = 300
+    groups = np.random.permutation(np.arange(nobs) % 50)
+    xmat = sparse.hstack([dummy_sparse(groups),
+                          sparse.csr_matrix(np.random.randn(nobs, 2) * 1e3)])
+    xmat = xmat.tocsr()
+    xdense = xmat.toarray()
+    y = xdense.dot(np.arange(52) / 10.) + np.random.randn(nobs)
+
+    res1 = OLS(y, xmat).fit()
+    res2 = OLS(y, xdense).fit()
+    assert_allclose(res1.params, res2.params, rtol=1e-9)
+    assert_allclose(res1.bse, res2.bse, rtol=1e-9)
+    assert_allclose(res1.tvalues, res2.tvalues, rtol=1e-9)
+    assert_allclose(res1.cov_params(column=[3, 50, 51]),
+                    res2.cov_params(column=[3, 50, 51]), rtol=1e-9)
+    assert_allclose(res1.cov_params(column=50), res2.cov_params(column=50),
+                    rtol=1e-9)
+    # the dense covariance has not been computed
+    assert_(res1._normalized_cov_params is None)
+    assert_allclose(res1.cov_params(), res2.cov_params(), rtol=1e-9,
+                    atol=1e-15)
+    assert_(res1._normalized_cov_params is not None)
+
+
+def test_sparse_exog_single_factorization():
+    from scipy import sparse
+    from statsmodels.regression import linear_model
+    np.random.seed(3132)
+    xmat = sparse.csr_matrix(np.random.randn(50, 3))
+    y = np.random.randn(50)
+    normal_lu = linear_model._sparse_normal_lu
+    calls = []
+
+    def counted(exog):
+        calls.append(exog)
+        return normal_lu(exog)
+
+    linear_model._sparse_normal_lu = counted
+    try:
+        # the rank check and the parameters share the factorization
+        for mod in [OLS(y, xmat), WLS(y, xmat, weights=np.arange(1., 51))]:
+            del calls[:]
+            assert_equal(mod.df_resid, 47)
+            res = mod.fit()
+            res.bse
+            assert_equal(res.df_model, 3)
+            assert_equal(len(calls), 1)
+    finally:
+        linear_model._sparse_normal_lu = normal_lu
+
+
+def test_absorb_fixed_effects():
+    np.random.seed(987125)
+    nobs = 600
+    f1 = np.random.randint(0, 30, size=nobs)
+    f2 = np.random.randint(0, 12, size=nobs)
+    x = np.random.randn(nobs, 2)
+    y = x.dot([1., -2.]) + 0.1 * f1 + np.sin(f2) + np.random.randn(nobs)
+    weights = np.random.uniform(0.5, 2, size=nobs)
+    clusters = np.random.randint(0, 40, size=nobs)
+    dummies = np.column_stack(((f1[:, None] == np.arange(30)),
+                               (f2[:, None] == np.arange(1, 12))))
+    xdummy = np.column_stack((x, dummies.astype(float)))
+    absorb = np.column_stack((f1, f2))
+
+    for mod1, mod2 in [(OLS(y, x, absorb=absorb), OLS(y, xdummy)),
+                       (WLS(y, x, weights=weights, absorb=absorb),
+                        WLS(y, xdummy, weights=weights))]:
+        assert_equal(mod1.k_absorb, 41)
+        res1 = mod1.fit()
+        res2 = mod2.fit()
+        assert_allclose(res1.params, res2.params[:2], rtol=1e-10)
+        assert_allclose(res1.bse, res2.bse[:2], rtol=1e-10)
+        assert_allclose(res1.resid, res2.resid, atol=1e-10)
+        assert_allclose(res1.ssr, res2.ssr, rtol=1e-10)
+        assert_equal(res1.df_resid, res2.df_resid)
+
+        cov_kwds = {'groups': clusters}
+        res1 = mod1.fit(cov_type='cluster', cov_kwds=cov_kwds)
+        res2 = mod2.fit(cov_type='cluster', cov_kwds=cov_kwds)
+        assert_allclose(res1.bse, res2.bse[:2], rtol=1e-10)
+        assert_allclose(res1.tvalues, res2.tvalues[:2], rtol=1e-10)
+
+    # absorbed factors with disconnected levels
+    f3 = f1 // 10 * 3 + f2 % 3
+    mod = OLS(y, x, absorb=np.column_stack((f1, f3)))
+    assert_equal(mod.k_absorb, 30 + 9 - 3)
+
+    # more than two factors and nested factors, k_absorb is the rank of the
+    # dummy variables
+    f4 = f1 // 10
+    f5 = np.random.randint(0, 5, size=nobs)
+    for factors in [(f1, f2, f5), (f1, f4), (f4, f1, f2), (f1, f2, f2 % 3)]:
+        dummies = np.column_stack([f[:, None] == np.unique(f)
+                                   for f in factors]).astype(float)
+        mod1 = OLS(y, x, absorb=np.column_stack(factors))
+        assert_equal(mod1.k_absorb, np_matrix_rank(dummies))
+        res1 = mod1.fit()
+        res2 = OLS(y, np.column_stack((x, dummies))).fit()
+        assert_allclose(res1.params, res2.params[:2], rtol=1e-8)
+        assert_allclose(res1.bse, res2.bse[:2], rtol=1e-8)
+        assert_equal(res1.df_resid, res2.df_resid)
+
+    assert_raises(ValueError, OLS, y, add_constant(x), absorb=f1)
+    assert_raises(ValueError, OLS, y, x, absorb=f1[:-1])
+
+
+def test_absorb_rank_many_factors():
+    # sparse designs with many levels, partly disconnected levels and a
+    # factor that is the interaction of two others
+    np.random.seed(12345)
+    for nobs, k_levels in [(60, (20, 15, 8)), (80, (40, 10, 10, 3)),
+                           (300, (150, 100, 40))]:
+        factors = [np.random.randint(0, k, size=nobs) for k in k_levels]
+        factors.append(factors[0] % 5 * 2 + factors[-1] % 2)
+        for k in [3, len(factors)]:
+            absorb = np.column_stack(factors[-k:])
+            dummies = np.column_stack([f[:, None] == np.unique(f)
+                                       for f in absorb.T]).astype(float)
+            x = np.random.randn(nobs, 2)
+            mod = OLS(np.random.randn(nobs), x, absorb=absorb)
+            assert_equal(mod.k_absorb, np_matrix_rank(dummies))
+
+
+def test_absorb_formula():
+    np.random.seed(987125)
+    nobs = 300
+    data = pandas.DataFrame({'x1': np.random.randn(nobs),
+                             'x2': np.random.randn(nobs),
+                             'store': np.random.randint(0, 20, size=nobs),
+                             'week': np.random.randint(0, 8, size=nobs)})
+    data['store'] = ['s%d' % i for i in data['store']]
+    data['y'] = (data['x1'] - data['x2'] + data['week'] +
+                 np.random.randn(nobs))
+    data.loc[[3, 17], 'x1'] = np.nan
+
+    res1 = OLS.from_formula('y ~ x1 + x2', data, missing='drop',
+                            absorb=['store', 'week']).fit()
+    res2 = OLS.from_formula('y ~ x1 + x2 + C(store) + C(week)', data,
+                            missing='drop').fit()
+    assert_equal(res1.model.exog_names, ['x1', 'x2'])
+    assert_allclose(res1.params, res2.params[['x1', 'x2']], rtol=1e-10)
+    assert_allclose(res1.bse, res2.bse[['x1', 'x2']], rtol=1e-10)
+    assert_equal(res1.nobs, nobs - 2)
+    assert_equal(res1.df_resid, res2.df_resid)
+
+
+def test_absorb_formula_missing():
+    # rows with missing values and an index that is not a range, absorb is
+    # aligned by the row labels
+    np.random.seed(987125)
+    nobs = 300
+    index = np.random.permutation(nobs) + 1000
+    data = pandas.DataFrame({'x1': np.random.randn(nobs),
+                             'x2': np.random.randn(nobs),
+                             'store': np.random.randint(0, 20, size=nobs),
+                             'week': np.random.randint(0, 8, size=nobs),
+                             'w': np.random.uniform(0.5, 2, size=nobs)},
+                            index=index)
+    data['y'] = (data['x1'] - data['x2'] + data['week'] +
+                 np.random.randn(nobs))
+    data.loc[index[[3, 17]], 'x1'] = np.nan
+    data.loc[index[[5, 40]], 'y'] = np.nan
+
+    res2 = WLS.from_formula('y ~ x1 + x2 + C(store) + C(week)', data,
+                            weights=data['w'].values, missing='drop').fit()
+    absorb_sorted = data[['store', 'week']].sort_index()
+    for absorb in [['store', 'week'], absorb_sorted,
+                   data['store'].sort_index()]:
+        res1 = WLS.from_formula('y ~ x1 + x2', data, absorb=absorb,
+                                weights=data['w'].values,
+                                missing='drop').fit()
+        if isinstance(absorb, pandas.Series):
+            res2 = WLS.from_formula('y ~ x1 + x2 + C(store)', data,
+                                    weights=data['w'].values,
+                                    missing='drop').fit()
+        assert_equal(res1.nobs, nobs - 4)
+        assert_allclose(res1.params, res2.params[['x1', 'x2']], rtol=1e-10)
+        assert_allclose(res1.bse, res2.bse[['x1', 'x2']], rtol=1e-10)
+        assert_equal(res1.df_resid, res2.df_resid)
+
+    assert_raises(ValueError, OLS.from_formula, 'y ~ x1 + x2', data,
+                  absorb=absorb_sorted.iloc[10:])
+
+
 if __name__ == "__main__":
 
     import nose
@@ -0,0 +1,205 @@
+"""
+Tests for rolling and expanding window least squares
+"""
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose, assert_equal, assert_raises
+
+from statsmodels.regression.linear_model import OLS, WLS
+from statsmodels.regression.rolling import (RollingOLS, RollingWLS,
+                                            _window_sums)
+
+
+def _gen_data(nobs=150, k_vars=3, seed=987125):
+    np.random.seed(seed)
+    exog = np.column_stack((np.ones(nobs),
+                            np.random.randn(nobs, k_vars - 1)))
+    endog = (exog.sum(1) + 100 +
+             np.random.randn(nobs) * (1 + np.abs(exog[:, 1])))
+    weights = 1. / (1 + np.abs(exog[:, 1]))
+    return endog, exog, weights
+
+
+def test_window_sums():
+    np.random.seed(987125)
+    x = np.random.randn(23, 2, 2)
+    for window in [1, 4, 5, 23, None]:
+        w = 23 if window is None else window
+        expected = np.array([x[max(0, t - w + 1):t + 1].sum(0)
+                             for t in range(23)])
+        assert_allclose(_window_sums(x, window), expected, rtol=1e-12)
+
+
+class CheckRolling(object):
+
+    def ref_fit(self, t, cov_type='nonrobust'):
+        start = 0 if self.window is None else max(0, t - self.window + 1)
+        sl = slice(start, t + 1)
+        if self.weights is None:
+            mod = OLS(self.endog[sl], self.exog[sl])
+        else:
+            mod = WLS(self.endog[sl], self.exog[sl],
+                      weights=self.weights[sl])
+        return mod.fit(cov_type=cov_type)
+
+    def check_windows(self, res, cov_type='nonrobust'):
+        first = self.first
+        assert_equal(np.isnan(res.params[:first]).all(), True)
+        assert_equal(np.isnan(res.rsquared[:first]).all(), True)
+        for t in range(first, len(self.endog)):
+            res2 = self.ref_fit(t, cov_type)
+            assert_allclose(res.params[t], res2.params, rtol=1e-8)
+            assert_allclose(res.bse[t], res2.bse, rtol=1e-8)
+            assert_allclose(res.pvalues[t], res2.pvalues, rtol=1e-6)
+            assert_allclose(res.fvalue[t], res2.fvalue, rtol=1e-8)
+            assert_allclose(res.cov_params()[t], res2.cov_params(),
+                            rtol=1e-8, atol=1e-14)
+            if cov_type == 'nonrobust':
+                assert_equal(res.nobs[t], res2.nobs)
+                assert_equal(res.df_resid[t], res2.df_resid)
+                assert_equal(res.df_model[t], res2.df_model)
+                assert_allclose(res.ssr[t], res2.ssr, rtol=1e-8)
+                assert_allclose(res.rsquared[t], res2.rsquared, rtol=1e-8)
+                assert_allclose(res.rsquared_adj[t], res2.rsquared_adj,
+                                rtol=1e-8)
+                assert_allclose(res.llf[t], res2.llf, rtol=1e-8)
+                assert_allclose(res.aic[t], res2.aic, rtol=1e-8)
+                assert_allclose(res.bic[t], res2.bic, rtol=1e-8)
+                assert_allclose(res.f_pvalue[t], res2.f_pvalue, rtol=1e-6)
+
+    def test_nonrobust(self):
+        self.check_windows(self.mod.fit())
+
+    def test_robust(self):
+        for cov_type in ['HC0', 'HC1', 'HC2', 'HC3']:
+            self.check_windows(self.mod.fit(cov_type=cov_type), cov_type)
+
+    def test_params_only(self):
+        res = self.mod.fit(params_only=True)
+        res2 = self.mod.fit()
+        assert_allclose(res.params, res2.params, rtol=1e-12)
+        assert_equal(res.nobs, res2.nobs)
+        assert_allclose(res.ssr, res2.ssr, rtol=1e-12)
+        assert_allclose(res.rsquared, res2.rsquared, rtol=1e-12)
+        assert_raises(ValueError, res.cov_params)
+
+
+class TestRollingOLS(CheckRolling):
+
+    @classmethod
+    def setup_class(cls):
+        cls.endog, cls.exog, _ = _gen_data()
+        cls.weights = None
+        cls.window = 30
+        cls.first = 29
+        cls.mod = RollingOLS(cls.endog, cls.exog, window=cls.window)
+
+
+class TestRollingWLS(CheckRolling):
+
+    @classmethod
+    def setup_class(cls):
+        cls.endog, cls.exog, cls.weights = _gen_data()
+        cls.window = 25
+        cls.first = 9
+        cls.mod = RollingWLS(cls.endog, cls.exog, window=cls.window,
+                             weights=cls.weights, expanding=True,
+                             min_nobs=10)
+
+
+class TestRollingExpanding(CheckRolling):
+
+    @classmethod
+    def setup_class(cls):
+        cls.endog, cls.exog, _ = _gen_data(nobs=80)
+        cls.weights = None
+        cls.window = None
+        cls.first = 3
+        cls.mod = RollingOLS(cls.endog, cls.exog)
+
+
+def test_expanding_start():
+    endog, exog, _ = _gen_data()
+    res = RollingOLS(endog, exog, window=20, expanding=True).fit()
+    assert_equal(np.isnan(res.params[:3]).all(), True)
+    res2 = OLS(endog[:10], exog[:10]).fit()
+    assert_allclose(res.params[9], res2.params, rtol=1e-8)
+    assert_equal(res.nobs[9], 10)
+    res2 = OLS(endog[31:51], exog[31:51]).fit()
+    assert_allclose(res.params[50], res2.params, rtol=1e-8)
+
+
+def test_missing():
+    endog, exog, _ = _gen_data()
+    endog = endog.copy()
+    endog[40] = np.nan
+    res = RollingOLS(endog, exog, window=20).fit(cov_type='HC0')
+    keep = np.r_[30:40, 41:50]
+    res2 = OLS(endog[keep], exog[keep]).fit(cov_type='HC0')
+    assert_equal(res.nobs[49], 19)
+    assert_allclose(res.params[49], res2.params, rtol=1e-8)
+    assert_allclose(res.bse[49], res2.bse, rtol=1e-8)
+    assert_equal(np.isnan(res.params[60]).any(), False)
+
+    assert_raises(ValueError, RollingOLS, endog, exog, window=20,
+                  missing='raise')
+
+
+def test_exact_fit():
+    # the windows in the middle are fit exactly, the sum of squared
+    # residuals is computed from the residuals and not as a difference of
+    # the large sums of squares
+    endog, exog, _ = _gen_data()
+    endog = endog.copy()
+    endog[60:100] = np.dot(exog[60:100], [1e3, 2., 3.])
+    endog[70] += 1e-5
+    res = RollingOLS(endog, exog, window=20).fit()
+    for t in [79, 85, 89]:
+        res2 = OLS(endog[t - 19:t + 1], exog[t - 19:t + 1]).fit()
+        assert_allclose(res.params[t], res2.params, rtol=1e-8)
+        assert_allclose(res.ssr[t], res2.ssr, rtol=1e-6, atol=1e-20)
+    assert_equal((res.ssr[79:90] > 1e-11).all(), True)
+    assert_equal((res.ssr[90:100] < 1e-16).all(), True)
+
+
+def test_rank_deficient():
+    endog, exog, _ = _gen_data()
+    exog = exog.copy()
+    exog[40:70, 2] = 0
+    res = RollingOLS(endog, exog, window=20).fit(cov_type='HC0')
+    for t in [59, 69, 75, 89]:
+        res2 = OLS(endog[t - 19:t + 1], exog[t - 19:t + 1]).fit(
+            cov_type='HC0')
+        assert_allclose(res.params[t], res2.params, rtol=1e-8, atol=1e-12)
+        assert_allclose(res.bse[t], res2.bse, rtol=1e-8, atol=1e-12)
+        assert_allclose(res.ssr[t], res2.ssr, rtol=1e-8)
+        assert_equal(res.df_resid[t], res2.df_resid)
+        assert_equal(res.df_model[t], res2.df_model)
+    # the windows with a singular covariance have no robust F statistic
+    singular = np.zeros(len(endog), dtype=bool)
+    singular[59:70] = True
+    assert_equal(np.isnan(res.fvalue[19:]), singular[19:])
+
+
+def test_pandas():
+    endog, exog, _ = _gen_data()
+    index = pd.date_range('2000-01-01', periods=len(endog), freq='D')
+    exog = pd.DataFrame(exog, columns=['const', 'x1', 'x2'], index=index)
+    endog = pd.Series(endog, index=index, name='y')
+    res = RollingOLS(endog, exog, window=30).fit()
+    res2 = OLS(endog.iloc[40:70], exog.iloc[40:70]).fit()
+    assert_equal(res.params.columns.tolist(), ['const', 'x1', 'x2'])
+    assert_equal(res.params.index.equals(index), True)
+    assert_allclose(res.params.loc[index[69]], res2.params, rtol=1e-8)
+    assert_allclose(res.bse.loc[index[69]], res2.bse, rtol=1e-8)
+    assert_allclose(res.rsquared.loc[index[69]], res2.rsquared, rtol=1e-8)
+
+
+def test_errors():
+    endog, exog, _ = _gen_data()
+    assert_raises(ValueError, RollingOLS, endog, exog, window=0)
+    assert_raises(ValueError, RollingOLS, endog, exog, window=len(endog) + 1)
+    assert_raises(ValueError, RollingWLS, endog, exog, window=10,
+                  weights=np.ones(3))
+    mod = RollingOLS(endog, exog, window=10)
+    assert_raises(ValueError, mod.fit, cov_type='HAC')
@@ -168,6 +168,29 @@ def variance_inflation_factor(exog, exog_idx):
     return vif
 
 
+def _row_chunks(nobs, chunksize=None):
+    """slices of consecutive rows, one slice if chunksize is None"""
+    if chunksize is None:
+        chunksize = max(nobs, 1)
+    for start in range(0, nobs, chunksize):
+        yield slice(start, min(start + chunksize, nobs))
+
+
+def _hat_matrix_diag(exog, cov_unscaled, weights=None, chunksize=None):
+    """diagonal of the hat matrix w_i x_i' cov_unscaled x_i
+
+    computed in blocks of rows without creating the nobs x nobs hat matrix
+    """
+    nobs = exog.shape[0]
+    hii = np.empty(nobs, dtype=np.float64)
+    for sl in _row_chunks(nobs, chunksize):
+        x = exog[sl]
+        hii[sl] = (np.dot(x, cov_unscaled) * x).sum(1)
+    if weights is not None:
+        hii *= weights
+    return hii
+
+
 class OLSInfluence(object):
     '''class to calculate outlier and influence measures for OLS result
 
@@ -175,20 +198,28 @@ class OLSInfluence(object):
     ----------
     results : Regression Results instance
         currently assumes the results are from an OLS regression
+    chunksize : int or None
+        If not None, then the observation specific measures are computed
+        in blocks of `chunksize` rows, so that temporary arrays have at most
+        chunksize x k_vars elements. No nobs x nobs arrays are created in
+        either case.
 
     Notes
     -----
     One part of the results can be calculated without any auxiliary regression
     (some of which have the `_internal` postfix in the name. Other statistics
-    require leave-one-observation-out (LOOO) auxiliary regression, and will be
-    slower (mainly results with `_external` postfix in the name).
-    The auxiliary LOOO regression only the required results are stored.
+    are based on leave-one-observation-out (LOOO) regressions (mainly results
+    with `_external` postfix in the name).
+
+    The LOOO regressions are not estimated. The parameters, the residual
+    variance and the determinant of the parameter covariance of each LOOO
+    regression are computed from the full sample estimate with the
+    Sherman-Morrison updating formulas, e.g. ::
 
-    Using the LOO measures is currently only recommended if the data set
-    is not too large. One possible approach for LOOO measures would be to
-    identify possible problem observations with the _internal measures, and
-    then run the leave-one-observation-out only with observations that are
-    possible outliers. (However, this is not yet available in an automized way.)
+        params_not_obsi = params - inv(X'X) x_i resid_i / (1 - h_i)
+
+    where h_i is the diagonal of the hat matrix. This requires one
+    vectorized pass over the observations.
 
     This should be extended to general least squares.
 
@@ -197,13 +228,14 @@ class OLSInfluence(object):
 
     '''
 
-    def __init__(self, results):
+    def __init__(self, results, chunksize=None):
         #check which model is allowed
         self.results = maybe_unwrap_results(results)
         self.nobs, self.k_vars = results.model.exog.shape
         self.endog = results.model.endog
         self.exog = results.model.exog
         self.model_class = results.model.__class__
+        self.chunksize = chunksize
 
         self.sigma_est = np.sqrt(results.mse_resid)
 
@@ -218,7 +250,9 @@ class OLSInfluence(object):
         -----
         temporarily calculated here, this should go to model class
         '''
-        return (self.exog * self.results.model.pinv_wexog.T).sum(1)
+        return _hat_matrix_diag(self.exog,
+                                self.results.normalized_cov_params,
+                                chunksize=self.chunksize)
 
     @cache_readonly
     def resid_press(self):
@@ -504,7 +538,10 @@ class OLSInfluence(object):
     def _get_drop_vari(self, attributes):
         '''regress endog on exog without one of the variables
 
-        This uses a k_vars loop, only attributes of the OLS instance are stored.
+        Only attributes of the OLS instance are stored. 'params', 'ssr',
+        'mse_resid', 'normalized_cov_params' and 'bse' are computed from the
+        full regression by partitioned inversion, other attributes require
+        an auxiliary regression for each variable.
 
         Parameters
         ----------
@@ -514,50 +551,72 @@ class OLSInfluence(object):
 
         not yet used
         '''
-        from statsmodels.sandbox.tools.cross_val import LeaveOneOut
-
+        closed_form = ['params', 'ssr', 'mse_resid', 'normalized_cov_params',
+                       'bse']
         endog = self.results.model.endog
         exog = self.exog
+        params = self.results.params
+        cov_unscaled = self.results.normalized_cov_params
+        ssr = self.results.ssr
+        df_resid = self.results.df_resid + 1
 
-        cv_iter = LeaveOneOut(self.k_vars)
         res_loo = defaultdict(list)
-        for inidx, outidx in cv_iter:
+        for j in range(self.k_vars):
+            inidx = np.arange(self.k_vars) != j
+            g_j = cov_unscaled[inidx, j]
+            g_jj = cov_unscaled[j, j]
+            res_j = {}
+            res_j['params'] = params[inidx] - g_j * params[j] / g_jj
+            res_j['ssr'] = ssr + params[j]**2 / g_jj
+            res_j['mse_resid'] = res_j['ssr'] / df_resid
+            res_j['normalized_cov_params'] = (
+                cov_unscaled[inidx][:, inidx] - np.outer(g_j, g_j) / g_jj)
+            res_j['bse'] = np.sqrt(res_j['mse_resid'] *
+                               np.diag(res_j['normalized_cov_params']))
+            if any(att not in closed_form for att in attributes):
+                res_i = self.model_class(endog, exog[:, inidx]).fit()
             for att in attributes:
-                res_i = self.model_class(endog, exog[:,inidx]).fit()
-                res_loo[att].append(getattr(res_i, att))
+                if att in closed_form:
+                    res_loo[att].append(res_j[att])
+                else:
+                    res_loo[att].append(getattr(res_i, att))
 
         return res_loo
 
     @cache_readonly
     def _res_looo(self):
-        '''collect required results from the LOOO loop
+        '''collect required results of the LOOO regressions
 
         all results will be attached.
         currently only 'params', 'mse_resid', 'det_cov_params' are stored
 
-        regresses endog on exog dropping one observation at a time
-
-        this uses a nobs loop, only attributes of the OLS instance are stored.
+        The results are computed from the full sample regression with the
+        Sherman-Morrison formulas for dropping one observation, no auxiliary
+        regressions are estimated.
         '''
-        from statsmodels.sandbox.tools.cross_val import LeaveOneOut
-        get_det_cov_params = lambda res: np.linalg.det(res.cov_params())
+        results = self.results
+        cov_unscaled = results.normalized_cov_params
+        hii = self.hat_matrix_diag
+        resid = results.resid
+        # resid of observation i in the regression without observation i
+        resid_deleted = resid / (1 - hii)
 
-        endog = self.endog
-        exog = self.exog
+        d_params = np.empty(self.exog.shape, dtype=np.float64)
+        for sl in _row_chunks(self.nobs, self.chunksize):
+            d_params[sl] = (np.dot(self.exog[sl], cov_unscaled) *
+                            resid_deleted[sl, None])
+        params = results.params - d_params
 
-        params = np.zeros(exog.shape, dtype=np.float)
-        mse_resid = np.zeros(endog.shape, dtype=np.float)
-        det_cov_params = np.zeros(endog.shape, dtype=np.float)
+        ssr = results.ssr - resid * resid_deleted
+        mse_resid = ssr / (results.df_resid - 1)
 
-        cv_iter = LeaveOneOut(self.nobs)
-        for inidx, outidx in cv_iter:
-            res_i = self.model_class(endog[inidx], exog[inidx]).fit()
-            params[outidx] = res_i.params
-            mse_resid[outidx] = res_i.mse_resid
-            det_cov_params[outidx] = get_det_cov_params(res_i)
+        # det(X'X - x_i x_i') = det(X'X) (1 - h_i)
+        sign, logdet = np.linalg.slogdet(cov_unscaled)
+        det_cov_params = sign * np.exp(self.k_vars * np.log(mse_resid) +
+                                       logdet - np.log(1 - hii))
 
         return dict(params=params, mse_resid=mse_resid,
-                       det_cov_params=det_cov_params)
+                    det_cov_params=det_cov_params)
 
     def summary_frame(self):
         """
@@ -664,6 +723,178 @@ class OLSInfluence(object):
                            html_fmt=fmt_html)
 
 
+class GLMInfluence(object):
+    '''class to calculate outlier and influence measures for GLM results
+
+    Parameters
+    ----------
+    results : GLMResults instance
+        results of a GLM estimated with IRLS or another method
+    chunksize : int or None
+        If not None, then the observation specific measures are computed
+        in blocks of `chunksize` rows, so that temporary arrays have at most
+        chunksize x k_vars elements.
+
+    Notes
+    -----
+    The leave-one-observation-out (LOOO) parameters are one-step
+    approximations, i.e. one IRLS step from the full sample estimate
+    without the observation, Pregibon (1981) and Williams (1987). The
+    hat matrix is the hat matrix of the weighted least squares problem of
+    the last IRLS iteration, ::
+
+        h_i = w_i x_i' inv(X' W X) x_i
+
+    The approximation is exact for the Gaussian family with identity link.
+    No auxiliary models are estimated and no nobs x nobs arrays are created.
+
+    References
+    ----------
+    Pregibon, D. (1981). Logistic regression diagnostics. The Annals of
+        Statistics, 9(4), 705-724.
+    Williams, D. A. (1987). Generalized linear model diagnostics using the
+        deviance and single case deletions. Applied Statistics, 36(2),
+        181-191.
+    '''
+
+    def __init__(self, results, chunksize=None):
+        self.results = maybe_unwrap_results(results)
+        model = self.results.model
+        self.nobs, self.k_vars = model.exog.shape
+        self.endog = model.endog
+        self.exog = model.exog
+        self.chunksize = chunksize
+
+        mu = self.results.mu
+        family = model.family
+        # weights of the IRLS iteration at the estimate
+        self.weights = (model.freq_weights * model.n_trials *
+                        family.weights(mu))
+        self.resid_working = (model.endog - mu) * family.link.deriv(mu)
+        self.scale = self.results.scale
+
+    @cache_readonly
+    def hat_matrix_diag(self):
+        '''(cached attribute) diagonal of the hat matrix of the IRLS
+        weighted least squares problem
+        '''
+        return _hat_matrix_diag(self.exog, self.results.normalized_cov_params,
+                                weights=self.weights,
+                                chunksize=self.chunksize)
+
+    @cache_readonly
+    def resid_pearson(self):
+        '''(cached attribute) Pearson residuals including the weights
+        '''
+        return np.sqrt(self.weights) * self.resid_working
+
+    @cache_readonly
+    def resid_studentized(self):
+        '''(cached attribute) studentized Pearson residuals
+
+        resid_pearson / sqrt(scale * (1 - hii))
+        '''
+        hii = self.hat_matrix_diag
+        return self.resid_pearson / np.sqrt(self.scale * (1 - hii))
+
+    @cache_readonly
+    def d_params(self):
+        '''(cached attribute) change in parameters when an observation is
+        dropped
+
+        one-step approximation, params - params_not_obsi
+        '''
+        cov_unscaled = self.results.normalized_cov_params
+        factor = (self.weights * self.resid_working /
+                  (1 - self.hat_matrix_diag))
+        d_params = np.empty(self.exog.shape, dtype=np.float64)
+        for sl in _row_chunks(self.nobs, self.chunksize):
+            d_params[sl] = (np.dot(self.exog[sl], cov_unscaled) *
+                            factor[sl, None])
+        return d_params
+
+    @cache_readonly
+    def params_not_obsi(self):
+        '''(cached attribute) one-step parameter estimates for all LOOO
+        models
+        '''
+        return self.results.params - self.d_params
+
+    @cache_readonly
+    def dfbetas(self):
+        '''(cached attribute) dfbetas
+
+        change in parameters scaled by the standard errors of the full
+        sample estimate
+        '''
+        return self.d_params / self.results.bse
+
+    @cache_readonly
+    def cooks_distance(self):
+        '''(cached attribute) Cooks distance and p-values
+
+        based on the one-step approximation of the LOOO parameters
+        '''
+        hii = self.hat_matrix_diag
+        cooks_d2 = self.resid_studentized**2 / self.k_vars
+        cooks_d2 *= hii / (1 - hii)
+
+        from scipy import stats
+        pvals = stats.f.sf(cooks_d2, self.k_vars, self.results.df_resid)
+        return cooks_d2, pvals
+
+    @cache_readonly
+    def dffits(self):
+        '''(cached attribute) dffits measure for influence of an observation
+
+        based on the studentized Pearson residuals, see
+        `OLSInfluence.dffits_internal`
+        '''
+        hii = self.hat_matrix_diag
+        dffits_ = self.resid_studentized * np.sqrt(hii / (1 - hii))
+        dffits_threshold = 2 * np.sqrt(self.k_vars * 1. / self.nobs)
+        return dffits_, dffits_threshold
+
+    def summary_frame(self):
+        """
+        Creates a DataFrame with all available influence results.
+
+        Returns
+        -------
+        frame : DataFrame
+            A DataFrame with all results.
+
+        Notes
+        -----
+        The resultant DataFrame contains four variables in addition to the
+        DFBETAS. These are:
+
+        * cooks_d : Cook's Distance defined in `cooks_distance`
+        * standard_resid : Standardized residuals defined in
+          `resid_studentized`
+        * hat_diag : The diagonal of the projection, or hat, matrix defined in
+          `hat_matrix_diag`
+        * dffits : DFFITS statistics defined in `dffits`
+        """
+        from pandas import DataFrame
+
+        data = self.results.model.data
+        row_labels = data.row_labels
+        beta_labels = ['dfb_' + i for i in data.xnames]
+
+        summary_data = DataFrame(dict(
+                            cooks_d=self.cooks_distance[0],
+                            standard_resid=self.resid_studentized,
+                            hat_diag=self.hat_matrix_diag,
+                            dffits=self.dffits[0],
+                            ),
+                            index=row_labels)
+        dfbeta = DataFrame(self.dfbetas, columns=beta_labels,
+                           index=row_labels)
+
+        return dfbeta.join(summary_data)
+
+
 def summary_table(res, alpha=0.05):
     """
     Generate summary table of outlier and influence similar to SAS
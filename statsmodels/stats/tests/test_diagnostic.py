@@ -790,6 +790,87 @@ def test_influence_dtype():
     assert_almost_equal(cr1, cr3, decimal=8)
 
 
+def test_influence_looo_refit():
+    # closed form leave-one-out results against explicit refits
+    np.random.seed(987125)
+    nobs = 30
+    x = add_constant(np.random.randn(nobs, 2))
+    y = x.sum(1) + np.random.randn(nobs) * (1 + np.abs(x[:, 1]))
+    res = OLS(y, x).fit()
+    infl = oi.OLSInfluence(res)
+    infl_chunked = res.get_influence(chunksize=7)
+
+    params = np.zeros((nobs, 3))
+    mse_resid = np.zeros(nobs)
+    det_cov = np.zeros(nobs)
+    for i in range(nobs):
+        mask = np.arange(nobs) != i
+        res_i = OLS(y[mask], x[mask]).fit()
+        params[i] = res_i.params
+        mse_resid[i] = res_i.mse_resid
+        det_cov[i] = np.linalg.det(res_i.cov_params())
+
+    for infl_ in [infl, infl_chunked]:
+        assert_allclose(infl_.params_not_obsi, params, rtol=1e-10)
+        assert_allclose(infl_.sigma2_not_obsi, mse_resid, rtol=1e-10)
+        assert_allclose(infl_.det_cov_params_not_obsi, det_cov, rtol=1e-10)
+    assert_allclose(infl_chunked.hat_matrix_diag, infl.hat_matrix_diag,
+                    rtol=1e-13)
+    assert_allclose(infl_chunked.summary_frame(), infl.summary_frame(),
+                    rtol=1e-13)
+
+    # leave one variable out
+    attributes = ['params', 'ssr', 'bse', 'rsquared']
+    res_lovo = infl._get_drop_vari(attributes)
+    for j in range(3):
+        res_j = OLS(y, x[:, np.arange(3) != j]).fit()
+        for att in attributes:
+            assert_allclose(res_lovo[att][j], getattr(res_j, att),
+                            rtol=1e-10)
+
+
+def test_influence_glm():
+    from statsmodels.genmod.generalized_linear_model import GLM
+    from statsmodels.genmod import families
+
+    np.random.seed(987125)
+    nobs = 50
+    x = add_constant(np.random.randn(nobs, 2))
+    y = x.sum(1) + np.random.randn(nobs)
+
+    # one step approximation is exact for gaussian with identity link
+    infl_ols = OLS(y, x).fit().get_influence()
+    infl = GLM(y, x).fit().get_influence()
+    assert_allclose(infl.hat_matrix_diag, infl_ols.hat_matrix_diag,
+                    rtol=1e-10)
+    assert_allclose(infl.params_not_obsi, infl_ols.params_not_obsi,
+                    rtol=1e-10)
+    assert_allclose(infl.cooks_distance[0], infl_ols.cooks_distance[0],
+                    rtol=1e-10)
+    assert_allclose(infl.resid_studentized,
+                    infl_ols.resid_studentized_internal, rtol=1e-10)
+
+    y = np.random.poisson(np.exp(0.2 * x.sum(1)))
+    res = GLM(y, x, family=families.Poisson()).fit()
+    infl = res.get_influence()
+    infl_chunked = res.get_influence(chunksize=9)
+    assert_allclose(infl_chunked.d_params, infl.d_params, rtol=1e-13)
+    hii = np.diag(infl.exog.dot(res.normalized_cov_params).dot(
+        infl.exog.T)) * res.mu
+    assert_allclose(infl.hat_matrix_diag, hii, rtol=1e-10)
+
+    d_params = np.zeros((nobs, 3))
+    for i in range(nobs):
+        mask = np.arange(nobs) != i
+        res_i = GLM(y[mask], x[mask], family=families.Poisson()).fit()
+        d_params[i] = res.params - res_i.params
+    # one step approximation
+    assert_allclose(infl.d_params, d_params, rtol=0.1, atol=0.01)
+    frame = infl.summary_frame()
+    assert_equal(frame.shape, (nobs, 7))
+    assert_allclose(frame['cooks_d'], infl.cooks_distance[0])
+
+
 def test_outlier_test():
     # results from R with NA -> 1. Just testing interface here because
     # outlier_test is just a wrapper
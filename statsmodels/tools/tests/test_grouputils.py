@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
-from statsmodels.tools.grouputils import Grouping
+from numpy.testing import assert_allclose
+from statsmodels.tools.grouputils import Grouping, Group
 from statsmodels.tools.tools import categorical
 from statsmodels.datasets import grunfeld, anes96
 from pandas.util import testing as ptesting
@@ -248,3 +249,22 @@ def test_init_api():
     grouping = Grouping(list_groups)
     np.testing.assert_array_equal(grouping.group_names,
                                   ['group0', 'group1', 'group2'])
+
+
+def test_group_demean():
+    np.random.seed(987125)
+    group = np.random.randint(0, 5, size=50)
+    x = np.random.randn(50, 2)
+    weights = np.random.uniform(0.5, 2, size=50)
+    g = Group(group)
+    for w in [None, weights]:
+        w_ = np.ones(50) if w is None else w
+        means = np.array([np.average(x[group == i], axis=0,
+                                     weights=w_[group == i])
+                          for i in range(5)])
+        for use_bincount in [True, False]:
+            xd, m = g.group_demean(x, use_bincount=use_bincount, weights=w)
+            assert_allclose(m, means, rtol=1e-12)
+            assert_allclose(xd, x - means[group], rtol=1e-12)
+        xd, m = g.group_demean(x[:, 1], weights=w)
+        assert_allclose(m, means[:, 1], rtol=1e-12)
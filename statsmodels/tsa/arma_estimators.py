@@ -0,0 +1,390 @@
+"""Fast preliminary estimators for ARMA processes
+
+The estimators in this module only require linear least squares steps (the
+Hannan-Rissanen procedure) or a recursion on the sample autocovariances (the
+innovations algorithm), so they are much cheaper than exact or conditional
+maximum likelihood. They are consistent, and can be used as standalone
+estimators, for example to screen a large number of series, or to compute
+starting values for likelihood based estimation, e.g. `start_params` in
+`SARIMAX.fit` or `ARMA.fit`.
+
+All estimators accept a 2-dim `endog`, in which case each column is treated
+as a separate series and the least squares steps are computed for all series
+at once.
+
+References
+----------
+Brockwell, Peter J., and Richard A. Davis. 2016.
+Introduction to Time Series and Forecasting. Springer.
+
+Hannan, E. J., and J. Rissanen. 1982.
+"Recursive Estimation of Mixed Autoregressive-Moving Average Order."
+Biometrika 69 (1): 81-94.
+
+License: BSD
+"""
+from __future__ import division
+
+import numpy as np
+from scipy.signal import lfilter
+
+__all__ = ['hannan_rissanen', 'innovations', 'innovations_algo']
+
+
+def _order_to_lags(order, name):
+    """
+    Convert an integer order or an iterable of lags to an array of lags
+    """
+    if np.isscalar(order):
+        order = int(order)
+        if order < 0:
+            raise ValueError('%s must be non-negative.' % name)
+        return np.arange(1, order + 1)
+    lags = np.unique(np.asarray(order, dtype=int))
+    if len(lags) and lags[0] < 1:
+        raise ValueError('%s lags must be positive integers.' % name)
+    return lags
+
+
+def _prepare_endog(endog, demean):
+    endog = np.array(endog, dtype=float)
+    squeeze = endog.ndim == 1
+    if squeeze:
+        endog = endog[:, None]
+    elif endog.ndim != 2:
+        raise ValueError('endog must be 1-dim or 2-dim.')
+    if np.any(np.isnan(endog)):
+        raise ValueError('endog cannot contain missing values.')
+    if demean:
+        endog -= endog.mean(0)
+    # Internally, series are along the first axis
+    return endog.T, squeeze
+
+
+def _lagged(x, lags, start):
+    """
+    Lagged values of each series in `x` (nseries, nobs), for t >= start
+
+    Returns an array of shape (nseries, nobs - start, len(lags)).
+    """
+    nobs = x.shape[1]
+    index = np.arange(start, nobs)[:, None] - np.asarray(lags)[None, :]
+    return x[:, index]
+
+
+def _batched_lstsq(y, X):
+    """
+    Least squares for a stack of regressions
+
+    y has shape (nseries, n) and X has shape (nseries, n, k). The normal
+    equations are solved for all series at once, falling back to the
+    pseudo-inverse if one of the cross-product matrices is singular.
+    """
+    # A loop of BLAS products is much faster here than a stacked einsum
+    xtx = np.array([np.dot(x.T, x) for x in X])
+    xty = np.einsum('snk,sn->sk', X, y)
+    try:
+        params = np.linalg.solve(xtx, xty)
+    except np.linalg.LinAlgError:
+        params = np.einsum('skl,sl->sk', np.linalg.pinv(xtx), xty)
+    resid = y - np.einsum('snk,sk->sn', X, params)
+    return params, resid
+
+
+def _lag_polynomial(params, lags):
+    polynomial = np.zeros(lags[-1] + 1 if len(lags) else 1)
+    polynomial[0] = 1
+    polynomial[lags] = params
+    return polynomial
+
+
+def _is_invertible(polynomial):
+    # Roots of 1 + theta_1 L + ... must lie outside the unit circle
+    return np.all(np.abs(np.roots(polynomial)) < 1)
+
+
+def _bias_correction(y, ar_lags, ma_lags, ar_params, ma_params, start):
+    """
+    Third (Gauss-Newton) step of the Hannan-Rissanen procedure for one series
+    """
+    nobs = len(y)
+    ma_poly = _lag_polynomial(ma_params, ma_lags)
+
+    # Innovations implied by the second step estimates, started at zero
+    ylags = np.zeros((nobs, len(ar_lags)))
+    ylags[start:] = _lagged(y[None, :], ar_lags, start)[0]
+    u = np.zeros(nobs)
+    u[start:] = y[start:] - ylags[start:].dot(ar_params)
+    z = lfilter([1], ma_poly, u)
+
+    # Regressors are the lagged series filtered by 1 / theta(L)
+    zlags = _lagged(np.r_[np.zeros(ma_lags[-1]), z][None, :], ma_lags,
+                    ma_lags[-1])[0]
+    regressors = lfilter([1], ma_poly, np.c_[ylags, zlags], axis=0)
+    delta = np.linalg.lstsq(regressors[start:], z[start:], rcond=-1)[0]
+
+    k_ar = len(ar_lags)
+    ar_params = ar_params + delta[:k_ar]
+    ma_params = ma_params + delta[k_ar:]
+    ma_poly = _lag_polynomial(ma_params, ma_lags)
+    if not _is_invertible(ma_poly):
+        return None
+
+    u[start:] = y[start:] - ylags[start:].dot(ar_params)
+    resid = lfilter([1], ma_poly, u)[start:]
+    return ar_params, ma_params, np.mean(resid**2)
+
+
+def hannan_rissanen(endog, ar_order=0, ma_order=0, demean=True,
+                    initial_ar_order=None, unbiased=True):
+    r"""
+    Estimate ARMA parameters using the Hannan-Rissanen procedure
+
+    Parameters
+    ----------
+    endog : array_like
+        Input time series. If 2-dim, each column is a separate series and
+        all of them are estimated at once.
+    ar_order : int or array_like, optional
+        Autoregressive order, or an iterable of the included lags. Default
+        is 0.
+    ma_order : int or array_like, optional
+        Moving average order, or an iterable of the included lags. Default
+        is 0.
+    demean : bool, optional
+        Whether to subtract the sample mean of each series before
+        estimation. Default is True.
+    initial_ar_order : int, optional
+        Order of the long autoregression used to estimate the innovations
+        in the first step. Default is `max(floor(log(nobs)**2),
+        2 * max(ar_order, ma_order))`.
+    unbiased : bool, optional
+        Whether to apply the third step of the procedure, a single
+        Gauss-Newton update that removes the bias of the second step
+        estimates. The update is skipped for a series if the second step or
+        the updated moving average polynomial is not invertible. Default is
+        True.
+
+    Returns
+    -------
+    ar_params : array
+        Estimated autoregressive coefficients. Shape is (k_ar,) or, for 2-dim
+        `endog`, (nseries, k_ar).
+    ma_params : array
+        Estimated moving average coefficients, shaped like `ar_params`.
+    sigma2 : float or array
+        Estimated innovation variance.
+
+    Notes
+    -----
+    The model is
+
+    .. math::
+
+        y_t = \phi_1 y_{t-1} + \dots + \phi_p y_{t-p} + \epsilon_t +
+              \theta_1 \epsilon_{t-1} + \dots + \theta_q \epsilon_{t-q}
+
+    so that the returned coefficients have the same sign convention as the
+    `ar` and `ma` parameters in `SARIMAX`.
+
+    In the first step, a long autoregression is fit by least squares and its
+    residuals are used as estimates of the innovations. In the second step,
+    `y_t` is regressed on its own lags and on the lagged estimated
+    innovations. If `unbiased` is True, the third step described in
+    Brockwell and Davis (2016), section 5.1.4, is applied. Each least squares
+    step is computed for all series at once.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2016.
+       Introduction to Time Series and Forecasting. Springer.
+    .. [2] Hannan, E. J., and J. Rissanen. 1982.
+       "Recursive Estimation of Mixed Autoregressive-Moving Average Order."
+       Biometrika 69 (1): 81-94.
+    """
+    y, squeeze = _prepare_endog(endog, demean)
+    nseries, nobs = y.shape
+    ar_lags = _order_to_lags(ar_order, 'ar_order')
+    ma_lags = _order_to_lags(ma_order, 'ma_order')
+    k_ar = len(ar_lags)
+    k_ma = len(ma_lags)
+    max_ar = ar_lags[-1] if k_ar else 0
+    max_ma = ma_lags[-1] if k_ma else 0
+
+    if k_ma == 0:
+        start = max_ar
+        if nobs - start <= k_ar:
+            raise ValueError('Too few observations for the requested order.')
+        if k_ar:
+            ar_params, resid = _batched_lstsq(
+                y[:, start:], _lagged(y, ar_lags, start))
+        else:
+            ar_params = np.zeros((nseries, 0))
+            resid = y
+        ma_params = np.zeros((nseries, 0))
+        sigma2 = np.mean(resid**2, axis=1)
+    else:
+        if initial_ar_order is None:
+            initial_ar_order = max(int(np.floor(np.log(nobs)**2)),
+                                   2 * max(max_ar, max_ma))
+        initial_ar_order = int(initial_ar_order)
+        start = max(initial_ar_order + max_ma, max_ar)
+        if initial_ar_order < 1:
+            raise ValueError('initial_ar_order must be positive.')
+        if nobs - start <= k_ar + k_ma:
+            raise ValueError('Too few observations for the requested order.'
+                             ' Reduce the orders or initial_ar_order.')
+
+        # Step 1: long autoregression
+        m = initial_ar_order
+        _, resid = _batched_lstsq(y[:, m:],
+                                  _lagged(y, np.arange(1, m + 1), m))
+        innov = np.zeros_like(y)
+        innov[:, m:] = resid
+
+        # Step 2: regression on lagged values and lagged innovations
+        exog = np.concatenate([_lagged(y, ar_lags, start),
+                               _lagged(innov, ma_lags, start)], axis=2)
+        params, resid = _batched_lstsq(y[:, start:], exog)
+        ar_params = params[:, :k_ar]
+        ma_params = params[:, k_ar:]
+        sigma2 = np.mean(resid**2, axis=1)
+
+        # Step 3: bias correction, which requires filtering by the inverse of
+        # the moving average polynomial, series by series
+        if unbiased:
+            for i in range(nseries):
+                if not _is_invertible(_lag_polynomial(ma_params[i], ma_lags)):
+                    continue
+                corrected = _bias_correction(y[i], ar_lags, ma_lags,
+                                             ar_params[i], ma_params[i],
+                                             start)
+                if corrected is not None:
+                    ar_params[i], ma_params[i], sigma2[i] = corrected
+
+    if squeeze:
+        return ar_params[0], ma_params[0], sigma2[0]
+    return ar_params, ma_params, sigma2
+
+
+def innovations_algo(acov, nobs=None):
+    r"""
+    Innovations algorithm for a stationary process
+
+    Parameters
+    ----------
+    acov : array_like
+        Autocovariances at lags 0, 1, .... May have leading dimensions, in
+        which case the last axis holds the autocovariances and the algorithm
+        is applied to all of them at once.
+    nobs : int, optional
+        Number of periods for which to compute the coefficients. Default is
+        the number of autocovariances, which is also the maximum.
+
+    Returns
+    -------
+    theta : array
+        Innovations coefficients, shape (..., nobs, nobs - 1). Row `n`
+        contains :math:`\theta_{n,1}, \dots, \theta_{n,n}` followed by
+        zeros.
+    v : array
+        Mean squared one-step prediction errors, shape (..., nobs).
+
+    Notes
+    -----
+    Implements Proposition 5.2.2 in Brockwell and Davis (2016). For an
+    MA(q) process, :math:`\theta_{n,j}` converges to :math:`\theta_j` and
+    :math:`v_n` to the innovation variance as `n` grows.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2016.
+       Introduction to Time Series and Forecasting. Springer.
+    """
+    acov = np.asarray(acov, dtype=float)
+    if nobs is None:
+        nobs = acov.shape[-1]
+    if nobs > acov.shape[-1] or nobs < 1:
+        raise ValueError('nobs must be between 1 and the number of'
+                         ' autocovariances.')
+    shape = acov.shape[:-1]
+    # reversed[n, j] = theta_{n, n - j}, so that the sums run over j
+    theta_rev = np.zeros(shape + (nobs, nobs))
+    v = np.zeros(shape + (nobs,))
+    v[..., 0] = acov[..., 0]
+    for n in range(1, nobs):
+        for k in range(n):
+            total = np.sum(theta_rev[..., k, :k] * theta_rev[..., n, :k] *
+                           v[..., :k], axis=-1)
+            theta_rev[..., n, k] = (acov[..., n - k] - total) / v[..., k]
+        v[..., n] = acov[..., 0] - np.sum(theta_rev[..., n, :n]**2 *
+                                          v[..., :n], axis=-1)
+
+    theta = np.zeros(shape + (nobs, max(nobs - 1, 0)))
+    for n in range(1, nobs):
+        theta[..., n, :n] = theta_rev[..., n, n - 1::-1]
+    return theta, v
+
+
+def innovations(endog, ma_order=0, demean=True, initial_order=None):
+    r"""
+    Estimate MA parameters using the innovations algorithm
+
+    Parameters
+    ----------
+    endog : array_like
+        Input time series. If 2-dim, each column is a separate series and
+        all of them are estimated at once.
+    ma_order : int, optional
+        Moving average order. Default is 0.
+    demean : bool, optional
+        Whether to subtract the sample mean of each series before
+        estimation. Default is True.
+    initial_order : int, optional
+        Number of recursions `m` of the innovations algorithm; the estimates
+        are :math:`\hat \theta_{m,1}, \dots, \hat \theta_{m,q}` and
+        :math:`\hat v_m`. Must be at least `ma_order`. Default is
+        `max(ma_order, min(nobs - 1, floor(log(nobs)**2)))`.
+
+    Returns
+    -------
+    ma_params : array
+        Estimated moving average coefficients. Shape is (ma_order,) or, for
+        2-dim `endog`, (nseries, ma_order).
+    sigma2 : float or array
+        Estimated innovation variance.
+
+    Notes
+    -----
+    The sample autocovariances of all series are computed with a single FFT.
+    See Brockwell and Davis (2016), section 5.1.3.
+
+    References
+    ----------
+    .. [1] Brockwell, Peter J., and Richard A. Davis. 2016.
+       Introduction to Time Series and Forecasting. Springer.
+    """
+    y, squeeze = _prepare_endog(endog, demean)
+    nobs = y.shape[1]
+    ma_order = int(ma_order)
+    if ma_order < 0:
+        raise ValueError('ma_order must be non-negative.')
+    if initial_order is None:
+        initial_order = max(ma_order,
+                            min(nobs - 1, int(np.floor(np.log(nobs)**2))))
+    m = int(initial_order)
+    if m < ma_order or m >= nobs:
+        raise ValueError('initial_order must be at least ma_order and less'
+                         ' than the number of observations.')
+
+    # Biased sample autocovariances, zero-padded to avoid circular terms
+    n = 2 ** int(np.ceil(np.log2(2 * nobs - 1)))
+    fy = np.fft.rfft(y, n=n, axis=1)
+    acov = np.fft.irfft(fy * np.conj(fy), n=n, axis=1)[:, :m + 1] / nobs
+
+    theta, v = innovations_algo(acov)
+    ma_params = theta[:, m, :ma_order]
+    sigma2 = v[:, m]
+    if squeeze:
+        return ma_params[0], sigma2[0]
+    return ma_params, sigma2
@@ -296,34 +296,29 @@ class MarkovAutoregression(markov_regression.MarkovRegression):
         resid = np.zeros((self.k_regimes, self.nobs + self.order))
         resid[:] = self.orig_endog
         if self._k_exog > 0:
-            for i in range(self.k_regimes):
-                resid[i] -= np.dot(self.orig_exog, betas[i])
+            resid -= np.dot(betas, self.orig_exog.T)
 
         # The difference between this and `_em_exog` is that here we have a
-        # different endog and exog for each regime
-        coeffs = np.zeros((self.k_regimes,) + (self.order,))
-        variance = np.zeros((self.k_regimes,))
-        exog = np.zeros((self.nobs, self.order))
-        for i in range(self.k_regimes):
-            endog = resid[i, self.order:]
-            exog = lagmat(resid[i], self.order)[self.order:]
-            tmp_endog = tmp[i] * endog
-            tmp_exog = tmp[i][:, None] * exog
-
-            coeffs[i] = np.dot(np.linalg.pinv(tmp_exog), tmp_endog)
-
-            if self.switching_variance:
-                tmp_resid = endog - np.dot(exog, coeffs[i])
-                variance[i] = (np.sum(
-                    tmp_resid**2 * result.smoothed_marginal_probabilities[i]) /
-                    np.sum(result.smoothed_marginal_probabilities[i]))
-            else:
-                tmp_resid = tmp_endog - np.dot(tmp_exog, coeffs[i])
-                variance[i] = np.sum(tmp_resid**2)
+        # different endog and exog for each regime, the lags of the residuals
+        # of each regime are shaped (k_regimes, nobs, order)
+        endog = resid[:, self.order:]
+        exog = np.zeros((self.k_regimes, self.nobs, self.order))
+        for j in range(self.order):
+            exog[..., j] = resid[:, self.order - j - 1:-j - 1]
+        tmp_endog = tmp * endog
+        tmp_exog = tmp[:, :, None] * exog
+
+        coeffs = markov_switching._pinv_solve(tmp_exog, tmp_endog)
+        tmp_resid = endog - np.einsum('itj,ij->it', exog, coeffs)
 
         # Variances
-        if not self.switching_variance:
-            variance = variance.sum() / self.nobs
+        if self.switching_variance:
+            variance = (
+                np.sum(tmp_resid**2 * result.smoothed_marginal_probabilities,
+                       1) /
+                np.sum(result.smoothed_marginal_probabilities, 1))
+        else:
+            variance = np.sum((tmp * tmp_resid)**2) / self.nobs
 
         return coeffs, variance
 
@@ -250,16 +250,15 @@ class MarkovRegression(markov_switching.MarkovSwitching):
             coeffs[:, ~switching] = nonswitching_coeffs
             endog = endog - np.dot(nonswitching_exog, nonswitching_coeffs)
 
-        # Next, get switching coefficients
+        # Next, get switching coefficients, for all regimes at once
         if np.any(switching):
             switching_exog = exog[:, switching]
             if tmp is None:
                 tmp = np.sqrt(result.smoothed_marginal_probabilities)
-            for i in range(self.k_regimes):
-                tmp_endog = tmp[i] * endog
-                tmp_exog = tmp[i][:, np.newaxis] * switching_exog
-                coeffs[i, switching] = (
-                    np.dot(np.linalg.pinv(tmp_exog), tmp_endog))
+            tmp_endog = tmp * endog
+            tmp_exog = tmp[:, :, np.newaxis] * switching_exog
+            coeffs[:, switching] = markov_switching._pinv_solve(tmp_exog,
+                                                                tmp_endog)
 
         return coeffs
 
@@ -269,30 +268,20 @@ class MarkovRegression(markov_switching.MarkovSwitching):
         """
         k_exog = 0 if exog is None else exog.shape[1]
 
+        # Residuals of each regime, shaped (k_regimes, nobs)
+        if k_exog > 0:
+            resid = endog - np.dot(betas, exog.T)
+        else:
+            resid = np.tile(endog, (self.k_regimes, 1))
+
         if self.switching_variance:
-            variance = np.zeros(self.k_regimes)
-            for i in range(self.k_regimes):
-                if k_exog > 0:
-                    resid = endog - np.dot(exog, betas[i])
-                else:
-                    resid = endog
-                variance[i] = (
-                    np.sum(resid**2 *
-                           result.smoothed_marginal_probabilities[i]) /
-                    np.sum(result.smoothed_marginal_probabilities[i]))
+            variance = (
+                np.sum(resid**2 * result.smoothed_marginal_probabilities, 1) /
+                np.sum(result.smoothed_marginal_probabilities, 1))
         else:
-            variance = 0
             if tmp is None:
                 tmp = np.sqrt(result.smoothed_marginal_probabilities)
-            for i in range(self.k_regimes):
-                tmp_endog = tmp[i] * endog
-                if k_exog > 0:
-                    tmp_exog = tmp[i][:, np.newaxis] * exog
-                    resid = tmp_endog - np.dot(tmp_exog, betas[i])
-                else:
-                    resid = tmp_endog
-                variance += np.sum(resid**2)
-            variance /= self.nobs
+            variance = np.sum((tmp * resid)**2) / self.nobs
         return variance
 
     @property
@@ -9,6 +9,7 @@ from __future__ import division, absolute_import, print_function
 
 import warnings
 import numpy as np
+from numpy.linalg import LinAlgError
 import pandas as pd
 from statsmodels.compat.collections import OrderedDict
 
@@ -22,6 +23,7 @@ from statsmodels.tools.decorators import cache_readonly, resettable_cache
 from statsmodels.tools.eval_measures import aic, bic, hqic
 from statsmodels.tools.tools import pinv_extended
 from statsmodels.tools.sm_exceptions import EstimationWarning
+from statsmodels.tools.parallel import parallel_func
 import statsmodels.base.wrapper as wrap
 
 
@@ -120,6 +122,71 @@ def _partials_logistic(x):
     return partials
 
 
+def _pinv_solve(a, b):
+    """
+    Least squares solutions of a stack of problems using the pseudoinverse
+
+    Parameters
+    ----------
+    a : array
+        Array of regressors, shaped (k_regimes, nobs, k).
+    b : array
+        Array of dependent variables, shaped (k_regimes, nobs).
+
+    Returns
+    -------
+    x : array
+        Array of coefficients, shaped (k_regimes, k), where `x[i]` is
+        `np.dot(np.linalg.pinv(a[i]), b[i])`.
+
+    Notes
+    -----
+    This uses the stacked singular value decomposition, with the default
+    cutoff of `np.linalg.pinv` for small singular values, so that the
+    coefficients of all regimes are computed at once.
+    """
+    u, s, vt = np.linalg.svd(a, full_matrices=False)
+    cutoff = 1e-15 * s.max(axis=1)[:, None]
+    s_inv = np.zeros(s.shape)
+    large = s > cutoff
+    s_inv[large] = 1. / s[large]
+    return np.einsum('ikj,ik->ij', vt,
+                     s_inv * np.einsum('itk,it->ik', u, b))
+
+
+def _search_em(model, start_params, variates, em_iter):
+    """
+    Apply EM iterations to random permutations of a parameter vector
+
+    Returns the loglikelihood and the (untransformed) parameters of the best
+    permutation, or None if none could be evaluated.
+
+    Notes
+    -----
+    The permutations are handled one at a time, each with the usual compiled
+    Hamilton filter and Kim smoother, so that this is the unit of work that
+    is run in a separate process for each job.
+    """
+    llf = None
+    params = None
+    for i in range(len(variates)):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+
+            try:
+                proposed_params = model._fit_em(
+                    start_params + variates[i], transformed=False,
+                    maxiter=em_iter, return_params=True)
+                proposed_llf = model.loglike(proposed_params)
+
+                if llf is None or proposed_llf > llf:
+                    llf = proposed_llf
+                    params = model.untransform_params(proposed_params)
+            except (LinAlgError, ValueError, FloatingPointError):
+                pass
+    return llf, params
+
+
 def py_hamilton_filter(initial_probabilities, regime_transition,
                        conditional_likelihoods):
     """
@@ -1191,7 +1258,7 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
     def fit(self, start_params=None, transformed=True, cov_type='approx',
             cov_kwds=None, method='bfgs', maxiter=100, full_output=1, disp=0,
             callback=None, return_params=False, em_iter=5, search_reps=0,
-            search_iter=5, search_scale=1., **kwargs):
+            search_iter=5, search_scale=1., search_n_jobs=1, **kwargs):
         """
         Fits the model by maximum likelihood via Hamilton filter.
 
@@ -1252,6 +1319,10 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
             search parameter repetitions.
         search_scale : float or array, optional.
             Scale of variates for random start parameter search.
+        search_n_jobs : int, optional
+            Number of jobs used to run the random start parameter search in
+            parallel, with one process per job. -1 uses all CPUs. Requires
+            joblib. Default is 1.
         **kwargs
             Additional keyword arguments to pass to the optimizer.
 
@@ -1259,6 +1330,17 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
         -------
         MarkovSwitchingResults
 
+        Notes
+        -----
+        `search_n_jobs` only parallelizes the random start parameter search,
+        across processes. Each random start vector is still improved by
+        separate calls to the compiled Hamilton filter and Kim smoother, and
+        the EM steps run in Python. There is no batched filter that evaluates
+        many parameter vectors at once, and no compiled EM iteration. The
+        EM M-steps, not the filter, take most of the time of an iteration.
+        The EM iterations (`em_iter`) and the maximum likelihood estimation
+        itself are not parallelized.
+
         """
 
         if start_params is None:
@@ -1272,7 +1354,7 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
             start_params = self._start_params_search(
                 search_reps, start_params=start_params,
                 transformed=transformed, em_iter=search_iter,
-                scale=search_scale)
+                scale=search_scale, n_jobs=search_n_jobs)
             transformed = True
 
         # Get better start params through EM algorithm
@@ -1439,31 +1521,29 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
             tmp = np.sum(tmp, -2)
         smoothed_joint_probabilities = tmp
 
-        # Transition parameters (recall we're not yet supporting TVTP here)
-        k_transition = len(self.parameters[0, 'regime_transition'])
-        regime_transition = np.zeros((self.k_regimes, k_transition))
-        for i in range(self.k_regimes):  # S_{t_1}
-            for j in range(self.k_regimes - 1):  # S_t
-                regime_transition[i, j] = (
-                    np.sum(smoothed_joint_probabilities[j, i]) /
-                    np.sum(result.smoothed_marginal_probabilities[i]))
-
-            # It may be the case that due to rounding error this estimates
-            # transition probabilities that sum to greater than one. If so,
-            # re-scale the probabilities and warn the user that something
-            # is not quite right
-            delta = np.sum(regime_transition[i]) - 1
-            if delta > 0:
-                warnings.warn('Invalid regime transition probabilities'
-                              ' estimated in EM iteration; probabilities have'
-                              ' been re-scaled to continue estimation.',
-                              EstimationWarning)
-                regime_transition[i] /= 1 + delta + 1e-6
+        # Transition parameters (recall we're not yet supporting TVTP here),
+        # rows are S_{t-1} and columns are S_t
+        regime_transition = (
+            np.sum(smoothed_joint_probabilities[:-1], -1).T /
+            np.sum(result.smoothed_marginal_probabilities, -1)[:, None])
+
+        # It may be the case that due to rounding error this estimates
+        # transition probabilities that sum to greater than one. If so,
+        # re-scale the probabilities and warn the user that something
+        # is not quite right
+        delta = np.sum(regime_transition, 1) - 1
+        invalid = delta > 0
+        if np.any(invalid):
+            warnings.warn('Invalid regime transition probabilities'
+                          ' estimated in EM iteration; probabilities have'
+                          ' been re-scaled to continue estimation.',
+                          EstimationWarning)
+            regime_transition[invalid] /= 1 + delta[invalid, None] + 1e-6
 
         return regime_transition
 
     def _start_params_search(self, reps, start_params=None, transformed=True,
-                             em_iter=5, scale=1.):
+                             em_iter=5, scale=1., n_jobs=1):
         """
         Search for starting parameters as random permutations of a vector
 
@@ -1483,12 +1563,23 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
             Scale of variates for random start parameter search. Can be given
             as an array of length equal to the number of parameters or as a
             single scalar.
+        n_jobs : int, optional
+            Number of jobs used to evaluate the random permutations in
+            parallel. The permutations are split into `n_jobs` groups, and
+            each job applies the EM iterations to one group. Default is 1.
 
         Notes
         -----
         This is a private method for finding good starting parameters for MLE
         by scoring, where the defaults have been set heuristically.
 
+        The random permutations are drawn before they are split between jobs,
+        so the result does not depend on `n_jobs`. The parallelism is only
+        across processes: within a job, each permutation is evaluated by its
+        own calls to the compiled filter and smoother (see `_search_em`).
+        The M-steps of each EM iteration are computed for all regimes at
+        once.
+
         """
         if start_params is None:
             start_params = self.start_params
@@ -1516,21 +1607,20 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
 
         llf = self.loglike(start_params, transformed=False)
         params = start_params
-        for i in range(reps):
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-
-                try:
-                    proposed_params = self._fit_em(
-                        start_params + variates[i], transformed=False,
-                        maxiter=em_iter, return_params=True)
-                    proposed_llf = self.loglike(proposed_params)
-
-                    if proposed_llf > llf:
-                        llf = proposed_llf
-                        params = self.untransform_params(proposed_params)
-                except:
-                    pass
+
+        if n_jobs == 1:
+            parallel, p_func = list, _search_em
+        else:
+            parallel, p_func, n_jobs = parallel_func(_search_em, n_jobs,
+                                                     verbose=0)
+        chunks = np.array_split(variates, max(min(n_jobs, reps), 1))
+        out = parallel(p_func(self, start_params, chunk, em_iter)
+                       for chunk in chunks)
+
+        for proposed_llf, proposed_params in out:
+            if proposed_llf is not None and proposed_llf > llf:
+                llf = proposed_llf
+                params = proposed_params
 
         # Return transformed parameters
         return self.transform_params(params)
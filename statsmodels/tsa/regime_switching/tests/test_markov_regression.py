@@ -1091,6 +1091,18 @@ class TestFedFundsConstL1Exog3(MarkovRegression):
         np.random.seed(1234)
         super(TestFedFundsConstL1Exog3, self).test_fit(**kwargs)
 
+    def test_start_params_search_n_jobs(self):
+        # The random search gives the same result however the random
+        # permutations are split between jobs
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            np.random.seed(1234)
+            desired = self.model._start_params_search(10, em_iter=2)
+            np.random.seed(1234)
+            actual = self.model._start_params_search(10, em_iter=2,
+                                                     n_jobs=3)
+        assert_allclose(actual, desired)
+
 
 class TestAreturnsConstL1Variance(MarkovRegression):
     # Results from Stata, see http://www.stata.com/manuals14/tsmswitch.pdf
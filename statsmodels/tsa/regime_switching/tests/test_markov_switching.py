@@ -315,3 +315,16 @@ def test_partials_logistic():
             desired = np.diag(evaluated[:, j, t] - evaluated[:, j, t]**2)
             desired[0, 1] = desired[1, 0] = -np.multiply(*evaluated[:, j, t])
             assert_allclose(partials[..., j, t], desired)
+
+
+def test_pinv_solve():
+    # stacked least squares for all regimes, including a regime without
+    # probability mass and a rank deficient regressor matrix
+    np.random.seed(1234)
+    a = np.random.normal(size=(3, 20, 3))
+    a[1] = 0
+    a[2, :, 2] = a[2, :, 0] + a[2, :, 1]
+    b = np.random.normal(size=(3, 20))
+    desired = [np.dot(np.linalg.pinv(a[i]), b[i]) for i in range(3)]
+    assert_allclose(markov_switching._pinv_solve(a, b), desired,
+                    atol=1e-12)
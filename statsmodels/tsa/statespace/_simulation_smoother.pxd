@@ -89,6 +89,7 @@ cdef class sSimulationSmoother(object):
     cpdef set_initial_state_variates(self, np.float32_t [:] variates, int pretransformed=*)
     cpdef set_initial_state(self, np.float32_t [:] initial_state)
     cpdef simulate(self, int simulation_output=*)
+    cpdef simulate_multiple(self, np.float32_t [:, ::1] disturbance_variates, np.float32_t [:, ::1] initial_state_variates, np.float32_t [::1, :, :] generated_obs, np.float32_t [::1, :, :] generated_state, np.float32_t [::1, :, :] simulated_measurement_disturbance=*, np.float32_t [::1, :, :] simulated_state_disturbance=*, np.float32_t [::1, :, :] simulated_state=*, int simulation_output=*)
 
     cdef np.float32_t generate_obs(self, int t, np.float32_t * obs, np.float32_t * state, np.float32_t * variates)
     cdef np.float32_t generate_state(self, int t, np.float32_t * state, np.float32_t * input_state, np.float32_t * variates)
@@ -158,6 +159,7 @@ cdef class dSimulationSmoother(object):
     cpdef set_initial_state_variates(self, np.float64_t [:] variates, int pretransformed=*)
     cpdef set_initial_state(self, np.float64_t [:] initial_state)
     cpdef simulate(self, int simulation_output=*)
+    cpdef simulate_multiple(self, np.float64_t [:, ::1] disturbance_variates, np.float64_t [:, ::1] initial_state_variates, np.float64_t [::1, :, :] generated_obs, np.float64_t [::1, :, :] generated_state, np.float64_t [::1, :, :] simulated_measurement_disturbance=*, np.float64_t [::1, :, :] simulated_state_disturbance=*, np.float64_t [::1, :, :] simulated_state=*, int simulation_output=*)
 
     cdef np.float64_t generate_obs(self, int t, np.float64_t * obs, np.float64_t * state, np.float64_t * variates)
     cdef np.float64_t generate_state(self, int t, np.float64_t * state, np.float64_t * input_state, np.float64_t * variates)
@@ -227,6 +229,7 @@ cdef class cSimulationSmoother(object):
     cpdef set_initial_state_variates(self, np.complex64_t [:] variates, int pretransformed=*)
     cpdef set_initial_state(self, np.complex64_t [:] initial_state)
     cpdef simulate(self, int simulation_output=*)
+    cpdef simulate_multiple(self, np.complex64_t [:, ::1] disturbance_variates, np.complex64_t [:, ::1] initial_state_variates, np.complex64_t [::1, :, :] generated_obs, np.complex64_t [::1, :, :] generated_state, np.complex64_t [::1, :, :] simulated_measurement_disturbance=*, np.complex64_t [::1, :, :] simulated_state_disturbance=*, np.complex64_t [::1, :, :] simulated_state=*, int simulation_output=*)
 
     cdef np.complex64_t generate_obs(self, int t, np.complex64_t * obs, np.complex64_t * state, np.complex64_t * variates)
     cdef np.complex64_t generate_state(self, int t, np.complex64_t * state, np.complex64_t * input_state, np.complex64_t * variates)
@@ -296,6 +299,7 @@ cdef class zSimulationSmoother(object):
     cpdef set_initial_state_variates(self, np.complex128_t [:] variates, int pretransformed=*)
     cpdef set_initial_state(self, np.complex128_t [:] initial_state)
     cpdef simulate(self, int simulation_output=*)
+    cpdef simulate_multiple(self, np.complex128_t [:, ::1] disturbance_variates, np.complex128_t [:, ::1] initial_state_variates, np.complex128_t [::1, :, :] generated_obs, np.complex128_t [::1, :, :] generated_state, np.complex128_t [::1, :, :] simulated_measurement_disturbance=*, np.complex128_t [::1, :, :] simulated_state_disturbance=*, np.complex128_t [::1, :, :] simulated_state=*, int simulation_output=*)
 
     cdef np.complex128_t generate_obs(self, int t, np.complex128_t * obs, np.complex128_t * state, np.complex128_t * variates)
     cdef np.complex128_t generate_state(self, int t, np.complex128_t * state, np.complex128_t * input_state, np.complex128_t * variates)
@@ -0,0 +1,785 @@
+"""
+Kalman Filter for Many Independent Series with One Model Specification
+
+License: Simplified-BSD
+"""
+from __future__ import division, absolute_import, print_function
+
+from statsmodels.compat.numpy import np_moveaxis, np_stack
+
+import numpy as np
+
+from statsmodels.tools.tools import Bunch
+from statsmodels.tools.numdiff import _get_epsilon
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+from statsmodels.tsa.statespace.varmax import VARMAX
+
+_matrices = ['design', 'obs_intercept', 'obs_cov', 'transition',
+             'state_intercept', 'selection', 'state_cov']
+
+
+# The series are in the last axis of all arrays, so that the elementwise
+# operations below run over long contiguous vectors.  For the small state
+# dimensions of typical models this is much faster than stacked matrix
+# routines over a leading series axis.
+
+def _dot(a, b):
+    # a (i, l, nseries) times b (l, j, nseries) or b (l, nseries)
+    if b.ndim == 2:
+        return (a * b[None]).sum(1)
+    return (a[:, :, None] * b[None]).sum(1)
+
+
+def _t(a):
+    # (non-conjugate) transpose, complex step differentiation requires the
+    # plain transpose
+    return np.swapaxes(a, 0, 1)
+
+
+def _at(matrix, t):
+    # period t of a matrix that may be time-invariant
+    return matrix[..., t if matrix.shape[-2] > 1 else 0, :]
+
+
+def _solve(a, b):
+    # solve a x = b for a (k, k, nseries) and b (k, m, nseries)
+    if a.shape[0] == 1:
+        return b / a
+    x = np.linalg.solve(np_moveaxis(a, -1, 0), np_moveaxis(b, -1, 0))
+    return np_moveaxis(x, 0, -1)
+
+
+def _log_det(a):
+    # log determinant of a (k, k, nseries)
+    if a.shape[0] == 1:
+        return np.log(a[0, 0])
+    a = np_moveaxis(a, -1, 0)
+    if np.iscomplexobj(a):
+        return np.log(np.linalg.det(a))
+    return np.linalg.slogdet(a)[1]
+
+
+def _set(matrices, key, value):
+    # the batched analog of Representation.__setitem__, key refers to a
+    # matrix without the series axis and value has the series in the last
+    # axis.  If the key omits the time axis, then value is set for all
+    # periods.
+    name, index = key[0], key[1:]
+    matrix = matrices[name]
+    value = np.asarray(value)
+    if len(index) == matrix.ndim - 2:
+        value = value[..., None, :]
+    matrix[index] = value
+
+
+def _polymul(a, b):
+    # products of the polynomials in the columns of a and b
+    out = np.zeros((a.shape[0] + b.shape[0] - 1,) + a.shape[1:],
+                   np.result_type(a, b))
+    for i in range(a.shape[0]):
+        out[i:i + b.shape[0]] += a[i] * b
+    return out
+
+
+def _sarimax_update(model, params, matrices):
+    """
+    Batched `SARIMAX.update` and `SARIMAX.initialize_state`
+
+    Sets the parameter dependent elements of the stacked matrices and
+    returns the initial state and its covariance matrix, or None if the
+    initialization of the model does not depend on the parameters.
+    """
+    nseries = params.shape[0]
+    params = params.T
+
+    start = 0
+    offsets = {}
+    for name, k in [
+            ('trend', model.k_trend),
+            ('exog', model.k_exog if model.mle_regression else 0),
+            ('ar', model.k_ar_params), ('ma', model.k_ma_params),
+            ('seasonal_ar', model.k_seasonal_ar_params),
+            ('seasonal_ma', model.k_seasonal_ma_params),
+            ('exog_variance', model.k_exog if (
+                model.state_regression and model.time_varying_regression)
+                else 0),
+            ('measurement_variance', int(model.measurement_error)),
+            ('variance', int(model.state_error))]:
+        offsets[name] = params[start:start + k]
+        start += k
+
+    def polynomial(base, idx, values):
+        poly = np.repeat(base.real.astype(params.dtype)[:, None], nseries, 1)
+        poly[idx] = values
+        return poly
+
+    polynomial_ar = polynomial(model.polynomial_ar, model._polynomial_ar_idx,
+                               -offsets['ar'])
+    polynomial_ma = polynomial(model.polynomial_ma, model._polynomial_ma_idx,
+                               offsets['ma'])
+    if model.k_seasonal_ar > 0:
+        reduced_polynomial_ar = -_polymul(polynomial_ar, polynomial(
+            model.polynomial_seasonal_ar, model._polynomial_seasonal_ar_idx,
+            -offsets['seasonal_ar']))
+    else:
+        reduced_polynomial_ar = -polynomial_ar
+    if model.k_seasonal_ma > 0:
+        reduced_polynomial_ma = _polymul(polynomial_ma, polynomial(
+            model.polynomial_seasonal_ma, model._polynomial_seasonal_ma_idx,
+            offsets['seasonal_ma']))
+    else:
+        reduced_polynomial_ma = polynomial_ma
+
+    if model.mle_regression:
+        matrices['obs_intercept'] = np.dot(model.exog,
+                                           offsets['exog'])[None, :, :]
+    if model.k_trend > 0:
+        data = np.dot(model._trend_data, offsets['trend'])
+        if not model.hamilton_representation:
+            _set(matrices, ('state_intercept', model._k_states_diff,
+                            slice(None)), data)
+        else:
+            data = data / np.sum(-reduced_polynomial_ar, 0)
+            if model.mle_regression:
+                matrices['obs_intercept'] = (matrices['obs_intercept'] +
+                                             data[None, :, :])
+            else:
+                matrices['obs_intercept'] = data[None, :, :]
+    if model.measurement_error:
+        _set(matrices, ('obs_cov', 0, 0), offsets['measurement_variance'][0])
+    if model.k_ar > 0 or model.k_seasonal_ar > 0:
+        _set(matrices, model.transition_ar_params_idx,
+             reduced_polynomial_ar[1:])
+    if model.k_ma > 0 or model.k_seasonal_ma > 0:
+        if not model.hamilton_representation:
+            _set(matrices, model.selection_ma_params_idx,
+                 reduced_polynomial_ma[1:])
+        else:
+            _set(matrices, model.design_ma_params_idx,
+                 reduced_polynomial_ma[1:])
+    if model.k_posdef > 0:
+        # without ARMA terms the state covariance only holds the variances
+        # of the time-varying regression coefficients
+        if model.state_error:
+            _set(matrices, ('state_cov', 0, 0), offsets['variance'][0])
+        if model.state_regression and model.time_varying_regression:
+            _set(matrices, model._exog_variance_idx,
+                 offsets['exog_variance'])
+
+    if (model._manual_initialization or not model.enforce_stationarity or
+            model._k_order == 0):
+        return None
+
+    k_states = model.k_states
+    dtype = matrices['transition'].dtype
+    initial_state = np.zeros((k_states, nseries), dtype=dtype)
+    initial_state_cov = np.repeat(
+        np.eye(k_states, dtype=dtype)[..., None] * model.ssm.initial_variance,
+        nseries, -1)
+    if model.state_regression:
+        start = k_states - (model.k_exog + model._k_order)
+    else:
+        start = k_states - model._k_order
+    end = start + model._k_order
+    transition = matrices['transition'][start:end, start:end, 0]
+    if not model.hamilton_representation and model.k_trend > 0:
+        initial_intercept = matrices['state_intercept'][
+            model._k_states_diff, 0]
+        initial_mean = initial_intercept / (1 - transition[:, 0].sum(0))
+        initial_state[model._k_states_diff] = initial_mean
+        _start = model._k_states_diff + 1
+        _end = _start + transition.shape[0] - 1
+        initial_state[_start:_end] = transition[1:, 0] * initial_mean
+    selection = matrices['selection'][start:end, :, 0]
+    selected_state_cov = np.einsum('ikn,kln,jln->ijn', selection,
+                                   matrices['state_cov'][:, :, 0], selection)
+    initial_state_cov[start:end, start:end] = (
+        batched_stationary_initialization(
+            transition, np.zeros((end - start, nseries)),
+            selected_state_cov)[1])
+    return initial_state, initial_state_cov
+
+
+def _varmax_update(model, params, matrices):
+    """
+    Batched `VARMAX.update`
+
+    Sets the parameter dependent elements of the stacked matrices, the
+    initialization of VARMAX does not depend on the parameters.
+    """
+    nseries = params.shape[0]
+    k_endog = model.k_endog
+    if model.mle_regression:
+        exog_params = params[:, model._params_regression].reshape(
+            nseries, k_endog, model.k_exog)
+        intercept = np.einsum('tx,nex->etn', model.exog, exog_params)
+        if model.trend == 'c':
+            intercept = intercept + params[:, model._params_trend].T[:, None]
+        _set(matrices, model._idx_state_intercept, intercept)
+    elif model.trend == 'c':
+        _set(matrices, model._idx_state_intercept,
+             params[:, model._params_trend].T)
+
+    ar = params[:, model._params_ar].reshape(
+        nseries, k_endog, k_endog * model.k_ar)
+    ma = params[:, model._params_ma].reshape(
+        nseries, k_endog, k_endog * model.k_ma)
+    _set(matrices, model._idx_transition,
+         np.concatenate((ar, ma), axis=2).transpose(1, 2, 0))
+
+    if model.error_cov_type == 'diagonal':
+        _set(matrices, model._idx_state_cov,
+             params[:, model._params_state_cov].T)
+    elif model.error_cov_type == 'unstructured':
+        lower = np.zeros((nseries, k_endog, k_endog), dtype=params.dtype)
+        lower[(slice(None),) + model._idx_lower_state_cov] = (
+            params[:, model._params_state_cov])
+        # plain transpose for complex step differentiation
+        state_cov = np.einsum('nik,njk->ijn', lower, lower)
+        _set(matrices, ('state_cov', slice(None), slice(None)), state_cov)
+
+    if model.measurement_error:
+        _set(matrices, model._idx_obs_cov,
+             params[:, model._params_obs_cov].T)
+    return None
+
+
+def _batched_update(model):
+    # the batched update for models whose update method is not overridden
+    update = type(model).update
+    if update is SARIMAX.update:
+        return _sarimax_update
+    if update is VARMAX.update:
+        return _varmax_update
+    return None
+
+
+def _initialization(ssm):
+    # initial state, its covariance and whether it is stationary, the
+    # stationary initialization is computed later for all series at once
+    if ssm.initialization == 'known':
+        return ssm._initial_state.copy(), ssm._initial_state_cov.copy(), False
+    elif ssm.initialization == 'approximate_diffuse':
+        return (np.zeros(ssm.k_states),
+                np.eye(ssm.k_states) * ssm._initial_variance, False)
+    elif ssm.initialization == 'stationary':
+        return (np.zeros(ssm.k_states),
+                np.zeros((ssm.k_states, ssm.k_states)), True)
+    raise RuntimeError('Statespace model not initialized.')
+
+
+def batched_stationary_initialization(transition, state_intercept,
+                                      selected_state_cov):
+    r"""
+    Unconditional mean and covariance of the state for a batch of series
+
+    Parameters
+    ----------
+    transition : ndarray
+        Transition matrices, shape (k_states, k_states, nseries).
+    state_intercept : ndarray
+        State intercepts, shape (k_states, nseries).
+    selected_state_cov : ndarray
+        The matrices :math:`R Q R'`, shape (k_states, k_states, nseries).
+
+    Returns
+    -------
+    initial_state : ndarray
+        Shape (k_states, nseries).
+    initial_state_cov : ndarray
+        Shape (k_states, k_states, nseries).
+
+    Notes
+    -----
+    The discrete Lyapunov equations are solved in their vectorized form
+    :math:`(I - T \otimes T) vec(P) = vec(R Q R')`, which is efficient for
+    the small state dimensions of typical univariate models.
+    """
+    k_states, nseries = state_intercept.shape
+    eye = np.eye(k_states)[..., None]
+
+    initial_state = np.zeros(state_intercept.shape, state_intercept.dtype)
+    nonzero = np.abs(state_intercept).sum(0) > 1e-9
+    if nonzero.any():
+        initial_state[:, nonzero] = _solve(
+            eye - transition[..., nonzero],
+            state_intercept[:, None, nonzero])[:, 0]
+
+    kron = np.einsum('ikn,jln->ijkln', transition, transition)
+    kron = kron.reshape(k_states ** 2, k_states ** 2, nseries)
+    vec_cov = _solve(np.eye(k_states ** 2)[..., None] - kron,
+                     selected_state_cov.reshape(k_states ** 2, 1, nseries))
+    initial_state_cov = vec_cov.reshape(k_states, k_states, nseries)
+    return initial_state, initial_state_cov
+
+
+def batched_kalman_filter(endog, design, obs_intercept, obs_cov, transition,
+                          state_intercept, selection, state_cov,
+                          initial_state, initial_state_cov,
+                          store_states=False):
+    """
+    Kalman filter for a batch of independent series
+
+    The arrays have the shapes of the corresponding `Representation` arrays
+    with an additional last axis for the series.  The time axis of the
+    system matrices has length 1 if they are time-invariant and length
+    nobs if they are time-varying.
+
+    Parameters
+    ----------
+    endog : ndarray
+        Observations, shape (k_endog, nobs, nseries).  Missing observations
+        are nan.
+    design : ndarray
+        Shape (k_endog, k_states, 1 or nobs, nseries).
+    obs_intercept : ndarray
+        Shape (k_endog, 1 or nobs, nseries).
+    obs_cov : ndarray
+        Shape (k_endog, k_endog, 1 or nobs, nseries).
+    transition : ndarray
+        Shape (k_states, k_states, 1 or nobs, nseries).
+    state_intercept : ndarray
+        Shape (k_states, 1 or nobs, nseries).
+    selection : ndarray
+        Shape (k_states, k_posdef, 1 or nobs, nseries).
+    state_cov : ndarray
+        Shape (k_posdef, k_posdef, 1 or nobs, nseries).
+    initial_state : ndarray
+        Shape (k_states, nseries).
+    initial_state_cov : ndarray
+        Shape (k_states, k_states, nseries).
+    store_states : bool
+        Whether to store the predicted and filtered states and their
+        covariance matrices for all periods.
+
+    Returns
+    -------
+    results : Bunch
+        With attributes `llf_obs` (nobs, nseries), `forecasts`,
+        `forecasts_error` (k_endog, nobs, nseries), `forecasts_error_cov`
+        (k_endog, k_endog, nobs, nseries) and the predicted state and
+        state covariance for period nobs + 1, `predicted_state` and
+        `predicted_state_cov`.  If `store_states` is True these have a
+        time axis of length nobs + 1 and `filtered_state` and
+        `filtered_state_cov` are included.
+
+    Notes
+    -----
+    This is the conventional Kalman filter of `KalmanFilter` with the
+    default options, but each step is applied to all series at once, so
+    the Python overhead is paid once per period instead of once per series.
+
+    Missing elements of the observation vector are handled by zeroing the
+    corresponding rows of the design matrix and forecast error and
+    replacing the rows and columns of the forecast error covariance by
+    those of the identity matrix.  The elements then do not contribute to
+    the state update or to the loglikelihood.
+    """
+    k_endog, nobs, nseries = endog.shape
+    k_states = transition.shape[0]
+    dtype = np.result_type(design, obs_intercept, obs_cov, transition,
+                           state_intercept, selection, state_cov,
+                           initial_state, initial_state_cov, np.float64)
+
+    missing = np.isnan(endog)
+    endog = np.where(missing, 0, endog)
+    eye = np.eye(k_endog)[..., None]
+    log_2pi = np.log(2 * np.pi)
+
+    # R Q R' for all periods
+    selected_state_cov = np.einsum('ikpn,klpn,jlpn->ijpn', selection,
+                                   state_cov, selection)
+
+    llf_obs = np.zeros((nobs, nseries), dtype)
+    forecasts = np.zeros((k_endog, nobs, nseries), dtype)
+    forecasts_error = np.zeros((k_endog, nobs, nseries), dtype)
+    forecasts_error_cov = np.zeros((k_endog, k_endog, nobs, nseries), dtype)
+    if store_states:
+        predicted_state = np.zeros((k_states, nobs + 1, nseries), dtype)
+        predicted_state_cov = np.zeros(
+            (k_states, k_states, nobs + 1, nseries), dtype)
+        filtered_state = np.zeros((k_states, nobs, nseries), dtype)
+        filtered_state_cov = np.zeros(
+            (k_states, k_states, nobs, nseries), dtype)
+
+    state = np.array(initial_state, dtype=dtype)
+    state_cov = np.array(initial_state_cov, dtype=dtype)
+    for t in range(nobs):
+        if store_states:
+            predicted_state[:, t] = state
+            predicted_state_cov[:, :, t] = state_cov
+
+        # Forecast
+        design_t = _at(design, t)
+        forecast = _at(obs_intercept, t) + _dot(design_t, state)
+        error = endog[:, t] - forecast
+        design_cov = _dot(design_t, state_cov)
+        error_cov = _dot(design_cov, _t(design_t)) + _at(obs_cov, t)
+
+        forecasts[:, t] = forecast
+        forecasts_error[:, t] = error
+        forecasts_error_cov[:, :, t] = error_cov
+
+        # Remove the missing elements
+        k_obs = k_endog
+        if missing[:, t].any():
+            mask = (~missing[:, t]).astype(float)
+            error = error * mask
+            design_cov = design_cov * mask[:, None]
+            error_cov = (error_cov * mask[:, None] * mask[None, :] +
+                         eye * (1 - mask)[:, None])
+            k_obs = mask.sum(0)
+
+        # Loglikelihood, gain and updating step
+        rhs = np.concatenate((error[:, None], design_cov), axis=1)
+        sol = _solve(error_cov, rhs)
+        llf_obs[t] = -0.5 * (k_obs * log_2pi + _log_det(error_cov) +
+                             (error * sol[:, 0]).sum(0))
+
+        state = state + _dot(_t(design_cov), sol[:, 0])
+        state_cov = state_cov - _dot(_t(design_cov), sol[:, 1:])
+        if store_states:
+            filtered_state[:, t] = state
+            filtered_state_cov[:, :, t] = state_cov
+
+        # Prediction step
+        transition_t = _at(transition, t)
+        state = _at(state_intercept, t) + _dot(transition_t, state)
+        state_cov = (_dot(_dot(transition_t, state_cov), _t(transition_t)) +
+                     _at(selected_state_cov, t))
+        state_cov = (state_cov + _t(state_cov)) / 2
+
+    forecasts_error[missing] = np.nan
+
+    res = Bunch(llf_obs=llf_obs, forecasts=forecasts,
+                forecasts_error=forecasts_error,
+                forecasts_error_cov=forecasts_error_cov)
+    if store_states:
+        predicted_state[:, nobs] = state
+        predicted_state_cov[:, :, nobs] = state_cov
+        res.update(predicted_state=predicted_state,
+                   predicted_state_cov=predicted_state_cov,
+                   filtered_state=filtered_state,
+                   filtered_state_cov=filtered_state_cov)
+    else:
+        res.update(predicted_state=state, predicted_state_cov=state_cov)
+    return res
+
+
+class BatchedMLEModel(object):
+    r"""
+    One state space model specification applied to many independent series
+
+    Parameters
+    ----------
+    model : MLEModel
+        A model for one of the series, for example a `SARIMAX` model created
+        for the first series, with the same number of observations.  It is
+        used to construct the system matrices for the parameters of each
+        series, time-varying matrices such as trends or exogenous
+        regressors are shared by all series.
+    endog : array_like
+        The observations, with the series in the last axis.  Shape
+        (nobs, nseries) or, for models with more than one endogenous
+        variable, (nobs, k_endog, nseries).
+
+    Notes
+    -----
+    For `SARIMAX` and `VARMAX` models the system matrices of all series are
+    constructed at once from the stacked parameters, following the
+    `update` method of the model.  For other models, and for subclasses
+    that override `update`, the parameters of each series are translated
+    into system matrices by the `update` method of `model`.  The Kalman
+    filter then runs over all series at once, see `batched_kalman_filter`.
+
+    Params arguments are arrays of shape (nseries, k_params), or of shape
+    (k_params,) if all series share the same parameters.
+
+    Examples
+    --------
+    >>> mod = sm.tsa.SARIMAX(endog[:, 0], order=(1, 0, 1))
+    >>> batch = BatchedMLEModel(mod, endog)
+    >>> llf = batch.loglike(params)  # params has shape (nseries, 3)
+    """
+
+    def __init__(self, model, endog):
+        endog = np.asarray(endog, dtype=float)
+        if endog.ndim == 2:
+            endog = endog[:, None, :]
+        if endog.ndim != 3 or endog.shape[1] != model.k_endog:
+            raise ValueError('endog must have shape (nobs, nseries) or '
+                             '(nobs, k_endog, nseries) with k_endog=%d'
+                             % model.k_endog)
+        self.model = model
+        self.endog = endog
+        self.nobs, self.k_endog, self.nseries = endog.shape
+        self.k_params = len(model.param_names)
+        # (k_endog, nobs, nseries) layout used by the filter
+        self._endog = np.ascontiguousarray(endog.transpose(1, 0, 2))
+
+    def _check_params(self, params):
+        params = np.asarray(params)
+        if params.ndim == 1:
+            params = np.tile(params, (self.nseries, 1))
+        if params.shape != (self.nseries, self.k_params):
+            raise ValueError('params must have shape (%d,) or (%d, %d)'
+                             % (self.k_params, self.nseries, self.k_params))
+        return params
+
+    def transform_params(self, unconstrained):
+        """
+        Transform unconstrained parameters of all series
+
+        Parameters
+        ----------
+        unconstrained : array_like
+            Unconstrained parameters, shape (nseries, k_params).
+
+        Returns
+        -------
+        constrained : ndarray
+            Constrained parameters, shape (nseries, k_params).
+        """
+        unconstrained = self._check_params(unconstrained)
+        return np.array([self.model.transform_params(p)
+                         for p in unconstrained])
+
+    def system_matrices(self, params, transformed=True, complex_step=False):
+        """
+        Stacked system matrices and initialization for all series
+
+        Parameters
+        ----------
+        params : array_like
+            Parameters, shape (nseries, k_params).
+        transformed : boolean, optional
+            Whether or not `params` is already transformed. Default is True.
+        complex_step : boolean, optional
+            Whether the parameters contain a complex step perturbation.
+
+        Returns
+        -------
+        matrices : dict
+            The system matrices, the initial state and initial state
+            covariance matrix with the series in the last axis.
+        """
+        params = self._check_params(params)
+        if not transformed:
+            params = self.transform_params(params)
+        model = self.model
+        ssm = model.ssm
+        nseries = self.nseries
+
+        update = _batched_update(model)
+        if update is not None:
+            # the structure of the matrices from the first series, the
+            # parameter dependent elements are set for all series at once
+            model.update(params[0], transformed=True,
+                         complex_step=complex_step)
+            matrices = {}
+            for name in _matrices:
+                matrix = getattr(ssm, name)
+                dtype = np.result_type(matrix, params)
+                matrices[name] = np.repeat(matrix.astype(dtype)[..., None],
+                                           nseries, -1)
+            init = update(model, params, matrices)
+            if init is None:
+                init = _initialization(ssm)
+                initial_state = np.repeat(init[0][:, None], nseries, -1)
+                initial_state_cov = np.repeat(init[1][..., None], nseries,
+                                              -1)
+                stationary = np.repeat(init[2], nseries)
+            else:
+                initial_state, initial_state_cov = init
+                stationary = np.zeros(nseries, bool)
+        else:
+            matrices = {}
+            initial_state = []
+            initial_state_cov = []
+            stationary = np.zeros(nseries, bool)
+            for i in range(nseries):
+                model.update(params[i], transformed=True,
+                             complex_step=complex_step)
+                for name in _matrices:
+                    # copy, the model updates the matrices in place
+                    matrices.setdefault(name, []).append(
+                        getattr(ssm, name).copy())
+                init = _initialization(ssm)
+                initial_state.append(init[0])
+                initial_state_cov.append(init[1])
+                stationary[i] = init[2]
+
+            matrices = dict((name, np_stack(value, axis=-1))
+                            for name, value in matrices.items())
+            initial_state = np_stack(initial_state, axis=-1)
+            initial_state_cov = np_stack(initial_state_cov, axis=-1)
+
+        for name in _matrices:
+            if matrices[name].shape[-2] not in (1, self.nobs):
+                raise ValueError('time-varying system matrices must'
+                                 ' have nobs=%d periods' % self.nobs)
+
+        if stationary.any():
+            # the stationary distribution of the first period
+            selection = matrices['selection'][..., 0, stationary]
+            selected_state_cov = np.einsum(
+                'ikn,kln,jln->ijn', selection,
+                matrices['state_cov'][..., 0, stationary], selection)
+            dtype = np.result_type(initial_state, selected_state_cov)
+            initial_state = initial_state.astype(dtype)
+            initial_state_cov = initial_state_cov.astype(dtype)
+            init = batched_stationary_initialization(
+                matrices['transition'][..., 0, stationary],
+                matrices['state_intercept'][..., 0, stationary],
+                selected_state_cov)
+            initial_state[..., stationary] = init[0]
+            initial_state_cov[..., stationary] = init[1]
+
+        matrices['initial_state'] = initial_state
+        matrices['initial_state_cov'] = initial_state_cov
+        return matrices
+
+    def filter(self, params, transformed=True, complex_step=False,
+               store_states=False):
+        """
+        Kalman filter all series
+
+        Parameters
+        ----------
+        params : array_like
+            Parameters, shape (nseries, k_params).
+        transformed : boolean, optional
+            Whether or not `params` is already transformed. Default is True.
+        complex_step : boolean, optional
+            Whether the parameters contain a complex step perturbation.
+        store_states : bool, optional
+            Whether to store the predicted and filtered states for all
+            periods. Default is False.
+
+        Returns
+        -------
+        results : Bunch
+            The output of `batched_kalman_filter`.
+        """
+        matrices = self.system_matrices(params, transformed=transformed,
+                                        complex_step=complex_step)
+        return batched_kalman_filter(self._endog, store_states=store_states,
+                                     **matrices)
+
+    def loglikeobs(self, params, transformed=True, complex_step=False):
+        """
+        Loglikelihood contributions of all observations
+
+        Parameters
+        ----------
+        params : array_like
+            Parameters, shape (nseries, k_params).
+        transformed : boolean, optional
+            Whether or not `params` is already transformed. Default is True.
+        complex_step : boolean, optional
+            Whether the parameters contain a complex step perturbation.
+
+        Returns
+        -------
+        llf_obs : ndarray
+            Shape (nobs, nseries).  The entries of the first
+            `loglikelihood_burn` periods of the model are zero.
+        """
+        res = self.filter(params, transformed=transformed,
+                          complex_step=complex_step)
+        llf_obs = res.llf_obs
+        # Set any burned observations to have zero likelihood
+        llf_obs[:self.model.loglikelihood_burn] = 0
+        return llf_obs
+
+    def loglike(self, params, transformed=True, complex_step=False):
+        """
+        Loglikelihood of each series
+
+        Parameters
+        ----------
+        params : array_like
+            Parameters, shape (nseries, k_params).
+        transformed : boolean, optional
+            Whether or not `params` is already transformed. Default is True.
+        complex_step : boolean, optional
+            Whether the parameters contain a complex step perturbation.
+
+        Returns
+        -------
+        llf : ndarray
+            Shape (nseries,).
+        """
+        llf_obs = self.loglikeobs(params, transformed=transformed,
+                                  complex_step=complex_step)
+        return llf_obs.sum(0)
+
+    def score(self, params, transformed=True):
+        """
+        Score of the loglikelihood of each series
+
+        Parameters
+        ----------
+        params : array_like
+            Parameters, shape (nseries, k_params).
+        transformed : boolean, optional
+            Whether or not `params` is already transformed. Default is True.
+
+        Returns
+        -------
+        score : ndarray
+            Shape (nseries, k_params).
+
+        Notes
+        -----
+        The score is computed by complex step differentiation, as the
+        default score of `MLEModel`, with one batched filter per parameter.
+        """
+        params = self._check_params(params)
+        if not transformed:
+            params = self.transform_params(params)
+        epsilon = _get_epsilon(params, 2., None, self.k_params)
+        score = np.zeros(params.shape)
+        for j in range(self.k_params):
+            params_j = params.astype(complex)
+            params_j[:, j] += 1j * epsilon[:, j]
+            llf = self.loglike(params_j, complex_step=True)
+            score[:, j] = llf.imag / epsilon[:, j]
+        return score
+
+    def forecast(self, params, steps=1, transformed=True):
+        """
+        Out-of-sample forecasts of all series
+
+        Parameters
+        ----------
+        params : array_like
+            Parameters, shape (nseries, k_params).
+        steps : int, optional
+            The number of out of sample forecasts. Default is 1.
+        transformed : boolean, optional
+            Whether or not `params` is already transformed. Default is True.
+
+        Returns
+        -------
+        forecasts : ndarray
+            Shape (steps, nseries) or (steps, k_endog, nseries).
+        """
+        matrices = self.system_matrices(params, transformed=transformed)
+        if any(matrices[name].shape[-2] > 1 for name in _matrices):
+            raise ValueError('out-of-sample forecasting requires'
+                             ' time-invariant system matrices')
+        res = batched_kalman_filter(self._endog, **matrices)
+
+        design = matrices['design'][..., 0, :]
+        obs_intercept = matrices['obs_intercept'][..., 0, :]
+        transition = matrices['transition'][..., 0, :]
+        state_intercept = matrices['state_intercept'][..., 0, :]
+        state = res.predicted_state
+        forecasts = np.zeros((steps, self.k_endog, self.nseries))
+        for h in range(steps):
+            forecasts[h] = obs_intercept + _dot(design, state)
+            state = state_intercept + _dot(transition, state)
+        if self.k_endog == 1:
+            forecasts = forecasts[:, 0]
+        return forecasts
@@ -12,6 +12,8 @@ from statsmodels.compat.collections import OrderedDict
 import numpy as np
 import pandas as pd
 from .mlemodel import MLEModel, MLEResults, MLEResultsWrapper
+from .kalman_filter import (FILTER_CONVENTIONAL, FILTER_COLLAPSED,
+                            FILTER_UNIVARIATE, MEMORY_NO_FILTERED)
 from .tools import (
     is_invertible,
     constrain_stationary_univariate, unconstrain_stationary_univariate,
@@ -225,6 +227,11 @@ class DynamicFactor(MLEModel):
         if self.k_exog > 0:
             self.ssm._time_invariant = False
 
+        # update _init_keys attached by super
+        self._init_keys += ['k_factors', 'factor_order', 'error_order',
+                            'error_var', 'error_cov_type',
+                            'enforce_stationarity'] + list(kwargs.keys())
+
         # Initialize the components
         self.parameters = OrderedDict()
         self._initialize_loadings()
@@ -437,6 +444,15 @@ class DynamicFactor(MLEModel):
         idx = idx[:, np.lexsort((idx[1], idx[0]))]
         self._idx_error_transition = np.s_['transition', idx[0], idx[1]]
 
+    def _get_init_kwds(self):
+        kwds = super(DynamicFactor, self)._get_init_kwds()
+
+        for key, value in kwds.items():
+            if value is None and hasattr(self.ssm, key):
+                kwds[key] = getattr(self.ssm, key)
+
+        return kwds
+
     def filter(self, params, **kwargs):
         kwargs.setdefault('results_class', DynamicFactorResults)
         kwargs.setdefault('results_wrapper_class', DynamicFactorResultsWrapper)
@@ -447,12 +463,288 @@ class DynamicFactor(MLEModel):
         kwargs.setdefault('results_wrapper_class', DynamicFactorResultsWrapper)
         return super(DynamicFactor, self).smooth(params, **kwargs)
 
+    def fit(self, start_params=None, transformed=True, cov_type=None,
+            cov_kwds=None, method='lbfgs', maxiter=None, **kwargs):
+        """
+        Fits the model by maximum likelihood via Kalman filter.
+
+        Parameters
+        ----------
+        start_params : array_like, optional
+            Initial guess of the solution for the loglikelihood maximization.
+            If None, the default is given by Model.start_params.
+        transformed : boolean, optional
+            Whether or not `start_params` is already transformed. Default is
+            True.
+        cov_type : str, optional
+            The type of covariance matrix estimator to use. See `MLEModel.fit`
+            for the available types. Default is 'opg', except when
+            `method='em'`, in which case it is 'none'.
+        cov_kwds : dict or None, optional
+            Keywords for alternative covariance estimators.
+        method : str, optional
+            Either 'em', for the Expectation-Maximization algorithm, or one of
+            the numerical optimizers listed in `MLEModel.fit`. Default is
+            'lbfgs'.
+        maxiter : int, optional
+            The maximum number of iterations to perform. Default is 50 for
+            numerical optimizers and 500 for the EM algorithm.
+        **kwargs
+            Additional keyword arguments, passed to `MLEModel.fit` or, if
+            `method='em'`, to `_fit_em` (for example, `tolerance`).
+
+        Returns
+        -------
+        DynamicFactorResults
+
+        See also
+        --------
+        statsmodels.tsa.statespace.mlemodel.MLEModel.fit
+        """
+        if method == 'em':
+            if maxiter is None:
+                maxiter = 500
+            if cov_type is None:
+                cov_type = 'none'
+            kwargs.pop('disp', None)
+            return self._fit_em(start_params, transformed=transformed,
+                                cov_type=cov_type, cov_kwds=cov_kwds,
+                                maxiter=maxiter, **kwargs)
+
+        if cov_type is None:
+            cov_type = 'opg'
+        if maxiter is None:
+            maxiter = 50
+        return super(DynamicFactor, self).fit(
+            start_params, transformed=transformed, cov_type=cov_type,
+            cov_kwds=cov_kwds, method=method, maxiter=maxiter, **kwargs)
+
+    def _fit_em(self, start_params=None, transformed=True, cov_type='none',
+                cov_kwds=None, maxiter=500, tolerance=1e-6, full_output=True,
+                return_params=False):
+        """
+        Fits the model using the Expectation-Maximization (EM) algorithm
+
+        Parameters
+        ----------
+        start_params : array_like, optional
+            Initial guess of the solution for the loglikelihood maximization.
+            If None, the default is given by `start_params`.
+        transformed : boolean, optional
+            Whether or not `start_params` is already transformed. Default is
+            True.
+        cov_type : str, optional
+            The type of covariance matrix estimator to use. Default is 'none',
+            since the numerical covariance estimators are expensive when there
+            are many parameters.
+        cov_kwds : dict or None, optional
+            Keywords for alternative covariance estimators
+        maxiter : int, optional
+            The maximum number of iterations to perform.
+        tolerance : float, optional
+            The iteration stops when the relative change in the loglikelihood
+            is less than this tolerance.
+        full_output : bool, optional
+            Set to True to have the loglikelihood at each iteration in the
+            Results object's mle_retvals attribute.
+        return_params : boolean, optional
+            Whether or not to return only the array of maximizing parameters.
+            Default is False.
+
+        Returns
+        -------
+        DynamicFactorResults
+
+        Notes
+        -----
+        Each iteration runs the Kalman smoother once and then updates the
+        factor loadings and exogenous coefficients, the factor VAR
+        coefficients and the observation error covariance matrix in closed
+        form, following Watson and Engle (1983) and, for missing data,
+        Banbura and Modugno (2014). The cost of an iteration therefore grows
+        only moderately with the number of observed series, which makes it
+        suitable for models with large cross-sections.
+
+        Only models with white noise observation errors (`error_order=0`)
+        are supported. Observations may be missing, except with the
+        "unstructured" error covariance matrix. The initial state
+        distribution is not taken into account in the M-step.
+
+        References
+        ----------
+        .. [1] Watson, Mark W., and Robert F. Engle. 1983.
+           "Alternative Algorithms for the Estimation of Dynamic Factor,
+           Mimic and Varying Coefficient Regression Models."
+           Journal of Econometrics 23 (3): 385-400.
+        .. [2] Banbura, Marta, and Michele Modugno. 2014.
+           "Maximum Likelihood Estimation of Factor Models on Datasets with
+           Arbitrary Pattern of Missing Data."
+           Journal of Applied Econometrics 29 (1): 133-60.
+        """
+        if self.error_order > 0:
+            raise NotImplementedError('EM estimation is only available for'
+                                      ' models with white noise observation'
+                                      ' errors (error_order=0).')
+        if self.k_factors == 0:
+            raise NotImplementedError('EM estimation requires at least one'
+                                      ' factor.')
+        if (self.error_cov_type == 'unstructured' and
+                np.any(np.isnan(self.ssm.endog))):
+            raise ValueError('EM estimation with missing data requires a'
+                             ' diagonal or scalar error covariance matrix.')
+
+        if start_params is None:
+            start_params = self.start_params
+            transformed = True
+        else:
+            start_params = np.array(start_params, ndmin=1)
+
+        if not transformed:
+            start_params = self.transform_params(start_params)
+
+        # Perform expectation-maximization
+        llf = []
+        params = start_params
+        converged = False
+        for i in range(maxiter):
+            llf_i, params_i = self._em_iteration(params)
+            llf.append(llf_i)
+            if i > 0 and (np.abs(llf[-1] - llf[-2]) <=
+                          tolerance * np.abs(llf[-2])):
+                converged = True
+                break
+            params = params_i
+
+        # Just return the fitted parameters if requested
+        if return_params:
+            result = params
+        # Otherwise construct the results class if desired
+        else:
+            result = self.smooth(params, transformed=True,
+                                 cov_type=cov_type, cov_kwds=cov_kwds)
+
+            # Save the output
+            if full_output:
+                em_retvals = Bunch(**{'llf': np.array(llf),
+                                      'iter': len(llf),
+                                      'converged': converged})
+                em_settings = Bunch(**{'optimizer': 'em',
+                                       'tolerance': tolerance,
+                                       'maxiter': maxiter})
+            else:
+                em_retvals = None
+                em_settings = None
+
+            result.mle_retvals = em_retvals
+            result.mle_settings = em_settings
+
+        return result
+
+    def _em_iteration(self, params0):
+        """
+        EM iteration
+
+        Returns the loglikelihood at `params0` and the updated parameters.
+        """
+        k_endog = self.k_endog
+        k_factors = self.k_factors
+        order = self.factor_order * k_factors
+
+        endog = self.ssm.endog
+        observed = ~np.isnan(endog)
+
+        # E-step: smoothed factors and their second moments. With many series
+        # it is much cheaper to filter the collapsed observation vector or
+        # (with missing data) to filter the series one at a time.
+        self.update(params0, transformed=True)
+        filter_method = self.ssm.filter_method
+        conserve_memory = self.ssm.conserve_memory
+        if k_endog <= 2 * self.k_states:
+            pass
+        elif np.all(observed) and self.k_exog == 0:
+            self.ssm.filter_method = FILTER_CONVENTIONAL | FILTER_COLLAPSED
+        elif not self.error_cov_type == 'unstructured':
+            self.ssm.filter_method = FILTER_UNIVARIATE
+        self.ssm.conserve_memory = MEMORY_NO_FILTERED
+        try:
+            res = self.ssm.smooth()
+        finally:
+            self.ssm.filter_method = filter_method
+            self.ssm.conserve_memory = conserve_memory
+        llf = np.sum(res.llf_obs[self.ssm.loglikelihood_burn:])
+
+        state = res.smoothed_state
+        state_cov = res.smoothed_state_cov
+        factors = state[:k_factors]
+        factors_cov = state_cov[:k_factors, :k_factors]
+
+        # Regressors in the observation equation
+        if self.k_exog > 0:
+            exog = np.asarray(self.exog).T
+            regressors = np.r_[factors, exog]
+        else:
+            regressors = factors
+        moments = regressors[:, None] * regressors[None, :]
+        moments[:k_factors, :k_factors] += factors_cov
+
+        endog = np.where(observed, endog, 0)
+
+        # M-step: loadings and exogenous coefficients (by equation, using only
+        # the periods in which each series is observed)
+        lhs = np.einsum('it,jkt->ijk', observed.astype(float), moments)
+        rhs = np.einsum('it,jt->ij', endog, regressors)
+        coefficients = np.linalg.solve(lhs, rhs[..., None])[..., 0]
+        loadings = coefficients[:, :k_factors]
+
+        # M-step: observation error covariance matrix
+        resid = endog - np.dot(coefficients, regressors)
+        if self.error_cov_type == 'unstructured':
+            error_cov = (np.dot(resid, resid.T) +
+                         np.dot(np.dot(loadings, factors_cov.sum(axis=-1)),
+                                loadings.T)) / self.nobs
+            error_cov_params = (
+                np.linalg.cholesky(error_cov)[self._idx_lower_error_cov])
+        else:
+            variances = resid**2 + np.einsum(
+                'ij,jkt,ik->it', loadings, factors_cov, loadings)
+            previous = np.diag(self.ssm['obs_cov'])[:, None]
+            variances = np.where(observed, variances, previous).mean(axis=1)
+            if self.error_cov_type == 'scalar':
+                variances = variances.mean()
+            error_cov_params = variances
+
+        # M-step: factor VAR coefficients (the factor innovation covariance
+        # matrix is fixed to the identity for identification)
+        if self.factor_order > 0:
+            lagged = state[:order, :-1]
+            cross = (np.dot(factors[:, 1:], lagged.T) +
+                     res.smoothed_state_autocov[:k_factors, :order,
+                                                :-1].sum(axis=-1))
+            second = (np.dot(lagged, lagged.T) +
+                      state_cov[:order, :order, :-1].sum(axis=-1))
+            factor_transition = np.linalg.solve(second, cross.T).T
+        else:
+            factor_transition = np.zeros((k_factors, 0))
+
+        params = np.zeros(self.k_params)
+        params[self._params_loadings] = loadings.ravel()
+        params[self._params_exog] = coefficients[:, k_factors:].ravel()
+        params[self._params_error_cov] = error_cov_params
+        params[self._params_factor_transition] = factor_transition.ravel()
+
+        return llf, params
+
     @property
     def start_params(self):
         params = np.zeros(self.k_params, dtype=np.float64)
 
         endog = self.endog.copy()
 
+        # 0. Fill in any missing values with the sample means of the series
+        missing = np.isnan(endog)
+        if np.any(missing):
+            endog[missing] = np.nanmean(endog, axis=0)[np.where(missing)[1]]
+
         # 1. Factor loadings (estimated via PCA)
         if self.k_factors > 0:
             # Use principal components + OLS as starting values
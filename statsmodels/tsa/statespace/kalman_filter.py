@@ -285,6 +285,11 @@ class KalmanFilter(Representation):
     """
     (int) Filter timing.
     """
+    steady_state = False
+    """
+    (bool) Whether to start the filter from the steady-state predicted state
+    covariance matrix.
+    """
 
     def __init__(self, k_endog, k_states, k_posdef=None,
                  loglikelihood_burn=0, tolerance=1e-19, results_class=None,
@@ -730,10 +735,29 @@ class KalmanFilter(Representation):
                                       ' updating dependencies for more'
                                       ' options.')
 
+    def _initialize_steady_state(self, prefix, complex_step=False):
+        if not self.time_invariant:
+            raise ValueError('Steady-state filtering requires a'
+                             ' time-invariant state space model.')
+        statespace = self._statespaces[prefix]
+        initial_state = np.array(statespace.initial_state, copy=True)
+        initial_state_cov = np.array(statespace.initial_state_cov)
+        initial_state_cov = np.nan_to_num(initial_state_cov)
+
+        steady_state_cov = tools.solve_discrete_riccati(
+            np.array(statespace.transition)[:, :, 0],
+            np.array(statespace.design)[:, :, 0],
+            np.array(statespace.selected_state_cov)[:, :, 0],
+            np.array(statespace.obs_cov)[:, :, 0],
+            initial_state_cov=initial_state_cov, complex_step=complex_step)
+
+        statespace.initialize_known(initial_state,
+                                    np.asfortranarray(steady_state_cov))
+
     def _filter(self, filter_method=None, inversion_method=None,
                 stability_method=None, conserve_memory=None,
                 filter_timing=None, tolerance=None, loglikelihood_burn=None,
-                complex_step=False):
+                complex_step=False, steady_state=None):
         # Initialize the filter
         prefix, dtype, create_filter, create_statespace = (
             self._initialize_filter(
@@ -746,6 +770,12 @@ class KalmanFilter(Representation):
         # Initialize the state
         self._initialize_state(prefix=prefix, complex_step=complex_step)
 
+        # Start from the steady-state covariance matrix, if requested
+        if steady_state is None:
+            steady_state = self.steady_state
+        if steady_state:
+            self._initialize_steady_state(prefix, complex_step=complex_step)
+
         # Run the filter
         kfilter()
         tmp = np.array(kfilter.loglikelihood)
@@ -755,7 +785,8 @@ class KalmanFilter(Representation):
 
     def filter(self, filter_method=None, inversion_method=None,
                stability_method=None, conserve_memory=None, filter_timing=None,
-               tolerance=None, loglikelihood_burn=None, complex_step=False):
+               tolerance=None, loglikelihood_burn=None, complex_step=False,
+               steady_state=None):
         r"""
         Apply the Kalman filter to the statespace model.
 
@@ -782,11 +813,22 @@ class KalmanFilter(Representation):
         loglikelihood_burn : int, optional
             The number of initial periods during which the loglikelihood is not
             recorded. Default is 0.
+        steady_state : bool, optional
+            Whether to replace the initial predicted state covariance matrix
+            by the solution of the discrete algebraic Riccati equation, so
+            that the filter starts in (and immediately converges to) its
+            steady state. Requires a time-invariant model. Default is the
+            `steady_state` attribute, which is False.
 
         Notes
         -----
         This function by default does not compute variables required for
         smoothing.
+
+        The steady-state filter yields an approximation to the likelihood
+        that is much cheaper to compute for long series, since the
+        covariance matrix recursions are skipped entirely. It is exact only
+        if the initial state covariance equals its steady-state value.
         """
         if conserve_memory is None:
             conserve_memory = self.conserve_memory | MEMORY_NO_SMOOTHING
@@ -794,7 +836,8 @@ class KalmanFilter(Representation):
         # Run the filter
         kfilter = self._filter(
             filter_method, inversion_method, stability_method, conserve_memory,
-            filter_timing, tolerance, loglikelihood_burn, complex_step)
+            filter_timing, tolerance, loglikelihood_burn, complex_step,
+            steady_state)
         tmp = np.array(kfilter.loglikelihood)
         # Create the results object
         results = self.results_class(self)
@@ -803,6 +846,128 @@ class KalmanFilter(Representation):
 
         return results
 
+    def continue_filter(self, results):
+        r"""
+        Continue the Kalman filter from the results of an earlier run
+
+        Parameters
+        ----------
+        results : FilterResults
+            Output of the Kalman filter applied to the first `results.nobs`
+            observations of this model, with the same system matrices.
+
+        Returns
+        -------
+        FilterResults
+            Results for the full sample. The filter is only run for the
+            observations after the first `results.nobs`, and the output for
+            the earlier observations is taken from `results`.
+
+        Notes
+        -----
+        The filter for the new observations is initialized with the last
+        predicted state and predicted state covariance matrix in `results`,
+        so that the output matches that of filtering the full sample. The
+        filtering options (other than memory conservation, which is taken
+        from `results`) are those of this model.
+
+        Only the default filter timing is supported, and `results` must not
+        have been created with the `MEMORY_NO_FORECAST`,
+        `MEMORY_NO_PREDICTED`, `MEMORY_NO_FILTERED`, `MEMORY_NO_LIKELIHOOD`
+        or `MEMORY_NO_GAIN` options.
+        """
+        nprevious = results.nobs
+        if not 0 < nprevious < self.nobs:
+            raise ValueError('The results to continue from must be for a'
+                             ' strictly shorter sample than the model.')
+        if self.filter_timing != 0 or results.filter_timing != 0:
+            raise NotImplementedError('Continuing the Kalman filter is only'
+                                      ' available for the default filter'
+                                      ' timing.')
+        conserve_memory = results.conserve_memory
+        if conserve_memory & ~(MEMORY_NO_SMOOTHING | MEMORY_NO_STD_FORECAST):
+            raise ValueError('Continuing the Kalman filter requires results'
+                             ' that store the full filter output.')
+
+        # Representation of the new observations, with the time-varying
+        # system matrices restricted to the new periods
+        matrices = {}
+        for name in self.shapes:
+            if name == 'obs':
+                continue
+            matrix = getattr(self, name)
+            if matrix.shape[-1] > 1:
+                matrix = matrix[..., nprevious:]
+            matrices[name] = matrix
+        mod = KalmanFilter(
+            self.k_endog, self.k_states, self.k_posdef,
+            nobs=self.nobs - nprevious,
+            loglikelihood_burn=max(self.loglikelihood_burn - nprevious, 0),
+            tolerance=self.tolerance, filter_method=self.filter_method,
+            inversion_method=self.inversion_method,
+            stability_method=self.stability_method, **matrices)
+        mod.bind(np.asfortranarray(self.endog[:, nprevious:]))
+        mod.initialize_known(results.predicted_state[:, -1],
+                             results.predicted_state_cov[:, :, -1])
+        new = mod.filter(conserve_memory=conserve_memory, steady_state=False)
+
+        # Combine the output
+        self._initialize_representation()
+        combined = self.results_class(self)
+        combined.update_representation(self)
+        combined.initial_state = results.initial_state
+        combined.initial_state_cov = results.initial_state_cov
+        for name in ['filter_method', 'inversion_method', 'stability_method',
+                     'filter_timing', 'tolerance', 'loglikelihood_burn']:
+            setattr(combined, name, getattr(self, name))
+        combined.conserve_memory = conserve_memory
+
+        if results.converged:
+            combined.converged = True
+            combined.period_converged = results.period_converged
+        else:
+            combined.converged = new.converged
+            combined.period_converged = nprevious + new.period_converged
+        if combined.converged:
+            combined.nobs_converged = (
+                combined.nobs - combined.period_converged - 1)
+        else:
+            combined.nobs_converged = 0
+
+        def concat(previous, current):
+            if previous is None or current is None:
+                return None
+            return np.concatenate([previous, current], axis=-1)
+
+        for name in ['predicted_state', 'predicted_state_cov']:
+            setattr(combined, name, concat(getattr(results, name)[..., :-1],
+                                           getattr(new, name)))
+        for name in ['filtered_state', 'filtered_state_cov', 'forecasts',
+                     'forecasts_error', 'forecasts_error_cov', 'llf_obs',
+                     'tmp1', 'tmp2', 'tmp3', 'tmp4', '_kalman_gain',
+                     '_standardized_forecasts_error', 'collapsed_forecasts',
+                     'collapsed_forecasts_error',
+                     'collapsed_forecasts_error_cov']:
+            setattr(combined, name, concat(getattr(results, name, None),
+                                           getattr(new, name, None)))
+
+        # The raw output for missing observations is only stored if there is
+        # missing data; otherwise it is equal to the usual output
+        for name in ['forecasts', 'forecasts_error', 'forecasts_error_cov']:
+            missing_name = 'missing_' + name
+            previous = getattr(results, missing_name)
+            current = getattr(new, missing_name)
+            if previous is None and current is None:
+                setattr(combined, missing_name, None)
+                continue
+            if previous is None:
+                previous = getattr(results, name)
+            if current is None:
+                current = getattr(new, name)
+            setattr(combined, missing_name, concat(previous, current))
+
+        return combined
+
     def loglike(self, **kwargs):
         r"""
         Calculate the loglikelihood associated with the statespace model.
@@ -1275,6 +1440,9 @@ class FilterResults(FrozenRepresentation):
         Whether or not the Kalman filter converged.
     period_converged : int
         The time period in which the Kalman filter converged.
+    nobs_converged : int
+        The number of periods after convergence, for which the covariance
+        matrix recursions were skipped.
     filtered_state : array
         The filtered state vector at each time period.
     filtered_state_cov : array
@@ -1297,7 +1465,7 @@ class FilterResults(FrozenRepresentation):
     _filter_attributes = [
         'filter_method', 'inversion_method', 'stability_method',
         'conserve_memory', 'filter_timing', 'tolerance', 'loglikelihood_burn',
-        'converged', 'period_converged', 'filtered_state',
+        'converged', 'period_converged', 'nobs_converged', 'filtered_state',
         'filtered_state_cov', 'predicted_state', 'predicted_state_cov',
         'tmp1', 'tmp2', 'tmp3', 'tmp4', 'forecasts',
         'forecasts_error', 'forecasts_error_cov', 'llf_obs',
@@ -1375,6 +1543,10 @@ class FilterResults(FrozenRepresentation):
         # Save Kalman filter output
         self.converged = bool(kalman_filter.converged)
         self.period_converged = kalman_filter.period_converged
+        if self.converged:
+            self.nobs_converged = self.nobs - self.period_converged - 1
+        else:
+            self.nobs_converged = 0
 
         self.filtered_state = np.array(kalman_filter.filtered_state, copy=True)
         self.filtered_state_cov = np.array(
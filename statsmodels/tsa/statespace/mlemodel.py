@@ -14,7 +14,9 @@ from scipy.stats import norm
 
 from .simulation_smoother import SimulationSmoother
 from .kalman_smoother import SmootherResults
-from .kalman_filter import (INVERT_UNIVARIATE, SOLVE_LU)
+from .kalman_filter import (INVERT_UNIVARIATE, SOLVE_LU, FILTER_CONVENTIONAL,
+                            MEMORY_STORE_ALL)
+from .tools import solve_discrete_lyapunov
 import statsmodels.tsa.base.tsa_model as tsbase
 import statsmodels.base.wrapper as wrap
 from statsmodels.tools.numdiff import (_get_epsilon, approx_hess_cs,
@@ -298,7 +300,7 @@ class MLEModel(tsbase.TimeSeriesModel):
             cov_type='opg', cov_kwds=None, method='lbfgs', maxiter=50,
             full_output=1, disp=5, callback=None, return_params=False,
             optim_score=None, optim_complex_step=None, optim_hessian=None,
-            flags=None, **kwargs):
+            flags=None, steady_state_warmup=False, **kwargs):
         """
         Fits the model by maximum likelihood via Kalman filter.
 
@@ -370,11 +372,13 @@ class MLEModel(tsbase.TimeSeriesModel):
         return_params : boolean, optional
             Whether or not to return only the array of maximizing parameters.
             Default is False.
-        optim_score : {'harvey', 'approx'} or None, optional
+        optim_score : {'harvey', 'approx', 'analytic'} or None, optional
             The method by which the score vector is calculated. 'harvey' uses
             the method from Harvey (1989), 'approx' uses either finite
             difference or complex step differentiation depending upon the
-            value of `optim_complex_step`, and None uses the built-in gradient
+            value of `optim_complex_step`, 'analytic' computes the score from a
+            single pass of the Kalman filter and smoother (Koopman and
+            Shephard, 1992), and None uses the built-in gradient
             approximation of the optimizer. Default is None. This keyword is
             only relevant if the optimization method uses the score.
         optim_complex_step : bool, optional
@@ -382,12 +386,20 @@ class MLEModel(tsbase.TimeSeriesModel):
             approximating the score; if False, finite difference approximation
             is used. Default is True. This keyword is only relevant if
             `optim_score` is set to 'harvey' or 'approx'.
-        optim_hessian : {'opg','oim','approx'}, optional
+        optim_hessian : {'opg','oim','approx','analytic'}, optional
             The method by which the Hessian is numerically approximated. 'opg'
             uses outer product of gradients, 'oim' uses the information
-            matrix formula from Harvey (1989), and 'approx' uses numerical
-            approximation. This keyword is only relevant if the
+            matrix formula from Harvey (1989), 'approx' uses numerical
+            approximation, and 'analytic' uses finite differences of the
+            analytic score. This keyword is only relevant if the
             optimization method uses the Hessian matrix.
+        steady_state_warmup : bool, optional
+            If True, the parameters are first estimated by maximizing the
+            approximate likelihood of the steady-state Kalman filter (see
+            `KalmanFilter.filter`), and the exact likelihood is then maximized
+            starting from those estimates. This can greatly reduce the cost of
+            estimation for long time series. Requires a time-invariant model.
+            Default is False.
         **kwargs
             Additional keyword arguments to pass to the optimizer.
 
@@ -433,6 +445,20 @@ class MLEModel(tsbase.TimeSeriesModel):
         if optim_hessian is not None:
             flags['hessian_method'] = optim_hessian
         fargs = (flags,)
+
+        # Optimizer warm-up on the steady-state likelihood
+        if steady_state_warmup:
+            steady_state = self.ssm.steady_state
+            self.ssm.steady_state = True
+            try:
+                warmup = super(MLEModel, self).fit(
+                    start_params, method=method, fargs=fargs, maxiter=maxiter,
+                    full_output=full_output, disp=disp, callback=callback,
+                    skip_hessian=True, **kwargs)
+            finally:
+                self.ssm.steady_state = steady_state
+            start_params = warmup.params
+
         mlefit = super(MLEModel, self).fit(start_params, method=method,
                                            fargs=fargs,
                                            maxiter=maxiter,
@@ -456,7 +482,8 @@ class MLEModel(tsbase.TimeSeriesModel):
 
     def filter(self, params, transformed=True, complex_step=False,
                cov_type=None, cov_kwds=None, return_ssm=False,
-               results_class=None, results_wrapper_class=None, **kwargs):
+               results_class=None, results_wrapper_class=None,
+               previous_results=None, **kwargs):
         """
         Kalman filtering
 
@@ -476,6 +503,11 @@ class MLEModel(tsbase.TimeSeriesModel):
         cov_kwds : dict or None, optional
             See `MLEResults.get_robustcov_results` for a description required
             keywords for alternative covariance estimators
+        previous_results : FilterResults, optional
+            Output of the Kalman filter applied, with the same parameters, to
+            the first observations of this model. If given, the filter is
+            only run for the remaining observations. See
+            `KalmanFilter.continue_filter` for more details.
         **kwargs
             Additional keyword arguments to pass to the Kalman filter. See
             `KalmanFilter.filter` for more details.
@@ -493,7 +525,13 @@ class MLEModel(tsbase.TimeSeriesModel):
             kwargs['inversion_method'] = INVERT_UNIVARIATE | SOLVE_LU
 
         # Get the state space output
-        result = self.ssm.filter(complex_step=complex_step, **kwargs)
+        if previous_results is None:
+            result = self.ssm.filter(complex_step=complex_step, **kwargs)
+        elif complex_step or kwargs:
+            raise ValueError('Filter options cannot be given when continuing'
+                             ' from previous results.')
+        else:
+            result = self.ssm.continue_filter(previous_results)
 
         # Wrap in a results object
         if not return_ssm:
@@ -1018,6 +1056,168 @@ class MLEModel(tsbase.TimeSeriesModel):
 
         return -partials / 2.
 
+    def _system_matrices(self):
+        """
+        Current system matrices, including the initialization
+
+        Returns the matrices used in the analytic score, with the selected
+        state covariance matrix :math:`R_t Q_t R_t'` formed explicitly.
+        Transposes are not conjugated, so that complex-step perturbations of
+        the parameters are passed through.
+        """
+        ssm = self.ssm
+        matrices = {}
+        for name in ['obs_intercept', 'design', 'obs_cov', 'state_intercept',
+                     'transition']:
+            matrices[name] = np.array(getattr(ssm, name))
+
+        selection = np.array(ssm.selection)
+        state_cov = np.array(ssm.state_cov)
+        nobs = max(selection.shape[-1], state_cov.shape[-1])
+        selection = selection * np.ones(nobs)
+        state_cov = state_cov * np.ones(nobs)
+        matrices['selected_state_cov'] = np.einsum(
+            'ikt,klt,jlt->ijt', selection, state_cov, selection)
+
+        # Initialization
+        if ssm.initialization == 'known':
+            initial_state = np.array(ssm._initial_state)
+            initial_state_cov = np.array(ssm._initial_state_cov)
+        elif ssm.initialization == 'approximate_diffuse':
+            initial_state = np.zeros(self.k_states)
+            initial_state_cov = np.zeros((self.k_states, self.k_states))
+        elif ssm.initialization == 'stationary':
+            transition = matrices['transition'][:, :, 0]
+            state_intercept = matrices['state_intercept'][:, 0]
+            if np.sum(state_intercept) == 0:
+                initial_state = np.zeros(self.k_states)
+            else:
+                initial_state = np.linalg.solve(
+                    np.eye(self.k_states) - transition, state_intercept)
+            initial_state_cov = solve_discrete_lyapunov(
+                transition, matrices['selected_state_cov'][:, :, 0],
+                complex_step=True).T
+        else:
+            raise RuntimeError('Statespace model not initialized.')
+        matrices['initial_state'] = initial_state
+        matrices['initial_state_cov'] = initial_state_cov
+
+        return matrices
+
+    def _system_matrices_partial_derivatives(self, params):
+        """
+        Partial derivatives of the system matrices w.r.t. the parameters
+
+        Computed by complex-step differentiation of `update`, which does not
+        require running the Kalman filter. Each derivative is stacked along a
+        new last axis.
+        """
+        params = np.array(params, ndmin=1)
+        n = len(params)
+        epsilon = _get_epsilon(params, 2., None, n)
+        increments = np.identity(n) * 1j * epsilon
+
+        partials = {}
+        for i, ih in enumerate(increments):
+            self.update(params + ih, transformed=True, complex_step=True)
+            for name, matrix in self._system_matrices().items():
+                if i == 0:
+                    partials[name] = np.zeros(matrix.shape + (n,))
+                partials[name][..., i] = matrix.imag / epsilon[i]
+        self.update(params, transformed=True)
+
+        return partials
+
+    def _score_analytic(self, params, **kwargs):
+        """
+        Score computed analytically from a single smoother pass
+
+        Notes
+        -----
+        The loglikelihood is differentiated with respect to each of the
+        system matrices using the smoothing recursions, as in Koopman and
+        Shephard (1992) and Durbin and Koopman (2012), section 7.3.3. The
+        score then follows by the chain rule, with the partial derivatives of
+        the system matrices w.r.t. the parameters computed by complex-step
+        differentiation of `update` alone, so that the Kalman filter and
+        smoother are run only once regardless of the number of parameters.
+
+        Falls back to complex-step differentiation of the loglikelihood if
+        the model has partially missing observations or if a filter method or
+        timing other than the conventional one is selected.
+
+        References
+        ----------
+        .. [1] Koopman, S. J., and N. Shephard. 1992.
+           "Exact Score for Time Series Models in State Space Form."
+           Biometrika 79 (4): 823-26.
+        .. [2] Durbin, James, and Siem Jan Koopman. 2012.
+           Time Series Analysis by State Space Methods: Second Edition.
+           Oxford University Press.
+        """
+        params = np.array(params, ndmin=1)
+        ssm = self.ssm
+
+        nmissing = np.sum(np.isnan(ssm.endog), axis=0)
+        if (ssm._compatibility_mode or
+                not ssm.filter_method == FILTER_CONVENTIONAL or
+                ssm.filter_timing or kwargs.get('steady_state') or
+                ssm.steady_state or
+                np.any((nmissing > 0) & (nmissing < self.k_endog))):
+            return self._score_complex_step(params, **kwargs)
+
+        # Partial derivatives of the system matrices
+        partials = self._system_matrices_partial_derivatives(params)
+
+        # Filter and smoother output
+        kwargs['conserve_memory'] = MEMORY_STORE_ALL
+        res = ssm.smooth(**kwargs)
+        smoother = ssm._kalman_smoothers[res.prefix]
+        # Here index 0 corresponds to r_{-1}, which is needed for the
+        # derivatives w.r.t. the initialization
+        r = np.array(smoother.scaled_smoothed_estimator, copy=True)
+        N = np.array(smoother.scaled_smoothed_estimator_cov, copy=True)
+
+        nobs = self.nobs
+        missing = nmissing == self.k_endog
+        forecasts_error = res.forecasts_error.copy()
+        forecasts_error[:, missing] = 0
+        inv_forecasts_error_cov = np.zeros(res.forecasts_error_cov.shape)
+        inv_forecasts_error_cov[..., ~missing] = np.linalg.inv(
+            res.forecasts_error_cov[..., ~missing].transpose(2, 0, 1)
+        ).transpose(1, 2, 0)
+        kalman_gain = res.kalman_gain.copy()
+        kalman_gain[..., missing] = 0
+        design = res.design * np.ones(nobs)
+        transition = res.transition * np.ones(nobs)
+
+        args = (forecasts_error, inv_forecasts_error_cov, kalman_gain, design,
+                transition, res.predicted_state[:, :-1],
+                res.predicted_state_cov[..., :-1])
+        score = _contract_partials(_loglike_matrix_derivatives(r, N, *args),
+                                   partials)
+
+        # Remove the contribution of the burned observations, which is the
+        # score of the loglikelihood of the first observations alone
+        burn = ssm.loglikelihood_burn
+        if burn > 0:
+            r_burn = np.zeros((self.k_states, burn + 1))
+            N_burn = np.zeros((self.k_states, self.k_states, burn + 1))
+            for t in range(burn - 1, -1, -1):
+                Z = design[..., t]
+                L = transition[..., t] - np.dot(kalman_gain[..., t], Z)
+                ZF = np.dot(Z.T, inv_forecasts_error_cov[..., t])
+                r_burn[:, t] = (np.dot(ZF, forecasts_error[:, t]) +
+                                np.dot(L.T, r_burn[:, t + 1]))
+                N_burn[..., t] = (np.dot(ZF, Z) +
+                                  np.dot(np.dot(L.T, N_burn[..., t + 1]), L))
+            args = tuple(arg[..., :burn] for arg in args)
+            score -= _contract_partials(
+                _loglike_matrix_derivatives(r_burn, N_burn, *args),
+                partials, burn)
+
+        return score
+
     _score_param_names = ['transformed', 'score_method',
                           'approx_complex_step', 'approx_centered']
     _score_param_defaults = [True, 'approx', None, False]
@@ -1042,8 +1242,12 @@ class MLEModel(tsbase.TimeSeriesModel):
 
         Notes
         -----
-        This is a numerical approximation, calculated using first-order complex
-        step differentiation on the `loglike` method.
+        By default (`score_method='approx'`) this is a numerical
+        approximation, calculated using first-order complex step
+        differentiation on the `loglike` method. With `score_method='analytic'`
+        the score is computed from a single pass of the Kalman filter and
+        smoother, using the formulas of Koopman and Shephard (1992), which is
+        much faster for models with many parameters.
 
         Both \*args and \*\*kwargs are necessary because the optimizer from
         `fit` must call this function and only supports passing arguments via
@@ -1073,6 +1277,8 @@ class MLEModel(tsbase.TimeSeriesModel):
         if method == 'harvey':
             score = self._score_harvey(
                 params, approx_complex_step=approx_complex_step, **kwargs)
+        elif method == 'analytic':
+            score = self._score_analytic(params, **kwargs)
         elif method == 'approx' and approx_complex_step:
             score = self._score_complex_step(params, **kwargs)
         elif method == 'approx':
@@ -1203,6 +1409,9 @@ class MLEModel(tsbase.TimeSeriesModel):
                 params, transformed=transformed,
                 approx_complex_step=approx_complex_step,
                 approx_centered=approx_centered, **kwargs)
+        elif method == 'analytic':
+            return self._hessian_analytic(
+                params, transformed=transformed, **kwargs)
         elif method == 'approx' and approx_complex_step:
             return self._hessian_complex_step(
                 params, transformed=transformed, **kwargs)
@@ -1245,6 +1454,22 @@ class MLEModel(tsbase.TimeSeriesModel):
 
         return hessian / (self.nobs - self.ssm.loglikelihood_burn)
 
+    def _hessian_analytic(self, params, transformed=True, **kwargs):
+        """
+        Hessian matrix computed by centered finite differences of the
+        analytic score, requiring two smoother passes per parameter.
+        """
+        params = np.array(params, ndmin=1)
+        if not transformed:
+            raise ValueError('Cannot compute the Hessian from the analytic'
+                             ' score with untransformed parameters.')
+        epsilon = _get_epsilon(params, 3., None, len(params)) / 2
+        hessian = approx_fprime(params, self._score_analytic,
+                                epsilon=epsilon, kwargs=kwargs, centered=True)
+        hessian = (hessian + hessian.T) / 2
+
+        return hessian / (self.nobs - self.ssm.loglikelihood_burn)
+
     def _hessian_complex_step(self, params, **kwargs):
         """
         Hessian matrix computed by second-order complex-step differentiation
@@ -1494,6 +1719,39 @@ class MLEModel(tsbase.TimeSeriesModel):
 
         return irfs
 
+    def clone(self, endog, exog=None, **kwargs):
+        """
+        Create a new model with the same specification and new data
+
+        Parameters
+        ----------
+        endog : array_like
+            The observed time-series process :math:`y`
+        exog : array_like, optional
+            Array of exogenous regressors.
+        **kwargs
+            Keyword arguments that override the specification of this model.
+
+        Returns
+        -------
+        model : MLEModel
+
+        Notes
+        -----
+        The new model is created from `endog`, `exog` and the keyword
+        arguments returned by `_get_init_kwds`. Models whose constructor
+        requires other arguments override this method.
+        """
+        return self._clone_from_init_kwds(endog, exog=exog, **kwargs)
+
+    def _clone_from_init_kwds(self, endog, exog=None, **kwargs):
+        kwds = self._get_init_kwds()
+        kwds.update(kwargs)
+        # models without exog need not accept the argument
+        if exog is not None or 'exog' in kwds:
+            kwds['exog'] = exog
+        return self.__class__(endog, **kwds)
+
     @classmethod
     def from_formula(cls, formula, data, subset=None):
         """
@@ -1502,6 +1760,71 @@ class MLEModel(tsbase.TimeSeriesModel):
         raise NotImplementedError
 
 
+def _loglike_matrix_derivatives(r, N, forecasts_error, inv_forecasts_error_cov,
+                                kalman_gain, design, transition,
+                                predicted_state, predicted_state_cov):
+    """
+    Derivatives of the loglikelihood w.r.t. the system matrices
+
+    `r` and `N` are the scaled smoothed estimator and its covariance matrix
+    for periods -1, ..., nobs - 1; all other arguments are stacked along the
+    last (time) axis. Returns a dictionary keyed like
+    `MLEModel._system_matrices`.
+    """
+    r_prev, r = r[:, :-1], r[:, 1:]
+    N_prev, N = N[..., :-1], N[..., 1:]
+
+    # Smoothing error and its variance, smoothed state
+    gain_T = kalman_gain.transpose(1, 0, 2)
+    u = (np.einsum('ijt,jt->it', inv_forecasts_error_cov, forecasts_error) -
+         np.einsum('ijt,jt->it', gain_T, r))
+    D = inv_forecasts_error_cov + np.einsum('ijt,jkt,klt->ilt',
+                                            gain_T, N, kalman_gain)
+    smoothed_state = predicted_state + np.einsum(
+        'ijt,jt->it', predicted_state_cov, r_prev)
+
+    NL = np.einsum('ijt,jkt->ikt', N, transition - np.einsum(
+        'ijt,jkt->ikt', kalman_gain, design))
+    FZ = np.einsum('ijt,jkt->ikt', inv_forecasts_error_cov, design)
+
+    derivatives = {
+        'obs_intercept': u,
+        'design': (u[:, None] * smoothed_state[None, :] -
+                   np.einsum('ijt,jkt->ikt',
+                             FZ - np.einsum('ijt,jkt->ikt', gain_T, NL),
+                             predicted_state_cov)),
+        'obs_cov': 0.5 * (u[:, None] * u[None, :] - D),
+        'state_intercept': r,
+        'transition': (r[:, None] * smoothed_state[None, :] -
+                       np.einsum('ijt,jkt->ikt', NL, predicted_state_cov)),
+        'selected_state_cov': 0.5 * (r[:, None] * r[None, :] - N),
+        'initial_state': r_prev[:, 0],
+        'initial_state_cov': 0.5 * (np.outer(r_prev[:, 0], r_prev[:, 0]) -
+                                    N_prev[..., 0])
+    }
+    return derivatives
+
+
+def _contract_partials(derivatives, partials, nobs=None):
+    """
+    Chain rule: combine loglikelihood derivatives w.r.t. the system matrices
+    with the partial derivatives of the system matrices w.r.t. the parameters
+    """
+    score = 0
+    for name, derivative in derivatives.items():
+        partial = partials[name]
+        if name in ['initial_state', 'initial_state_cov']:
+            pass
+        elif partial.shape[-2] == 1:
+            derivative = derivative.sum(axis=-1)
+            partial = partial[..., 0, :]
+        elif nobs is not None:
+            partial = partial[..., :nobs, :]
+        score = score + np.tensordot(derivative, partial,
+                                     axes=derivative.ndim)
+    return score
+
+
 class MLEResults(tsbase.TimeSeriesModelResults):
     r"""
     Class to hold results from fitting a state space model.
@@ -2471,6 +2794,130 @@ class MLEResults(tsbase.TimeSeriesModelResults):
             end = steps
         return self.predict(start=self.nobs, end=end, **kwargs)
 
+    def _fixed_params_cov_kwds(self):
+        # Keep the covariance matrix of the estimated parameters
+        return {
+            'custom_cov_type': self.cov_type,
+            'custom_cov_params': self.cov_params_default,
+            'custom_description': self.cov_kwds.get(
+                'description', 'Covariance matrix of the original results.')}
+
+    def _filter_fixed(self, mod, **kwargs):
+        # filter `mod` with the parameters and parameter covariance matrix
+        # of these results, used by `append` and `extend`
+        return mod.filter(self.params, cov_type='custom',
+                          cov_kwds=self._fixed_params_cov_kwds(), **kwargs)
+
+    def append(self, endog, exog=None, **kwargs):
+        """
+        Append new observations, keeping the parameters fixed
+
+        Parameters
+        ----------
+        endog : array_like
+            New observations of the modeled time series, which follow the
+            end of the current sample.
+        exog : array_like, optional
+            New observations of the exogenous regressors, if the model has
+            any.
+        **kwargs
+            Keyword arguments passed to `MLEModel.clone` when creating the
+            model for the full sample.
+
+        Returns
+        -------
+        results : MLEResults
+            Filtering results for the full sample (current and new
+            observations), with the same parameters and parameter covariance
+            matrix as these results.
+
+        See Also
+        --------
+        extend
+
+        Notes
+        -----
+        The Kalman filter is only run for the new observations, starting
+        from the last predicted state and predicted state covariance matrix,
+        so the cost is proportional to the number of new observations. The
+        output is the same as that from filtering the full sample.
+
+        The returned results do not contain smoothed values, even if these
+        results do.
+        """
+        model_endog = self.model.data.orig_endog
+        model_exog = self.model.data.orig_exog
+        if (exog is None) != (model_exog is None):
+            raise ValueError('New exog must be given if and only if the model'
+                             ' includes exogenous regressors.')
+
+        def concat(previous, new):
+            if isinstance(previous, (pd.Series, pd.DataFrame)):
+                if not isinstance(new, (pd.Series, pd.DataFrame)):
+                    raise ValueError('New data must be a pandas object if'
+                                     ' the model data is.')
+                values = np.asarray(new).reshape((-1,) + previous.shape[1:])
+                if previous.ndim == 1:
+                    new = pd.Series(values, index=new.index,
+                                    name=previous.name)
+                else:
+                    new = pd.DataFrame(values, index=new.index,
+                                       columns=previous.columns)
+                return pd.concat([previous, new])
+            previous = np.asarray(previous)
+            new = np.asarray(new).reshape((-1,) + previous.shape[1:])
+            return np.concatenate([previous, new])
+
+        endog = concat(model_endog, endog)
+        if exog is not None:
+            exog = concat(model_exog, exog)
+
+        mod = self.model.clone(endog, exog=exog, **kwargs)
+        return self._filter_fixed(mod, previous_results=self.filter_results)
+
+    def extend(self, endog, exog=None, **kwargs):
+        """
+        Filter new observations only, keeping the parameters fixed
+
+        Parameters
+        ----------
+        endog : array_like
+            New observations of the modeled time series, which follow the
+            end of the current sample.
+        exog : array_like, optional
+            New observations of the exogenous regressors, if the model has
+            any.
+        **kwargs
+            Keyword arguments passed to `MLEModel.clone` when creating the
+            model for the new observations.
+
+        Returns
+        -------
+        results : MLEResults
+            Filtering results for the new observations, with the same
+            parameters and parameter covariance matrix as these results.
+
+        See Also
+        --------
+        append
+
+        Notes
+        -----
+        A model is created for the new observations only, and initialized
+        with the last predicted state and predicted state covariance matrix,
+        so the cost is proportional to the number of new observations and
+        does not depend on the current sample at all. This is appropriate if
+        the system matrices do not depend on the position in the sample,
+        which excludes, for example, models with a time trend. Otherwise,
+        use `append`.
+        """
+        mod = self.model.clone(endog, exog=exog, **kwargs)
+        mod.initialize_known(self.predicted_state[:, -1],
+                             self.predicted_state_cov[:, :, -1])
+        mod.loglikelihood_burn = max(
+            self.filter_results.loglikelihood_burn - self.nobs, 0)
+        return self._filter_fixed(mod)
+
     def simulate(self, nsimulations, measurement_shocks=None,
                  state_shocks=None, initial_state=None):
         r"""
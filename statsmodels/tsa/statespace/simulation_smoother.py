@@ -341,6 +341,8 @@ class SimulationSmoothResults(object):
         self._simulated_state = None
         self._simulated_measurement_disturbance = None
         self._simulated_state_disturbance = None
+        # Number of draws of the last call to `simulate`, None for one draw
+        self._nsimulations = None
 
     @property
     def simulation_output(self):
@@ -484,7 +486,7 @@ class SimulationSmoothResults(object):
             \alpha ~ p(\alpha \mid Y_n)
 
         """
-        if self._simulated_state is None:
+        if self._simulated_state is None and self._nsimulations is None:
             self._simulated_state = np.array(
                 self._simulation_smoother.simulated_state, copy=True
             )
@@ -503,7 +505,8 @@ class SimulationSmoothResults(object):
             \varepsilon ~ N(\hat \varepsilon, Var(\hat \varepsilon \mid Y_n))
 
         """
-        if self._simulated_measurement_disturbance is None:
+        if (self._simulated_measurement_disturbance is None and
+                self._nsimulations is None):
             self._simulated_measurement_disturbance = np.array(
                 self._simulation_smoother.simulated_measurement_disturbance,
                 copy=True
@@ -523,7 +526,8 @@ class SimulationSmoothResults(object):
             \eta ~ N(\hat \eta, Var(\hat \eta \mid Y_n))
 
         """
-        if self._simulated_state_disturbance is None:
+        if (self._simulated_state_disturbance is None and
+                self._nsimulations is None):
             self._simulated_state_disturbance = np.array(
                 self._simulation_smoother.simulated_state_disturbance,
                 copy=True
@@ -531,7 +535,7 @@ class SimulationSmoothResults(object):
         return self._simulated_state_disturbance
 
     def simulate(self, simulation_output=-1, disturbance_variates=None,
-                 initial_state_variates=None):
+                 initial_state_variates=None, nsimulations=None):
         r"""
         Perform simulation smoothing
 
@@ -547,13 +551,30 @@ class SimulationSmoothResults(object):
             Random values to use as disturbance variates, distributed standard
             Normal. Usually only specified if results are to be replicated
             (e.g. to enforce a seed) or for testing. If not specified, random
-            variates are drawn.
+            variates are drawn. If `nsimulations` is given, this should have
+            shape `(nsimulations, nobs * (k_endog + k_posdef))`.
         initial_state_variates : array_likes, optional
             Random values to use as initial state variates. Usually only
             specified if results are to be replicated (e.g. to enforce a seed)
-            or for testing. If not specified, random variates are drawn.
+            or for testing. If not specified, random variates are drawn. If
+            `nsimulations` is given, this should have shape
+            `(nsimulations, k_states)`.
+        nsimulations : int, optional
+            Number of draws to make. If specified, all draws are computed in
+            a single call to the compiled simulation smoother, and each of the
+            `generated_*` and `simulated_*` attributes gains a leading axis of
+            length `nsimulations` (so that e.g. `simulated_state` has shape
+            `(nsimulations, k_states, nobs)`). The `simulated_*` attributes
+            that are not included in `simulation_output` are then None.
+            Default is to make a single draw.
         """
+        if nsimulations is not None:
+            return self._simulate_multiple(
+                nsimulations, simulation_output, disturbance_variates,
+                initial_state_variates)
+
         # Clear any previous output
+        self._nsimulations = None
         self._generated_measurement_disturbance = None
         self._generated_state_disturbance = None
         self._generated_state = None
@@ -591,3 +612,95 @@ class SimulationSmoothResults(object):
         # Note: simulation_output=-1 corresponds to whatever was setup when
         # the simulation smoother was constructed
         self._simulation_smoother.simulate(simulation_output)
+
+    def _simulate_multiple(self, nsimulations, simulation_output=-1,
+                           disturbance_variates=None,
+                           initial_state_variates=None):
+        """
+        Perform simulation smoothing for multiple draws at once
+        """
+        model = self.model
+        nsimulations = int(nsimulations)
+        if nsimulations < 1:
+            raise ValueError('Invalid number of simulations; must be'
+                             ' positive.')
+        if simulation_output == -1:
+            simulation_output = self.simulation_output
+
+        nobs = model.nobs
+        k_endog = model.k_endog
+        k_states = model.k_states
+        k_posdef = model.k_posdef
+        dtype = self.dtype
+
+        # Random variates (copied, since they are transformed in place)
+        n_disturbance_variates = nobs * (k_endog + k_posdef)
+        if disturbance_variates is None:
+            disturbance_variates = np.random.normal(
+                size=(nsimulations, n_disturbance_variates))
+        disturbance_variates = np.array(disturbance_variates, dtype=dtype,
+                                        ndmin=2, copy=True)
+        if not disturbance_variates.shape == (nsimulations,
+                                              n_disturbance_variates):
+            raise ValueError('Invalid shape of disturbance variates. Required'
+                             ' (%d, %d), got %s.'
+                             % (nsimulations, n_disturbance_variates,
+                                str(disturbance_variates.shape)))
+        if initial_state_variates is None:
+            initial_state_variates = np.random.normal(
+                size=(nsimulations, k_states))
+        initial_state_variates = np.array(initial_state_variates, dtype=dtype,
+                                          ndmin=2, copy=True)
+        if not initial_state_variates.shape == (nsimulations, k_states):
+            raise ValueError('Invalid shape of initial state variates.'
+                             ' Required (%d, %d), got %s.'
+                             % (nsimulations, k_states,
+                                str(initial_state_variates.shape)))
+
+        # Re-initialize the _statespace representation
+        self.model._initialize_representation(prefix=self.prefix)
+
+        # Initialize the state
+        self.model._initialize_state(prefix=self.prefix)
+
+        # Output arrays, the compiled simulation smoother expects the draws
+        # in the second axis and Fortran order, so that the values of all
+        # draws in a period are one matrix; the attributes are the
+        # transposed views with the draws in the first axis
+        def output(k, n):
+            return np.zeros((k, nsimulations, n), dtype=dtype, order='F')
+
+        generated_obs = output(k_endog, nobs)
+        generated_state = output(k_states, nobs + 1)
+        simulated_measurement_disturbance = None
+        simulated_state_disturbance = None
+        simulated_state = None
+        if simulation_output & SIMULATION_DISTURBANCE:
+            simulated_measurement_disturbance = output(k_endog, nobs)
+            simulated_state_disturbance = output(k_posdef, nobs)
+        if simulation_output & SIMULATION_STATE:
+            simulated_state = output(k_states, nobs)
+
+        # Perform simulation smoothing
+        self._simulation_smoother.simulate_multiple(
+            disturbance_variates, initial_state_variates, generated_obs,
+            generated_state, simulated_measurement_disturbance,
+            simulated_state_disturbance, simulated_state, simulation_output)
+
+        def draws_first(x):
+            return None if x is None else x.transpose(1, 0, 2)
+
+        end = nobs * k_endog
+        self._generated_measurement_disturbance = (
+            disturbance_variates[:, :end].reshape(nsimulations, nobs, k_endog))
+        self._generated_state_disturbance = (
+            disturbance_variates[:, end:].reshape(nsimulations, nobs,
+                                                  k_posdef))
+        self._generated_obs = draws_first(generated_obs)
+        self._generated_state = draws_first(generated_state)
+        self._simulated_state = draws_first(simulated_state)
+        self._simulated_measurement_disturbance = draws_first(
+            simulated_measurement_disturbance)
+        self._simulated_state_disturbance = draws_first(
+            simulated_state_disturbance)
+        self._nsimulations = nsimulations
@@ -0,0 +1,290 @@
+"""
+Tests for the Kalman filter over a batch of series
+
+License: Simplified-BSD
+"""
+from __future__ import division, absolute_import, print_function
+
+import warnings
+from itertools import product
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_equal, assert_raises
+
+from statsmodels.tsa.statespace import sarimax, varmax
+from statsmodels.tsa.statespace.batched import BatchedMLEModel
+
+
+def _sarimax_data(nobs=80, nseries=6):
+    np.random.seed(1234)
+    endog = (np.cumsum(np.random.normal(size=(nobs, nseries)), 0) * 0.3 +
+             np.random.normal(size=(nobs, nseries)))
+    endog[5, 1] = np.nan
+    endog[10:20, 3] = np.nan
+    return endog
+
+
+def check_sarimax(endog, params, **kwargs):
+    nseries = endog.shape[1]
+    mod = sarimax.SARIMAX(endog[:, 0], **kwargs)
+    batch = BatchedMLEModel(mod, endog)
+    models = [sarimax.SARIMAX(endog[:, i], **kwargs) for i in range(nseries)]
+
+    llf = batch.loglike(params)
+    llf2 = [models[i].loglike(params[i]) for i in range(nseries)]
+    assert_allclose(llf, llf2, rtol=1e-8)
+
+    llf_obs = batch.loglikeobs(params)
+    assert_equal(llf_obs.shape, (len(endog), nseries))
+    assert_allclose(llf_obs[:, 1], models[1].loglikeobs(params[1]),
+                    rtol=1e-8)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        score = batch.score(params)
+        score2 = [models[i].score(params[i]) for i in range(nseries)]
+    assert_allclose(score, score2, rtol=1e-5, atol=1e-5)
+
+    unconstrained = np.array([mod.untransform_params(p) for p in params])
+    assert_allclose(batch.loglike(unconstrained, transformed=False), llf,
+                    rtol=1e-10)
+    return batch, models
+
+
+def test_sarimax():
+    endog = _sarimax_data()
+    params = np.array([[0.5, 0.2, 1.], [0.3, -0.2, 0.8], [-0.4, 0.1, 1.5],
+                       [0.8, 0.3, 1.2], [0.1, 0.1, 0.6], [0.6, -0.5, 1.1]])
+    batch, models = check_sarimax(endog, params, order=(1, 0, 1))
+
+    forecasts = batch.forecast(params, steps=4)
+    assert_equal(forecasts.shape, (4, endog.shape[1]))
+    for i in [0, 3]:
+        res = models[i].filter(params[i])
+        assert_allclose(forecasts[:, i], res.forecast(4), rtol=1e-8)
+
+    res = batch.filter(params, store_states=True)
+    res2 = models[3].filter(params[3])
+    assert_allclose(res.filtered_state[..., 3], res2.filtered_state,
+                    rtol=1e-8, atol=1e-10)
+    assert_allclose(res.predicted_state_cov[..., 3],
+                    res2.predicted_state_cov, rtol=1e-8, atol=1e-10)
+    assert_allclose(res.forecasts[..., 3], res2.forecasts, rtol=1e-8)
+
+    # shared parameters
+    assert_allclose(batch.loglike(params[0]),
+                    [mod.loglike(params[0]) for mod in models], rtol=1e-8)
+
+
+def test_sarimax_trend_diffuse():
+    # time-varying trend and partially diffuse initialization
+    endog = _sarimax_data()
+    params = np.array([[0.1, 0.5, -0.2, 0.3, 1.]] * 6)
+    params[:, 1] *= np.linspace(0.5, 1.5, 6)
+    batch, models = check_sarimax(endog, params, order=(2, 1, 1),
+                                  trend='c')
+    assert_raises(ValueError, batch.forecast, params)
+
+
+def test_sarimax_seasonal():
+    endog = _sarimax_data()
+    params = np.array([[0.5, 0.2, 1.]] * 6)
+    params[:, 0] = np.linspace(-0.5, 0.8, 6)
+    check_sarimax(endog, params, order=(1, 0, 0),
+                  seasonal_order=(1, 0, 0, 4))
+
+
+def test_varmax_missing():
+    np.random.seed(1234)
+    nobs, nseries = 50, 4
+    endog = np.random.normal(size=(nobs, 2, nseries))
+    endog[3, 0, 1] = np.nan
+    endog[7, :, 2] = np.nan
+    mod = varmax.VARMAX(endog[..., 0], order=(1, 0))
+    params = np.array([mod.start_params * (1 + 0.1 * i)
+                       for i in range(nseries)])
+    batch = BatchedMLEModel(mod, endog)
+
+    llf2 = [varmax.VARMAX(endog[..., i], order=(1, 0)).loglike(params[i])
+            for i in range(nseries)]
+    assert_allclose(batch.loglike(params), llf2, rtol=1e-10)
+
+    res = varmax.VARMAX(endog[..., 1], order=(1, 0)).filter(params[1])
+    assert_allclose(batch.forecast(params, steps=3)[..., 1],
+                    res.forecast(3), rtol=1e-8)
+
+
+class _SARIMAXLoop(sarimax.SARIMAX):
+    # overrides update, so that the system matrices are constructed series
+    # by series
+    def update(self, params, **kwargs):
+        return super(_SARIMAXLoop, self).update(params, **kwargs)
+
+
+class _VARMAXLoop(varmax.VARMAX):
+    def update(self, params, **kwargs):
+        return super(_VARMAXLoop, self).update(params, **kwargs)
+
+
+def check_system_matrices(cls, cls_loop, endog, params, **kwargs):
+    nseries = endog.shape[-1]
+    batch = BatchedMLEModel(cls(endog[..., 0], **kwargs), endog)
+    batch_loop = BatchedMLEModel(cls_loop(endog[..., 0], **kwargs), endog)
+    matrices = batch.system_matrices(params)
+    matrices_loop = batch_loop.system_matrices(params)
+    for name in matrices:
+        assert_allclose(matrices[name], matrices_loop[name], rtol=1e-10,
+                        atol=1e-12)
+    llf = [cls(endog[..., i], **kwargs).loglike(params[i])
+           for i in range(nseries)]
+    assert_allclose(batch.loglike(params), llf, rtol=1e-8)
+    # complex step
+    matrices = batch.system_matrices(params + 1e-20j, complex_step=True)
+    matrices_loop = batch_loop.system_matrices(params + 1e-20j,
+                                               complex_step=True)
+    for name in matrices:
+        assert_allclose(matrices[name], matrices_loop[name], rtol=1e-10,
+                        atol=1e-12)
+
+
+def test_system_matrices_sarimax():
+    endog = _sarimax_data()
+    nobs, nseries = endog.shape
+    exog = np.sin(np.arange(nobs))[:, None] + np.arange(nobs)[:, None] / 50.
+    scale = np.linspace(0.5, 1.5, nseries)[:, None]
+    specs = [
+        (dict(order=(1, 0, 1)), [0.5, 0.2, 1.]),
+        (dict(order=(2, 1, 1), trend='ct'), [0.1, 0.01, 0.5, -0.2, 0.3, 1.]),
+        (dict(order=(1, 0, 1), seasonal_order=(1, 0, 1, 4), trend='c',
+              hamilton_representation=True),
+         [0.1, 0.5, 0.2, 0.3, -0.2, 1.]),
+        (dict(order=(1, 0, 0), exog=exog, measurement_error=True),
+         [0.4, 0.5, 0.3, 1.]),
+        (dict(order=(1, 0, 1), exog=exog, mle_regression=False,
+              time_varying_regression=True),
+         [0.5, 0.2, 0.1, 1.]),
+        (dict(order=(1, 0, 1), enforce_stationarity=False),
+         [0.5, 0.2, 1.]),
+    ]
+    for kwargs, params in specs:
+        params = np.array(params) * scale
+        check_system_matrices(sarimax.SARIMAX, _SARIMAXLoop, endog, params,
+                              **kwargs)
+
+
+def test_system_matrices_varmax():
+    np.random.seed(1234)
+    nobs, nseries = 50, 4
+    endog = np.random.normal(size=(nobs, 2, nseries))
+    exog = np.random.normal(size=(nobs, 1))
+    scale = np.linspace(0.8, 1.2, nseries)[:, None]
+    specs = [dict(order=(1, 0)),
+             dict(order=(1, 1), error_cov_type='diagonal',
+                  measurement_error=True),
+             dict(order=(2, 0), trend='nc', exog=exog),
+             dict(order=(1, 0), exog=exog)]
+    for kwargs in specs:
+        mod = varmax.VARMAX(endog[..., 0], **kwargs)
+        params = mod.start_params * scale
+        check_system_matrices(varmax.VARMAX, _VARMAXLoop, endog, params,
+                              **kwargs)
+
+
+def _grid_params(mod, nseries):
+    # admissible parameters for all specifications, varied across series
+    params = []
+    for name in mod.param_names:
+        if name.startswith('ar.'):
+            params.append(0.3)
+        elif name.startswith('L'):
+            # VARMAX lag coefficients
+            params.append(0.15)
+        elif name.startswith('ma.'):
+            params.append(0.2)
+        elif name.startswith('sigma2') or name.startswith('var.'):
+            params.append(1.)
+        elif name.startswith('sqrt.var') or name.startswith('measurement'):
+            params.append(0.8)
+        else:
+            params.append(0.1)
+    scale = np.linspace(0.5, 1.2, nseries)[:, None]
+    return np.array(params)[None, :] * scale
+
+
+def check_update(cls, cls_loop, endog, initialize=None, **kwargs):
+    # the vectorized update against the update method of the model applied
+    # to each series
+    mod = cls(endog[..., 0], **kwargs)
+    mod_loop = cls_loop(endog[..., 0], **kwargs)
+    if initialize is not None:
+        getattr(mod, initialize)()
+        getattr(mod_loop, initialize)()
+    params = _grid_params(mod, endog.shape[-1])
+    batch = BatchedMLEModel(mod, endog)
+    batch_loop = BatchedMLEModel(mod_loop, endog)
+    try:
+        mod_loop.update(params[0])
+    except ValueError:
+        # specifications that the model cannot represent
+        assert_raises(ValueError, batch.system_matrices, params)
+        return
+    for p, complex_step in [(params, False), (params + 1e-20j, True)]:
+        matrices = batch.system_matrices(p, complex_step=complex_step)
+        matrices_loop = batch_loop.system_matrices(
+            p, complex_step=complex_step)
+        for name in matrices:
+            assert_allclose(matrices[name], matrices_loop[name],
+                            rtol=1e-10, atol=1e-12, err_msg=name)
+
+
+def test_update_grid_sarimax():
+    # all options of SARIMAX that the vectorized update distinguishes
+    endog = _sarimax_data(nobs=30, nseries=4)
+    exog = np.sin(np.arange(30))[:, None] + np.arange(30)[:, None] / 50.
+    orders = [((0, 0, 0), (0, 0, 0, 0)), ((2, 1, 1), (0, 0, 0, 0)),
+              (([1, 0, 1], 0, 0), (0, 0, 1, 4)),
+              ((1, 0, 1), (1, 1, 1, 4))]
+    exogs = [dict(), dict(exog=exog),
+             dict(exog=exog, mle_regression=False),
+             dict(exog=exog, mle_regression=False,
+                  time_varying_regression=True)]
+    for (order, seasonal_order), trend, kw_exog, measurement_error, \
+            hamilton, stationarity, initialize in product(
+                orders, [None, 'c', 'ct', [1, 0, 1]], exogs, [False, True],
+                [False, True], [True, False],
+                [None, 'initialize_approximate_diffuse']):
+        if hamilton and (order[1] > 0 or seasonal_order[1] > 0):
+            # not available with differencing in the state vector
+            continue
+        check_update(sarimax.SARIMAX, _SARIMAXLoop, endog,
+                     initialize=initialize, order=order,
+                     seasonal_order=seasonal_order, trend=trend,
+                     measurement_error=measurement_error,
+                     hamilton_representation=hamilton,
+                     enforce_stationarity=stationarity, **kw_exog)
+
+
+def test_update_grid_varmax():
+    # all options of VARMAX that the vectorized update distinguishes
+    np.random.seed(1234)
+    endog = np.random.normal(size=(30, 2, 3))
+    exog = np.random.normal(size=(30, 2))
+    exogs = [dict(), dict(exog=exog[:, :1]), dict(exog=exog)]
+    for order, trend, kw_exog, error_cov_type, measurement_error in product(
+            [(1, 0), (2, 0), (0, 1), (1, 1)], ['c', 'nc'], exogs,
+            ['unstructured', 'diagonal'], [False, True]):
+        with warnings.catch_warnings():
+            # VARMA(p, q) models are not identified
+            warnings.simplefilter('ignore')
+            check_update(varmax.VARMAX, _VARMAXLoop, endog, order=order,
+                         trend=trend, error_cov_type=error_cov_type,
+                         measurement_error=measurement_error, **kw_exog)
+
+
+def test_errors():
+    endog = _sarimax_data()
+    mod = sarimax.SARIMAX(endog[:, 0], order=(1, 0, 1))
+    assert_raises(ValueError, BatchedMLEModel, mod, endog[:, :, None])
+    batch = BatchedMLEModel(mod, endog)
+    assert_raises(ValueError, batch.loglike, np.ones((2, 3)))
+    assert_raises(ValueError, batch.loglike, np.ones(4))
@@ -640,3 +640,49 @@ def test_predict_custom_index():
     res = mod.smooth(mod.start_params)
     out = res.predict(start=1, end=1, index=['a'])
     assert_equal(out.index.equals(pd.Index(['a'])), True)
+
+
+def test_fit_em():
+    # EM estimation: the loglikelihood increases at each iteration and the
+    # maximum agrees with the quasi-Newton estimates
+    np.random.seed(1234)
+    nobs, k_endog = 200, 8
+    factor = np.zeros(nobs)
+    for t in range(1, nobs):
+        factor[t] = 0.7 * factor[t - 1] + np.random.normal()
+    loadings = np.random.normal(size=k_endog)
+    endog = (factor[:, None] * loadings[None, :] +
+             np.random.normal(size=(nobs, k_endog)))
+
+    mod = dynamic_factor.DynamicFactor(endog, k_factors=1, factor_order=1)
+
+    params = mod.start_params
+    llfs = []
+    for i in range(5):
+        llf, params = mod._em_iteration(params)
+        llfs.append(llf)
+    assert_equal(np.all(np.diff(llfs) > 0), True)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        res_em = mod.fit(method='em', tolerance=1e-9, disp=False)
+        res_mle = mod.fit(res_em.params, disp=False)
+    assert_equal(res_em.mle_settings.optimizer, 'em')
+    assert_equal(res_em.mle_retvals.converged, True)
+    assert_allclose(res_em.llf, res_mle.llf, rtol=1e-5)
+    assert_allclose(res_em.params, res_mle.params, rtol=1e-2, atol=1e-2)
+
+    # Missing data
+    endog[10:20, 0] = np.nan
+    endog[50, 2:5] = np.nan
+    mod = dynamic_factor.DynamicFactor(endog, k_factors=1, factor_order=1)
+    res_em = mod.fit(method='em', maxiter=20)
+    assert_equal(np.all(np.isfinite(res_em.params)), True)
+
+    # Unsupported specifications
+    mod = dynamic_factor.DynamicFactor(endog, k_factors=1, factor_order=1,
+                                       error_order=1)
+    assert_raises(NotImplementedError, mod.fit, method='em')
+    mod = dynamic_factor.DynamicFactor(endog, k_factors=1, factor_order=1,
+                                       error_cov_type='unstructured')
+    assert_raises(ValueError, mod.fit, method='em')
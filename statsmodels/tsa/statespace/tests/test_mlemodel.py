@@ -12,9 +12,11 @@ import os
 import re
 
 import warnings
-from statsmodels.tsa.statespace import (sarimax, varmax, kalman_filter,
-                                        kalman_smoother)
+from statsmodels.tsa.statespace import (sarimax, varmax, dynamic_factor,
+                                        kalman_filter, kalman_smoother)
 from statsmodels.tsa.statespace.mlemodel import MLEModel, MLEResultsWrapper
+from statsmodels.tsa.statespace.structural import UnobservedComponents
+from statsmodels.regression.recursive_ls import RecursiveLS
 from statsmodels.tsa.statespace.tools import compatibility_mode
 from statsmodels.datasets import nile
 from numpy.testing import assert_almost_equal, assert_equal, assert_allclose, assert_raises
@@ -205,6 +207,94 @@ def test_fit_misc():
     assert_almost_equal(res_params, [0, 0], 5)
 
 
+def test_steady_state():
+    np.random.seed(1234)
+    endog = np.cumsum(np.random.normal(size=500)) + np.random.normal(size=500)
+    mod = sarimax.SARIMAX(endog, order=(1, 1, 1))
+    params = [0.3, -0.5, 1.]
+
+    res = mod.filter(params).filter_results
+    res_ss = mod.filter(params, steady_state=True).filter_results
+
+    # The steady-state filter converges immediately, and afterwards agrees
+    # with the exact filter, which converges later
+    assert_equal(res_ss.converged, True)
+    assert_equal(res_ss.nobs_converged, mod.nobs - 1)
+    assert_equal(res.converged, True)
+    assert_equal(res.nobs_converged < res_ss.nobs_converged, True)
+    assert_allclose(res_ss.predicted_state_cov[..., 1:],
+                    res_ss.predicted_state_cov[..., :1] *
+                    np.ones((1, 1, mod.nobs)), atol=1e-12)
+    assert_allclose(res_ss.predicted_state_cov[..., -1],
+                    res.predicted_state_cov[..., -1], atol=1e-12)
+    assert_allclose(res_ss.llf_obs[-100:], res.llf_obs[-100:], rtol=1e-8)
+    assert_allclose(mod.loglike(params, steady_state=True),
+                    np.sum(res_ss.llf_obs[mod.loglikelihood_burn:]))
+
+    # Estimation warmed up on the steady-state likelihood reaches the exact
+    # maximum likelihood estimates
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        res1 = mod.fit(disp=False)
+        res2 = mod.fit(disp=False, steady_state_warmup=True)
+    assert_equal(mod.ssm.steady_state, False)
+    assert_allclose(res2.llf, res1.llf, rtol=1e-6)
+    assert_allclose(res2.params, res1.params, rtol=1e-3)
+
+    # Time-varying models cannot be started in steady-state
+    mod = sarimax.SARIMAX(endog, order=(1, 0, 0), trend='ct')
+    assert_raises(ValueError, mod.filter, [0., 0., 0.5, 1.],
+                  steady_state=True)
+
+
+def test_score_analytic():
+    np.random.seed(1234)
+    endog = np.cumsum(np.random.normal(size=200)) + np.random.normal(size=200)
+    endog_missing = endog.copy()
+    endog_missing[[5, 50, 51]] = np.nan
+    endog_mv = np.random.normal(size=(200, 3))
+    endog_mv[:, 1:] += endog_mv[:, :1]
+
+    models = [
+        (sarimax.SARIMAX(endog, order=(1, 0, 1)), [0.5, 0.3, 1.2]),
+        (sarimax.SARIMAX(endog_missing, order=(1, 1, 1)), [0.3, -0.5, 1.]),
+        (sarimax.SARIMAX(endog, order=(1, 0, 0), trend='ct',
+                         measurement_error=True), [0.1, 0.01, 0.5, 1., 0.2]),
+        (UnobservedComponents(endog, 'lltrend', cycle=True,
+                              damped_cycle=True), None),
+        (UnobservedComponents(endog, 'rwalk', cycle=True, damped_cycle=True,
+                              stochastic_cycle=False), None),
+        (varmax.VARMAX(endog_mv[:, :2], order=(1, 0)), None),
+        (dynamic_factor.DynamicFactor(endog_mv, k_factors=1, factor_order=2,
+                                      error_order=1), None),
+    ]
+    for mod, params in models:
+        if params is None:
+            params = mod.start_params
+        params = np.array(params)
+        desired = mod.score(params)
+        actual = mod.score(params, method='analytic')
+        assert_allclose(actual, desired, rtol=1e-6, atol=1e-6)
+
+    # Untransformed parameters and Hessian
+    mod, params = models[0]
+    params = np.array(params)
+    unconstrained = mod.untransform_params(params)
+    assert_allclose(mod.score(unconstrained, transformed=False,
+                              method='analytic'),
+                    mod.score(unconstrained, transformed=False), rtol=1e-6)
+    assert_allclose(mod.hessian(params, method='analytic'),
+                    mod.hessian(params), rtol=1e-5)
+
+    # Estimation using the analytic score
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        res1 = mod.fit(disp=False)
+        res2 = mod.fit(disp=False, optim_score='analytic')
+    assert_allclose(res2.llf, res1.llf, rtol=1e-6)
+    assert_allclose(res2.params, res1.params, rtol=1e-3, atol=1e-4)
+
+
 def test_score_misc():
     mod, res = get_dummy_mod()
 
@@ -910,3 +1000,126 @@ def test_lutkepohl_information_criteria():
     bic = res.info_criteria('bic') - 6 * np.log(res.nobs_effective)
     assert_allclose(aic, true['estat_aic'])
     assert_allclose(bic, true['estat_bic'])
+
+
+def check_append(mod_full, mod_previous, params, endog, exog=None):
+    res_full = mod_full.filter(params)
+    res_previous = mod_previous.filter(params)
+    res = res_previous.append(endog, exog=exog)
+
+    assert_equal(res.nobs, res_full.nobs)
+    for name in ['llf_obs', 'filtered_state', 'filtered_state_cov',
+                 'predicted_state', 'predicted_state_cov', 'forecasts',
+                 'forecasts_error', 'forecasts_error_cov']:
+        assert_allclose(getattr(res, name), getattr(res_full, name))
+    assert_allclose(res.llf, res_full.llf)
+    assert_allclose(res.cov_params(), res_previous.cov_params())
+    return res, res_full
+
+
+def test_append():
+    endog = nile.load_pandas().data['volume']
+    endog.index = pd.date_range(start='1871-01-01', periods=100, freq='AS')
+    exog = pd.Series(np.arange(100.), index=endog.index, name='x')
+
+    # SARIMAX with a time trend, exog and missing data
+    endog_missing = endog.copy()
+    endog_missing.iloc[[10, 85, 86]] = np.nan
+    kwargs = {'order': (1, 1, 1), 'trend': 'ct'}
+    mod_full = sarimax.SARIMAX(endog_missing, exog=exog, **kwargs)
+    mod_previous = sarimax.SARIMAX(endog_missing[:80], exog=exog[:80],
+                                   **kwargs)
+    params = [0.1, 0.01, 0.2, 0.4, -0.5, 15000]
+    res, res_full = check_append(mod_full, mod_previous, params,
+                                 endog_missing[80:], exog[80:])
+    assert_equal(res.model.k_exog, 1)
+    assert_equal(res.forecast(1, exog=[[100.]]).index[0],
+                 res_full.forecast(1, exog=[[100.]]).index[0])
+    assert_allclose(res.forecast(2, exog=[[100.], [101.]]),
+                    res_full.forecast(2, exog=[[100.], [101.]]))
+
+    # Exog must be given if the model has it
+    res_previous = mod_previous.filter(params)
+    assert_raises(ValueError, res_previous.append, endog[80:])
+
+    # Other models
+    mod_full = UnobservedComponents(endog.values, 'llevel')
+    mod_previous = UnobservedComponents(endog.values[:50], 'llevel')
+    check_append(mod_full, mod_previous, [15000., 1500.], endog.values[50:])
+
+    endog = np.log(np.array(results_var_misc.lutkepohl_data)[:, :2])
+    endog = np.diff(endog, axis=0) * 100
+    mod_full = varmax.VARMAX(endog, order=(1, 0), trend='nc')
+    mod_previous = varmax.VARMAX(endog[:60], order=(1, 0), trend='nc')
+    params = np.r_[0.5, 0.1, 0.1, 0.5, 5., 1., 5.]
+    check_append(mod_full, mod_previous, params, endog[60:])
+
+    mod_full = dynamic_factor.DynamicFactor(endog, k_factors=1,
+                                            factor_order=1)
+    mod_previous = dynamic_factor.DynamicFactor(endog[:60], k_factors=1,
+                                                factor_order=1)
+    check_append(mod_full, mod_previous, [1., 0.5, 1., 1., 0.5], endog[60:])
+
+    # Models without their own clone method
+    endog = nile.load_pandas().data['volume'].values
+    exog = np.column_stack((np.ones(100), np.arange(100.)))
+    res_previous = RecursiveLS(endog[:60], exog[:60]).fit()
+    mod_full = RecursiveLS(endog, exog)
+    mod_full['obs_cov', 0, 0] = res_previous.filter_results.obs_cov[0, 0]
+    res_full = mod_full.filter()
+    res = res_previous.append(endog[60:], exog[60:])
+    assert_allclose(res.params, res_full.params)
+    assert_allclose(res.llf_obs, res_full.llf_obs)
+    assert_allclose(res.filtered_state, res_full.filtered_state)
+    res = res_previous.extend(endog[60:], exog[60:])
+    assert_allclose(res.params, res_full.params)
+    assert_allclose(res.filtered_state, res_full.filtered_state[:, 60:])
+
+    mod_full = _LocalLevel(endog)
+    mod_previous = _LocalLevel(endog[:60])
+    check_append(mod_full, mod_previous, [15000., 1500.], endog[60:])
+
+
+class _LocalLevel(MLEModel):
+    # user-defined model whose constructor only takes endog
+    def __init__(self, endog):
+        super(_LocalLevel, self).__init__(
+            endog, k_states=1, initialization='approximate_diffuse')
+        self['design', 0, 0] = 1.
+        self['transition', 0, 0] = 1.
+        self['selection', 0, 0] = 1.
+
+    def update(self, params, **kwargs):
+        params = super(_LocalLevel, self).update(params, **kwargs)
+        self['obs_cov', 0, 0] = params[0]
+        self['state_cov', 0, 0] = params[1]
+
+
+def test_extend():
+    endog = nile.load_pandas().data['volume'].values
+    params = [0.5, -0.3, 15000.]
+    mod_full = sarimax.SARIMAX(endog, order=(1, 1, 1))
+    mod_previous = sarimax.SARIMAX(endog[:70], order=(1, 1, 1))
+    res_full = mod_full.filter(params)
+    res = mod_previous.filter(params).extend(endog[70:])
+
+    assert_equal(res.nobs, 30)
+    assert_allclose(res.llf_obs, res_full.llf_obs[70:])
+    assert_allclose(res.filtered_state, res_full.filtered_state[:, 70:])
+    assert_allclose(res.forecast(5), res_full.forecast(5))
+
+
+def test_continue_filter_invalid():
+    endog = nile.load_pandas().data['volume'].values
+    mod = sarimax.SARIMAX(endog, order=(1, 0, 0))
+    res = mod.filter([0.5, 15000.])
+
+    # Results must be for a shorter sample
+    assert_raises(ValueError, mod.ssm.continue_filter, res.filter_results)
+
+    # Results must contain the full filter output
+    mod_previous = sarimax.SARIMAX(endog[:50], order=(1, 0, 0))
+    mod_previous.ssm.memory_no_filtered = True
+    res_previous = mod_previous.filter([0.5, 15000.])
+    assert_raises(ValueError, mod.ssm.continue_filter,
+                  res_previous.filter_results)
@@ -623,3 +623,141 @@ def test_simulation_smoothing_obs_intercept():
     sim.simulate(disturbance_variates=np.zeros(mod.nobs * 2),
                  initial_state_variates=np.zeros(1))
     assert_equal(sim.simulated_state[0], 0)
+
+
+def test_simulate_multiple():
+    # Multiple draws at once give the same draws as repeated single draws
+    mod = TestMultivariateVAR
+    mod.setup_class()
+    nsimulations = 3
+    nobs = mod.model.nobs
+    np.random.seed(1234)
+    disturbance_variates = np.random.normal(size=(nsimulations, nobs * 6))
+    initial_state_variates = np.random.normal(size=(nsimulations, 3))
+
+    sim = mod.model.simulation_smoother()
+    sim.simulate(disturbance_variates=disturbance_variates,
+                 initial_state_variates=initial_state_variates,
+                 nsimulations=nsimulations)
+    assert_equal(sim.simulated_state.shape, (nsimulations, 3, nobs))
+    assert_equal(sim.generated_state.shape, (nsimulations, 3, nobs + 1))
+    assert_equal(sim.simulated_measurement_disturbance.shape,
+                 (nsimulations, 3, nobs))
+
+    sim1 = mod.model.simulation_smoother()
+    for i in range(nsimulations):
+        sim1.simulate(disturbance_variates=disturbance_variates[i],
+                      initial_state_variates=initial_state_variates[i])
+        assert_allclose(sim.generated_obs[i], sim1.generated_obs)
+        assert_allclose(sim.generated_state[i], sim1.generated_state)
+        assert_allclose(sim.simulated_state[i], sim1.simulated_state,
+                        atol=1e-7)
+        assert_allclose(sim.simulated_measurement_disturbance[i],
+                        sim1.simulated_measurement_disturbance, atol=1e-7)
+        assert_allclose(sim.simulated_state_disturbance[i],
+                        sim1.simulated_state_disturbance, atol=1e-7)
+
+    # Only generate the series, the outputs that were not requested are
+    # not taken from the last draw
+    sim.simulate(simulation_output=0, nsimulations=2)
+    assert_equal(sim.generated_obs.shape, (2, 3, nobs))
+    assert_equal(sim.simulated_state, None)
+    assert_equal(sim.simulated_measurement_disturbance, None)
+    assert_equal(sim.simulated_state_disturbance, None)
+    sim.simulate(simulation_output=SIMULATION_STATE, nsimulations=2)
+    assert_equal(sim.simulated_state.shape, (2, 3, nobs))
+    assert_equal(sim.simulated_state_disturbance, None)
+    sim.simulate(simulation_output=SIMULATION_DISTURBANCE, nsimulations=2)
+    assert_equal(sim.simulated_state, None)
+    assert_equal(sim.simulated_state_disturbance.shape, (2, 3, nobs))
+
+    assert_raises(ValueError, sim.simulate, nsimulations=2,
+                  disturbance_variates=disturbance_variates)
+
+
+def test_simulate_multiple_time_varying():
+    # The Kalman gains shared by all draws with time-varying system matrices,
+    # an observation intercept and a state intercept
+    np.random.seed(1234)
+    nobs = 60
+    endog = np.cumsum(np.random.normal(size=nobs)) * 0.3
+    exog = np.random.normal(size=(nobs, 1))
+    mod = structural.UnobservedComponents(endog, 'lltrend', exog=exog,
+                                          seasonal=4)
+    mod.update([1., 0.5, 0.1, 0.2, 0.8])
+    nsimulations = 4
+    n_variates = nobs * (mod.k_endog + mod.ssm.k_posdef)
+    disturbance_variates = np.random.normal(size=(nsimulations, n_variates))
+    initial_state_variates = np.random.normal(
+        size=(nsimulations, mod.k_states))
+
+    sim = mod.simulation_smoother()
+    sim.simulate(disturbance_variates=disturbance_variates,
+                 initial_state_variates=initial_state_variates,
+                 nsimulations=nsimulations)
+    sim1 = mod.simulation_smoother()
+    for i in range(nsimulations):
+        sim1.simulate(disturbance_variates=disturbance_variates[i],
+                      initial_state_variates=initial_state_variates[i])
+        assert_allclose(sim.generated_obs[i], sim1.generated_obs)
+        assert_allclose(sim.generated_state[i], sim1.generated_state)
+        assert_allclose(sim.simulated_state[i], sim1.simulated_state,
+                        rtol=1e-7, atol=1e-7)
+        assert_allclose(sim.simulated_measurement_disturbance[i],
+                        sim1.simulated_measurement_disturbance,
+                        rtol=1e-7, atol=1e-7)
+        assert_allclose(sim.simulated_state_disturbance[i],
+                        sim1.simulated_state_disturbance,
+                        rtol=1e-7, atol=1e-7)
+
+
+def test_simulate_multiple_missing():
+    # With zero variates, the draws are the smoothed values
+    for missing in ['all', 'partial', 'mixed']:
+        mod = MultivariateVAR
+        mod.setup_class(missing=missing)
+        res = mod.model.ssm.smooth()
+        nobs = mod.model.nobs
+
+        sim = mod.model.simulation_smoother()
+        sim.simulate(disturbance_variates=np.zeros((2, nobs * 6)),
+                     initial_state_variates=np.zeros((2, 3)),
+                     nsimulations=2)
+        for i in range(2):
+            assert_allclose(sim.simulated_state[i], res.smoothed_state,
+                            atol=1e-7)
+            assert_allclose(sim.simulated_measurement_disturbance[i],
+                            res.smoothed_measurement_disturbance, atol=1e-7)
+            assert_allclose(sim.simulated_state_disturbance[i],
+                            res.smoothed_state_disturbance, atol=1e-7)
+
+
+def test_simulate_multiple_filter_timing():
+    # Multiple draws also work with the alternative filter timing
+    mod = TestMultivariateVAR
+    mod.setup_class()
+    mod.model.ssm.timing_init_filtered = True
+    nsimulations = 2
+    nobs = mod.model.nobs
+    np.random.seed(1234)
+    disturbance_variates = np.random.normal(size=(nsimulations, nobs * 6))
+    initial_state_variates = np.random.normal(size=(nsimulations, 3))
+
+    sim = mod.model.simulation_smoother()
+    sim.simulate(disturbance_variates=disturbance_variates,
+                 initial_state_variates=initial_state_variates,
+                 nsimulations=nsimulations)
+
+    sim1 = mod.model.simulation_smoother()
+    for i in range(nsimulations):
+        sim1.simulate(disturbance_variates=disturbance_variates[i],
+                      initial_state_variates=initial_state_variates[i])
+        assert_allclose(sim.generated_measurement_disturbance[i],
+                        sim1.generated_measurement_disturbance)
+        assert_allclose(sim.generated_state_disturbance[i],
+                        sim1.generated_state_disturbance)
+        assert_allclose(sim.simulated_state[i], sim1.simulated_state)
+        assert_allclose(sim.simulated_measurement_disturbance[i],
+                        sim1.simulated_measurement_disturbance)
+        assert_allclose(sim.simulated_state_disturbance[i],
+                        sim1.simulated_state_disturbance)
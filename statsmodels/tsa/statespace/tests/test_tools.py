@@ -9,7 +9,7 @@ from __future__ import division, absolute_import, print_function
 import numpy as np
 import pandas as pd
 
-from scipy.linalg import solve_discrete_lyapunov
+from scipy.linalg import solve_discrete_lyapunov, solve_discrete_are
 from statsmodels.tsa.statespace import tools
 from statsmodels.tsa.api import acovf
 # from .results import results_sarimax
@@ -147,6 +147,54 @@ class TestSolveDiscreteLyapunov(object):
         desired = self.solve_dicrete_lyapunov_direct(a, q, complex_step=True)
         assert_allclose(actual, desired)
 
+
+class TestSolveDiscreteRiccati(object):
+
+    def check(self, transition, design, selected_state_cov, obs_cov):
+        desired = solve_discrete_are(transition.T, design.T,
+                                     selected_state_cov, obs_cov)
+        actual = tools.solve_discrete_riccati(transition, design,
+                                              selected_state_cov, obs_cov)
+        assert_allclose(actual, desired, atol=1e-12)
+
+        # Starting from an approximately diffuse covariance matrix
+        actual = tools.solve_discrete_riccati(
+            transition, design, selected_state_cov, obs_cov,
+            initial_state_cov=1e6 * np.eye(transition.shape[0]))
+        assert_allclose(actual, desired, atol=1e-12)
+
+    def test_local_level(self):
+        self.check(np.eye(1), np.eye(1), np.array([[0.5]]),
+                   np.array([[2.]]))
+
+    def test_local_linear_trend(self):
+        self.check(np.array([[1., 1], [0, 1]]), np.array([[1., 0]]),
+                   np.diag([0.1, 0.01]), np.array([[1.]]))
+
+    def test_multivariate(self):
+        transition = tools.companion_matrix([1, -0.4, 0.5, -0.1]).T
+        design = np.array([[1., 0, 0], [0.5, 0.2, 0]])
+        selected_state_cov = np.diag([1., 0, 0])
+        self.check(transition, design, selected_state_cov, np.eye(2))
+
+    def test_complex_step(self):
+        # The derivative of the solution in the observation variance is
+        # recovered through a complex step perturbation
+        transition = np.array([[0.5]])
+        design = np.eye(1)
+        selected_state_cov = np.eye(1)
+        epsilon = 1e-20
+        actual = tools.solve_discrete_riccati(
+            transition, design, selected_state_cov,
+            np.array([[2. + epsilon * 1j]]), complex_step=True)
+        upper = solve_discrete_are(transition, design, selected_state_cov,
+                                   np.array([[2. + 1e-6]]))
+        lower = solve_discrete_are(transition, design, selected_state_cov,
+                                   np.array([[2. - 1e-6]]))
+        assert_allclose(actual.imag / epsilon, (upper - lower) / 2e-6,
+                        rtol=1e-5)
+
+
 class TestConcat(object):
 
     x = np.arange(10)
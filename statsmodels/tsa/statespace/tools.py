@@ -531,6 +531,112 @@ def solve_discrete_lyapunov(a, q, complex_step=False):
         return solve_sylvester(b.transpose(), b, -c)
 
 
+def solve_discrete_riccati(transition, design, selected_state_cov, obs_cov,
+                           initial_state_cov=None, tolerance=1e-12,
+                           maxiter=100, complex_step=False):
+    r"""
+    Solve for the steady-state predicted state covariance matrix
+
+    Parameters
+    ----------
+    transition : array
+        Transition matrix, shape (k_states, k_states).
+    design : array
+        Design matrix, shape (k_endog, k_states).
+    selected_state_cov : array
+        State covariance matrix premultiplied by the selection matrix and
+        postmultiplied by its transpose, shape (k_states, k_states).
+    obs_cov : array
+        Observation covariance matrix, shape (k_endog, k_endog).
+    initial_state_cov : array, optional
+        Covariance matrix from which to start the iterations. If it is not
+        given, `selected_state_cov` is used. Very large (approximately
+        diffuse) values are acceptable.
+    tolerance : float, optional
+        Convergence tolerance on the relative change in the solution.
+        Default is 1e-12.
+    maxiter : int, optional
+        Maximum number of Newton steps. Default is 100.
+    complex_step : bool, optional
+        Whether or not the matrices contain a complex step perturbation, in
+        which case transposes are not conjugated.
+
+    Returns
+    -------
+    predicted_state_cov : array
+        The steady-state predicted state covariance matrix, shape
+        (k_states, k_states).
+
+    Notes
+    -----
+    Solves the discrete algebraic Riccati equation
+
+    .. math::
+
+        P = T P T' + R Q R' - T P Z' (Z P Z' + H)^{-1} Z P T'
+
+    by Newton-Kleinman (Hewer) iterations, each of which requires the
+    solution of a discrete Lyapunov equation in the closed-loop transition
+    matrix :math:`L = T - K Z`. A few ordinary Riccati recursions are run
+    first so that the initial gain is stabilizing even when the transition
+    matrix has unit roots.
+    """
+    if complex_step:
+        transpose = np.transpose
+    else:
+        def transpose(x):
+            return x.conj().transpose()
+
+    transition = np.asarray(transition)
+    design = np.atleast_2d(design)
+    selected_state_cov = np.atleast_2d(selected_state_cov)
+    obs_cov = np.atleast_2d(obs_cov)
+    k_states = transition.shape[0]
+
+    if initial_state_cov is None:
+        cov = selected_state_cov
+    else:
+        cov = np.asarray(initial_state_cov)
+
+    def gain(cov):
+        forecast_cov = np.dot(np.dot(design, cov), transpose(design)) + obs_cov
+        return np.linalg.solve(
+            transpose(forecast_cov),
+            np.dot(design, np.dot(cov, transpose(transition)))).T
+
+    # Riccati recursions, to obtain a stabilizing gain
+    for i in range(k_states + 1):
+        kalman_gain = gain(cov)
+        closed = transition - np.dot(kalman_gain, design)
+        cov = (np.dot(np.dot(closed, cov), transpose(transition)) +
+               selected_state_cov)
+        cov = (cov + transpose(cov)) / 2
+
+    # Newton-Kleinman iterations
+    converged = False
+    for i in range(maxiter):
+        kalman_gain = gain(cov)
+        closed = transition - np.dot(kalman_gain, design)
+        rhs = selected_state_cov + np.dot(np.dot(kalman_gain, obs_cov),
+                                          transpose(kalman_gain))
+        updated = solve_discrete_lyapunov(closed, rhs,
+                                          complex_step=complex_step)
+        updated = (updated + transpose(updated)) / 2
+        delta = np.max(np.abs(updated - cov))
+        cov = updated
+        if not np.all(np.isfinite(cov)):
+            break
+        if delta <= tolerance * max(1, np.max(np.abs(cov))):
+            converged = True
+            break
+
+    if not converged:
+        raise ValueError('Solution of the discrete algebraic Riccati'
+                         ' equation did not converge.')
+
+    return cov
+
+
 def constrain_stationary_univariate(unconstrained):
     """
     Transform unconstrained parameters used by the optimizer to constrained
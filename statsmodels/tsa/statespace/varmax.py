@@ -199,6 +199,11 @@ class VARMAX(MLEModel):
         if self.k_exog > 0 or self.k_trend > 1:
             self.ssm._time_invariant = False
 
+        # update _init_keys attached by super
+        self._init_keys += ['order', 'trend', 'error_cov_type',
+                            'measurement_error', 'enforce_stationarity',
+                            'enforce_invertibility'] + list(kwargs.keys())
+
         # Initialize the parameters
         self.parameters = OrderedDict()
         self.parameters['trend'] = self.k_endog * self.k_trend
@@ -284,6 +289,15 @@ class VARMAX(MLEModel):
         self._params_state_cov, offset = _slice('state_cov', offset)
         self._params_obs_cov, offset = _slice('obs_cov', offset)
 
+    def _get_init_kwds(self):
+        kwds = super(VARMAX, self)._get_init_kwds()
+
+        for key, value in kwds.items():
+            if value is None and hasattr(self.ssm, key):
+                kwds[key] = getattr(self.ssm, key)
+
+        return kwds
+
     def filter(self, params, **kwargs):
         kwargs.setdefault('results_class', VARMAXResults)
         kwargs.setdefault('results_wrapper_class', VARMAXResultsWrapper)
@@ -4,6 +4,9 @@ Statistical tools for time series analysis
 from statsmodels.compat.python import (iteritems, range, lrange, string_types,
                                        lzip, zip, long)
 from statsmodels.compat.scipy import _next_regular
+from statsmodels.compat.numpy import np_moveaxis, np_stack
+
+import time
 
 import numpy as np
 from numpy.linalg import LinAlgError
@@ -11,6 +14,7 @@ from scipy import stats
 
 from statsmodels.regression.linear_model import OLS, yule_walker
 from statsmodels.tools.tools import add_constant, Bunch
+from statsmodels.tools.parallel import parallel_func
 from statsmodels.tsa.tsatools import lagmat, lagmat2ds, add_trend
 from statsmodels.tsa.adfvalues import mackinnonp, mackinnoncrit
 from statsmodels.tsa._bds import bds
@@ -19,7 +23,7 @@ from statsmodels.tools.sm_exceptions import InterpolationWarning, MissingDataErr
 
 
 __all__ = ['acovf', 'acf', 'pacf', 'pacf_yw', 'pacf_ols', 'ccovf', 'ccf',
-           'periodogram', 'q_stat', 'coint', 'arma_order_select_ic',
+           'ccovf_matrix', 'ccf_matrix', 'periodogram', 'q_stat', 'coint', 'arma_order_select_ic',
            'adfuller', 'kpss', 'bds']
 
 
@@ -74,13 +78,38 @@ def _autolag(mod, endog, exog, startlag, maxlag, method, modargs=(),
     where i goes from lagstart to lagstart+maxlag+1.  Therefore, lags are
     assumed to be in contiguous columns from low to high lag length with
     the highest lag in the last column.
+
+    For OLS without modargs and fitargs, the criteria of all methods,
+    including the t-values of 't-stat', are computed from a single QR
+    decomposition of the nested regressions, see `_ols_lag_ic`.  Each lag
+    is refit separately only if `regresults` is True, if another model or
+    arguments are used, or if exog is rank deficient.
+
+    If no lag has a significant t-value with 't-stat', the smallest lag
+    length `startlag` is returned.
     """
     #TODO: can tcol be replaced by maxlag + 2?
     #TODO: This could be changed to laggedRHS and exog keyword arguments if
     #    this will be more general.
 
-    results = {}
     method = method.lower()
+    if (mod is OLS and not modargs and not fitargs and not regresults and
+            method in ("aic", "bic", "t-stat")):
+        ics = _ols_lag_ic(endog, exog, startlag, maxlag)
+        if ics is not None:
+            lags = np.arange(startlag, startlag + maxlag + 1)
+            if method == "t-stat":
+                stop = 1.6448536269514722
+                for lag in lags[::-1]:
+                    icbest = np.abs(ics[method][lag - startlag])
+                    if icbest >= stop:
+                        break
+                return icbest, lag
+            else:
+                i = np.argmin(ics[method])
+                return ics[method][i], lags[i]
+
+    results = {}
     for lag in range(startlag, startlag + maxlag + 1):
         mod_instance = mod(endog, exog[:, :lag], *modargs)
         results[lag] = mod_instance.fit()
@@ -94,9 +123,8 @@ def _autolag(mod, endog, exog, startlag, maxlag, method, modargs=(),
         stop = 1.6448536269514722
         for lag in range(startlag + maxlag, startlag - 1, -1):
             icbest = np.abs(results[lag].tvalues[-1])
+            bestlag = lag
             if np.abs(icbest) >= stop:
-                bestlag = lag
-                icbest = icbest
                 break
     else:
         raise ValueError("Information Criterion %s not understood.") % method
@@ -107,6 +135,56 @@ def _autolag(mod, endog, exog, startlag, maxlag, method, modargs=(),
         return icbest, bestlag, results
 
 
+def _ols_lag_ic(endog, exog, startlag, maxlag):
+    """
+    Information criteria of nested OLS regressions from a single QR
+
+    Parameters
+    ----------
+    endog : ndarray
+        nobs array containing endogenous variable
+    exog : ndarray
+        nobs by (startlag + maxlag) array of regressors
+    startlag : int
+        Number of columns in the smallest regression.
+    maxlag : int
+        Number of additional nested regressions.
+
+    Returns
+    -------
+    ics : dict or None
+        Arrays of 'aic', 'bic' and 't-stat', the t-value of the last
+        column, for the regressions on ``exog[:, :lag]``, ``lag`` in
+        ``range(startlag, startlag + maxlag + 1)``.  None if exog is
+        rank deficient, in which case the regressions need to be estimated
+        separately.
+
+    Notes
+    -----
+    The residual sum of squares of the regression on the first ``j``
+    columns are the sums of squares of the trailing elements of the last
+    column of the R factor of ``[exog, endog]``.
+    """
+    nobs = endog.shape[0]
+    k = startlag + maxlag
+    if nobs <= k:
+        return None
+    r = np.linalg.qr(np.column_stack((exog[:, :k], endog)), mode='r')
+    diag = np.diag(r)[:k]
+    if np.abs(diag).min() <= 1e-10 * np.abs(diag).max():
+        return None
+
+    lags = np.arange(startlag, k + 1)
+    ry = r[:, k]
+    ssr = np.cumsum(ry[::-1] ** 2)[::-1][lags]
+    llf = -nobs / 2. * (np.log(2 * np.pi) + np.log(ssr / nobs) + 1)
+    scale = ssr / (nobs - lags)
+    tvalues = ry[lags - 1] * np.sign(diag[lags - 1]) / np.sqrt(scale)
+    return {'aic': -2 * llf + 2 * lags,
+            'bic': -2 * llf + np.log(nobs) * lags,
+            't-stat': tvalues}
+
+
 #this needs to be converted to a class like HetGoldfeldQuandt,
 # 3 different returns are a mess
 # See:
@@ -293,14 +371,60 @@ def adfuller(x, maxlag=None, regression="c", autolag='AIC',
             return adfstat, pvalue, usedlag, nobs, critvalues, icbest
 
 
-def acovf(x, unbiased=False, demean=True, fft=False, missing='none'):
+def _correlate(x, y, fft):
+    """
+    Sums of lagged products along the last axis, for lags 0, ..., nobs - 1
+
+    Element `k` of the output is `sum_t x[..., t + k] * y[..., t]`.
+    """
+    nobs = x.shape[-1]
+    if fft:
+        # Zero-pad to a fast length to avoid the circular terms
+        n = _next_regular(2 * nobs + 1)
+        fx = np.fft.rfft(x, n=n)
+        fy = fx if y is x else np.fft.rfft(y, n=n)
+        return np.fft.irfft(fx * np.conjugate(fy), n=n)[..., :nobs]
+    elif x.ndim == 1 and y.ndim == 1:
+        return np.correlate(x, y, 'full')[nobs - 1:]
+    else:
+        out = [np.sum(x[..., k:] * y[..., :nobs - k], axis=-1)
+               for k in range(nobs)]
+        return np_moveaxis(np.array(out), 0, -1)
+
+
+def _levinson_durbin_pacf(acov, nlags):
+    """
+    Partial autocorrelations from autocovariances along the last axis
+
+    Uses the Levinson-Durbin recursion for all series at once.
+    """
+    acov = np.asarray(acov)
+    shape = acov.shape[:-1]
+    pacf = np.zeros(shape + (nlags + 1,))
+    pacf[..., 0] = 1.
+    phi = np.zeros(shape + (nlags,))
+    sigma = acov[..., 0]
+    for k in range(1, nlags + 1):
+        numerator = acov[..., k] - np.sum(phi[..., :k - 1] *
+                                          acov[..., k - 1:0:-1], axis=-1)
+        reflection = numerator / sigma
+        phi[..., :k - 1] -= (reflection[..., None] *
+                             phi[..., :k - 1][..., ::-1])
+        phi[..., k - 1] = reflection
+        sigma = sigma * (1 - reflection**2)
+        pacf[..., k] = reflection
+    return pacf
+
+
+def acovf(x, unbiased=False, demean=True, fft=False, missing='none',
+          axis=None):
     """
     Autocovariance for 1D
 
     Parameters
     ----------
     x : array
-        Time series data. Must be 1d.
+        Time series data. Must be 1d, unless `axis` is given.
     unbiased : bool
         If True, then denominators is n-k, otherwise n
     demean : bool
@@ -311,6 +435,12 @@ def acovf(x, unbiased=False, demean=True, fft=False, missing='none'):
     missing : str
         A string in ['none', 'raise', 'conservative', 'drop'] specifying how the NaNs
         are to be treated.
+    axis : int, optional
+        If given, `x` can have any number of dimensions and the
+        autocovariances of all series along `axis` are computed at once.
+        The lags then replace `axis` in the output. `missing='drop'` is not
+        available in this case. Default is None, in which case `x` is
+        squeezed and must be 1d.
 
     Returns
     -------
@@ -323,9 +453,13 @@ def acovf(x, unbiased=False, demean=True, fft=False, missing='none'):
            and amplitude modulation. Sankhya: The Indian Journal of
            Statistics, Series A, pp.383-392.
     """
-    x = np.squeeze(np.asarray(x))
-    if x.ndim > 1:
-        raise ValueError("x must be 1d. Got %d dims." % x.ndim)
+    x = np.asarray(x, dtype=float)
+    if axis is None:
+        x = np.squeeze(x)
+        if x.ndim > 1:
+            raise ValueError("x must be 1d. Got %d dims." % x.ndim)
+        axis = 0
+    x = np_moveaxis(x, axis, -1)
 
     missing = missing.lower()
     if missing not in ['none', 'raise', 'conservative', 'drop']:
@@ -337,49 +471,43 @@ def acovf(x, unbiased=False, demean=True, fft=False, missing='none'):
     if deal_with_masked:
         if missing == 'raise':
             raise MissingDataError("NaNs were encountered in the data")
-        notmask_bool = ~np.isnan(x) #bool
-        if missing == 'conservative':
-            x[~notmask_bool] = 0
-        else: #'drop'
-            x = x[notmask_bool] #copies non-missing
-        notmask_int = notmask_bool.astype(int) #int
+        notmask_bool = ~np.isnan(x)
+        if missing == 'drop':
+            if x.ndim > 1:
+                raise ValueError("missing='drop' is only available for 1d"
+                                 " x.")
+            x = x[notmask_bool]  # copies non-missing
+            notmask_bool = notmask_bool[notmask_bool]
+        else:  # 'conservative'
+            x = np.where(notmask_bool, x, 0)
+        notmask_int = notmask_bool.astype(float)
 
     if demean and deal_with_masked:
         # whether 'drop' or 'conservative':
-        xo = x - x.sum()/notmask_int.sum()
-        if missing=='conservative':
-            xo[~notmask_bool] = 0
+        mean = (x.sum(axis=-1, keepdims=True) /
+                notmask_int.sum(axis=-1, keepdims=True))
+        xo = (x - mean) * notmask_int
     elif demean:
-        xo = x - x.mean()
+        xo = x - x.mean(axis=-1, keepdims=True)
     else:
         xo = x
 
-    n = len(x)
-    if unbiased and deal_with_masked and missing=='conservative':
-        d = np.correlate(notmask_int, notmask_int, 'full')
+    n = xo.shape[-1]
+    if unbiased and deal_with_masked and missing == 'conservative':
+        d = _correlate(notmask_int, notmask_int, fft)
+        if fft:
+            d = np.round(d)
     elif unbiased:
-        xi = np.arange(1, n + 1)
-        d = np.hstack((xi, xi[:-1][::-1]))
-    elif deal_with_masked: #biased and NaNs given and ('drop' or 'conservative')
-        d = notmask_int.sum() * np.ones(2*n-1)
-    else: #biased and no NaNs or missing=='none'
-        d = n * np.ones(2 * n - 1)
-
-    if fft:
-        nobs = len(xo)
-        n = _next_regular(2 * nobs + 1)
-        Frf = np.fft.fft(xo, n=n)
-        acov = np.fft.ifft(Frf * np.conjugate(Frf))[:nobs] / d[nobs - 1:]
-        acov = acov.real
+        d = n - np.arange(n)
+    elif deal_with_masked:
+        # biased and NaNs given and ('drop' or 'conservative')
+        d = notmask_int.sum(axis=-1, keepdims=True)
     else:
-        acov = (np.correlate(xo, xo, 'full') / d)[n - 1:]
-
-    if deal_with_masked and missing=='conservative':
-        # restore data for the user
-        x[~notmask_bool] = np.nan
-
-    return acov
+        # biased and no NaNs or missing=='none'
+        d = n
 
+    acov = _correlate(xo, xo, fft) / d
+    return np_moveaxis(acov, -1, axis)
 
 
 def q_stat(x, nobs, type="ljungbox"):
@@ -388,6 +516,7 @@ def q_stat(x, nobs, type="ljungbox"):
 
     x : array-like
         Array of autocorrelation coefficients.  Can be obtained from acf.
+        If multidimensional, the lags are along the last axis.
     nobs : int
         Number of observations in the entire sample (ie., not just the length
         of the autocorrelation function results.
@@ -404,10 +533,12 @@ def q_stat(x, nobs, type="ljungbox"):
     Written to be used with acf.
     """
     x = np.asarray(x)
+    nlags = x.shape[-1]
     if type == "ljungbox":
         ret = (nobs * (nobs + 2) *
-               np.cumsum((1. / (nobs - np.arange(1, len(x) + 1))) * x**2))
-    chi2 = stats.chi2.sf(ret, np.arange(1, len(x) + 1))
+               np.cumsum((1. / (nobs - np.arange(1, nlags + 1))) * x**2,
+                         axis=-1))
+    chi2 = stats.chi2.sf(ret, np.arange(1, nlags + 1))
     return ret, chi2
 
 
@@ -415,7 +546,7 @@ def q_stat(x, nobs, type="ljungbox"):
 #see for example
 # http://www.itl.nist.gov/div898/handbook/eda/section3/autocopl.htm
 def acf(x, unbiased=False, nlags=40, qstat=False, fft=False, alpha=None,
-        missing='none'):
+        missing='none', axis=None):
     """
     Autocorrelation function for 1d arrays.
 
@@ -440,6 +571,11 @@ def acf(x, unbiased=False, nlags=40, qstat=False, fft=False, alpha=None,
     missing : str, optional
         A string in ['none', 'raise', 'conservative', 'drop'] specifying how the NaNs
         are to be treated.
+    axis : int, optional
+        If given, the autocorrelations of all series along `axis` of a
+        multidimensional `x` are computed at once, and the lags replace
+        `axis` in the output. The confidence intervals then have an
+        additional last axis of length 2. See `acovf`.
 
     Returns
     -------
@@ -470,29 +606,38 @@ def acf(x, unbiased=False, nlags=40, qstat=False, fft=False, alpha=None,
        Statistics, Series A, pp.383-392.
 
     """
-    nobs = len(x)  # should this shrink for missing='drop' and NaNs in x?
-    avf = acovf(x, unbiased=unbiased, demean=True, fft=fft, missing=missing)
-    acf = avf[:nlags + 1] / avf[0]
+    # should this shrink for missing='drop' and NaNs in x?
+    nobs = len(x) if axis is None else np.shape(x)[axis]
+    avf = acovf(x, unbiased=unbiased, demean=True, fft=fft, missing=missing,
+                axis=axis)
+    if axis is None:
+        axis = 0
+    avf = np_moveaxis(avf, axis, -1)
+    acf = avf[..., :nlags + 1] / avf[..., :1]
     if not (qstat or alpha):
-        return acf
+        return np_moveaxis(acf, -1, axis)
     if alpha is not None:
-        varacf = np.ones(nlags + 1) / nobs
-        varacf[0] = 0
-        varacf[1] = 1. / nobs
-        varacf[2:] *= 1 + 2 * np.cumsum(acf[1:-1]**2)
+        varacf = np.ones(acf.shape) / nobs
+        varacf[..., 0] = 0
+        varacf[..., 1] = 1. / nobs
+        varacf[..., 2:] *= 1 + 2 * np.cumsum(acf[..., 1:-1]**2, axis=-1)
         interval = stats.norm.ppf(1 - alpha / 2.) * np.sqrt(varacf)
-        confint = np.array(lzip(acf - interval, acf + interval))
+        confint = np_moveaxis(
+            np_stack([acf - interval, acf + interval], axis=-1), -2, axis)
         if not qstat:
-            return acf, confint
+            return np_moveaxis(acf, -1, axis), confint
     if qstat:
-        qstat, pvalue = q_stat(acf[1:], nobs=nobs)  # drop lag 0
+        qstat, pvalue = q_stat(acf[..., 1:], nobs=nobs)  # drop lag 0
+        qstat = np_moveaxis(qstat, -1, axis)
+        pvalue = np_moveaxis(pvalue, -1, axis)
+        acf = np_moveaxis(acf, -1, axis)
         if alpha is not None:
             return acf, confint, qstat, pvalue
         else:
             return acf, qstat, pvalue
 
 
-def pacf_yw(x, nlags=40, method='unbiased'):
+def pacf_yw(x, nlags=40, method='unbiased', axis=None):
     '''Partial autocorrelation estimated with non-recursive yule_walker
 
     Parameters
@@ -503,6 +648,10 @@ def pacf_yw(x, nlags=40, method='unbiased'):
         largest lag for which pacf is returned
     method : 'unbiased' (default) or 'mle'
         method for the autocovariance calculations in yule walker
+    axis : int, optional
+        If given, the partial autocorrelations of all series along `axis` of
+        a multidimensional `x` are computed at once, and the lags replace
+        `axis` in the output.
 
     Returns
     -------
@@ -511,13 +660,17 @@ def pacf_yw(x, nlags=40, method='unbiased'):
 
     Notes
     -----
-    This solves yule_walker for each desired lag and contains
-    currently duplicate calculations.
+    The sample autocovariances are computed once, with FFT, and the
+    Yule-Walker equations for all lags are solved by the Levinson-Durbin
+    recursion, which gives the same solution as solving them separately
+    for each lag.
     '''
-    pacf = [1.]
-    for k in range(1, nlags + 1):
-        pacf.append(yule_walker(x, k, method=method)[0][-1])
-    return np.array(pacf)
+    acov = acovf(x, unbiased=(method == 'unbiased'), demean=True, fft=True,
+                 axis=axis)
+    if axis is None:
+        axis = 0
+    acov = np_moveaxis(acov, axis, -1)[..., :nlags + 1]
+    return np_moveaxis(_levinson_durbin_pacf(acov, nlags), -1, axis)
 
 
 #NOTE: this is incorrect.
@@ -538,7 +691,7 @@ def pacf_ols(x, nlags=40):
 
     Notes
     -----
-    This solves a separate OLS estimation for each desired lag.
+    This solves a separate least squares problem for each desired lag.
     '''
     #TODO: add warnings for Yule-Walker
     #NOTE: demeaning and not using a constant gave incorrect answers?
@@ -549,14 +702,12 @@ def pacf_ols(x, nlags=40):
     xlags = add_constant(xlags)
     pacf = [1.]
     for k in range(1, nlags+1):
-        res = OLS(x0[k:], xlags[k:, :k+1]).fit()
-         #np.take(xlags[k:], range(1,k+1)+[-1],
-
-        pacf.append(res.params[-1])
+        params = np.linalg.lstsq(xlags[k:, :k+1], x0[k:], rcond=-1)[0]
+        pacf.append(np.squeeze(params)[-1])
     return np.array(pacf)
 
 
-def pacf(x, nlags=40, method='ywunbiased', alpha=None):
+def pacf(x, nlags=40, method='ywunbiased', alpha=None, axis=None):
     '''Partial autocorrelation estimated
 
     Parameters
@@ -580,6 +731,11 @@ def pacf(x, nlags=40, method='ywunbiased', alpha=None):
         returned. For instance if alpha=.05, 95 % confidence intervals are
         returned where the standard deviation is computed according to
         1/sqrt(len(x))
+    axis : int, optional
+        If given, the partial autocorrelations of all series along `axis` of
+        a multidimensional `x` are computed at once, and the lags replace
+        `axis` in the output. The confidence intervals then have an
+        additional last axis of length 2.
 
     Returns
     -------
@@ -590,39 +746,43 @@ def pacf(x, nlags=40, method='ywunbiased', alpha=None):
 
     Notes
     -----
-    This solves yule_walker equations or ols for each desired lag
-    and contains currently duplicate calculations.
+    The Yule-Walker and Levinson-Durbin methods compute the autocovariances
+    once and use the Levinson-Durbin recursion for all series at once. The
+    OLS method solves a least squares problem for each lag and series.
     '''
 
     if method == 'ols':
-        ret = pacf_ols(x, nlags=nlags)
-    elif method in ['yw', 'ywu', 'ywunbiased', 'yw_unbiased']:
-        ret = pacf_yw(x, nlags=nlags, method='unbiased')
-    elif method in ['ywm', 'ywmle', 'yw_mle']:
-        ret = pacf_yw(x, nlags=nlags, method='mle')
-    elif method in ['ld', 'ldu', 'ldunbiase', 'ld_unbiased']:
-        acv = acovf(x, unbiased=True)
-        ld_ = levinson_durbin(acv, nlags=nlags, isacov=True)
-        #print 'ld', ld_
-        ret = ld_[2]
+        if axis is None:
+            ret = pacf_ols(x, nlags=nlags)
+        else:
+            x = np_moveaxis(np.asarray(x), axis, -1)
+            ret = np.zeros(x.shape[:-1] + (nlags + 1,))
+            for index in np.ndindex(*x.shape[:-1]):
+                ret[index] = pacf_ols(x[index], nlags=nlags)
+            ret = np_moveaxis(ret, -1, axis)
+    elif method in ['yw', 'ywu', 'ywunbiased', 'yw_unbiased',
+                    'ld', 'ldu', 'ldunbiase', 'ld_unbiased']:
+        ret = pacf_yw(x, nlags=nlags, method='unbiased', axis=axis)
     # inconsistent naming with ywmle
-    elif method in ['ldb', 'ldbiased', 'ld_biased']:
-        acv = acovf(x, unbiased=False)
-        ld_ = levinson_durbin(acv, nlags=nlags, isacov=True)
-        ret = ld_[2]
+    elif method in ['ywm', 'ywmle', 'yw_mle', 'ldb', 'ldbiased', 'ld_biased']:
+        ret = pacf_yw(x, nlags=nlags, method='mle', axis=axis)
     else:
         raise ValueError('method not available')
     if alpha is not None:
-        varacf = 1. / len(x) # for all lags >=1
+        nobs = len(x) if axis is None else np.shape(x)[axis]
+        varacf = 1. / nobs  # for all lags >=1
         interval = stats.norm.ppf(1. - alpha / 2.) * np.sqrt(varacf)
-        confint = np.array(lzip(ret - interval, ret + interval))
-        confint[0] = ret[0]  # fix confidence interval for lag 0 to varpacf=0
+        confint = np_stack([ret - interval, ret + interval], axis=-1)
+        # fix confidence interval for lag 0 to varpacf=0
+        index = [slice(None)] * ret.ndim
+        index[0 if axis is None else axis] = 0
+        confint[tuple(index)] = ret[tuple(index)][..., None]
         return ret, confint
     else:
         return ret
 
 
-def ccovf(x, y, unbiased=True, demean=True):
+def ccovf(x, y, unbiased=True, demean=True, fft=False, axis=None):
     ''' crosscovariance for 1D
 
     Parameters
@@ -631,6 +791,15 @@ def ccovf(x, y, unbiased=True, demean=True):
        time series data
     unbiased : boolean
        if True, then denominators is n-k, otherwise n
+    demean : boolean
+       if True, then subtract the means of x and y
+    fft : boolean
+       if True, use FFT convolution, which is much faster for long series.
+    axis : int, optional
+       If given, `x` and `y` can be multidimensional (and are broadcast
+       against each other) and the crosscovariances of all pairs of series
+       along `axis` are computed at once. The lags replace `axis` in the
+       output.
 
     Returns
     -------
@@ -639,25 +808,34 @@ def ccovf(x, y, unbiased=True, demean=True):
 
     Notes
     -----
-    This uses np.correlate which does full convolution. For very long time
-    series it is recommended to use fft convolution instead.
+    Element `k` of the output is the covariance of `x[t + k]` and `y[t]`.
+
+    Without `fft`, this uses np.correlate which does full convolution. For
+    very long time series it is recommended to use fft convolution instead.
     '''
-    n = len(x)
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if axis is None:
+        axis = 0
+    else:
+        x, y = np.broadcast_arrays(x, y)
+    x = np_moveaxis(x, axis, -1)
+    y = np_moveaxis(y, axis, -1)
+    n = x.shape[-1]
     if demean:
-        xo = x - x.mean()
-        yo = y - y.mean()
+        xo = x - x.mean(axis=-1, keepdims=True)
+        yo = y - y.mean(axis=-1, keepdims=True)
     else:
         xo = x
         yo = y
     if unbiased:
-        xi = np.ones(n)
-        d = np.correlate(xi, xi, 'full')
+        d = n - np.arange(n)
     else:
         d = n
-    return (np.correlate(xo, yo, 'full') / d)[n - 1:]
+    return np_moveaxis(_correlate(xo, yo, fft) / d, -1, axis)
 
 
-def ccf(x, y, unbiased=True):
+def ccf(x, y, unbiased=True, fft=False, axis=None):
     '''cross-correlation function for 1d
 
     Parameters
@@ -666,6 +844,11 @@ def ccf(x, y, unbiased=True):
        time series data
     unbiased : boolean
        if True, then denominators for autocovariance is n-k, otherwise n
+    fft : boolean
+       if True, use FFT convolution, which is much faster for long series.
+    axis : int, optional
+       If given, the cross-correlations of all pairs of series along `axis`
+       are computed at once. See `ccovf`.
 
     Returns
     -------
@@ -674,15 +857,105 @@ def ccf(x, y, unbiased=True):
 
     Notes
     -----
-    This is based np.correlate which does full convolution. For very long time
-    series it is recommended to use fft convolution instead.
+    Without `fft`, this is based np.correlate which does full convolution.
+    For very long time series it is recommended to use fft convolution
+    instead.
 
     If unbiased is true, the denominator for the autocovariance is adjusted
     but the autocorrelation is not an unbiased estimtor.
 
     '''
-    cvf = ccovf(x, y, unbiased=unbiased, demean=True)
-    return cvf / (np.std(x) * np.std(y))
+    cvf = ccovf(x, y, unbiased=unbiased, demean=True, fft=fft, axis=axis)
+    if axis is None:
+        return cvf / (np.std(x) * np.std(y))
+    std = np.std(x, axis=axis, keepdims=True) * np.std(y, axis=axis,
+                                                       keepdims=True)
+    return cvf / std
+
+
+def ccovf_matrix(x, nlags=40, unbiased=False, demean=True, fft=False):
+    '''Cross-covariance matrices of a multivariate time series
+
+    Parameters
+    ----------
+    x : array_like
+        Time series data, shaped (nobs, k_series).
+    nlags : int, optional
+        Largest lag for which the matrices are returned. Default is 40, or
+        nobs - 1 if that is smaller.
+    unbiased : bool, optional
+        If True, then denominators are n-k, otherwise n. Default is False.
+    demean : bool, optional
+        If True, then subtract the mean of each series. Default is True.
+    fft : bool, optional
+        If True, compute all cross-covariances with FFT convolution, which
+        is faster if `nlags` is large. Default is False, which uses one
+        matrix product per lag.
+
+    Returns
+    -------
+    ccovf : ndarray
+        Array shaped (nlags + 1, k_series, k_series), in which element
+        `[h, i, j]` is the covariance of `x[t + h, i]` and `x[t, j]`.
+
+    See Also
+    --------
+    ccf_matrix
+    '''
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 1:
+        x = x[:, None]
+    nobs = x.shape[0]
+    nlags = min(nlags, nobs - 1)
+    if demean:
+        x = x - x.mean(0)
+
+    if fft:
+        n = _next_regular(2 * nobs + 1)
+        fx = np.fft.rfft(x, n=n, axis=0)
+        cross = fx[:, :, None] * np.conjugate(fx[:, None, :])
+        ccov = np.fft.irfft(cross, n=n, axis=0)[:nlags + 1]
+    else:
+        ccov = np.array([np.dot(x[lag:].T, x[:nobs - lag])
+                         for lag in range(nlags + 1)])
+
+    if unbiased:
+        d = (nobs - np.arange(nlags + 1))[:, None, None]
+    else:
+        d = nobs
+    return ccov / d
+
+
+def ccf_matrix(x, nlags=40, unbiased=False, fft=False):
+    '''Cross-correlation matrices of a multivariate time series
+
+    Parameters
+    ----------
+    x : array_like
+        Time series data, shaped (nobs, k_series).
+    nlags : int, optional
+        Largest lag for which the matrices are returned. Default is 40, or
+        nobs - 1 if that is smaller.
+    unbiased : bool, optional
+        If True, then denominators for the cross-covariances are n-k,
+        otherwise n. Default is False.
+    fft : bool, optional
+        If True, use FFT convolution. See `ccovf_matrix`.
+
+    Returns
+    -------
+    ccf : ndarray
+        Array shaped (nlags + 1, k_series, k_series), in which element
+        `[h, i, j]` is the correlation of `x[t + h, i]` and `x[t, j]`.
+
+    See Also
+    --------
+    ccovf_matrix
+    '''
+    ccov = ccovf_matrix(x, nlags=nlags, unbiased=unbiased, demean=True,
+                        fft=fft)
+    sd = np.sqrt(np.diag(ccov[0]))
+    return ccov / np.outer(sd, sd)
 
 
 def periodogram(X):
@@ -1032,18 +1305,47 @@ def coint(y0, y1, trend='c', method='aeg', maxlag=None, autolag='aic',
     return res_adf[0], pval_asy, crit
 
 
-def _safe_arma_fit(y, order, model_kw, trend, fit_kw, start_params=None):
+class _FitTimeout(Exception):
+    pass
+
+
+def _timeout_callback(timeout, callback=None):
+    """
+    Optimizer callback that aborts a fit after timeout seconds
+
+    The time limit is checked once per optimizer iteration.
+    """
+    start = time.time()
+
+    def _callback(params, *args):
+        if time.time() - start > timeout:
+            raise _FitTimeout("fit did not finish within %s seconds" %
+                              timeout)
+        if callback is not None:
+            callback(params, *args)
+
+    return _callback
+
+
+def _safe_arma_fit(y, order, model_kw, trend, fit_kw, start_params=None,
+                   reraise=False):
     try:
         return ARMA(y, order=order, **model_kw).fit(disp=0, trend=trend,
                                                     start_params=start_params,
                                                     **fit_kw)
+    except _FitTimeout:
+        raise
     except LinAlgError:
         # SVD convergence failure on badly misspecified models
+        if reraise:
+            raise
         return
 
     except ValueError as error:
         if start_params is not None:  # don't recurse again
             # user supplied start_params only get one chance
+            if reraise:
+                raise
             return
         # try a little harder, should be handled in fit really
         elif ('initial' not in error.args[0] or 'initial' in str(error)):
@@ -1051,15 +1353,98 @@ def _safe_arma_fit(y, order, model_kw, trend, fit_kw, start_params=None):
             if trend == 'c':
                 start_params = [.1] + start_params
             return _safe_arma_fit(y, order, model_kw, trend, fit_kw,
-                                  start_params)
+                                  start_params, reraise)
         else:
+            if reraise:
+                raise
             return
     except:  # no idea what happened
+        if reraise:
+            raise
         return
 
 
+def _warm_start_params(params, from_order, order, k_trailing=0):
+    """
+    Start params for order from the estimates of a neighboring order
+
+    AR and MA coefficients that are not in the neighboring model are set to
+    zero, the deterministic and exogenous coefficients before and the
+    `k_trailing` variance parameters after the ARMA coefficients are kept.
+    """
+    if params is None:
+        return None
+    p0, q0 = from_order
+    p, q = order
+    k_lead = len(params) - p0 - q0 - k_trailing
+    ar = np.zeros(p)
+    ar[:min(p, p0)] = params[k_lead:k_lead + min(p, p0)]
+    ma = np.zeros(q)
+    ma[:min(q, q0)] = params[k_lead + p0:k_lead + p0 + min(q, q0)]
+    return np.r_[params[:k_lead], ar, ma,
+                 params[len(params) - k_trailing:]]
+
+
+def _fit_arma_order(y, order, ic, trend, model, model_kw, fit_kw,
+                    start_params=None, timeout=None):
+    """
+    Fit a single ARMA order for arma_order_select_ic
+
+    Returns
+    -------
+    values : list
+        The information criteria in `ic`, nan if the estimation failed.
+    params : ndarray or None
+        The parameter estimates, used as start values for other orders.
+    error : str or None
+        Description of the failure.
+    """
+    fit_kw = dict(fit_kw)
+    if timeout is not None:
+        fit_kw['callback'] = _timeout_callback(timeout,
+                                               fit_kw.get('callback'))
+    try:
+        if model == 'sarimax':
+            from statsmodels.tsa.statespace.sarimax import SARIMAX
+            mod = SARIMAX(y, order=(order[0], 0, order[1]),
+                          trend='n' if trend == 'nc' else trend,
+                          **model_kw)
+            if start_params is None:
+                try:
+                    start_params = mod.start_params
+                except ValueError:
+                    # non-stationary or non-invertible start values, start
+                    # from white noise instead
+                    start_params = np.zeros(len(mod.param_names))
+                    if mod.trend in ('c', 'ct'):
+                        start_params[0] = np.mean(mod.endog)
+                    start_params[-1] = np.var(mod.endog)
+            res = mod.fit(disp=0, start_params=start_params, **fit_kw)
+        else:
+            try:
+                res = _safe_arma_fit(y, order, model_kw, trend, fit_kw,
+                                     start_params=start_params, reraise=True)
+            except _FitTimeout:
+                raise
+            except Exception:
+                if start_params is None:
+                    raise
+                # warm start failed, try the default start values
+                res = _safe_arma_fit(y, order, model_kw, trend, fit_kw,
+                                     reraise=True)
+        values = [getattr(res, criteria) for criteria in ic]
+    except _FitTimeout as error:
+        return [np.nan] * len(ic), None, str(error)
+    except Exception as error:
+        msg = '%s: %s' % (type(error).__name__, error)
+        return [np.nan] * len(ic), None, msg
+
+    return values, np.asarray(res.params), None
+
+
 def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
-                         model_kw={}, fit_kw={}):
+                         model_kw={}, fit_kw={}, model='arma', n_jobs=1,
+                         warm_start=False, timeout=None):
     """
     Returns information criteria for many ARMA models
 
@@ -1080,13 +1465,33 @@ def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
         Keyword arguments to be passed to the ``ARMA`` model
     fit_kw : dict
         Keyword arguments to be passed to ``ARMA.fit``.
+    model : {'arma', 'sarimax'}
+        Estimate the models with ``ARMA`` or with the state space model
+        ``SARIMAX``.  `model_kw` and `fit_kw` are passed to the chosen
+        model.  For 'sarimax', trend 'nc' is translated to 'n'.
+    n_jobs : int
+        Number of jobs used to estimate the models in parallel with
+        joblib, -1 uses all cores.  Default 1 estimates the models in the
+        current process.
+    warm_start : bool
+        If True, the estimates of order (p - 1, q), or (p, q - 1) if that
+        failed, are used as start values for order (p, q) with zero for the
+        additional coefficient.  Orders with the same p + q are estimated
+        together, so the parallelism is limited by the number of orders on
+        each diagonal of the grid.
+    timeout : float, optional
+        Maximum time in seconds for the estimation of a single model.  The
+        time limit is checked in each iteration of the optimizer, models
+        that exceed it are reported as failures.
 
     Returns
     -------
     obj : Results object
         Each ic is an attribute with a DataFrame for the results. The AR order
         used is the row index. The ma order used is the column index. The
-        minimum orders are available as ``ic_min_order``.
+        minimum orders are available as ``ic_min_order``.  ``failures`` is a
+        dict that maps the orders (ar, ma) that could not be estimated to a
+        description of the error.
 
     Examples
     --------
@@ -1114,6 +1519,9 @@ def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
     therefore a little slow. An implementation using approximate estimates
     will be provided in the future. In the meantime, consider passing
     {method : 'css'} to fit_kw.
+
+    When many series are analyzed, it is usually more efficient to
+    parallelize over the series and to use ``n_jobs=1`` within each call.
     """
     from pandas import DataFrame
 
@@ -1123,22 +1531,53 @@ def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
         ic = [ic]
     elif not isinstance(ic, (list, tuple)):
         raise ValueError("Need a list or a tuple for ic if not a string.")
+    model = model.lower()
+    if model not in ('arma', 'sarimax'):
+        raise ValueError("model must be 'arma' or 'sarimax'")
+    k_trailing = 1 if model == 'sarimax' else 0
+
+    if not hasattr(y, 'index'):
+        y = np.asarray(y)
+
+    orders = [(ar, ma) for ar in ar_range for ma in ma_range
+              if not (ar == 0 and ma == 0 and trend == 'nc')]
+    if warm_start:
+        # orders on the same diagonal do not depend on each other
+        waves = [[order for order in orders if sum(order) == d]
+                 for d in range(max_ar + max_ma + 1)]
+    else:
+        waves = [orders]
 
-    results = np.zeros((len(ic), max_ar + 1, max_ma + 1))
-
-    for ar in ar_range:
-        for ma in ma_range:
-            if ar == 0 and ma == 0 and trend == 'nc':
-                results[:, ar, ma] = np.nan
-                continue
-
-            mod = _safe_arma_fit(y, (ar, ma), model_kw, trend, fit_kw)
-            if mod is None:
-                results[:, ar, ma] = np.nan
-                continue
-
-            for i, criteria in enumerate(ic):
-                results[i, ar, ma] = getattr(mod, criteria)
+    if n_jobs == 1:
+        parallel, p_func = list, _fit_arma_order
+    else:
+        parallel, p_func, n_jobs = parallel_func(_fit_arma_order, n_jobs,
+                                                 verbose=0)
+
+    results = np.empty((len(ic), max_ar + 1, max_ma + 1))
+    results.fill(np.nan)
+    params = {}
+    failures = {}
+    for wave in waves:
+        start_params = []
+        for ar, ma in wave:
+            start = None
+            if warm_start:
+                for prev in [(ar - 1, ma), (ar, ma - 1)]:
+                    if params.get(prev) is not None:
+                        start = _warm_start_params(params[prev], prev,
+                                                   (ar, ma), k_trailing)
+                        break
+            start_params.append(start)
+
+        fits = parallel(p_func(y, order, ic, trend, model, model_kw, fit_kw,
+                               start, timeout)
+                        for order, start in zip(wave, start_params))
+        for order, (values, order_params, error) in zip(wave, fits):
+            results[:, order[0], order[1]] = values
+            params[order] = order_params
+            if error is not None:
+                failures[order] = error
 
     dfs = [DataFrame(res, columns=ma_range, index=ar_range) for res in results]
 
@@ -1148,8 +1587,12 @@ def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
     min_res = {}
     for i, result in iteritems(res):
         mins = np.where(result.min().min() == result)
+        if len(mins[0]) == 0:  # no model could be estimated
+            min_res.update({i + '_min_order' : None})
+            continue
         min_res.update({i + '_min_order' : (mins[0][0], mins[1][0])})
     res.update(min_res)
+    res['failures'] = failures
 
     return Bunch(**res)
 
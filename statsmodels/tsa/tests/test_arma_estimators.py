@@ -0,0 +1,109 @@
+import warnings
+
+import numpy as np
+from numpy.testing import (assert_allclose, assert_equal, assert_raises)
+
+from statsmodels.tsa.arima_process import arma_generate_sample, arma_acovf
+from statsmodels.tsa.arma_estimators import (hannan_rissanen, innovations,
+                                              innovations_algo)
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+
+def _simulate(ar, ma, nobs, nseries=1, seed=1234):
+    np.random.seed(seed)
+    ar = np.r_[1, -np.asarray(ar)]
+    ma = np.r_[1, ma]
+    return np.column_stack([arma_generate_sample(ar, ma, nobs, burnin=100)
+                            for i in range(nseries)]).squeeze()
+
+
+def test_hannan_rissanen_arma11():
+    endog = _simulate([0.5], [0.4], 5000)
+    for unbiased in [True, False]:
+        ar_params, ma_params, sigma2 = hannan_rissanen(endog, 1, 1,
+                                                       unbiased=unbiased)
+        assert_allclose(ar_params, [0.5], atol=0.05)
+        assert_allclose(ma_params, [0.4], atol=0.05)
+        assert_allclose(sigma2, 1, atol=0.05)
+
+    # The bias correction moves the estimates towards the MLE
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        res = SARIMAX(endog, order=(1, 0, 1)).fit(disp=False)
+    hr = np.r_[hannan_rissanen(endog, 1, 1)[:2]]
+    hr_biased = np.r_[hannan_rissanen(endog, 1, 1, unbiased=False)[:2]]
+    assert_allclose(hr, res.params[:2], atol=0.01)
+    assert np.max(np.abs(hr - res.params[:2])) < np.max(np.abs(hr_biased -
+                                                              res.params[:2]))
+
+
+def test_hannan_rissanen_ar():
+    # Without MA terms, the estimator is OLS on the lagged values
+    endog = _simulate([0.5, -0.2], [], 500)
+    y = endog - endog.mean()
+    exog = np.column_stack([y[1:-1], y[:-2]])
+    desired = np.linalg.lstsq(exog, y[2:], rcond=-1)[0]
+    ar_params, ma_params, sigma2 = hannan_rissanen(endog, 2)
+    assert_allclose(ar_params, desired)
+    assert_equal(ma_params.shape, (0,))
+    assert_allclose(sigma2, np.mean((y[2:] - exog.dot(desired))**2))
+
+    # Lag lists
+    ar_params, _, _ = hannan_rissanen(endog, [2])
+    assert_allclose(ar_params,
+                    np.linalg.lstsq(y[:-2, None], y[2:], rcond=-1)[0])
+
+
+def test_hannan_rissanen_batched():
+    endog = _simulate([0.5], [0.4, 0.2], 300, nseries=4)
+    ar_params, ma_params, sigma2 = hannan_rissanen(endog, 1, [1, 2])
+    assert_equal(ar_params.shape, (4, 1))
+    assert_equal(ma_params.shape, (4, 2))
+    for i in range(4):
+        desired = hannan_rissanen(endog[:, i], 1, [1, 2])
+        assert_allclose(ar_params[i], desired[0])
+        assert_allclose(ma_params[i], desired[1])
+        assert_allclose(sigma2[i], desired[2])
+
+
+def test_hannan_rissanen_invalid():
+    endog = _simulate([0.5], [0.4], 100)
+    assert_raises(ValueError, hannan_rissanen, endog, -1, 1)
+    assert_raises(ValueError, hannan_rissanen, endog, 1, [0, 1])
+    assert_raises(ValueError, hannan_rissanen, endog[:10], 2, 2)
+    endog[10] = np.nan
+    assert_raises(ValueError, hannan_rissanen, endog, 1, 1)
+
+
+def test_innovations_algo():
+    # MA(1): theta_{n,1} converges to theta and v_n to sigma2
+    acov = arma_acovf([1], [1, 0.5], nobs=50)
+    theta, v = innovations_algo(acov)
+    assert_equal(theta.shape, (50, 49))
+    assert_allclose(theta[1, 0], 0.5 / 1.25)
+    assert_allclose(v[:2], [1.25, 1.25 - 0.25 / 1.25])
+    assert_allclose(theta[-1, 0], 0.5, atol=1e-10)
+    assert_allclose(theta[-1, 1:], 0)
+    assert_allclose(v[-1], 1, atol=1e-10)
+
+    # Leading dimensions
+    acov2 = arma_acovf([1], [1, -0.3], nobs=50)
+    theta2, v2 = innovations_algo(np.c_[acov, acov2].T, nobs=20)
+    assert_allclose(theta2[0], theta[:20, :19])
+    assert_allclose(v2[0], v[:20])
+    assert_allclose(theta2[1, -1, 0], -0.3, atol=1e-6)
+
+
+def test_innovations():
+    endog = _simulate([], [0.6, 0.2], 5000, nseries=2)
+    ma_params, sigma2 = innovations(endog, 2)
+    assert_equal(ma_params.shape, (2, 2))
+    assert_allclose(ma_params, [[0.6, 0.2]] * 2, atol=0.05)
+    assert_allclose(sigma2, 1, atol=0.05)
+
+    desired = innovations(endog[:, 1], 2, initial_order=10)
+    actual = innovations(endog, 2, initial_order=10)
+    assert_allclose(actual[0][1], desired[0])
+    assert_allclose(actual[1][1], desired[1])
+
+    assert_raises(ValueError, innovations, endog, 2, initial_order=1)
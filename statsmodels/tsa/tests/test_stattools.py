@@ -5,7 +5,9 @@ from statsmodels.tools.sm_exceptions import ColinearityWarning
 from statsmodels.tsa.stattools import (adfuller, acf, pacf_ols, pacf_yw,
                                                pacf, grangercausalitytests,
                                                coint, acovf, kpss, ResultsStore,
-                                               arma_order_select_ic)
+                                               arma_order_select_ic, ccovf, ccf,
+                                               ccovf_matrix, ccf_matrix,
+                                               levinson_durbin)
 import numpy as np
 from numpy.testing import (assert_almost_equal, assert_equal, assert_warns,
                            assert_raises, dec, assert_, assert_allclose)
@@ -524,6 +526,62 @@ def test_arma_order_select_ic():
     assert_(res.aic.columns.equals(aic.columns))
     assert_equal(res.aic_min_order, (1, 2))
 
+def test_arma_order_select_ic_options():
+    from statsmodels.tsa.arima_process import arma_generate_sample
+    np.random.seed(2014)
+    y = arma_generate_sample([1, -.75, .25], [1, .65, .35], 250)
+    res = arma_order_select_ic(y, max_ar=2, max_ma=2, ic=['aic', 'bic'],
+                               trend='nc')
+    assert_equal(res.failures, {})
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for kwds in [dict(warm_start=True), dict(model='sarimax'),
+                     dict(model='sarimax', warm_start=True)]:
+            res2 = arma_order_select_ic(y, max_ar=2, max_ma=2,
+                                        ic=['aic', 'bic'], trend='nc',
+                                        **kwds)
+            assert_allclose(res2.aic.values, res.aic.values, rtol=1e-4)
+            assert_allclose(res2.bic.values, res.bic.values, rtol=1e-4)
+            assert_equal(res2.aic_min_order, res.aic_min_order)
+            assert_equal(res2.failures, {})
+
+    # every fit is stopped in its first iteration
+    res = arma_order_select_ic(y, max_ar=1, max_ma=1, trend='nc', timeout=0)
+    assert_equal(np.isnan(res.bic.values).all(), True)
+    assert_equal(res.bic_min_order, None)
+    assert_equal(sorted(res.failures), [(0, 1), (1, 0), (1, 1)])
+    assert_('within 0 seconds' in res.failures[(1, 1)])
+
+    assert_raises(ValueError, arma_order_select_ic, y, model='arima')
+
+
+def test_autolag_nested_ols():
+    # the information criteria of the nested regressions computed from one
+    # QR decomposition agree with separate OLS fits
+    from statsmodels.regression.linear_model import OLS
+    from statsmodels.tsa.stattools import _autolag
+    np.random.seed(12345)
+    exog = np.column_stack((np.ones(150), np.random.randn(150, 7)))
+    endog = np.dot(exog[:, :4], [1, 0.5, -0.5, 0.2]) + np.random.randn(150)
+    for method in ['aic', 'bic', 't-stat']:
+        icbest, bestlag = _autolag(OLS, endog, exog, 2, 5, method)
+        icbest2, bestlag2, results = _autolag(OLS, endog, exog, 2, 5, method,
+                                              regresults=True)
+        assert_equal(bestlag, bestlag2)
+        assert_allclose(icbest, icbest2, rtol=1e-10)
+
+    # no significant lag, endog is orthogonal to exog
+    endog = np.random.randn(150)
+    endog -= np.dot(exog, np.linalg.lstsq(exog, endog, rcond=-1)[0])
+    icbest, bestlag = _autolag(OLS, endog, exog, 2, 5, 't-stat')
+    icbest2, bestlag2, results = _autolag(OLS, endog, exog, 2, 5, 't-stat',
+                                          regresults=True)
+    assert_equal(bestlag, 2)
+    assert_equal(bestlag2, 2)
+    assert_allclose(icbest, icbest2, atol=1e-8)
+
+
 def test_arma_order_select_ic_failure():
     # this should trigger an SVD convergence failure, smoke test that it
     # returns, likely platform dependent failure...
@@ -551,6 +609,92 @@ def test_acf_fft_dataframe():
     result = acf(sunspots.load_pandas().data[['SUNACTIVITY']], fft=True)
     assert_equal(result.ndim, 1)
 
+
+def test_acovf_axis():
+    np.random.seed(1234)
+    x = np.random.normal(size=(3, 50, 4))
+    x[1, 5, 2] = np.nan
+    for unbiased in [True, False]:
+        for fft in [True, False]:
+            for missing in ['none', 'conservative']:
+                res = acovf(x, unbiased=unbiased, fft=fft, missing=missing,
+                            axis=1)
+                assert_equal(res.shape, x.shape)
+                for i in range(3):
+                    for j in range(4):
+                        desired = acovf(x[i, :, j], unbiased=unbiased,
+                                        fft=fft, missing=missing)
+                        assert_allclose(res[i, :, j], desired, atol=1e-12)
+    assert_raises(ValueError, acovf, x, missing='drop', axis=1)
+
+    # The data are not modified
+    assert_(np.isnan(x[1, 5, 2]))
+
+
+def test_acf_axis():
+    np.random.seed(1234)
+    x = np.random.normal(size=(100, 3))
+    acf2d, confint, qstat, pvalue = acf(x, nlags=10, qstat=True, alpha=0.05,
+                                        fft=True, axis=0)
+    assert_equal(acf2d.shape, (11, 3))
+    assert_equal(confint.shape, (11, 3, 2))
+    assert_equal(qstat.shape, (10, 3))
+    for j in range(3):
+        desired = acf(x[:, j], nlags=10, qstat=True, alpha=0.05)
+        assert_allclose(acf2d[:, j], desired[0])
+        assert_allclose(confint[:, j], desired[1])
+        assert_allclose(qstat[:, j], desired[2])
+        assert_allclose(pvalue[:, j], desired[3])
+
+
+def test_pacf_axis():
+    np.random.seed(1234)
+    x = np.random.normal(size=(3, 200)).cumsum(1)
+    for method in ['ywunbiased', 'ywmle', 'ldb', 'ols']:
+        res, confint = pacf(x, nlags=10, method=method, alpha=0.05, axis=1)
+        assert_equal(res.shape, (3, 11))
+        assert_equal(confint.shape, (3, 11, 2))
+        for i in range(3):
+            desired = pacf(x[i], nlags=10, method=method, alpha=0.05)
+            assert_allclose(res[i], desired[0])
+            assert_allclose(confint[i], desired[1])
+
+    # Yule-Walker and Levinson-Durbin give the same partial autocorrelations
+    desired = levinson_durbin(acovf(x[0], unbiased=True), nlags=10,
+                              isacov=True)[2]
+    assert_allclose(pacf_yw(x[0], nlags=10), desired)
+
+
+def test_ccovf():
+    np.random.seed(1234)
+    x = np.random.normal(size=(60, 2))
+    y = np.random.normal(size=(60, 1))
+    for unbiased in [True, False]:
+        desired = ccovf(x[:, 0], y[:, 0], unbiased=unbiased)
+        assert_allclose(ccovf(x[:, 0], y[:, 0], unbiased=unbiased, fft=True),
+                        desired)
+        res = ccovf(x, y, unbiased=unbiased, fft=True, axis=0)
+        assert_equal(res.shape, (60, 2))
+        assert_allclose(res[:, 0], desired)
+        assert_allclose(res[:, 1], ccovf(x[:, 1], y[:, 0],
+                                         unbiased=unbiased))
+    res = ccf(x, y, axis=0)
+    assert_allclose(res[:, 1], ccf(x[:, 1], y[:, 0]))
+
+    # Cross-covariance matrices
+    for unbiased in [True, False]:
+        res = ccovf_matrix(x, nlags=5, unbiased=unbiased)
+        assert_allclose(ccovf_matrix(x, nlags=5, unbiased=unbiased, fft=True),
+                        res)
+        assert_equal(res.shape, (6, 2, 2))
+        assert_allclose(res[:, 0, 1],
+                        ccovf(x[:, 0], x[:, 1], unbiased=unbiased)[:6])
+        assert_allclose(res[:, 1, 0],
+                        ccovf(x[:, 1], x[:, 0], unbiased=unbiased)[:6])
+    res = ccf_matrix(x, nlags=5)
+    assert_allclose(np.diag(res[0]), 1)
+    assert_allclose(res[:, 0, 0], acf(x[:, 0], nlags=5))
+
 if __name__=="__main__":
     import nose
 #    nose.runmodule(argv=[__file__, '-vvs','-x','-pdb'], exit=False)
@@ -14,10 +14,18 @@ from statsmodels.tools.decorators import cache_readonly
 from statsmodels.tools.tools import chain_dot
 #from statsmodels.tsa.api import VAR
 from statsmodels.compat.python import range
+from statsmodels.compat.numpy import np_moveaxis
 import statsmodels.tsa.tsatools as tsa
 import statsmodels.tsa.vector_ar.plotting as plotting
 import statsmodels.tsa.vector_ar.util as util
 
+
+def _real_eigval_decomp(sym_array):
+    # eigenvalues of the symmetric covariance matrices are real
+    W, eigva, k = util.eigval_decomp(sym_array)
+    return np.real(W), np.real(eigva), k
+
+
 mat = np.array
 
 class BaseIRAnalysis(object):
@@ -266,9 +274,12 @@ class IRAnalysis(BaseIRAnalysis):
         return covs
 
     def errband_mc(self, orth=False, svar=False, repl=1000,
-                   signif=0.05, seed=None, burn=100):
+                   signif=0.05, seed=None, burn=100, n_jobs=1):
         """
         IRF Monte Carlo integrated error bands
+
+        `n_jobs` is the number of jobs used to compute the replications in
+        parallel, see `VARResults.irf_resim`. It is ignored with `svar`.
         """
         model = self.model
         periods = self.periods
@@ -279,9 +290,10 @@ class IRAnalysis(BaseIRAnalysis):
         else:
             return model.irf_errband_mc(orth=orth, repl=repl, T=periods,
                                         signif=signif, seed=seed,
-                                        burn=burn, cum=False)
+                                        burn=burn, cum=False, n_jobs=n_jobs)
     def err_band_sz1(self, orth=False, svar=False, repl=1000,
-                     signif=0.05, seed=None, burn=100, component=None):
+                     signif=0.05, seed=None, burn=100, component=None,
+                     n_jobs=1):
         """
         IRF Sims-Zha error band method 1. Assumes symmetric error bands around
         mean.
@@ -302,6 +314,11 @@ class IRAnalysis(BaseIRAnalysis):
             Index of column of eigenvector/value to use for each error band
             Note: period of impulse (t=0) is not included when computing
             principle component
+        n_jobs : int, default 1
+            Number of jobs used to compute the replications in parallel, see
+            `VARResults.irf_resim`
+        svar : bool, default False
+            Compute the bands of the structural impulse responses
 
         References
         ----------
@@ -319,32 +336,33 @@ class IRAnalysis(BaseIRAnalysis):
             irfs = self.irfs
         neqs = self.neqs
         irf_resim = model.irf_resim(orth=orth, repl=repl, T=periods, seed=seed,
-                                   burn=100)
+                                   burn=burn, n_jobs=n_jobs)
         q = util.norm_signif_level(signif)
 
         W, eigva, k =self._eigval_decomp_SZ(irf_resim)
 
-        if component != None:
+        if component is not None:
             if np.shape(component) != (neqs,neqs):
                 raise ValueError("Component array must be " + str(neqs) + " x " + str(neqs))
-            if np.argmax(component) >= neqs*periods:
+            if np.max(component) >= periods:
                 raise ValueError("Atleast one of the components does not exist")
             else:
-                k = component
+                k = np.asarray(component, dtype=int)
 
         # here take the kth column of W, which we determine by finding the largest eigenvalue of the covaraince matrix
+        ii, jj = np.indices((neqs, neqs))
+        band = (np_moveaxis(W[ii, jj, :, k], -1, 0) * q *
+                np.sqrt(eigva[ii, jj, k, 0]))
         lower = np.copy(irfs)
         upper = np.copy(irfs)
-        for i in range(neqs):
-            for j in range(neqs):
-                lower[1:,i,j] = irfs[1:,i,j] + W[i,j,:,k[i,j]]*q*np.sqrt(eigva[i,j,k[i,j]])
-                upper[1:,i,j] = irfs[1:,i,j] - W[i,j,:,k[i,j]]*q*np.sqrt(eigva[i,j,k[i,j]])
-
+        lower[1:] = irfs[1:] + band
+        upper[1:] = irfs[1:] - band
 
         return lower, upper
 
     def err_band_sz2(self, orth=False, repl=1000, signif=0.05,
-                     seed=None, burn=100, component=None):
+                     seed=None, burn=100, component=None, n_jobs=1,
+                     svar=False):
         """
         IRF Sims-Zha error band method 2.
 
@@ -366,6 +384,11 @@ class IRAnalysis(BaseIRAnalysis):
             Index of column of eigenvector/value to use for each error band
             Note: period of impulse (t=0) is not included when computing
             principle component
+        n_jobs : int, default 1
+            Number of jobs used to compute the replications in parallel, see
+            `VARResults.irf_resim`
+        svar : bool, default False
+            Compute the bands of the structural impulse responses
 
         References
         ----------
@@ -382,38 +405,27 @@ class IRAnalysis(BaseIRAnalysis):
             irfs = self.irfs
         neqs = self.neqs
         irf_resim = model.irf_resim(orth=orth, repl=repl, T=periods, seed=seed,
-                                   burn=100)
+                                   burn=burn, n_jobs=n_jobs)
 
         W, eigva, k = self._eigval_decomp_SZ(irf_resim)
 
-        if component != None:
+        if component is not None:
             if np.shape(component) != (neqs,neqs):
                 raise ValueError("Component array must be " + str(neqs) + " x " + str(neqs))
-            if np.argmax(component) >= neqs*periods:
+            if np.max(component) >= periods:
                 raise ValueError("Atleast one of the components does not exist")
             else:
-                k = component
+                k = np.asarray(component, dtype=int)
 
+        ii, jj = np.indices((neqs, neqs))
         gamma = np.zeros((repl, periods+1, neqs, neqs))
-        for p in range(repl):
-            for i in range(neqs):
-                for j in range(neqs):
-                    gamma[p,1:,i,j] = W[i,j,k[i,j],:] * irf_resim[p,1:,i,j]
-
-        gamma_sort = np.sort(gamma, axis=0) #sort to get quantiles
-        indx = round(signif/2*repl)-1,round((1-signif/2)*repl)-1
+        gamma[:, 1:] = np_moveaxis(W[ii, jj, k, :], -1, 0) * irf_resim[:, 1:]
 
-        lower = np.copy(irfs)
-        upper = np.copy(irfs)
-        for i in range(neqs):
-            for j in range(neqs):
-                lower[:,i,j] = irfs[:,i,j] + gamma_sort[indx[0],:,i,j]
-                upper[:,i,j] = irfs[:,i,j] + gamma_sort[indx[1],:,i,j]
-
-        return lower, upper
+        return self._gamma_bands(irfs, gamma, signif)
 
     def err_band_sz3(self, orth=False, repl=1000, signif=0.05,
-                     seed=None, burn=100, component=None):
+                     seed=None, burn=100, component=None, n_jobs=1,
+                     svar=False):
         """
         IRF Sims-Zha error band method 3. Does not assume symmetric error bands around mean.
 
@@ -433,6 +445,11 @@ class IRAnalysis(BaseIRAnalysis):
             Index of column of eigenvector/value to use for each error band
             Note: period of impulse (t=0) is not included when computing
             principle component
+        n_jobs : int, default 1
+            Number of jobs used to compute the replications in parallel, see
+            `VARResults.irf_resim`
+        svar : bool, default False
+            Compute the bands of the structural impulse responses
 
         References
         ----------
@@ -450,52 +467,48 @@ class IRAnalysis(BaseIRAnalysis):
             irfs = self.irfs
         neqs = self.neqs
         irf_resim = model.irf_resim(orth=orth, repl=repl, T=periods, seed=seed,
-                                   burn=100)
-        stack = np.zeros((neqs, repl, periods*neqs))
+                                   burn=burn, n_jobs=n_jobs)
 
-        #stack left to right, up and down
+        #stack left to right, up and down, one stack per shock
+        stack = irf_resim[:, 1:].transpose(3, 0, 2, 1).reshape(
+            neqs, repl, neqs*periods)
 
-        for p in range(repl):
-            for i in range(neqs):
-                stack[i, p,:] = np.ravel(irf_resim[p,1:,:,i].T)
-
-        stack_cov=np.zeros((neqs, periods*neqs, periods*neqs))
         W = np.zeros((neqs, periods*neqs, periods*neqs))
         eigva = np.zeros((neqs, periods*neqs))
-        k = np.zeros((neqs))
+        k = np.zeros(neqs, dtype=int)
 
-        if component != None:
+        #compute for eigen decomp for each stack
+        for i in range(neqs):
+            stack_cov = np.cov(stack[i], rowvar=0)
+            W[i], eigva[i], k[i] = _real_eigval_decomp(stack_cov)
+
+        if component is not None:
             if np.size(component) != (neqs):
                 raise ValueError("Component array must be of length " + str(neqs))
-            if np.argmax(component) >= neqs*periods:
+            if np.max(component) >= neqs*periods:
                 raise ValueError("Atleast one of the components does not exist")
             else:
-                k = component
-
-        #compute for eigen decomp for each stack
-        for i in range(neqs):
-            stack_cov[i] = np.cov(stack[i],rowvar=0)
-            W[i], eigva[i], k[i] = util.eigval_decomp(stack_cov[i])
+                k = np.asarray(component, dtype=int)
 
+        # the kth row of W for shock j, split into the periods of response i
+        Wk = W[np.arange(neqs), k].reshape(neqs, neqs, periods)
         gamma = np.zeros((repl, periods+1, neqs, neqs))
-        for p in range(repl):
-            c=0
-            for j in range(neqs):
-                for i in range(neqs):
-                        gamma[p,1:,i,j] = W[j,k[j],i*periods:(i+1)*periods] * irf_resim[p,1:,i,j]
-                        if i == neqs-1:
-                            gamma[p,1:,i,j] = W[j,k[j],i*periods:] * irf_resim[p,1:,i,j]
+        gamma[:, 1:] = Wk.transpose(2, 1, 0) * irf_resim[:, 1:]
 
-        gamma_sort = np.sort(gamma, axis=0) #sort to get quantiles
-        indx = round(signif/2*repl)-1,round((1-signif/2)*repl)-1
+        return self._gamma_bands(irfs, gamma, signif)
 
-        lower = np.copy(irfs)
-        upper = np.copy(irfs)
-        for i in range(neqs):
-            for j in range(neqs):
-                lower[:,i,j] = irfs[:,i,j] + gamma_sort[indx[0],:,i,j]
-                upper[:,i,j] = irfs[:,i,j] + gamma_sort[indx[1],:,i,j]
+    def _gamma_bands(self, irfs, gamma, signif):
+        """
+        Error bands from the quantiles of the simulated `gamma` across
+        replications
+        """
+        repl = len(gamma)
+        gamma_sort = np.sort(gamma, axis=0) #sort to get quantiles
+        indx = (int(round(signif/2*repl)) - 1,
+                int(round((1-signif/2)*repl)) - 1)
 
+        lower = irfs + gamma_sort[indx[0]]
+        upper = irfs + gamma_sort[indx[1]]
         return lower, upper
 
     def _eigval_decomp_SZ(self, irf_resim):
@@ -510,18 +523,15 @@ class IRAnalysis(BaseIRAnalysis):
         neqs = self.neqs
         periods = self.periods
 
-        cov_hold = np.zeros((neqs, neqs, periods, periods))
-        for i in range(neqs):
-            for j in range(neqs):
-                cov_hold[i,j,:,:] = np.cov(irf_resim[:,1:,i,j],rowvar=0)
-
         W = np.zeros((neqs, neqs, periods, periods))
         eigva = np.zeros((neqs, neqs, periods, 1))
-        k = np.zeros((neqs, neqs))
+        k = np.zeros((neqs, neqs), dtype=int)
 
         for i in range(neqs):
             for j in range(neqs):
-                W[i,j,:,:], eigva[i,j,:,0], k[i,j] = util.eigval_decomp(cov_hold[i,j,:,:])
+                cov_hold = np.cov(irf_resim[:,1:,i,j], rowvar=0)
+                W[i,j,:,:], eigva[i,j,:,0], k[i,j] = _real_eigval_decomp(
+                    cov_hold)
         return W, eigva, k
 
     @cache_readonly
@@ -625,14 +635,15 @@ class IRAnalysis(BaseIRAnalysis):
         return covs
 
     def cum_errband_mc(self, orth=False, repl=1000,
-                          signif=0.05, seed=None, burn=100):
+                          signif=0.05, seed=None, burn=100, n_jobs=1):
         """
         IRF Monte Carlo integrated error bands of cumulative effect
         """
         model = self.model
         periods = self.periods
         return model.irf_errband_mc(orth=orth, repl=repl,
-                                    T=periods, signif=signif, seed=seed, burn=burn, cum=True)
+                                    T=periods, signif=signif, seed=seed, burn=burn, cum=True,
+                                    n_jobs=n_jobs)
 
     def lr_effect_cov(self, orth=False):
         """
@@ -15,6 +15,7 @@ import numpy as np
 import statsmodels.api as sm
 import statsmodels.tsa.vector_ar.util as util
 import statsmodels.tools.data as data_util
+import statsmodels.tsa.vector_ar.var_model as var_model
 from statsmodels.tsa.vector_ar.var_model import VAR
 
 
@@ -352,6 +353,57 @@ class TestVARResults(CheckIRF, CheckFEVD):
         ma_rep = self.res.ma_rep(self.nahead)
         assert_almost_equal(ma_rep, self.ref.ma_rep)
 
+    def test_ma_rep_stacked(self):
+        coefs = np.array([self.res.coefs, 0.5 * self.res.coefs])
+        ma_rep = var_model.ma_rep(coefs, self.nahead)
+        assert_almost_equal(ma_rep[0], self.res.ma_rep(self.nahead))
+        assert_almost_equal(ma_rep[1],
+                            var_model.ma_rep(coefs[1], self.nahead))
+
+    def test_irf_resim(self):
+        res = self.res
+        chol_sigma_u = np.linalg.cholesky(res.sigma_u)
+        sim = var_model._varsim_batch(res.coefs, res.intercept, chol_sigma_u,
+                                      res.nobs + 100, 3, seed=1234)
+        irf_resim = var_model._irf_resim_chunk(
+            res.coefs, res.intercept, res.sigma_u, res.nobs, 100, 5, True,
+            True, 3, 1234)
+        for i in range(3):
+            sim_res = VAR(sim[100:, i]).fit(maxlags=self.p)
+            coefs, sigma_u = var_model._var_fit_batch(sim[100:], self.p)
+            assert_almost_equal(coefs[i], sim_res.coefs)
+            assert_almost_equal(sigma_u[i], sim_res.sigma_u)
+            assert_almost_equal(irf_resim[i],
+                                sim_res.orth_ma_rep(5).cumsum(axis=0))
+
+        # the replications do not depend on the number of jobs
+        irf_resim = res.irf_resim(repl=600, T=5, seed=1234)
+        assert_equal(irf_resim.shape, (600, 6, self.k, self.k))
+        assert_(np.all(np.diff(irf_resim[:, 1:], axis=0) != 0))
+        assert_equal(res.irf_resim(repl=600, T=5, seed=1234, n_jobs=2),
+                     irf_resim)
+        assert_raises(ValueError, res.irf_resim, repl=0)
+
+        lower, upper = res.irf_errband_mc(repl=600, T=5, seed=1234)
+        irf_sorted = np.sort(irf_resim, axis=0)
+        assert_equal(lower, irf_sorted[14])
+        assert_equal(upper, irf_sorted[584])
+
+    def test_irf_err_bands(self):
+        irf = self.res.irf(5)
+        for method in ['err_band_sz1', 'err_band_sz2', 'err_band_sz3']:
+            lower, upper = getattr(irf, method)(repl=100, seed=1234)
+            assert_equal(lower.shape, irf.irfs.shape)
+            assert_equal(lower[0], np.eye(self.k))
+            if method == 'err_band_sz1':
+                assert_almost_equal(lower + upper, 2 * irf.irfs)
+            else:
+                assert_(np.all(lower <= upper))
+                # the original positional order of the arguments
+                positional = getattr(irf, method)(False, 100, 0.05, 1234)
+                assert_equal(positional[0], lower)
+                assert_equal(positional[1], upper)
+
     #--------------------------------------------------
     # Lots of tests to make sure stuff works...need to check correctness
 
@@ -9,6 +9,7 @@ Lutkepohl (2005) New Introduction to Multiple Time Series Analysis
 from __future__ import division, print_function
 from statsmodels.compat.python import (range, lrange, string_types, StringIO, iteritems,
                                 cStringIO)
+from statsmodels.compat.numpy import np_moveaxis
 
 from collections import defaultdict
 
@@ -21,7 +22,9 @@ import scipy.linalg as L
 from statsmodels.tools.decorators import cache_readonly
 from statsmodels.tools.tools import chain_dot
 from statsmodels.tools.linalg import logdet_symm
+from statsmodels.tools.parallel import parallel_func
 from statsmodels.tsa.tsatools import vec, unvec
+from statsmodels.tsa.stattools import ccovf_matrix
 
 from statsmodels.tsa.vector_ar.irf import IRAnalysis
 from statsmodels.tsa.vector_ar.output import VARSummary
@@ -45,6 +48,8 @@ def ma_rep(coefs, maxn=10):
     Parameters
     ----------
     coefs : ndarray (p x k x k)
+        Leading dimensions, e.g. (nsim x p x k x k), are treated as a stack
+        of separate VAR processes.
     maxn : int
         Number of MA matrices to compute
 
@@ -63,8 +68,21 @@ def ma_rep(coefs, maxn=10):
     Returns
     -------
     phis : ndarray (maxn + 1 x k x k)
+        With leading dimensions if `coefs` has them.
     """
-    p, k, k = coefs.shape
+    coefs = np.asarray(coefs)
+    p, k = coefs.shape[-3:-1]
+    if coefs.ndim > 3:
+        # stacked processes, move the lag axis to the front
+        coefs = np_moveaxis(coefs, -3, 0)
+        phis = np.zeros((maxn+1,) + coefs.shape[1:])
+        phis[0] = np.eye(k)
+        for i in range(1, maxn + 1):
+            for j in range(1, min(i, p) + 1):
+                phis[i] += np.einsum('...ij,...jk->...ik', phis[i-j],
+                                     coefs[j-1])
+        return np_moveaxis(phis, 0, -3)
+
     phis = np.zeros((maxn+1, k, k))
     phis[0] = np.eye(k)
 
@@ -78,6 +96,79 @@ def ma_rep(coefs, maxn=10):
 
     return phis
 
+
+def _varsim_batch(coefs, intercept, chol_sig_u, steps, nsim, seed=None):
+    """
+    Simulate `nsim` independent paths of a VAR(p) process at once
+
+    Returns an array (steps x nsim x k). The initialization matches
+    `util.varsim`, the first p observations are zero.
+    """
+    rs = np.random.RandomState(seed=seed)
+    p, k, k = coefs.shape
+    ugen = np.dot(rs.standard_normal((steps, nsim, k)), chol_sig_u.T)
+    result = np.zeros((steps, nsim, k))
+    result[p:] = intercept + ugen[p:]
+
+    # add in AR terms, for all paths at each period
+    coefs_t = coefs.swapaxes(1, 2)
+    for t in range(p, steps):
+        for j in range(p):
+            result[t] += np.dot(result[t-j-1], coefs_t[j])
+
+    return result
+
+
+def _var_fit_batch(y, lags):
+    """
+    OLS fit with a constant of a VAR(lags) to each of a stack of samples
+
+    Parameters
+    ----------
+    y : ndarray (nobs x nsim x k)
+
+    Returns
+    -------
+    coefs : ndarray (nsim x lags x k x k)
+    sigma_u : ndarray (nsim x k x k)
+        Degrees of freedom corrected, as in `VAR.fit`
+    """
+    nobs, nsim, k = y.shape
+    # regressors in the order of util.get_var_endog, (nsim x T x 1 + k*p)
+    z = np.concatenate([np.ones((nobs - lags, nsim, 1))] +
+                       [y[lags - i - 1:nobs - i - 1] for i in range(lags)],
+                       axis=2).swapaxes(0, 1)
+    y_sample = y[lags:].swapaxes(0, 1)
+
+    # cross products and solve for all samples at once
+    zz = np.einsum('sti,stj->sij', z, z)
+    zy = np.einsum('sti,stj->sij', z, y_sample)
+    params = np.linalg.solve(zz, zy)
+    resid = y_sample - np.einsum('sti,sij->stj', z, params)
+
+    df_resid = nobs - lags - (k * lags + 1)
+    sigma_u = np.einsum('sti,stj->sij', resid, resid) / df_resid
+    coefs = params[:, 1:].reshape((nsim, lags, k, k)).swapaxes(2, 3)
+    return coefs, sigma_u
+
+
+def _irf_resim_chunk(coefs, intercept, sigma_u, nobs, burn, T, orth, cum,
+                     nsim, seed):
+    """
+    Simulate, refit and compute the impulse responses of `nsim` replications
+    """
+    k_ar = coefs.shape[0]
+    sim = _varsim_batch(coefs, intercept, chol(sigma_u), nobs + burn, nsim,
+                        seed=seed)
+    sim_coefs, sim_sigma_u = _var_fit_batch(sim[burn:], k_ar)
+    ma_coll = ma_rep(sim_coefs, maxn=T)
+    if orth:
+        ma_coll = np.einsum('...ij,...jk->...ik', ma_coll,
+                            chol(sim_sigma_u)[:, None])
+    if cum:
+        ma_coll = ma_coll.cumsum(axis=1)
+    return ma_coll
+
 def is_stable(coefs, verbose=False):
     """
     Determine stability of VAR(p) system by examining the eigenvalues of the
@@ -1047,7 +1138,8 @@ class VARResults(VARProcess):
 
     #Monte Carlo irf standard errors
     def irf_errband_mc(self, orth=False, repl=1000, T=10,
-                       signif=0.05, seed=None, burn=100, cum=False):
+                       signif=0.05, seed=None, burn=100, cum=False,
+                       n_jobs=1):
         """
         Compute Monte Carlo integrated error bands assuming normally
         distributed for impulse response functions
@@ -1068,6 +1160,9 @@ class VARResults(VARProcess):
             number of initial observations to discard for simulation
         cum: bool, default False
             produce cumulative irf error bands
+        n_jobs: int, default 1
+            Number of jobs used to compute the replications in parallel,
+            see `irf_resim`.
 
         Notes
         -----
@@ -1078,36 +1173,8 @@ class VARResults(VARProcess):
         Tuple of lower and upper arrays of ma_rep monte carlo standard errors
 
         """
-        neqs = self.neqs
-        mean = self.mean()
-        k_ar = self.k_ar
-        coefs = self.coefs
-        sigma_u = self.sigma_u
-        intercept = self.intercept
-        df_model = self.df_model
-        nobs = self.nobs
-
-        ma_coll = np.zeros((repl, T+1, neqs, neqs))
-
-        if (orth == True and cum == True):
-            fill_coll = lambda sim : VAR(sim).fit(maxlags=k_ar).\
-                              orth_ma_rep(maxn=T).cumsum(axis=0)
-        elif (orth == True and cum == False):
-            fill_coll = lambda sim : VAR(sim).fit(maxlags=k_ar).\
-                              orth_ma_rep(maxn=T)
-        elif (orth == False and cum == True):
-            fill_coll = lambda sim : VAR(sim).fit(maxlags=k_ar).\
-                              ma_rep(maxn=T).cumsum(axis=0)
-        elif (orth == False and cum == False):
-            fill_coll = lambda sim : VAR(sim).fit(maxlags=k_ar).\
-                              ma_rep(maxn=T)
-
-        for i in range(repl):
-            #discard first hundred to eliminate correct for starting bias
-            sim = util.varsim(coefs, intercept, sigma_u,
-                              seed=seed, steps=nobs+burn)
-            sim = sim[burn:]
-            ma_coll[i,:,:,:] = fill_coll(sim)
+        ma_coll = self.irf_resim(orth=orth, repl=repl, T=T, seed=seed,
+                                 burn=burn, cum=cum, n_jobs=n_jobs)
 
         ma_sort = np.sort(ma_coll, axis=0) #sort to get quantiles
         index = round(signif/2*repl)-1,round((1-signif/2)*repl)-1
@@ -1116,7 +1183,7 @@ class VARResults(VARProcess):
         return lower, upper
 
     def irf_resim(self, orth=False, repl=1000, T=10,
-                      seed=None, burn=100, cum=False):
+                      seed=None, burn=100, cum=False, n_jobs=1):
 
         """
         Simulates impulse response function, returning an array of simulations.
@@ -1130,57 +1197,56 @@ class VARResults(VARProcess):
             number of Monte Carlo replications to perform
         T: int, default 10
             number of impulse response periods
-        signif: float (0 < signif <1)
-            Significance level for error bars, defaults to 95% CI
         seed: int
             np.random.seed for replications
         burn: int
             number of initial observations to discard for simulation
         cum: bool, default False
             produce cumulative irf error bands
+        n_jobs: int, default 1
+            Number of jobs used to compute the replications in parallel.
+            -1 uses all CPUs. Requires joblib, otherwise the replications
+            are computed sequentially.
 
         Notes
         -----
         Sims, Christoper A., and Tao Zha. 1999. "Error Bands for Impulse Response." Econometrica 67: 1113-1155.
 
+        The replications are computed in blocks. All paths of a block are
+        simulated together, the VARs are refit with one stacked least squares
+        solve and the MA representations are computed for the whole block.
+        The blocks are seeded from `seed` and do not depend on `n_jobs`.
+
         Returns
         -------
         Array of simulated impulse response functions
 
         """
-        neqs = self.neqs
-        mean = self.mean()
+        if repl < 1:
+            raise ValueError("repl must be at least 1")
+
         k_ar = self.k_ar
         coefs = self.coefs
         sigma_u = self.sigma_u
         intercept = self.intercept
-        df_model = self.df_model
         nobs = self.nobs
 
-        ma_coll = np.zeros((repl, T+1, neqs, neqs))
-
-        if (orth == True and cum == True):
-            fill_coll = lambda sim : VAR(sim).fit(maxlags=k_ar).\
-                              orth_ma_rep(maxn=T).cumsum(axis=0)
-        elif (orth == True and cum == False):
-            fill_coll = lambda sim : VAR(sim).fit(maxlags=k_ar).\
-                              orth_ma_rep(maxn=T)
-        elif (orth == False and cum == True):
-            fill_coll = lambda sim : VAR(sim).fit(maxlags=k_ar).\
-                              ma_rep(maxn=T).cumsum(axis=0)
-        elif (orth == False and cum == False):
-            fill_coll = lambda sim : VAR(sim).fit(maxlags=k_ar).\
-                              ma_rep(maxn=T)
-
-        for i in range(repl):
-            #discard first hundred to eliminate correct for starting bias
-            sim = util.varsim(coefs, intercept, sigma_u,
-                              seed=seed, steps=nobs+burn)
-            sim = sim[burn:]
-            ma_coll[i,:,:,:] = fill_coll(sim)
+        # replications per block, bounds the memory of the simulated paths
+        chunksize = 500
+        sizes = np.diff(np.r_[0:repl:chunksize, repl])
+        rs = np.random.RandomState(seed=seed)
+        seeds = rs.randint(np.iinfo(np.int32).max, size=len(sizes))
 
-        return ma_coll
+        if n_jobs == 1:
+            parallel, p_func = list, _irf_resim_chunk
+        else:
+            parallel, p_func, n_jobs = parallel_func(_irf_resim_chunk, n_jobs,
+                                                     verbose=0)
+        ma_coll = parallel(p_func(coefs, intercept, sigma_u, nobs, burn, T,
+                                  orth, cum, size, chunk_seed)
+                           for size, chunk_seed in zip(sizes, seeds))
 
+        return np.concatenate(ma_coll, axis=0)
 
     def _omega_forc_cov(self, steps):
         # Approximate MSE matrix \Omega(h) as defined in Lut p97
@@ -1630,18 +1696,7 @@ class FEVD(object):
 #-------------------------------------------------------------------------------
 
 def _compute_acov(x, nlags=1):
-    x = x - x.mean(0)
-
-    result = []
-    for lag in range(nlags + 1):
-        if lag > 0:
-            r = np.dot(x[lag:].T, x[:-lag])
-        else:
-            r = np.dot(x.T, x)
-
-        result.append(r)
-
-    return np.array(result) / len(x)
+    return ccovf_matrix(x, nlags=nlags)
 
 def _acovs_to_acorrs(acovs):
     sd = np.sqrt(np.diag(acovs[0]))